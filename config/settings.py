@@ -91,18 +91,25 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 FIELD_ENCRYPTION_KEY = 'KBjpQhY7oW/NX8eeubTH45vcA3rVqkTdzKP1AAcFXCE='
 
-# 캐시 설정 - 파일 기반 캐시 (Worker 간 공유)
+# 캐시 설정 - 로컬 SQLite(WAL) 캐시 (Worker 간 공유, msgpack 직렬화, LRU 정리)
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
-        'LOCATION': '/tmp/django_cache',
+        'BACKEND': 'stats.cache_backends.SQLiteCache',
+        'LOCATION': '/tmp/django_cache.sqlite3',
         'TIMEOUT': 86400,  # 24시간 (초 단위)
         'OPTIONS': {
-            'MAX_ENTRIES': 1000,  # 최대 캐시 항목 수
+            'MAX_ENTRIES': 20000,  # 최대 캐시 항목 수
+            'MAX_BYTES': 512 * 1024 * 1024,  # 최대 캐시 크기 (바이트)
+            'CULL_FREQUENCY': 4,  # 초과 시 오래 사용하지 않은 1/4 정리
         }
     }
 }
 
+# 수집 후 리포트 캐시 워밍 (stats.services.cache_warmer)
+CACHE_WARM_SET = env.list('CACHE_WARM_SET', default=['home', 'report', 'purchase', 'sales'])
+CACHE_WARM_CONCURRENCY = env.int('CACHE_WARM_CONCURRENCY', default=2)
+CACHE_WARM_ACTIVE_DAYS = env.int('CACHE_WARM_ACTIVE_DAYS', default=30)
+
 # 로깅 설정
 LOGGING = {
     'version': 1,
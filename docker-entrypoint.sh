@@ -12,6 +12,10 @@ export DISPLAY=:99
 echo "데이터베이스 마이그레이션을 실행합니다..."
 python manage.py migrate
 
+# newspic 통계 스냅샷 동기화 (최초 배포 시 원본 전체, 이후에는 최근 일자만)
+echo "newspic 통계 스냅샷을 동기화합니다..."
+python manage.py sync_newspic_stats || echo "⚠️ newspic 통계 동기화에 실패했습니다. 스케줄러가 다시 시도합니다."
+
 # Gunicorn으로 서버 실행
 echo "Gunicorn 서버를 시작합니다..."
 gunicorn -c gunicorn.docker.conf.py config.wsgi:application 
\ No newline at end of file
@@ -1,20 +1,22 @@
-import os, json
+import os, json, csv, base64, itertools, zlib
 from datetime import datetime
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Sum
-from django.db.models.functions import ExtractMonth, ExtractYear
+from django.db.models import F, FloatField, Max, Q, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncMonth, TruncWeek
 from django.utils import timezone
 from oauthlib.oauth2 import InvalidClientError
 from google_auth_oauthlib.flow import Flow
-import pandas as pd
+import logging
 
 from .models import AdStats
+from .models import DailyRevenueRollup
 from .models import PlatformCredential
+from .models import UploadJob
 from .services.adsense_service import fetch_adsense_stats_by_credential
 from .services.admanager_service import fetch_admanager_stats_by_credential, get_admanager_reports, save_report_to_credential, get_admanager_network
 from .services.coupang_service import fetch_coupang_stats_by_credential
@@ -22,6 +24,12 @@ from .services.cozymamang_service import fetch_cozymamang_stats_by_credential
 from .services.mediamixer_service import fetch_mediamixer_stats_by_credential
 from .services.teads_service import fetch_teads_stats_by_credential
 from .services.aceplanet_service import fetch_aceplanet_stats_by_credential
+from .services.spreadsheet_reader import get_file_ext, SUPPORTED_EXTENSIONS
+from .services.rollups import fetch_with_rollups
+from .services.upload_jobs import submit_upload_job, get_job_status
+from .services.xlsx_stream import XLSX_CONTENT_TYPE, XlsxSheet, stream_xlsx
+
+logger = logging.getLogger(__name__)
 
 # ===== 유틸리티 함수 =====
 def get_required(params, keys):
@@ -53,7 +61,7 @@ def fetch_adsense_api(request):
         results = []
         for cred in credentials:
             try:
-                fetch_adsense_stats_by_credential(cred, data["start_date"], data["end_date"])
+                fetch_with_rollups(fetch_adsense_stats_by_credential, cred, data["start_date"], data["end_date"])
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -85,7 +93,7 @@ def fetch_admanager_api(request):
             try:
                 # 보고서 ID가 제공되면 사용, 없으면 자격증명에서 가져옴
                 report_id = data.get("report_id")
-                fetch_admanager_stats_by_credential(cred, data["start_date"], data["end_date"], report_id)
+                fetch_with_rollups(fetch_admanager_stats_by_credential, cred, data["start_date"], data["end_date"], report_id)
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -169,7 +177,7 @@ def fetch_coupang_api(request):
         results = []
         for cred in credentials:
             try:
-                fetch_coupang_stats_by_credential(cred, data["start_date"], data["end_date"])
+                fetch_with_rollups(fetch_coupang_stats_by_credential, cred, data["start_date"], data["end_date"])
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -198,7 +206,7 @@ def fetch_cozymamang_api(request):
         results = []
         for cred in credentials:
             try:
-                fetch_cozymamang_stats_by_credential(cred, data["start_date"], data["end_date"])
+                fetch_with_rollups(fetch_cozymamang_stats_by_credential, cred, data["start_date"], data["end_date"])
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -227,7 +235,7 @@ def fetch_mediamixer_api(request):
         results = []
         for cred in credentials:
             try:
-                fetch_mediamixer_stats_by_credential(cred, data["start_date"], data["end_date"])
+                fetch_with_rollups(fetch_mediamixer_stats_by_credential, cred, data["start_date"], data["end_date"])
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -256,7 +264,7 @@ def fetch_teads_api(request):
         results = []
         for cred in credentials:
             try:
-                fetch_teads_stats_by_credential(cred, data["start_date"], data["end_date"])
+                fetch_with_rollups(fetch_teads_stats_by_credential, cred, data["start_date"], data["end_date"])
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -285,7 +293,7 @@ def fetch_aceplanet_api(request):
         results = []
         for cred in credentials:
             try:
-                fetch_aceplanet_stats_by_credential(cred, data["start_date"], data["end_date"])
+                fetch_with_rollups(fetch_aceplanet_stats_by_credential, cred, data["start_date"], data["end_date"])
                 results.append({"alias": cred.alias, "status": "success"})
             except Exception as e:
                 results.append({"alias": cred.alias, "status": "error", "message": str(e)})
@@ -293,10 +301,8 @@ def fetch_aceplanet_api(request):
     except Exception as e:
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
-@csrf_exempt
-@login_required
-def upload_adpost_excel(request):
-    """Adpost Excel/CSV 파일 업로드 처리"""
+def _submit_report_upload(request, platform):
+    """리포트 파일 업로드 접수 (검증 후 백그라운드 작업 생성)"""
     if request.method != "POST":
         return JsonResponse({"error": "잘못된 요청입니다."}, status=400)
 
@@ -310,332 +316,64 @@ def upload_adpost_excel(request):
             return JsonResponse({"error": "계정이 선택되지 않았습니다."}, status=400)
 
         # 자격증명 조회
-        cred = PlatformCredential.objects.filter(user=request.user, platform="adpost", alias=account_id).first()
+        cred = PlatformCredential.objects.filter(user=request.user, platform=platform, alias=account_id).first()
         if not cred:
             return JsonResponse({"error": "등록되지 않은 계정입니다."}, status=400)
 
         # 파일 확장자 확인
-        file_ext = file.name.split('.')[-1].lower()
-        if file_ext not in ['xlsx', 'xls', 'csv']:
+        file_ext = get_file_ext(file.name)
+        if file_ext not in SUPPORTED_EXTENSIONS:
             return JsonResponse({"error": "지원하지 않는 파일 형식입니다. (지원: xlsx, xls, csv)"}, status=400)
 
-        # 파일 읽기
-        if file_ext == 'csv':
-            df = pd.read_csv(file, encoding='utf-8')
-        else:
-            df = pd.read_excel(file)
-
-        # 컬럼 매핑 정의
-        column_mapping = {
-            'date': ['날짜', 'date', 'Date', 'DATE'],
-            'content_id': ['미디어명', 'content_id', 'Content ID', 'CONTENT_ID'],
-            'content_name': ['미디어명', 'content_name', 'Content Name', 'CONTENT_NAME'],
-            'ad_unit_id': ['채널명', 'ad_unit_id', 'Ad Unit ID', 'AD_UNIT_ID'],
-            'ad_unit_name': ['채널명', 'ad_unit_name', 'Ad Unit Name', 'AD_UNIT_NAME'],
-            'impressions': ['광고요청수', '노출수', 'impressions', 'Impressions', 'IMPRESSIONS'],
-            'view_count': ['조회수', 'view_count', 'View Count', 'VIEW_COUNT'],
-            'clicks': ['클릭수', 'clicks', 'Clicks', 'CLICKS'],
-            'ctr': ['클릭률', 'ctr', 'CTR', 'Click Rate', 'CLICK_RATE'],
-            'earnings': ['매출', '수입예정액', 'earnings', 'Earnings', 'EARNINGS', '수입', '수익']
-        }
-
-        # 실제 컬럼명 찾기
-        actual_columns = {}
-        for field, possible_names in column_mapping.items():
-            found = False
-            for col in df.columns:
-                if any(name in col for name in possible_names):
-                    actual_columns[field] = col
-                    found = True
-                    break
-            if not found:
-                missing_columns = {
-                    'date': '날짜',
-                    'content_id': '미디어명',
-                    'ad_unit_id': '채널명',
-                    'impressions': '광고요청수',
-                    'view_count': '조회수',
-                    'clicks': '클릭수',
-                    'ctr': '클릭률',
-                    'earnings': '매출'
-                }
-                return JsonResponse({
-                    "error": f"필수 컬럼이 없습니다: {missing_columns[field]}"
-                }, status=400)
-
-        # 데이터 처리 및 저장
-        saved_count = 0
-        error_count = 0
-        error_messages = []
-
-        for index, row in df.iterrows():
-            try:
-                # 날짜 처리 (YYYYMMDD 형식)
-                date_str = str(row[actual_columns['date']])
-                if len(date_str) != 8:
-                    error_messages.append(f"행 {index + 2}: 잘못된 날짜 형식 ({date_str})")
-                    error_count += 1
-                    continue
-
-                try:
-                    date = datetime.strptime(date_str, '%Y%m%d').date()
-                except ValueError:
-                    error_messages.append(f"행 {index + 2}: 날짜 변환 실패 ({date_str})")
-                    error_count += 1
-                    continue
-
-                # CTR 처리
-                ctr_str = str(row[actual_columns['ctr']]).replace('%', '').strip()
-                try:
-                    ctr = float(ctr_str)
-                except ValueError:
-                    error_messages.append(f"행 {index + 2}: CTR 변환 실패 ({ctr_str})")
-                    error_count += 1
-                    continue
-
-                # 수입 처리
-                earnings_str = str(row[actual_columns['earnings']]).replace(',', '').strip()
-                try:
-                    earnings = float(earnings_str)
-                except ValueError:
-                    error_messages.append(f"행 {index + 2}: 수입 변환 실패 ({earnings_str})")
-                    error_count += 1
-                    continue
-
-                # 데이터 저장
-                AdStats.objects.update_or_create(
-                    user=request.user,
-                    platform="adpost",
-                    alias=account_id,
-                    credential=cred,
-                    content_id=str(row[actual_columns['content_id']]),
-                    content_name=str(row[actual_columns['content_name']]),
-                    ad_unit_id=str(row[actual_columns['ad_unit_id']]),
-                    ad_unit_name=str(row[actual_columns['ad_unit_name']]),
-                    view_count=int(row[actual_columns['view_count']]),
-                    date=date,
-                    impressions=int(row[actual_columns['impressions']]),
-                    clicks=int(row[actual_columns['clicks']]),
-                    ctr=ctr,
-                    earnings=earnings
-                )
-                saved_count += 1
-
-            except Exception as e:
-                error_messages.append(f"행 {index + 2}: {str(e)}")
-                error_count += 1
-                continue
-
-        if saved_count == 0:
-            return JsonResponse({
-                "error": "저장된 데이터가 없습니다.",
-                "details": error_messages[:5]  # 처음 5개의 에러 메시지만 반환
-            }, status=400)
-
-        # 마지막 저장 시간 업데이트
-        if saved_count > 0:
-            cred.last_fetched_at = timezone.now()
-            cred.save()
-
-        message = f"{saved_count}개의 데이터가 성공적으로 저장되었습니다."
-        if error_count > 0:
-            message += f" ({error_count}개의 데이터 처리 실패)"
-
+        force = request.POST.get("force") in ("1", "true")
+        job = submit_upload_job(cred, file, force=force)
         return JsonResponse({
-            "message": message,
-            "saved_count": saved_count,
-            "error_count": error_count,
-            "errors": error_messages[:5] if error_count > 0 else []
-        })
+            "job_id": str(job.job_id),
+            "status": job.status,
+            "message": "파일 업로드가 접수되었습니다. 처리 상태를 확인합니다."
+        }, status=202)
 
     except Exception as e:
+        logger.exception(f"[{platform}] 업로드 접수 오류")
         return JsonResponse({
             "error": f"파일 처리 중 오류가 발생했습니다: {str(e)}"
         }, status=500)
 
 @csrf_exempt
 @login_required
-def upload_taboola_excel(request):
-    """Taboola Excel/CSV 파일 업로드 처리"""
-    if request.method != "POST":
-        return JsonResponse({"error": "잘못된 요청입니다."}, status=400)
-
-    try:
-        file = request.FILES.get("file")
-        if not file:
-            return JsonResponse({"error": "파일이 없습니다."}, status=400)
-
-        account_id = request.POST.get("account_id")
-        if not account_id:
-            return JsonResponse({"error": "계정이 선택되지 않았습니다."}, status=400)
-
-        # 자격증명 조회
-        cred = PlatformCredential.objects.filter(user=request.user, platform="taboola", alias=account_id).first()
-        if not cred:
-            return JsonResponse({"error": "등록되지 않은 계정입니다."}, status=400)
-
-        # 파일 확장자 확인
-        file_ext = file.name.split('.')[-1].lower()
-        if file_ext not in ['xlsx', 'xls', 'csv']:
-            return JsonResponse({"error": "지원하지 않는 파일 형식입니다. (지원: xlsx, xls, csv)"}, status=400)
-
-        # 파일 읽기
-        try:
-            if file_ext == 'csv':
-                df = pd.read_csv(file, encoding='utf-8')
-            else:
-                df = pd.read_excel(file)
-        except Exception as e:
-            return JsonResponse({
-                "error": f"파일 읽기 실패: {str(e)}"
-            }, status=400)
-
-        # 디버깅: 컬럼명 출력
-        print(f"파일 컬럼: {list(df.columns)}")
-        print(f"데이터 샘플: {df.head()}")
-
-        # Taboola CSV 컬럼 매핑 정의
-        column_mapping = {
-            'date': ['Date', 'date', '날짜', 'DATE'],
-            'page_views': ['Page Views', 'page_views', '페이지뷰', 'PAGE_VIEWS'],
-            'ad_clicks': ['Ad Clicks', 'ad_clicks', '광고클릭', 'AD_CLICKS'],
-            'ad_revenue': ['Ad Revenue (KRW)', 'Ad Revenue', 'ad_revenue', '광고수익', 'AD_REVENUE']
-        }
-
-        # 실제 컬럼명 찾기
-        actual_columns = {}
-        for field, possible_names in column_mapping.items():
-            found = False
-            for col in df.columns:
-                if any(name in col for name in possible_names):
-                    actual_columns[field] = col
-                    found = True
-                    break
-            if not found:
-                missing_columns = {
-                    'date': 'Date',
-                    'page_views': 'Page Views',
-                    'ad_clicks': 'Ad Clicks',
-                    'ad_revenue': 'Ad Revenue (KRW)'
-                }
-                return JsonResponse({
-                    "error": f"필수 컬럼이 없습니다: {missing_columns[field]} (파일 컬럼: {list(df.columns)})"
-                }, status=400)
-
-        print(f"매핑된 컬럼: {actual_columns}")
-
-        # 데이터 처리 및 저장
-        saved_count = 0
-        error_count = 0
-        error_messages = []
-
-        for index, row in df.iterrows():
-            try:
-                # 날짜 처리 (MM/DD/YYYY 형식)
-                date_str = str(row[actual_columns['date']]).strip()
-                print(f"행 {index + 2}: 날짜 원본값 = '{date_str}'")
-                
-                try:
-                    # MM/DD/YYYY 형식 처리
-                    date = datetime.strptime(date_str, '%m/%d/%Y').date()
-                except ValueError:
-                    # YYYY-MM-DD 형식도 시도
-                    try:
-                        date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        error_messages.append(f"행 {index + 2}: 날짜 변환 실패 ({date_str})")
-                        error_count += 1
-                        continue
-
-                # Page Views 처리
-                page_views_str = str(row[actual_columns['page_views']]).replace(',', '').strip()
-                print(f"행 {index + 2}: Page Views 원본값 = '{page_views_str}'")
-                try:
-                    page_views = int(float(page_views_str))
-                except ValueError:
-                    error_messages.append(f"행 {index + 2}: Page Views 변환 실패 ({page_views_str})")
-                    error_count += 1
-                    continue
-
-                # Ad Clicks 처리
-                ad_clicks_str = str(row[actual_columns['ad_clicks']]).replace(',', '').strip()
-                print(f"행 {index + 2}: Ad Clicks 원본값 = '{ad_clicks_str}'")
-                try:
-                    ad_clicks = int(float(ad_clicks_str))
-                except ValueError:
-                    error_messages.append(f"행 {index + 2}: Ad Clicks 변환 실패 ({ad_clicks_str})")
-                    error_count += 1
-                    continue
-
-                # Ad Revenue 처리 (KRW)
-                ad_revenue_str = str(row[actual_columns['ad_revenue']]).replace(',', '').strip()
-                print(f"행 {index + 2}: Ad Revenue 원본값 = '{ad_revenue_str}'")
-                try:
-                    ad_revenue = float(ad_revenue_str)
-                except ValueError:
-                    error_messages.append(f"행 {index + 2}: Ad Revenue 변환 실패 ({ad_revenue_str})")
-                    error_count += 1
-                    continue
-
-                # CTR 계산 (Ad Clicks / Page Views * 100)
-                ctr = (ad_clicks / page_views * 100) if page_views > 0 else 0
-
-                print(f"행 {index + 2}: 처리된 데이터 - 날짜: {date}, Page Views: {page_views}, Ad Clicks: {ad_clicks}, Ad Revenue: {ad_revenue}, CTR: {ctr}")
-
-                # 데이터 저장
-                AdStats.objects.update_or_create(
-                    user=request.user,
-                    platform="taboola",
-                    alias=account_id,
-                    date=date,
-                    defaults={
-                        'credential': cred,
-                        'impressions': int(page_views),  # int로 변환
-                        'clicks': int(ad_clicks),        # int로 변환
-                        'ctr': float(ctr),               # float로 변환
-                        'earnings': float(ad_revenue)    # float로 변환
-                    }
-                )
-                saved_count += 1
-
-            except Exception as e:
-                error_msg = f"행 {index + 2}: {str(e)}"
-                print(f"오류 발생: {error_msg}")
-                error_messages.append(error_msg)
-                error_count += 1
-                continue
-
-        if saved_count == 0:
-            return JsonResponse({
-                "error": "저장된 데이터가 없습니다.",
-                "details": error_messages[:5]  # 처음 5개의 에러 메시지만 반환
-            }, status=400)
-
-        # 마지막 저장 시간 업데이트
-        if saved_count > 0:
-            cred.last_fetched_at = timezone.now()
-            cred.save()
+def upload_adpost_excel(request):
+    """Adpost Excel/CSV 파일 업로드 처리 (백그라운드 작업)"""
+    return _submit_report_upload(request, "adpost")
 
-        message = f"{saved_count}개의 데이터가 성공적으로 저장되었습니다."
-        if error_count > 0:
-            message += f" ({error_count}개의 데이터 처리 실패)"
+@csrf_exempt
+@login_required
+def upload_taboola_excel(request):
+    """Taboola Excel/CSV 파일 업로드 처리 (백그라운드 작업)"""
+    return _submit_report_upload(request, "taboola")
 
-        return JsonResponse({
-            "message": message,
-            "saved_count": saved_count,
-            "error_count": error_count,
-            "errors": error_messages[:5] if error_count > 0 else []
-        })
+@login_required
+def upload_job_status_api(request, job_id):
+    """업로드 작업 진행 상태 조회 (폴링)"""
+    job = UploadJob.objects.filter(user=request.user, job_id=job_id).first()
+    if not job:
+        return JsonResponse({"error": "업로드 작업을 찾을 수 없습니다."}, status=404)
+    return JsonResponse(get_job_status(job))
 
-    except Exception as e:
-        import traceback
-        error_traceback = traceback.format_exc()
-        print(f"전체 오류: {str(e)}")
-        print(f"오류 상세: {error_traceback}")
-        return JsonResponse({
-            "error": f"파일 처리 중 오류가 발생했습니다: {str(e)}",
-            "details": error_traceback
-        }, status=500)
+@login_required
+def upload_job_errors_api(request, job_id):
+    """업로드 작업 행 단위 오류 리포트 (CSV 다운로드)"""
+    job = UploadJob.objects.filter(user=request.user, job_id=job_id).first()
+    if not job:
+        return JsonResponse({"error": "업로드 작업을 찾을 수 없습니다."}, status=404)
+
+    response = HttpResponse(content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="upload_errors_{job.job_id}.csv"'
+    response.write('\ufeff')  # 엑셀 한글 깨짐 방지
+    writer = csv.writer(response)
+    writer.writerow(['파일명', '오류'])
+    for message in job.errors:
+        writer.writerow([job.file_name, message])
+    return response
     
 # ===== 인증 관련 함수 =====
 def adsense_auth_start(request):
@@ -824,9 +562,64 @@ def admanager_auth_callback(request):
         """)
 
 # ===== 통계 관련 함수 =====
+# 통계 API 집계 단위 (SQL 에서 절사) / 선택 가능한 지표 / 페이지 크기
+STATS_BUCKETS = {
+    "day": None,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+STATS_SERIES = ("earnings", "clicks", "impressions", "order_count", "total_amount", "ctr", "ppc")
+STATS_DEFAULT_LIMIT = 5000
+STATS_MAX_LIMIT = 20000
+
+
+def _encode_stats_cursor(bucket, platform, alias):
+    """마지막 행의 (구간, 플랫폼, 계정) → 다음 페이지 커서"""
+    raw = json.dumps([bucket.isoformat(), platform, alias], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_stats_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    bucket, platform, alias = json.loads(raw)
+    return datetime.strptime(bucket, "%Y-%m-%d").date(), platform, alias
+
+
+def _stats_series_expressions(series):
+    """선택한 지표의 집계식 {'<지표>_value': 식} (ctr/ppc 도 SQL 에서 계산, 필드명과 겹치지 않게 별칭 사용)"""
+    expressions = {}
+    for name in series:
+        if name == "ctr":
+            expressions[f"{name}_value"] = Coalesce(
+                Cast(Sum("clicks"), FloatField()) * 100.0 / NullIf(Sum("impressions"), 0), 0.0,
+                output_field=FloatField(),
+            )
+        elif name == "ppc":
+            expressions[f"{name}_value"] = Coalesce(
+                Cast(Sum("earnings"), FloatField()) / NullIf(Sum("clicks"), 0), 0.0,
+                output_field=FloatField(),
+            )
+        else:
+            expressions[f"{name}_value"] = Sum(name)
+    return expressions
+
+
+def _stats_json_value(name, value):
+    if name in ("clicks", "impressions", "order_count"):
+        return int(value or 0)
+    return float(value or 0)
+
+
 @login_required
 def api_stats_view(request):
-    """통계 데이터 API"""
+    """
+    통계 데이터 API
+    - bucket(또는 grouping): day / week / month - SQL 에서 구간별 합산
+    - series: 쉼표로 구분한 지표 목록 (기본: 전체)
+    - shape=compact: {columns, rows: [[...]], next_cursor} 배열 응답 + 커서 페이지네이션 (limit, cursor)
+    shape 를 지정하지 않으면 기존과 같은 객체 목록을 반환합니다.
+    일별 집계(DailyRevenueRollup)에서 읽고, ad_unit_id 로 거를 때만 AdStats 원본을 사용합니다.
+    """
     try:
         start_date = request.GET.get("start_date")
         end_date = request.GET.get("end_date")
@@ -849,67 +642,214 @@ def api_stats_view(request):
         if alias and alias != "all":
             filters["alias"] = alias
 
+        # 광고 단위 조회는 원본(AdStats)에서, 그 외에는 (사용자, 플랫폼, 계정, 날짜) 일별 집계에서 합산
+        source = DailyRevenueRollup
         ad_unit_id = request.GET.get("ad_unit_id")
         if ad_unit_id and ad_unit_id != "all":
             filters["ad_unit_id"] = ad_unit_id
+            source = AdStats
 
-        stats = AdStats.objects.filter(**filters)
-
-        grouping = request.GET.get("grouping", "day")
-        if grouping == "month":
-            stats = stats.annotate(
-                year=ExtractYear('date'),
-                month=ExtractMonth('date')
-            ).values('year', 'month', 'platform', 'alias').annotate(
-                earnings=Sum("earnings"),
-                clicks=Sum("clicks"),
-                impressions=Sum("impressions"),
-                order_count=Sum("order_count"),
-                total_amount=Sum("total_amount")
-            ).order_by('year', 'month')
-        else:
-            stats = stats.values("date", "platform", "alias").annotate(
-                earnings=Sum("earnings"),
-                clicks=Sum("clicks"),
-                impressions=Sum("impressions"),
-                order_count=Sum("order_count"),
-                total_amount=Sum("total_amount")
-            ).order_by("date")
-
-        result = []
-        for stat in stats:
-            if grouping == "month":
-                date_str = f"{stat['year']}-{stat['month']:02d}-01"
-            else:
-                date_str = stat["date"].strftime("%Y-%m-%d")
-                
-            total_clicks = int(stat["clicks"] or 0)
-            total_impressions = int(stat["impressions"] or 0)
-            total_earnings = float(stat["earnings"] or 0)
-            
-            ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
-            ppc = (total_earnings / total_clicks) if total_clicks > 0 else 0
-                
-            result.append({
-                "date": date_str,
-                "platform": stat["platform"],
-                "alias": stat["alias"],
-                "earnings": total_earnings,
-                "clicks": total_clicks,
-                "impressions": total_impressions,
-                "order_count": int(stat["order_count"] or 0),
-                "total_amount": float(stat["total_amount"] or 0),
-                "ctr": ctr,
-                "ppc": ppc
-            })
+        bucket = request.GET.get("bucket") or request.GET.get("grouping", "day")
+        if bucket not in STATS_BUCKETS:
+            return JsonResponse({"error": f"지원하지 않는 집계 단위입니다: {bucket}"}, status=400)
+
+        series_param = request.GET.get("series")
+        series = [name for name in series_param.split(",") if name] if series_param else list(STATS_SERIES)
+        unknown = [name for name in series if name not in STATS_SERIES]
+        if unknown:
+            return JsonResponse({"error": f"지원하지 않는 지표입니다: {', '.join(unknown)}"}, status=400)
 
-        return JsonResponse(result, safe=False)
+        compact = request.GET.get("shape") == "compact"
+
+        trunc = STATS_BUCKETS[bucket]
+        stats = source.objects.filter(**filters).annotate(
+            bucket=trunc("date") if trunc else F("date")
+        )
+
+        next_cursor = None
+        if compact:
+            try:
+                limit = min(max(int(request.GET.get("limit", STATS_DEFAULT_LIMIT)), 1), STATS_MAX_LIMIT)
+            except ValueError:
+                return JsonResponse({"error": "limit 은 숫자여야 합니다."}, status=400)
+            cursor = request.GET.get("cursor")
+            if cursor:
+                try:
+                    cursor_bucket, cursor_platform, cursor_alias = _decode_stats_cursor(cursor)
+                except (ValueError, TypeError):
+                    return JsonResponse({"error": "잘못된 커서입니다."}, status=400)
+                # (구간, 플랫폼, 계정) 순서 기준 키셋 페이지네이션
+                stats = stats.filter(
+                    Q(bucket__gt=cursor_bucket)
+                    | Q(bucket=cursor_bucket, platform__gt=cursor_platform)
+                    | Q(bucket=cursor_bucket, platform=cursor_platform, alias__gt=cursor_alias)
+                )
+
+        rows = stats.values("bucket", "platform", "alias").annotate(
+            **_stats_series_expressions(series)
+        ).order_by("bucket", "platform", "alias").values_list(
+            "bucket", "platform", "alias", *[f"{name}_value" for name in series]
+        )
+
+        if not compact:
+            result = [
+                {
+                    "date": row[0].strftime("%Y-%m-%d"),
+                    "platform": row[1],
+                    "alias": row[2],
+                    **{name: _stats_json_value(name, value) for name, value in zip(series, row[3:])},
+                }
+                for row in rows
+            ]
+            return JsonResponse(result, safe=False)
+
+        page = list(rows[:limit + 1])
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = _encode_stats_cursor(*page[-1][:3])
+        return JsonResponse({
+            "bucket": bucket,
+            "columns": ["date", "platform", "alias", *series],
+            "rows": [
+                [row[0].strftime("%Y-%m-%d"), row[1], row[2]]
+                + [_stats_json_value(name, value) for name, value in zip(series, row[3:])]
+                for row in page
+            ],
+            "next_cursor": next_cursor,
+        })
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+# 원본 데이터 내보내기 형식 / 한 번에 읽는 행 수
+STATS_EXPORT_FORMATS = ("json", "ndjson", "csv", "xlsx")
+STATS_EXPORT_CHUNK_SIZE = 2000
+STATS_EXPORT_CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": XLSX_CONTENT_TYPE,
+}
+# (JSON 키, 파일 헤더)
+STATS_EXPORT_COLUMNS = (
+    ("date", "날짜"),
+    ("platform", "플랫폼"),
+    ("alias", "계정"),
+    ("ad_unit", "광고 단위"),
+    ("earnings", "수익"),
+    ("clicks", "클릭 수"),
+    ("impressions", "광고 요청 수"),
+    ("order_count", "주문건수"),
+    ("total_amount", "합산금액"),
+    ("ctr", "CTR (%)"),
+    ("ppc", "PPC"),
+)
+
+
+class _Echo:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 버퍼 (스트리밍 CSV 용)"""
+
+    def write(self, value):
+        return value
+
+
+def _stats_export_rows(stats, grouping):
+    """
+    AdStats 를 values_list().iterator() 로 읽어 내보내기 행(튜플)을 하나씩 생성.
+    grouping=month 이면 DB 에서 월 × 플랫폼 × 계정 × 광고 단위로 합산합니다.
+    """
+    if grouping == "month":
+        rows = stats.annotate(month=TruncMonth("date")).values(
+            "month", "platform", "alias", "ad_unit_id"
+        ).annotate(
+            ad_unit_name=Max("ad_unit_name"),
+            earnings_sum=Sum("earnings"),
+            clicks_sum=Sum("clicks"),
+            impressions_sum=Sum("impressions"),
+            order_count_sum=Sum("order_count"),
+            total_amount_sum=Sum("total_amount"),
+        ).order_by("month", "platform", "alias", "ad_unit_id").values_list(
+            "month", "platform", "alias", "ad_unit_name", "ad_unit_id", "earnings_sum", "clicks_sum",
+            "impressions_sum", "order_count_sum", "total_amount_sum",
+        )
+        for month, platform, alias, ad_unit_name, ad_unit_id, earnings, clicks, impressions, order_count, total_amount in rows.iterator(chunk_size=STATS_EXPORT_CHUNK_SIZE):
+            earnings = float(earnings or 0)
+            clicks = int(clicks or 0)
+            impressions = int(impressions or 0)
+            yield (
+                month.strftime("%Y-%m"), platform or "", alias or "", ad_unit_name or ad_unit_id or "",
+                earnings, clicks, impressions, int(order_count or 0), float(total_amount or 0),
+                (clicks / impressions * 100) if impressions > 0 else 0.0,
+                (earnings / clicks) if clicks > 0 else 0.0,
+            )
+        return
+
+    rows = stats.order_by("date", "platform", "alias", "ad_unit_id").values_list(
+        "date", "platform", "alias", "ad_unit_name", "ad_unit_id", "earnings", "clicks",
+        "impressions", "order_count", "total_amount", "ctr", "ppc",
+    )
+    for day, platform, alias, ad_unit_name, ad_unit_id, earnings, clicks, impressions, order_count, total_amount, ctr, ppc in rows.iterator(chunk_size=STATS_EXPORT_CHUNK_SIZE):
+        yield (
+            day.strftime("%Y-%m-%d"), platform or "", alias or "", ad_unit_name or ad_unit_id or "",
+            float(earnings or 0), int(clicks or 0), int(impressions or 0), int(order_count or 0),
+            float(total_amount or 0), float(ctr or 0), float(ppc or 0),
+        )
+
+
+def _stats_export_stream(rows, export_format):
+    """내보내기 행을 형식별 바이트 청크로 변환"""
+    keys = [key for key, _ in STATS_EXPORT_COLUMNS]
+    if export_format == "xlsx":
+        header = [(label, "header") for _, label in STATS_EXPORT_COLUMNS]
+        yield from stream_xlsx([XlsxSheet("통계", itertools.chain([header], rows))])
+        return
+
+    batch = []
+    if export_format == "csv":
+        writer = csv.writer(_Echo())
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        batch.append("\ufeff" + writer.writerow([label for _, label in STATS_EXPORT_COLUMNS]))
+        for row in rows:
+            batch.append(writer.writerow(row))
+            if len(batch) >= STATS_EXPORT_CHUNK_SIZE:
+                yield "".join(batch).encode("utf-8")
+                batch = []
+    elif export_format == "ndjson":
+        for row in rows:
+            batch.append(json.dumps(dict(zip(keys, row)), ensure_ascii=False) + "\n")
+            if len(batch) >= STATS_EXPORT_CHUNK_SIZE:
+                yield "".join(batch).encode("utf-8")
+                batch = []
+    else:
+        # JSON 배열 (기존 응답 형식) 을 조각으로 출력
+        batch.append("[")
+        for i, row in enumerate(rows):
+            batch.append(("," if i else "") + json.dumps(dict(zip(keys, row)), ensure_ascii=False))
+            if len(batch) >= STATS_EXPORT_CHUNK_SIZE:
+                yield "".join(batch).encode("utf-8")
+                batch = []
+        batch.append("]")
+    if batch:
+        yield "".join(batch).encode("utf-8")
+
+
+def _gzip_stream(chunks):
+    """바이트 청크를 gzip 스트림으로 압축"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @login_required
 def api_stats_excel_view(request):
-    """엑셀 다운로드 API"""
+    """
+    통계 원본 데이터 내보내기 API (스트리밍).
+    - format: json(기본, 기존 배열 형식) / ndjson / csv / xlsx
+    - grouping=month: csv/ndjson/xlsx 에서 월 단위 합산 (json 은 기존처럼 일 단위 원본)
+    - gzip: 텍스트 형식은 클라이언트가 gzip 을 지원하면 압축 전송 (gzip=0 이면 비활성)
+    """
     start_date = request.GET.get("start_date")
     end_date = request.GET.get("end_date")
     if not start_date or not end_date:
@@ -921,6 +861,10 @@ def api_stats_excel_view(request):
     except ValueError:
         return JsonResponse({"error": "잘못된 날짜 형식입니다."}, status=400)
 
+    export_format = request.GET.get("format", "json")
+    if export_format not in STATS_EXPORT_FORMATS:
+        return JsonResponse({"error": f"지원하지 않는 형식입니다: {export_format}"}, status=400)
+
     filters = {
         "date__range": [start_date, end_date],
         "user": request.user,
@@ -938,25 +882,26 @@ def api_stats_excel_view(request):
     if ad_unit_id and ad_unit_id != "all":
         filters["ad_unit_id"] = ad_unit_id
 
-    stats = AdStats.objects.filter(**filters).order_by("date", "platform", "alias", "ad_unit_id")
-
-    result = []
-    for stat in stats:
-        result.append({
-            "date": stat.date.strftime("%Y-%m-%d"),
-            "platform": stat.platform or "",
-            "alias": stat.alias or "",
-            "ad_unit": stat.ad_unit_name or stat.ad_unit_id or "",
-            "earnings": float(stat.earnings or 0),
-            "clicks": int(stat.clicks or 0),
-            "impressions": int(stat.impressions or 0),
-            "order_count": int(stat.order_count or 0),
-            "total_amount": float(stat.total_amount or 0),
-            "ctr": float(stat.ctr or 0),
-            "ppc": float(stat.ppc or 0),
-        })
+    grouping = request.GET.get("grouping", "day") if export_format != "json" else "day"
+    rows = _stats_export_rows(AdStats.objects.filter(**filters), grouping)
+    chunks = _stats_export_stream(rows, export_format)
 
-    return JsonResponse(result, safe=False)
+    use_gzip = (
+        export_format != "xlsx"  # xlsx 는 이미 zip 압축
+        and request.GET.get("gzip", "1") != "0"
+        and "gzip" in request.headers.get("Accept-Encoding", "")
+    )
+    response = StreamingHttpResponse(
+        _gzip_stream(chunks) if use_gzip else chunks,
+        content_type=STATS_EXPORT_CONTENT_TYPES[export_format],
+    )
+    if use_gzip:
+        response["Content-Encoding"] = "gzip"
+    response["Vary"] = "Accept-Encoding"
+    if export_format != "json":
+        filename = f"stats_{start_date}_to_{end_date}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 @login_required
 def api_ad_units_view(request):
@@ -1,11 +1,19 @@
 from django.apps import AppConfig
 import os
+import sys
 
 class StatsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stats'
 
     def ready(self):
+        # 데이터 버전(캐시 무효화) 시그널 등록
+        from .services import data_versions  # noqa: F401
+
+        # 관리 명령(migrate, sync_newspic_stats 등)은 스케줄러 없이 실행 (runserver 제외)
+        if os.path.basename(sys.argv[0]) == 'manage.py' and 'runserver' not in sys.argv:
+            return
+
         # 개발 서버의 autoreloader가 두 번 실행하는 것을 방지
         if os.environ.get('RUN_MAIN', None) != 'true':
             from . import scheduler
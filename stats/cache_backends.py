@@ -0,0 +1,383 @@
+"""
+로컬 SQLite(WAL) 캐시 백엔드.
+
+한 호스트의 여러 gunicorn 워커가 하나의 SQLite 파일을 공유합니다.
+- 값은 msgpack 으로 직렬화 (Decimal/date/datetime/tuple/set 은 확장 타입)
+  모델 인스턴스 등 그 외 객체는 TypeError - dict/tuple 로 바꿔 저장하고, 꼭 필요하면 Pickled(obj) 로 감싸 명시적으로 pickle
+- MAX_ENTRIES / MAX_BYTES 를 넘으면 만료 항목 → 오래 사용하지 않은 항목(LRU) 순으로 정리
+- 적중/미스/저장/정리 건수와 총 바이트를 cache_stats 테이블에 누적 (stats() 로 조회)
+
+settings 예시:
+    CACHES = {'default': {
+        'BACKEND': 'stats.cache_backends.SQLiteCache',
+        'LOCATION': '/tmp/django_cache.sqlite3',
+        'OPTIONS': {'MAX_ENTRIES': 20000, 'MAX_BYTES': 512 * 1024 * 1024, 'CULL_FREQUENCY': 4},
+    }}
+"""
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+
+import msgpack
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# 조회 시각(LRU) 갱신 최소 간격 (초) - 읽기마다 쓰기가 발생하지 않도록
+ACCESS_RESOLUTION = 60
+# 프로세스별 적중/미스 카운터를 공유 통계 테이블에 반영하는 간격 (초)
+STATS_FLUSH_INTERVAL = 30
+# SQLite 바인드 변수 제한을 고려한 IN 조회 단위
+QUERY_CHUNK_SIZE = 500
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 256 * 1024 * 1024
+
+STAT_NAMES = ('hits', 'misses', 'sets', 'deletes', 'evictions', 'entries', 'bytes')
+
+# msgpack 확장 타입 코드
+EXT_DECIMAL = 1
+EXT_DATE = 2
+EXT_DATETIME = 3
+EXT_TUPLE = 4
+EXT_SET = 5
+EXT_PICKLE = 127
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entry (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        expires REAL,
+        size INTEGER NOT NULL,
+        accessed REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)",
+    "CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires)",
+    "CREATE TABLE IF NOT EXISTS cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID",
+)
+
+
+# ---- 직렬화 ----
+
+class Pickled:
+    """pickle 직렬화를 명시적으로 허용하는 값 래퍼. cache.set(key, Pickled(obj)) 후 조회하면 obj 를 반환합니다."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _default(obj):
+    """msgpack 기본 타입이 아닌 값 변환 (strict_types 이므로 하위 클래스도 여기로 옴)"""
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, tuple):
+        return msgpack.ExtType(EXT_TUPLE, dumps(list(obj)))
+    if isinstance(obj, (set, frozenset)):
+        return msgpack.ExtType(EXT_SET, dumps(list(obj)))
+    # dict/list/str/int/float 하위 클래스 (OrderedDict, defaultdict, SafeString, IntEnum 등)
+    for base in (dict, list, str, bool, int, float):
+        if isinstance(obj, base):
+            return base(obj)
+    # numpy 스칼라
+    if type(obj).__module__ == 'numpy' and getattr(obj, 'ndim', None) == 0:
+        return obj.item()
+    if isinstance(obj, Pickled):
+        return msgpack.ExtType(EXT_PICKLE, pickle.dumps(obj.value, pickle.HIGHEST_PROTOCOL))
+    logger.error(f"[SQLiteCache] 직렬화할 수 없는 캐시 값 타입: {type(obj).__module__}.{type(obj).__qualname__}")
+    raise TypeError(
+        f"캐시 값으로 저장할 수 없는 타입입니다: {type(obj).__qualname__} (dict/list/tuple 로 변환하거나 Pickled 로 감싸세요)"
+    )
+
+
+def _ext_hook(code, data):
+    if code == EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == EXT_TUPLE:
+        return tuple(loads(data))
+    if code == EXT_SET:
+        return set(loads(data))
+    if code == EXT_PICKLE:
+        return pickle.loads(data)
+    return msgpack.ExtType(code, data)
+
+
+def dumps(value):
+    return msgpack.packb(value, default=_default, strict_types=True, use_bin_type=True)
+
+
+def loads(data):
+    return msgpack.unpackb(data, ext_hook=_ext_hook, strict_map_key=False, raw=False)
+
+
+# ---- 백엔드 ----
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = location
+        self._max_bytes = int(options.get('MAX_BYTES', DEFAULT_MAX_BYTES))
+        self._local = threading.local()
+        self._schema_ready = False
+        self._stats_lock = threading.Lock()
+        self._pending = {'hits': 0, 'misses': 0}
+        self._last_flush = time.monotonic()
+
+    # -- 연결 --
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        # fork 된 워커는 부모 연결을 쓰지 않고 새로 연결
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+            conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+            if not self._schema_ready:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.executemany(
+                    'INSERT OR IGNORE INTO cache_stats (name, value) VALUES (?, 0)', [(name,) for name in STAT_NAMES]
+                )
+                self._schema_ready = True
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE 로 워커 간 쓰기 직렬화)"""
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            self._flush_pending(conn)
+            conn.execute('COMMIT')
+
+    # -- 통계 --
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._pending[name] += amount
+
+    def _flush_pending(self, conn):
+        with self._stats_lock:
+            pending = {name: count for name, count in self._pending.items() if count}
+            self._pending = {name: 0 for name in self._pending}
+            self._last_flush = time.monotonic()
+        self._adjust(conn, **pending)
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= STATS_FLUSH_INTERVAL:
+            with self._write():
+                pass
+
+    @staticmethod
+    def _adjust(conn, **deltas):
+        conn.executemany(
+            'UPDATE cache_stats SET value = value + ? WHERE name = ?',
+            [(delta, name) for name, delta in deltas.items() if delta],
+        )
+
+    def stats(self):
+        """캐시 통계 (모든 워커 누적): 적중/미스/저장/삭제/정리 건수, 항목 수, 바이트, 적중률"""
+        with self._write():
+            pass
+        stats = dict(self._conn().execute('SELECT name, value FROM cache_stats').fetchall())
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats['hit_rate'] = stats.get('hits', 0) / lookups if lookups else 0.0
+        stats['max_entries'] = self._max_entries
+        stats['max_bytes'] = self._max_bytes
+        return stats
+
+    # -- 정리 --
+
+    def _cull(self, conn, now):
+        counters = dict(conn.execute("SELECT name, value FROM cache_stats WHERE name IN ('entries', 'bytes')"))
+        entries, total_bytes = counters.get('entries', 0), counters.get('bytes', 0)
+        if entries <= self._max_entries and total_bytes <= self._max_bytes:
+            return
+
+        evicted = conn.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (now,)).rowcount
+        entries, total_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry').fetchone()
+        while entries and (entries > self._max_entries or total_bytes > self._max_bytes):
+            if self._cull_frequency == 0:
+                batch = entries
+            else:
+                batch = max(1, entries // self._cull_frequency)
+            evicted += conn.execute(
+                'DELETE FROM cache_entry WHERE key IN (SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)', (batch,)
+            ).rowcount
+            entries, total_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry').fetchone()
+
+        conn.executemany(
+            'UPDATE cache_stats SET value = ? WHERE name = ?', [(entries, 'entries'), (total_bytes, 'bytes')]
+        )
+        self._adjust(conn, evictions=evicted)
+        logger.debug(f"[SQLiteCache] {evicted}개 항목 정리 (남은 항목 {entries}, {total_bytes} bytes)")
+
+    # -- 기본 연산 --
+
+    def _store(self, conn, key, blob, expires, now):
+        size = len(blob) + len(key)
+        old = conn.execute('SELECT size FROM cache_entry WHERE key = ?', (key,)).fetchone()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?)',
+            (key, blob, expires, size, now),
+        )
+        self._adjust(conn, sets=1, entries=0 if old else 1, bytes=size - (old[0] if old else 0))
+
+    def _remove(self, conn, keys):
+        removed = 0
+        removed_bytes = 0
+        for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+            chunk = keys[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            count, size = conn.execute(
+                f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry WHERE key IN ({placeholders})', chunk
+            ).fetchone()
+            conn.execute(f'DELETE FROM cache_entry WHERE key IN ({placeholders})', chunk)
+            removed += count
+            removed_bytes += size
+        self._adjust(conn, deletes=removed, entries=-removed, bytes=-removed_bytes)
+        return removed
+
+    def _fetch(self, keys):
+        """{key: (value blob, accessed)} - 만료되지 않은 항목만"""
+        conn = self._conn()
+        now = time.time()
+        rows = {}
+        for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+            chunk = keys[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for key, blob, expires, accessed in conn.execute(
+                f'SELECT key, value, expires, accessed FROM cache_entry WHERE key IN ({placeholders})', chunk
+            ):
+                if expires is None or expires > now:
+                    rows[key] = (blob, accessed)
+
+        stale = [key for key, (_, accessed) in rows.items() if now - accessed >= ACCESS_RESOLUTION]
+        if stale:
+            with self._write() as conn:
+                conn.executemany('UPDATE cache_entry SET accessed = ? WHERE key = ?', [(now, key) for key in stale])
+        return rows
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        rows = self._fetch([key])
+        if key not in rows:
+            self._count('misses')
+            self._maybe_flush()
+            return default
+        self._count('hits')
+        self._maybe_flush()
+        return loads(rows[key][0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        rows = self._fetch(list(key_map))
+        self._count('hits', len(rows))
+        self._count('misses', len(key_map) - len(rows))
+        self._maybe_flush()
+        return {key_map[key]: loads(blob) for key, (blob, _) in rows.items()}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        blob = dumps(value)
+        now = time.time()
+        with self._write() as conn:
+            self._store(conn, key, blob, self.get_backend_timeout(timeout), now)
+            self._cull(conn, now)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        blobs = {self.make_and_validate_key(key, version=version): dumps(value) for key, value in data.items()}
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        with self._write() as conn:
+            for key, blob in blobs.items():
+                self._store(conn, key, blob, expires, now)
+            self._cull(conn, now)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        blob = dumps(value)
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute('SELECT expires FROM cache_entry WHERE key = ?', (key,)).fetchone()
+            if row and (row[0] is None or row[0] > now):
+                return False
+            self._store(conn, key, blob, self.get_backend_timeout(timeout), now)
+            self._cull(conn, now)
+        return True
+
+    def incr(self, key, delta=1, version=None):
+        """원자적 증가 (워커 간 동시 증가에도 값이 유실되지 않음)"""
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute('SELECT value, expires FROM cache_entry WHERE key = ?', (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                raise ValueError(f"Key '{key}' not found")
+            new_value = loads(row[0]) + delta
+            self._store(conn, key, dumps(new_value), row[1], now)
+        return new_value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self._write() as conn:
+            return conn.execute(
+                'UPDATE cache_entry SET expires = ?, accessed = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (self.get_backend_timeout(timeout), now, key, now),
+            ).rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn().execute('SELECT expires FROM cache_entry WHERE key = ?', (key,)).fetchone()
+        return bool(row) and (row[0] is None or row[0] > time.time())
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            return self._remove(conn, [key]) > 0
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if keys:
+            with self._write() as conn:
+                self._remove(conn, keys)
+
+    def clear(self):
+        with self._write() as conn:
+            conn.execute('DELETE FROM cache_entry')
+            conn.executemany('UPDATE cache_stats SET value = 0 WHERE name = ?', [('entries',), ('bytes',)])
+
+    def close(self, **kwargs):
+        # 요청 종료 시 호출되지만 연결은 스레드 단위로 재사용
+        pass
@@ -1,5 +1,6 @@
 import logging
 from django.core.management import call_command
+from stats.services.upload_jobs import process_pending_upload_jobs, sweep_orphaned_upload_jobs
 
 logger = logging.getLogger(__name__)
 
@@ -13,4 +14,53 @@ def scheduled_auto_fetch():
         call_command('auto_fetch_all')
         logger.info("✅ 스케줄된 자동 수집 작업이 성공적으로 완료되었습니다.")
     except Exception as e:
-        logger.error(f"❌ 스케줄된 자동 수집 작업 중 오류 발생: {e}", exc_info=True) 
\ No newline at end of file
+        logger.error(f"❌ 스케줄된 자동 수집 작업 중 오류 발생: {e}", exc_info=True)
+
+    # 수집 후 첫 페이지 조회가 전체 재계산을 하지 않도록 기본 화면 캐시 워밍
+    scheduled_cache_warm()
+
+def scheduled_cache_warm():
+    """
+    리포트 캐시 워밍 작업 (자동 수집 직후 실행).
+    'warm_report_cache' 관리자 명령을 직접 호출합니다.
+    """
+    logger.info("🚀 리포트 캐시 워밍 작업을 시작합니다...")
+    try:
+        call_command('warm_report_cache')
+        logger.info("✅ 리포트 캐시 워밍 작업이 성공적으로 완료되었습니다.")
+    except Exception as e:
+        logger.error(f"❌ 리포트 캐시 워밍 작업 중 오류 발생: {e}", exc_info=True)
+
+def scheduled_newspic_sync():
+    """
+    newspic 통계 스냅샷 증분 동기화 작업.
+    'sync_newspic_stats' 관리자 명령을 직접 호출합니다.
+    """
+    logger.info("🚀 newspic 통계 동기화 작업을 시작합니다...")
+    try:
+        call_command('sync_newspic_stats')
+        logger.info("✅ newspic 통계 동기화 작업이 성공적으로 완료되었습니다.")
+    except Exception as e:
+        logger.error(f"❌ newspic 통계 동기화 작업 중 오류 발생: {e}", exc_info=True)
+
+def scheduled_upload_jobs():
+    """
+    업로드 작업 실행 (DB 폴링).
+    대기 상태의 UploadJob 을 선점해 처리합니다.
+    """
+    try:
+        processed = process_pending_upload_jobs()
+        if processed:
+            logger.info(f"✅ 업로드 작업 {processed}건을 처리했습니다.")
+    except Exception as e:
+        logger.error(f"❌ 업로드 작업 처리 중 오류 발생: {e}", exc_info=True)
+
+def scheduled_upload_job_sweep():
+    """
+    중단된 업로드 작업 정리 (시작 시 1회 + 주기 실행).
+    진행이 멈춘 처리 중 작업과 오래된 대기 작업을 실패 처리합니다.
+    """
+    try:
+        sweep_orphaned_upload_jobs()
+    except Exception as e:
+        logger.error(f"❌ 업로드 작업 정리 중 오류 발생: {e}", exc_info=True)
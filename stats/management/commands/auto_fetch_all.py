@@ -10,6 +10,7 @@ from stats.services.cozymamang_service import fetch_cozymamang_stats_by_credenti
 from stats.services.mediamixer_service import fetch_mediamixer_stats_by_credential
 from stats.services.aceplanet_service import fetch_aceplanet_stats_by_credential
 from stats.services.teads_service import fetch_teads_stats_by_credential
+from stats.services.rollups import fetch_with_rollups
 
 class Command(BaseCommand):
     help = "설정된 주기에 따라 모든 플랫폼의 수익 데이터를 자동 수집합니다."
@@ -52,7 +53,7 @@ class Command(BaseCommand):
 
                 try:
                     self.stdout.write(f"🔄 [{user.username}] {platform}:{cred.alias or 'default'} → 수집 시작")
-                    self.PLATFORM_FETCHERS[platform](cred, start_date, end_date)
+                    fetch_with_rollups(self.PLATFORM_FETCHERS[platform], cred, start_date, end_date)
                     self.stdout.write(f"✅ [{user.username}] {platform}:{cred.alias or 'default'} → 완료")
                 except Exception as e:
                     self.stderr.write(f"❌ [{user.username}] {platform}:{cred.alias or 'default'} 오류: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,28 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "캐시 적중/미스/정리 통계와 사용 용량을 출력합니다. (SQLiteCache 백엔드)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clear", action="store_true", help="캐시 항목을 모두 삭제")
+
+    def handle(self, *args, **options):
+        if not hasattr(cache, "stats"):
+            self.stderr.write(f"❌ 현재 캐시 백엔드({type(cache).__name__})는 통계를 제공하지 않습니다.")
+            return
+
+        if options["clear"]:
+            cache.clear()
+            self.stdout.write("🧹 캐시를 비웠습니다.")
+
+        stats = cache.stats()
+        self.stdout.write(
+            f"📦 항목 {stats['entries']:,} / {stats['max_entries']:,}, "
+            f"크기 {stats['bytes'] / 1024 / 1024:.1f}MB / {stats['max_bytes'] / 1024 / 1024:.0f}MB"
+        )
+        self.stdout.write(
+            f"🎯 적중 {stats['hits']:,}, 미스 {stats['misses']:,} (적중률 {stats['hit_rate']:.1%}), "
+            f"저장 {stats['sets']:,}, 삭제 {stats['deletes']:,}, 정리 {stats['evictions']:,}"
+        )
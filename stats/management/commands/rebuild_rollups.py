@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from stats.services.rollups import list_partitions, rebuild_partition, verify_partition
+
+
+class Command(BaseCommand):
+    help = "AdStats 원본으로 일별 수익 집계(DailyRevenueRollup)를 재생성하거나 검증합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="대상 사용자 ID (미지정 시 전체)")
+        parser.add_argument("--platform", help="대상 플랫폼 (미지정 시 전체)")
+        parser.add_argument("--start", help="시작일 (YYYY-MM-DD, --end 와 함께 사용)")
+        parser.add_argument("--end", help="종료일 (YYYY-MM-DD, --start 와 함께 사용)")
+        parser.add_argument("--verify", action="store_true", help="재생성 없이 불일치만 출력")
+        parser.add_argument("--workers", type=int, default=4, help="병렬 처리 스레드 수")
+
+    def handle(self, *args, **options):
+        start_date = options["start"]
+        end_date = options["end"]
+        if bool(start_date) != bool(end_date):
+            self.stderr.write("❌ --start 와 --end 는 함께 지정해야 합니다.")
+            return
+
+        partitions = list_partitions(user_id=options["user"], platform=options["platform"])
+        if not partitions:
+            self.stdout.write("ℹ️ 대상 데이터가 없습니다.")
+            return
+
+        task = verify_partition if options["verify"] else rebuild_partition
+
+        def run(partition):
+            try:
+                user_id, platform, alias = partition
+                return task(user_id, platform, alias, start_date, end_date)
+            finally:
+                # 스레드별 DB 연결 정리
+                connection.close()
+
+        failed = 0
+        mismatched = 0
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as executor:
+            futures = {executor.submit(run, partition): partition for partition in partitions}
+            for future in as_completed(futures):
+                user_id, platform, alias = futures[future]
+                label = f"[{user_id}] {platform}:{alias}"
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"❌ {label} 오류: {str(e)}")
+                    continue
+
+                if options["verify"]:
+                    if result:
+                        mismatched += 1
+                        self.stdout.write(f"⚠️ {label} 불일치 {len(result)}건")
+                        for day, field, got, want in result[:20]:
+                            self.stdout.write(f"    {day} {field}: 집계 {got} / 원본 {want}")
+                    else:
+                        self.stdout.write(f"✅ {label} 일치")
+                else:
+                    created, updated, deleted = result
+                    self.stdout.write(f"✅ {label} → 생성 {created}, 갱신 {updated}, 삭제 {deleted}")
+
+        summary = f"🏁 {len(partitions)}개 파티션 처리 완료 (실패 {failed}"
+        if options["verify"]:
+            summary += f", 불일치 {mismatched}"
+        self.stdout.write(summary + ")")
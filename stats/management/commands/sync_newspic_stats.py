@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from stats.services.newspic_snapshot import NEWSPIC_RESYNC_DAYS, sync_lock, sync_newspic_stats, sync_range
+
+
+class Command(BaseCommand):
+    help = "newspic tbTotalStat/tbMemberStat 일별 집계를 로컬 스냅샷(NewspicDailyStat)으로 동기화합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="시작일 (YYYY-MM-DD, --end 와 함께 사용 시 워터마크와 무관하게 해당 기간만 재동기화)")
+        parser.add_argument("--end", help="종료일 (YYYY-MM-DD, --start 와 함께 사용)")
+        parser.add_argument("--resync-days", type=int, default=NEWSPIC_RESYNC_DAYS, help="매번 다시 동기화할 최근 일수")
+
+    def handle(self, *args, **options):
+        start_date = options["start"]
+        end_date = options["end"]
+        if bool(start_date) != bool(end_date):
+            self.stderr.write("❌ --start 와 --end 는 함께 지정해야 합니다.")
+            return
+
+        if start_date:
+            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+            with sync_lock() as acquired:
+                if not acquired:
+                    self.stdout.write("ℹ️ 다른 프로세스가 동기화 중입니다. 잠시 후 다시 실행해주세요.")
+                    return
+                created, updated, deleted = sync_range(start_date, end_date)
+        else:
+            result = sync_newspic_stats(resync_days=options["resync_days"])
+            if result is None:
+                self.stdout.write("ℹ️ 동기화할 원본 데이터가 없거나 다른 프로세스가 동기화 중입니다.")
+                return
+            start_date, end_date, (created, updated, deleted) = result
+
+        self.stdout.write(f"✅ {start_date} ~ {end_date} → 생성 {created}, 갱신 {updated}, 삭제 {deleted}")
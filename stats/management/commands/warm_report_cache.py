@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from stats.services.cache_warmer import WARM_TARGETS, warm_report_cache
+
+
+class Command(BaseCommand):
+    help = "홈/리포트/매입/매출 페이지의 기본 화면을 사용자별로 미리 계산해 캐시에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", dest="usernames", help="대상 사용자 (여러 번 지정 가능, 생략 시 최근 로그인한 활성 사용자)")
+        parser.add_argument("--target", action="append", dest="targets", choices=sorted(WARM_TARGETS), help="워밍할 페이지 (생략 시 settings.CACHE_WARM_SET)")
+        parser.add_argument("--concurrency", type=int, help="동시 실행 수 (생략 시 settings.CACHE_WARM_CONCURRENCY)")
+
+    def handle(self, *args, **options):
+        users = None
+        if options["usernames"]:
+            users = list(User.objects.filter(username__in=options["usernames"], is_active=True))
+            if not users:
+                self.stderr.write("❌ 대상 사용자를 찾을 수 없습니다.")
+                return
+
+        results = warm_report_cache(users=users, targets=options["targets"], concurrency=options["concurrency"])
+        for username, target, seconds, error in sorted(results):
+            if error:
+                self.stderr.write(f"❌ [{username}] {target} → {error}")
+            else:
+                self.stdout.write(f"✅ [{username}] {target} → {seconds:.2f}s")
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.1 on 2026-10-19 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('stats', '0004_alter_member_options_alter_memberstat_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.UUIDField(editable=False, help_text='작업 식별자 (폴링용)', unique=True)),
+                ('file_name', models.CharField(help_text='원본 파일명', max_length=255)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('success', '완료'), ('failed', '실패')], default='pending', max_length=20)),
+                ('total_rows', models.IntegerField(blank=True, help_text='예상 데이터 행 수', null=True)),
+                ('processed_rows', models.IntegerField(default=0)),
+                ('saved_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='행 단위 오류 메시지 목록')),
+                ('message', models.TextField(blank=True, help_text='결과/오류 메시지')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('credential', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_jobs', to='stats.platformcredential')),
+                ('user', models.ForeignKey(help_text='업로드 사용자', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '업로드 작업',
+                'verbose_name_plural': '업로드 작업',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='stats_uploa_user_id_5795d5_idx')],
+            },
+        ),
+    ]
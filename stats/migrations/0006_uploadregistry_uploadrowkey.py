@@ -0,0 +1,51 @@
+# Generated by Django 4.2.1 on 2026-10-19 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('stats', '0005_uploadjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadRegistry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text='업로드 구분 (예: adpost:계정, taboola:계정, sales:2025)', max_length=150)),
+                ('content_hash', models.CharField(help_text='파일 내용 SHA-256', max_length=64)),
+                ('file_name', models.CharField(max_length=255)),
+                ('row_count', models.IntegerField(default=0, help_text='처리된 데이터 행 수')),
+                ('changed_count', models.IntegerField(default=0, help_text='신규/변경 반영 행 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '업로드 파일 이력',
+                'verbose_name_plural': '업로드 파일 이력',
+                'unique_together': {('user', 'scope', 'content_hash')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadRowKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text='업로드 구분 (UploadRegistry.scope 와 동일)', max_length=150)),
+                ('row_key', models.CharField(help_text='행 식별 키 해시', max_length=64)),
+                ('row_hash', models.CharField(help_text='행 내용 해시', max_length=64)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, help_text='누적 반영된 금액 (매출 업로드)', max_digits=15)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '업로드 행 키',
+                'verbose_name_plural': '업로드 행 키',
+                'unique_together': {('user', 'scope', 'row_key')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.1 on 2026-10-19 13:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('stats', '0006_uploadregistry_uploadrowkey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(max_length=20)),
+                ('alias', models.CharField(default='default', max_length=100)),
+                ('date', models.DateField()),
+                ('earnings', models.FloatField(default=0.0)),
+                ('earnings_usd', models.FloatField(default=0.0)),
+                ('clicks', models.BigIntegerField(default=0)),
+                ('impressions', models.BigIntegerField(default=0)),
+                ('order_count', models.BigIntegerField(default=0)),
+                ('total_amount', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '일별 수익 집계',
+                'verbose_name_plural': '일별 수익 집계',
+                'unique_together': {('user', 'platform', 'alias', 'date')},
+                'indexes': [models.Index(fields=['user', 'date'], name='stats_daily_user_id_154465_idx')],
+            },
+        ),
+    ]
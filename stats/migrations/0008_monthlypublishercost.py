@@ -0,0 +1,44 @@
+# Generated by Django 4.2.1 on 2026-10-19 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('stats', '0007_dailyrevenuerollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='totalstat',
+            name='click_count',
+            field=models.BigIntegerField(db_column='clickCount', default=0, help_text='클릭'),
+        ),
+        migrations.CreateModel(
+            name='MonthlyPublisherCost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_key', models.CharField(max_length=50, verbose_name='퍼블리셔 코드')),
+                ('year_month', models.DateField(verbose_name='년월')),
+                ('ad_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='광고수익')),
+                ('click_count', models.BigIntegerField(default=0, verbose_name='클릭수')),
+                ('unit_price', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='적용 단가')),
+                ('unit_type', models.CharField(default='percent', max_length=10, verbose_name='적용 단가 유형')),
+                ('cost', models.BigIntegerField(default=0, verbose_name='매입비용')),
+                ('inputs_hash', models.CharField(help_text='계산 입력(단가, 광고 단위, 환율, 원천 데이터) 해시', max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('user', models.ForeignKey(help_text='설정 소유 사용자', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '월별 매입비용',
+                'verbose_name_plural': '월별 매입비용',
+                'db_table': 'monthly_publisher_cost',
+                'unique_together': {('user', 'request_key', 'year_month')},
+                'indexes': [models.Index(fields=['user', 'year_month'], name='monthly_pub_user_id_888dd3_idx')],
+            },
+        ),
+    ]
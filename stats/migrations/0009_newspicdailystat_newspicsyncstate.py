@@ -0,0 +1,50 @@
+# Generated by Django 4.2.1 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0008_monthlypublishercost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewspicDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_key', models.CharField(max_length=8, verbose_name='퍼블리셔 코드')),
+                ('date', models.DateField(verbose_name='일자')),
+                ('visit_count', models.BigIntegerField(default=0, help_text='페이지뷰 (tbTotalStat.visitCount)')),
+                ('powerlink_count', models.BigIntegerField(default=0, help_text='파워링크 클릭 (tbTotalStat.powerlinkCount)')),
+                ('click_count', models.BigIntegerField(default=0, help_text='클릭 (tbTotalStat.clickCount)')),
+                ('valid_pageview', models.BigIntegerField(default=0, help_text='유효 페이지뷰 (tbMemberStat.clickCnt)')),
+                ('has_total_stat', models.BooleanField(default=False, help_text='tbTotalStat 에 행이 있는지 여부')),
+                ('has_member_stat', models.BooleanField(default=False, help_text='tbMemberStat 에 행이 있는지 여부')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'newspic 일별 통계',
+                'verbose_name_plural': 'newspic 일별 통계',
+                'db_table': 'newspic_daily_stat',
+                'unique_together': {('request_key', 'date')},
+                'indexes': [models.Index(fields=['date'], name='newspic_dai_date_b72952_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NewspicSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True)),
+                ('synced_through', models.DateField(blank=True, help_text='동기화 완료 마지막 일자', null=True)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'newspic 동기화 상태',
+                'verbose_name_plural': 'newspic 동기화 상태',
+                'db_table': 'newspic_sync_state',
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Sum
+
+ROLLUP_FIELDS = ('earnings', 'earnings_usd', 'clicks', 'impressions', 'order_count', 'total_amount')
+FLOAT_FIELDS = ('earnings', 'earnings_usd', 'total_amount')
+BATCH_SIZE = 1000
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    기존 AdStats 로 DailyRevenueRollup 을 채웁니다 (배포 직후 리포트가 0 으로 보이지 않도록).
+    이미 있는 (user, platform, alias, date) 행은 건드리지 않습니다.
+    """
+    AdStats = apps.get_model('stats', 'AdStats')
+    DailyRevenueRollup = apps.get_model('stats', 'DailyRevenueRollup')
+    db_alias = schema_editor.connection.alias
+
+    rows = AdStats.objects.using(db_alias).values('user_id', 'platform', 'alias', 'date').annotate(
+        **{f'sum_{field}': Sum(field) for field in ROLLUP_FIELDS}
+    ).order_by()
+
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(DailyRevenueRollup(
+            user_id=row['user_id'], platform=row['platform'], alias=row['alias'], date=row['date'],
+            **{
+                field: (float(row[f'sum_{field}'] or 0) if field in FLOAT_FIELDS else int(row[f'sum_{field}'] or 0))
+                for field in ROLLUP_FIELDS
+            }
+        ))
+        if len(batch) >= BATCH_SIZE:
+            DailyRevenueRollup.objects.using(db_alias).bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        DailyRevenueRollup.objects.using(db_alias).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0009_newspicdailystat_newspicsyncstate'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
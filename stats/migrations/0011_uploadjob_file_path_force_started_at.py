@@ -0,0 +1,32 @@
+# Generated by Django 4.2.1 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0010_backfill_dailyrevenuerollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='file_path',
+            field=models.CharField(blank=True, help_text='처리 대기 중인 임시 파일 경로', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='force',
+            field=models.BooleanField(default=False, help_text='동일 파일/행 이력 무시 여부'),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, help_text='처리 시작 시각', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='uploadjob',
+            index=models.Index(fields=['status', 'created_at'], name='stats_uploa_status_bcd26f_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.1 on 2026-10-19 18:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0011_uploadjob_file_path_force_started_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='kind',
+            field=models.CharField(choices=[('report', '광고 리포트'), ('sales', '매출')], default='report', help_text='업로드 종류', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='year',
+            field=models.IntegerField(blank=True, help_text='매출 업로드 대상 연도', null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='credential',
+            field=models.ForeignKey(blank=True, help_text='광고 리포트 업로드 계정', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_jobs', to='stats.platformcredential'),
+        ),
+    ]
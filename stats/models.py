@@ -133,6 +133,32 @@ class AdStats(models.Model):
             return f"{self.platform}:{self.alias}:{self.content_name}:{self.ad_unit_name} | {self.date} | {self.earnings}"
         return f"{self.platform}:{self.alias}:{self.content_name} | {self.date} | {self.earnings}"
 
+class DailyRevenueRollup(models.Model):
+    """AdStats 일별 집계 (user, platform, alias, date 단위) - 리포트 조회용"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    platform = models.CharField(max_length=20)
+    alias = models.CharField(max_length=100, default="default")
+    date = models.DateField()
+
+    earnings = models.FloatField(default=0.0)
+    earnings_usd = models.FloatField(default=0.0)
+    clicks = models.BigIntegerField(default=0)
+    impressions = models.BigIntegerField(default=0)
+    order_count = models.BigIntegerField(default=0)
+    total_amount = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = '일별 수익 집계'
+        verbose_name_plural = '일별 수익 집계'
+        unique_together = ('user', 'platform', 'alias', 'date')
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.platform}:{self.alias} | {self.date} | {self.earnings}"
+
 class UserPreference(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     auto_fetch_days = models.IntegerField(default=0)
@@ -255,11 +281,19 @@ class PurchaseGroup(models.Model):
     
     @property
     def member(self):
-        """Member 객체를 반환하는 프로퍼티 (newspic 데이터베이스에서 조회)"""
-        try:
-            return Member.newspic_objects().get(request_key=self.member_request_key)
-        except Member.DoesNotExist:
-            return None
+        """
+        Member 객체를 반환하는 프로퍼티 (없으면 None).
+        prefetch_members 로 붙인 값이 있으면 그대로 쓰고, 없으면 멤버 디렉터리(프로세스 로컬 TTL 캐시)에서 조회해 보관합니다.
+        """
+        prefetched = getattr(self, '_prefetched_member', None)
+        if prefetched is None or prefetched[0] != self.member_request_key:
+            from stats.services.member_directory import get_member
+            self.set_prefetched_member(get_member(self.member_request_key))
+        return self._prefetched_member[1]
+
+    def set_prefetched_member(self, member):
+        """미리 조회한 Member 를 붙임 (stats.services.member_directory.prefetch_members 에서 사용)"""
+        self._prefetched_member = (self.member_request_key, member)
 
 class PurchasePrice(models.Model):
     """월별 매입 단가 설정"""
@@ -358,6 +392,31 @@ class ExchangeRate(models.Model):
         if self.year_month:
             self.year_month = self.year_month.replace(day=1)
 
+class MonthlyPublisherCost(models.Model):
+    """퍼블리셔별 월 매입비용 (일별 계산 결과의 월 합계) - 매입/매출 연간 리포트 조회용"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, help_text="설정 소유 사용자")
+    request_key = models.CharField(max_length=50, verbose_name='퍼블리셔 코드')
+    year_month = models.DateField(verbose_name='년월')  # YYYY-MM-01 형식으로 저장
+    ad_revenue = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name='광고수익')
+    click_count = models.BigIntegerField(default=0, verbose_name='클릭수')
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name='적용 단가')
+    unit_type = models.CharField(max_length=10, default='percent', verbose_name='적용 단가 유형')
+    cost = models.BigIntegerField(default=0, verbose_name='매입비용')
+    inputs_hash = models.CharField(max_length=64, help_text='계산 입력(단가, 광고 단위, 환율, 원천 데이터) 해시')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        db_table = 'monthly_publisher_cost'
+        verbose_name = '월별 매입비용'
+        verbose_name_plural = '월별 매입비용'
+        unique_together = ['user', 'request_key', 'year_month']
+        indexes = [
+            models.Index(fields=['user', 'year_month']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.request_key} - {self.year_month.strftime('%Y-%m')} ({self.cost})"
+
 class ServiceGroup(models.Model):
     """서비스 그룹 관리 모델"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, help_text="데이터 소유 사용자")
@@ -447,6 +506,7 @@ class TotalStat(models.Model):
     request_key = models.CharField(max_length=8, db_column='requestKey')
     visit_count = models.BigIntegerField(default=0, help_text='페이지뷰', db_column='visitCount')
     powerlink_count = models.BigIntegerField(default=0, help_text='파워링크 클릭', db_column='powerlinkCount')
+    click_count = models.BigIntegerField(default=0, help_text='클릭', db_column='clickCount')
 
     class Meta:
         db_table = 'tbTotalStat'
@@ -466,6 +526,48 @@ class TotalStat(models.Model):
         """newspic 데이터베이스에서 조회하는 매니저"""
         return cls.objects.using('newspic')
 
+class NewspicDailyStat(models.Model):
+    """
+    newspic tbTotalStat/tbMemberStat 의 (퍼블리셔, 일자) 집계 스냅샷 - 리포트 조회용.
+    stats.services.newspic_snapshot 동기화 작업이 워터마크 이후 구간과 최근 재동기화 구간을 갱신합니다.
+    """
+    request_key = models.CharField(max_length=8, verbose_name='퍼블리셔 코드')
+    date = models.DateField(verbose_name='일자')
+    visit_count = models.BigIntegerField(default=0, help_text='페이지뷰 (tbTotalStat.visitCount)')
+    powerlink_count = models.BigIntegerField(default=0, help_text='파워링크 클릭 (tbTotalStat.powerlinkCount)')
+    click_count = models.BigIntegerField(default=0, help_text='클릭 (tbTotalStat.clickCount)')
+    valid_pageview = models.BigIntegerField(default=0, help_text='유효 페이지뷰 (tbMemberStat.clickCnt)')
+    has_total_stat = models.BooleanField(default=False, help_text='tbTotalStat 에 행이 있는지 여부')
+    has_member_stat = models.BooleanField(default=False, help_text='tbMemberStat 에 행이 있는지 여부')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'newspic_daily_stat'
+        verbose_name = 'newspic 일별 통계'
+        verbose_name_plural = 'newspic 일별 통계'
+        unique_together = ('request_key', 'date')
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.request_key} - {self.date} (방문: {self.visit_count}, 파워링크: {self.powerlink_count})"
+
+class NewspicSyncState(models.Model):
+    """newspic 스냅샷 동기화 워터마크 (동기화가 끝난 마지막 일자)"""
+    source = models.CharField(max_length=50, unique=True)
+    synced_through = models.DateField(null=True, blank=True, help_text='동기화 완료 마지막 일자')
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'newspic_sync_state'
+        verbose_name = 'newspic 동기화 상태'
+        verbose_name_plural = 'newspic 동기화 상태'
+
+    def __str__(self):
+        return f"{self.source} ~ {self.synced_through}"
+
 # ============================================================================
 # Manual Input Models for Reports
 # ============================================================================
@@ -522,4 +624,90 @@ class MonthlyAdjustment(models.Model):
         ordering = ['-year_month', 'adjustment_type', 'sales_type']
 
     def __str__(self):
-        return f"{self.user.username} - {self.year_month.strftime('%Y-%m')} - {self.get_adjustment_type_display()}: {self.sales_type} - {self.adjustment_amount}" 
\ No newline at end of file
+        return f"{self.user.username} - {self.year_month.strftime('%Y-%m')} - {self.get_adjustment_type_display()}: {self.sales_type} - {self.adjustment_amount}" 
+
+# ============================================================================
+# Background Job Models
+# ============================================================================
+
+class UploadJob(models.Model):
+    """광고 리포트/매출 파일 업로드 백그라운드 처리 작업"""
+    KIND_CHOICES = [
+        ('report', '광고 리포트'),
+        ('sales', '매출'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '처리 중'),
+        ('success', '완료'),
+        ('failed', '실패'),
+    ]
+
+    job_id = models.UUIDField(unique=True, editable=False, help_text="작업 식별자 (폴링용)")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, help_text="업로드 사용자")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='report', help_text="업로드 종류")
+    credential = models.ForeignKey(
+        PlatformCredential, on_delete=models.CASCADE, related_name="upload_jobs",
+        null=True, blank=True, help_text="광고 리포트 업로드 계정",
+    )
+    year = models.IntegerField(null=True, blank=True, help_text="매출 업로드 대상 연도")
+    file_name = models.CharField(max_length=255, help_text="원본 파일명")
+    file_path = models.CharField(max_length=500, blank=True, help_text="처리 대기 중인 임시 파일 경로")
+    force = models.BooleanField(default=False, help_text="동일 파일/행 이력 무시 여부")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.IntegerField(null=True, blank=True, help_text="예상 데이터 행 수")
+    processed_rows = models.IntegerField(default=0)
+    saved_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="행 단위 오류 메시지 목록")
+    message = models.TextField(blank=True, help_text="결과/오류 메시지")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True, help_text="처리 시작 시각")
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = '업로드 작업'
+        verbose_name_plural = '업로드 작업'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        target = self.credential if self.kind == 'report' else f"{self.get_kind_display()} {self.year}"
+        return f"{target} - {self.file_name} ({self.get_status_display()})"
+
+
+class UploadRegistry(models.Model):
+    """처리 완료된 업로드 파일 이력 (내용 해시 기준 중복 업로드 차단)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    scope = models.CharField(max_length=150, help_text="업로드 구분 (예: adpost:계정, taboola:계정, sales:2025)")
+    content_hash = models.CharField(max_length=64, help_text="파일 내용 SHA-256")
+    file_name = models.CharField(max_length=255)
+    row_count = models.IntegerField(default=0, help_text="처리된 데이터 행 수")
+    changed_count = models.IntegerField(default=0, help_text="신규/변경 반영 행 수")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = '업로드 파일 이력'
+        verbose_name_plural = '업로드 파일 이력'
+        unique_together = ('user', 'scope', 'content_hash')
+
+    def __str__(self):
+        return f"{self.scope} - {self.file_name} ({self.content_hash[:12]})"
+
+
+class UploadRowKey(models.Model):
+    """업로드 행 단위 키 (변경된 행만 반영하기 위한 행 해시와 반영 금액)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    scope = models.CharField(max_length=150, help_text="업로드 구분 (UploadRegistry.scope 와 동일)")
+    row_key = models.CharField(max_length=64, help_text="행 식별 키 해시")
+    row_hash = models.CharField(max_length=64, help_text="행 내용 해시")
+    amount = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="누적 반영된 금액 (매출 업로드)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = '업로드 행 키'
+        verbose_name_plural = '업로드 행 키'
+        unique_together = ('user', 'scope', 'row_key')
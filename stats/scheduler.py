@@ -1,7 +1,9 @@
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
+from django.utils import timezone
 from django_apscheduler.jobstores import DjangoJobStore
-from stats.jobs import scheduled_auto_fetch
+from stats.jobs import scheduled_auto_fetch, scheduled_newspic_sync, scheduled_upload_jobs, scheduled_upload_job_sweep
+from stats.services.upload_jobs import UPLOAD_JOB_POLL_SECONDS, UPLOAD_JOB_WORKERS
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,38 @@ def start():
     )
     logger.info("✅ 'scheduled_auto_fetch' 작업이 1시간 주기로 등록되었습니다.")
 
+    scheduler.add_job(
+        scheduled_newspic_sync,
+        trigger="interval",
+        minutes=30,          # 30분마다 실행 (최근 일자는 매번 재동기화)
+        next_run_time=timezone.now(),  # 시작 직후 1회 실행 (동시 실행은 sync_lock 으로 방지)
+        id="scheduled_newspic_sync_job",
+        max_instances=1,
+        replace_existing=True,
+    )
+    logger.info("✅ 'scheduled_newspic_sync' 작업이 30분 주기로 등록되었습니다.")
+
+    scheduler.add_job(
+        scheduled_upload_jobs,
+        trigger="interval",
+        seconds=UPLOAD_JOB_POLL_SECONDS,  # 대기 중인 업로드 작업 폴링
+        id="scheduled_upload_jobs_job",
+        max_instances=UPLOAD_JOB_WORKERS,  # 동시에 처리하는 업로드 작업 수
+        replace_existing=True,
+    )
+    logger.info(f"✅ 'scheduled_upload_jobs' 작업이 {UPLOAD_JOB_POLL_SECONDS}초 주기로 등록되었습니다.")
+
+    scheduler.add_job(
+        scheduled_upload_job_sweep,
+        trigger="interval",
+        minutes=5,
+        next_run_time=timezone.now(),  # 시작 직후 1회 실행 (재시작 전 중단된 작업 정리)
+        id="scheduled_upload_job_sweep_job",
+        max_instances=1,
+        replace_existing=True,
+    )
+    logger.info("✅ 'scheduled_upload_job_sweep' 작업이 5분 주기로 등록되었습니다.")
+
     try:
         logger.info("🚀 스케줄러를 시작합니다...")
         scheduler.start()
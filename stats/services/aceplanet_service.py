@@ -116,4 +116,4 @@ def fetch_aceplanet_stats_by_credential(cred, start_date, end_date):
 
     # 마지막 수집 시간 업데이트
     cred.last_fetched_at = timezone.now()
-    cred.save()
\ No newline at end of file
+    cred.save(update_fields=["last_fetched_at"])
\ No newline at end of file
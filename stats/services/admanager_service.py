@@ -204,7 +204,7 @@ def save_report_to_credential(cred, report_id):
     # 자격증명에 보고서 정보 저장
     cred.report_resource_name = report_resource_name
     cred.report_id = report_id
-    cred.save()
+    cred.save(update_fields=["report_resource_name", "report_id"])
     
     # logger.info(f"보고서 정보가 자격증명에 저장되었습니다: {report_resource_name}")
 
@@ -0,0 +1,64 @@
+import logging
+
+from django.db import transaction
+
+from stats.models import AdStats
+from stats.services.rollups import refresh_daily_rollups
+
+logger = logging.getLogger(__name__)
+
+# AdStats 의 실제 유니크 키 (user, platform, alias 는 호출 단위로 고정)
+ADSTATS_ROW_KEY = ('date', 'content_id', 'ad_unit_id')
+
+
+def _row_key(obj):
+    """유니크 키 튜플 (date, content_id, ad_unit_id)"""
+    return tuple(getattr(obj, field) for field in ADSTATS_ROW_KEY)
+
+
+def bulk_upsert_adstats(user, platform, alias, objs, update_fields, batch_size=1000):
+    """
+    AdStats 일괄 upsert.
+    (user, platform, alias, date, content_id, ad_unit_id) 기준으로 기존 행을 한 번에 조회해
+    기존 행은 bulk_update, 신규 행은 bulk_create 로 저장하고 해당 날짜의 일별 집계를 갱신합니다.
+    content_id/ad_unit_id 가 NULL 인 행도 동일 키로 취급합니다 (MySQL 유니크 인덱스는 NULL 끼리 충돌하지 않으므로 직접 매칭).
+    반환값: (created_count, updated_count)
+    """
+    # 파일 내 중복 키는 마지막 행 우선
+    unique_objs = {}
+    for obj in objs:
+        obj.user = user
+        obj.platform = platform
+        obj.alias = alias
+        unique_objs[_row_key(obj)] = obj
+
+    if not unique_objs:
+        return 0, 0
+
+    dates = {key[0] for key in unique_objs}
+    existing = {}
+    for pk, date, content_id, ad_unit_id in AdStats.objects.filter(
+        user=user, platform=platform, alias=alias, date__in=dates
+    ).values_list('pk', *ADSTATS_ROW_KEY).iterator():
+        existing[(date, content_id, ad_unit_id)] = pk
+
+    to_create = []
+    to_update = []
+    for key, obj in unique_objs.items():
+        pk = existing.get(key)
+        if pk is None:
+            to_create.append(obj)
+        else:
+            obj.pk = pk
+            to_update.append(obj)
+
+    with transaction.atomic():
+        if to_create:
+            AdStats.objects.bulk_create(to_create, batch_size=batch_size)
+        if to_update:
+            AdStats.objects.bulk_update(to_update, update_fields, batch_size=batch_size)
+        # 변경된 날짜의 일별 집계 갱신
+        refresh_daily_rollups(user, platform, alias, dates)
+
+    logger.debug(f"[AdStats] {platform}:{alias} 생성 {len(to_create)}건, 갱신 {len(to_update)}건")
+    return len(to_create), len(to_update)
@@ -0,0 +1,104 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+# 워밍 대상: {이름: (URL 이름, 기본 조회 파라미터 생성 함수)}
+# 각 페이지의 기본 화면(파라미터 없이 열었을 때)과 같은 조회 조건으로 한 번 실행해
+# 계산 그래프/버전 키 캐시를 채웁니다.
+WARM_TARGETS = {
+    'home': ('main', lambda today: {}),                                        # 이번 달 1일 ~ 오늘
+    'report': ('report', lambda today: {}),                                    # 최근 7일
+    'purchase': ('purchase_report', lambda today: {'year': today.year}),       # 올해 (주요 퍼블리셔)
+    'sales': ('sales_report', lambda today: {'year': today.year}),             # 올해
+}
+DEFAULT_WARM_SET = ('home', 'report', 'purchase', 'sales')
+DEFAULT_WARM_CONCURRENCY = 2
+# 최근 N일 안에 로그인한 사용자만 워밍 (휴면 계정 제외)
+DEFAULT_WARM_ACTIVE_DAYS = 30
+
+
+def warm_settings():
+    """settings 의 워밍 설정 (CACHE_WARM_SET, CACHE_WARM_CONCURRENCY, CACHE_WARM_ACTIVE_DAYS)"""
+    return (
+        tuple(getattr(settings, 'CACHE_WARM_SET', DEFAULT_WARM_SET)),
+        int(getattr(settings, 'CACHE_WARM_CONCURRENCY', DEFAULT_WARM_CONCURRENCY)),
+        int(getattr(settings, 'CACHE_WARM_ACTIVE_DAYS', DEFAULT_WARM_ACTIVE_DAYS)),
+    )
+
+
+def active_users(active_days):
+    """워밍 대상 사용자 (활성 계정 중 최근 active_days 일 안에 로그인한 사용자)"""
+    since = date.today() - timedelta(days=active_days)
+    return list(User.objects.filter(is_active=True, last_login__date__gte=since).order_by('id'))
+
+
+def _host():
+    for host in settings.ALLOWED_HOSTS:
+        if host and '*' not in host and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def _warm_one(user, target, today):
+    """사용자 1명의 페이지 1개를 실행해 캐시를 채움. 반환값: (소요 시간, 오류 메시지 또는 None)"""
+    url_name, build_params = WARM_TARGETS[target]
+    path = reverse(url_name)
+    request = RequestFactory().get(path, build_params(today), HTTP_HOST=_host())
+    request.user = user
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+
+    started = time.monotonic()
+    try:
+        response = resolve(path).func(request)
+        error = None if response.status_code < 400 else f"HTTP {response.status_code}"
+    except Exception as e:
+        logger.error(f"[CacheWarmer] {user.username}:{target} 워밍 실패: {e}", exc_info=True)
+        error = str(e)
+    finally:
+        # 작업 스레드의 DB 연결 정리
+        connections.close_all()
+    return time.monotonic() - started, error
+
+
+def warm_report_cache(users=None, targets=None, concurrency=None):
+    """
+    수집 직후 무거운 리포트 페이지의 기본 화면을 미리 계산해 캐시에 저장합니다.
+    users/targets/concurrency 를 생략하면 settings 값(없으면 기본값)을 사용합니다.
+    반환값: [(username, target, seconds, error)]
+    """
+    warm_set, default_concurrency, active_days = warm_settings()
+    targets = tuple(targets or warm_set)
+    unknown = [target for target in targets if target not in WARM_TARGETS]
+    if unknown:
+        raise ValueError(f"알 수 없는 워밍 대상: {', '.join(unknown)}")
+    users = active_users(active_days) if users is None else list(users)
+    concurrency = max(1, concurrency or default_concurrency)
+    today = date.today()
+
+    jobs = [(user, target) for user in users for target in targets]
+    results = []
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='cache-warmer') as executor:
+        futures = {executor.submit(_warm_one, user, target, today): (user, target) for user, target in jobs}
+        for future in as_completed(futures):
+            user, target = futures[future]
+            seconds, error = future.result()
+            results.append((user.username, target, seconds, error))
+            logger.info(f"[CacheWarmer] {user.username}:{target} {seconds:.2f}s {'실패' if error else '완료'}")
+
+    failed = sum(1 for *_, error in results if error)
+    logger.info(
+        f"[CacheWarmer] 사용자 {len(users)}명 × {len(targets)}개 페이지 워밍 완료 "
+        f"({time.monotonic() - started:.1f}s, 실패 {failed}건)"
+    )
+    return results
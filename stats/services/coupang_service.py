@@ -241,6 +241,6 @@ def fetch_coupang_stats_by_credential(cred, start_date, end_date):
     finally:
         # 마지막 수집 시간 업데이트
         cred.last_fetched_at = timezone.now()
-        cred.save()
+        cred.save(update_fields=["last_fetched_at"])
         
         logger.info(f"쿠팡 데이터 수집 완료: 총 {total_saved}개 저장, {total_failed}개 실패")
\ No newline at end of file
@@ -11,6 +11,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from stats.models import AdStats, PlatformCredential
+from stats.services.upload_ingest import ingest_subid_report
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -36,36 +37,10 @@ def save_screenshot(driver, step_name):
 def process_excel_file(file_path, cred):
     """엑셀 파일을 처리하고 데이터를 저장하는 함수"""
     try:
-        df = pd.read_excel(file_path, header=0)
-        
-        for index, row in df.iterrows():
-            try:
-                date = pd.to_datetime(row['날짜']).date()
-                
-                ad_unit_id = str(row['SUB_ID'])
-                if 'SUBPARAM' in row and not pd.isna(row['SUBPARAM']):
-                    ad_unit_id += str(row['SUBPARAM'])
-                
-                AdStats.objects.update_or_create(
-                    user=cred.user,
-                    platform="cozymamang",
-                    alias=cred.alias,
-                    date=date,
-                    ad_unit_id=ad_unit_id,
-                    defaults={
-                        'ad_unit_name': row['지면명'],
-                        'earnings': float(row['최종수익금']) if not pd.isna(row['최종수익금']) else 0,
-                        'clicks': int(row['클릭수']) if not pd.isna(row['클릭수']) else 0,
-                        'impressions': int(row['노출수']) if not pd.isna(row['노출수']) else 0,
-                        'order_count': int(row['최종구매수량']) if not pd.isna(row['최종구매수량']) else 0,
-                        'total_amount': float(row['최종구매금액']) if not pd.isna(row['최종구매금액']) else 0,
-                        'credential': cred
-                    }
-                )
-                
-            except Exception as e:
-                logger.error(f"[Cozymamang] 행 {index+2} 처리 중 오류 발생: {str(e)}")
-                continue
+        # 배치 단위 스트리밍 + 일괄 upsert
+        result = ingest_subid_report(cred, file_path)
+        for message in result['errors']:
+            logger.error(f"[Cozymamang] {message} 처리 중 오류 발생")
         
         try:
             os.remove(file_path)
@@ -176,7 +151,7 @@ def fetch_cozymamang_stats_by_credential(cred, start_date, end_date):
                     logger.error(f"[Cozymamang] 엑셀 데이터 처리 실패")
             
             cred.last_fetched_at = timezone.now()
-            cred.save()
+            cred.save(update_fields=["last_fetched_at"])
             return True
             
         finally:            
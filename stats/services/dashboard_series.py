@@ -0,0 +1,190 @@
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+
+from stats.models import DailyRevenueRollup
+
+logger = logging.getLogger(__name__)
+
+# 대시보드 시계열 기간: 오늘 포함 최근 N일 (+ 시작일)
+DASHBOARD_DAYS = 30
+# 수집 시 해당 일자만 갱신하므로 만료는 공간 회수용
+DASHBOARD_SERIES_TIMEOUT = 60 * 60 * 24
+# 항목 생성/갱신 잠금 (읽고 고쳐 쓰는 동안 다른 작업의 반영이 끼어들지 않도록)
+SERIES_LOCK_TIMEOUT = 30
+# 잠금 대기: 조회는 짧게 기다린 뒤 캐시 없이 응답, 수집 반영은 더 길게 기다린 뒤 항목 삭제
+READ_LOCK_WAIT = 1
+PATCH_LOCK_WAIT = 10
+LOCK_POLL_INTERVAL = 0.05
+SERIES_FIELDS = ('earnings', 'clicks', 'impressions', 'order_count', 'total_amount')
+FLOAT_FIELDS = ('earnings', 'total_amount')
+
+
+def _cache_key(user_id):
+    return f"dashboard_series:{user_id}"
+
+
+def _lock_key(user_id):
+    return f"dashboard_series_lock:{user_id}"
+
+
+@contextmanager
+def _series_lock(user_id, wait):
+    """
+    사용자 시계열 항목 잠금. with _series_lock(user_id, wait) as acquired: 형태로 사용하며,
+    wait 초 안에 잡지 못하면 acquired 는 False 입니다.
+    """
+    key = _lock_key(user_id)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    acquired = cache.add(key, token, SERIES_LOCK_TIMEOUT)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        acquired = cache.add(key, token, SERIES_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+def series_window(today=None):
+    """대시보드 조회 기간 (시작일, 종료일)"""
+    end_date = today or date.today()
+    return end_date - timedelta(days=DASHBOARD_DAYS), end_date
+
+
+def _row_key(day, platform, alias):
+    # 일자가 앞에 오므로 키 정렬 = 일자 정렬, 문자열 비교로 기간을 자를 수 있음
+    return f"{day.isoformat()}|{platform}|{alias}"
+
+
+def _row_values(obj):
+    return [
+        float(getattr(obj, field) or 0) if field in FLOAT_FIELDS else int(getattr(obj, field) or 0)
+        for field in SERIES_FIELDS
+    ]
+
+
+def _trim(rows, start_date):
+    start_token = start_date.isoformat()
+    return {key: values for key, values in rows.items() if key >= start_token}
+
+
+def _timestamp(value):
+    return value.timestamp() if value else 0.0
+
+
+def _build(user_id, start_date, end_date):
+    """
+    rollup 에서 기간 전체를 읽어 캐시 항목 생성 (캐시가 없을 때만 실행).
+    반영 시각은 기간 안 rollup 행의 최종 수정 시각이라, 데이터가 그대로면 다시 생성해도 ETag/Last-Modified 가 같습니다.
+    """
+    rows = {}
+    latest = None
+    for obj in DailyRevenueRollup.objects.filter(
+        user_id=user_id, date__range=[start_date, end_date]
+    ).only('date', 'platform', 'alias', 'updated_at', *SERIES_FIELDS):
+        rows[_row_key(obj.date, obj.platform, obj.alias)] = _row_values(obj)
+        if obj.updated_at and (latest is None or obj.updated_at > latest):
+            latest = obj.updated_at
+    return {'rows': rows, 'ingested_at': _timestamp(latest)}
+
+
+def get_dashboard_series(user):
+    """
+    사용자의 대시보드 시계열 캐시 항목.
+    반환값: {'rows': {"YYYY-MM-DD|platform|alias": [earnings, clicks, impressions, order_count, total_amount]},
+             'ingested_at': 마지막 반영 시각(epoch)}
+    """
+    user_id = getattr(user, 'pk', user)
+    key = _cache_key(user_id)
+    entry = cache.get(key)
+    start_date, end_date = series_window()
+    if entry is None:
+        logger.info(f"캐시 MISS: dashboard_series {user_id}")
+        # 잠금 안에서 생성해야 생성 중에 커밋된 수집 반영이 저장 단계에서 유실되지 않음
+        with _series_lock(user_id, READ_LOCK_WAIT) as acquired:
+            entry = cache.get(key) if acquired else None
+            if entry is None:
+                entry = _build(user_id, start_date, end_date)
+                if acquired:
+                    cache.set(key, entry, DASHBOARD_SERIES_TIMEOUT)
+    entry['rows'] = _trim(entry['rows'], start_date)
+    return entry
+
+
+def ingested_at(entry):
+    """캐시 항목의 마지막 반영 시각 (aware datetime, 초 단위)"""
+    return datetime.fromtimestamp(int(entry['ingested_at']), tz=dt_timezone.utc)
+
+
+def series_rows(entry):
+    """일자순 행 목록: [{date, platform, alias, earnings, clicks, impressions, order_count, total_amount}]"""
+    result = []
+    for key in sorted(entry['rows']):
+        day, platform, alias = key.split('|', 2)
+        row = {'date': date.fromisoformat(day), 'platform': platform, 'alias': alias}
+        row.update(zip(SERIES_FIELDS, entry['rows'][key]))
+        result.append(row)
+    return result
+
+
+def record_rollup_changes(changed, deleted, ingested_at):
+    """
+    rollup 반영 직후 호출 - 캐시된 대시보드 시계열에서 바뀐 (일자, 플랫폼, 별칭) 행만 교체/추가/삭제하고
+    반영 시각을 바뀐 rollup 행의 수정 시각 (삭제만 있으면 ingested_at) 으로 올립니다. 캐시가 없는 사용자는 건너뜁니다 (다음 조회 때 생성).
+    사용자별 잠금 안에서 읽고 고쳐 쓰며, 커밋 후에 반영합니다.
+    """
+    by_user = {}
+    latest = {}
+    for obj in changed:
+        by_user.setdefault(obj.user_id, []).append((_row_key(obj.date, obj.platform, obj.alias), obj.date, _row_values(obj)))
+        if obj.updated_at and (obj.user_id not in latest or obj.updated_at > latest[obj.user_id]):
+            latest[obj.user_id] = obj.updated_at
+    for obj in deleted:
+        by_user.setdefault(obj.user_id, []).append((_row_key(obj.date, obj.platform, obj.alias), obj.date, None))
+    if not by_user:
+        return
+
+    def apply():
+        start_date, end_date = series_window()
+        for user_id, items in by_user.items():
+            key = _cache_key(user_id)
+            with _series_lock(user_id, PATCH_LOCK_WAIT) as acquired:
+                if not acquired:
+                    # 잠금을 잡지 못하면 고쳐 쓰지 않고 항목을 버림 (다음 조회 때 rollup 에서 다시 생성)
+                    logger.warning(f"[DashboardSeries] {user_id}: 잠금 대기 초과 - 캐시 삭제")
+                    cache.delete(key)
+                    continue
+                entry = cache.get(key)
+                if entry is None:
+                    continue
+                rows = entry['rows']
+                for row_key, day, values in items:
+                    if values is None or not start_date <= day <= end_date:
+                        rows.pop(row_key, None)
+                    else:
+                        rows[row_key] = values
+                entry['rows'] = _trim(rows, start_date)
+                entry['ingested_at'] = max(entry['ingested_at'], _timestamp(latest.get(user_id, ingested_at)))
+                cache.set(key, entry, DASHBOARD_SERIES_TIMEOUT)
+            logger.debug(f"[DashboardSeries] {user_id}: {len(items)}행 반영")
+
+    transaction.on_commit(apply)
+
+
+def invalidate_dashboard_series(user):
+    """사용자 시계열 캐시 삭제 (자격증명 삭제처럼 파티션 전체가 사라질 때). 커밋 후에 반영합니다."""
+    user_id = getattr(user, 'pk', user)
+
+    def apply():
+        with _series_lock(user_id, PATCH_LOCK_WAIT):
+            cache.delete(_cache_key(user_id))
+
+    transaction.on_commit(apply)
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import time
+from datetime import date, datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from stats.models import (
+    ExchangeRate, MonthlyAdjustment, MonthlySales, OtherRevenue, PurchaseGroup,
+    PurchaseGroupAdUnit, PurchasePrice, ServiceGroup, SettlementDepartment,
+)
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = 'data_version'
+# 키에 데이터 버전이 들어가므로 변경 시 자동으로 새 키를 사용 - 만료는 공간 회수용
+VERSIONED_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+ALL_MONTHS = '*'
+# 사용자와 무관한 공용 데이터 도메인 (newspic 통계 스냅샷, newspic 멤버 등급)
+SHARED_DOMAINS = ('newspic', 'member')
+SHARED_SCOPE = 0
+
+DOMAINS = (
+    'adstats',          # AdStats / DailyRevenueRollup (수집, 업로드)
+    'newspic',          # NewspicDailyStat (newspic 통계 동기화)
+    'member',           # newspic Member 등급 (멤버 디렉터리/등급 동기화)
+    'sales',            # MonthlySales, ServiceGroup, SettlementDepartment
+    'purchase',         # PurchasePrice, PurchaseGroup, PurchaseGroupAdUnit
+    'exchange_rate',    # ExchangeRate
+    'other_revenue',    # OtherRevenue
+    'adjustment',       # MonthlyAdjustment
+)
+
+
+def _scope(user, domain):
+    if domain in SHARED_DOMAINS:
+        return SHARED_SCOPE
+    return getattr(user, 'pk', user)
+
+
+def _month_token(value):
+    if value is None or value == ALL_MONTHS:
+        return ALL_MONTHS
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.strftime('%Y%m')
+    return str(value)
+
+
+def _counter_key(scope, domain, token):
+    return f"{VERSION_PREFIX}:{scope}:{domain}:{token}"
+
+
+def _seed():
+    # 카운터가 만료/축출된 뒤에도 이전 값과 겹치지 않도록 현재 시각(ms)에서 시작
+    return int(time.time() * 1000)
+
+
+def year_months(year):
+    """해당 연도의 월 시작일 목록"""
+    return [date(year, month, 1) for month in range(1, 13)]
+
+
+def bump(user, domain, months=None):
+    """
+    (사용자, 도메인, 월) 버전 증가. months 가 None 이면 도메인 전체(모든 월)를 무효화합니다.
+    트랜잭션 안에서 호출되면 커밋 후에 반영해, 커밋 전 데이터로 새 버전 캐시가 채워지지 않게 합니다.
+    """
+    if domain not in DOMAINS:
+        raise ValueError(f"알 수 없는 데이터 도메인: {domain}")
+    scope = _scope(user, domain)
+    tokens = {ALL_MONTHS} if months is None else {_month_token(month) for month in months}
+    keys = [_counter_key(scope, domain, token) for token in sorted(tokens)]
+
+    def apply():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _seed(), None)
+        logger.debug(f"[DataVersion] {scope}:{domain} 버전 증가 ({', '.join(sorted(tokens))})")
+
+    transaction.on_commit(apply)
+
+
+def current_versions(user, deps):
+    """
+    의존 데이터 버전 목록.
+    deps: [(domain, months)] - months 는 월 시작일 목록 (None 이면 도메인 전체 버전만 사용)
+    각 도메인의 전체 버전과 지정한 월별 버전을 함께 반환합니다.
+    """
+    keys = set()
+    for domain, months in deps:
+        if domain not in DOMAINS:
+            raise ValueError(f"알 수 없는 데이터 도메인: {domain}")
+        scope = _scope(user, domain)
+        keys.add(_counter_key(scope, domain, ALL_MONTHS))
+        for month in months or ():
+            keys.add(_counter_key(scope, domain, _month_token(month)))
+
+    versions = cache.get_many(keys)
+    missing = keys - versions.keys()
+    if missing:
+        seed = _seed()
+        for key in missing:
+            cache.add(key, seed, None)
+        versions.update(cache.get_many(missing))
+    return tuple(sorted(versions.items()))
+
+
+def versioned_key(name, user, deps, *parts):
+    """의존 데이터 버전이 포함된 캐시 키 (세션과 무관하게 공유, 데이터 변경 시 자동으로 바뀜)"""
+    digest = hashlib.sha1(repr((parts, current_versions(user, deps))).encode('utf-8')).hexdigest()[:16]
+    return f"{name}:{getattr(user, 'pk', user)}:{digest}"
+
+
+def get_or_compute(name, user, deps, compute, *parts, timeout=VERSIONED_CACHE_TIMEOUT):
+    """버전 키 캐시 조회, 없으면 compute() 결과를 저장 후 반환"""
+    cache_key = versioned_key(name, user, deps, *parts)
+    value = cache.get(cache_key)
+    if value is None:
+        logger.info(f"캐시 MISS: {name} {parts}")
+        value = compute()
+        cache.set(cache_key, value, timeout)
+    else:
+        logger.info(f"캐시 HIT: {name} {parts}")
+    return value
+
+
+# ---- 모델 변경 시 버전 증가 (개별 save/delete, 관리자 수정) ----
+# bulk_create/bulk_update/QuerySet.update 는 시그널이 없으므로 호출부에서 bump 를 직접 호출합니다.
+
+# (모델, 도메인, 월 필드, 사용자 ID 경로)
+TRACKED_MODELS = (
+    (MonthlySales, 'sales', 'year_month', 'user_id'),
+    (ServiceGroup, 'sales', None, 'user_id'),
+    (SettlementDepartment, 'sales', None, 'user_id'),
+    (PurchasePrice, 'purchase', 'year_month', 'user_id'),
+    (PurchaseGroup, 'purchase', None, 'user_id'),
+    (PurchaseGroupAdUnit, 'purchase', None, 'purchase_group.user_id'),
+    (ExchangeRate, 'exchange_rate', 'year_month', 'user_id'),
+    (OtherRevenue, 'other_revenue', 'date', 'user_id'),
+    (MonthlyAdjustment, 'adjustment', 'year_month', 'user_id'),
+)
+
+
+def _resolve(instance, path):
+    value = instance
+    for attr in path.split('.'):
+        value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def _connect(model, domain, month_field, user_path):
+    def on_change(sender, instance, created=False, **kwargs):
+        user_id = _resolve(instance, user_path)
+        if user_id is None:
+            return
+        month = getattr(instance, month_field, None) if month_field else None
+        # 수정은 이전 월 값을 알 수 없으므로 도메인 전체를 무효화
+        if month is None or (kwargs.get('signal') is post_save and not created):
+            bump(user_id, domain)
+        else:
+            bump(user_id, domain, [month])
+
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid=f'data_version_save_{model.__name__}')
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=f'data_version_delete_{model.__name__}')
+
+
+for _model, _domain, _month_field, _user_path in TRACKED_MODELS:
+    _connect(_model, _domain, _month_field, _user_path)
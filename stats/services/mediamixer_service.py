@@ -14,6 +14,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException, SessionNotCreatedException
 from stats.models import AdStats, PlatformCredential
+from stats.services.upload_ingest import ingest_subid_report
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -88,48 +89,13 @@ def save_screenshot(driver, step_name):
 def process_excel_file(file_path, cred):
     """엑셀 파일을 처리하고 데이터를 저장하는 함수"""
     try:
-        # 엑셀 파일 읽기
-        df = pd.read_excel(file_path, header=0)  # 첫 번째 행을 헤더로 사용
+        # 배치 단위 스트리밍 + 일괄 upsert
+        result = ingest_subid_report(cred, file_path)
+        for message in result['errors']:
+            logger.error(f"[mediamixer] {message} 처리 중 오류 발생")
         
-        # 데이터 처리
-        for index, row in df.iterrows():
-            try:
-                # 날짜 가져오기
-                date = pd.to_datetime(row['날짜']).date()
-                
-                # ad_unit_id 생성 (SUB_ID + SUBPARAM)
-                ad_unit_id = str(row['SUB_ID'])
-                if 'SUBPARAM' in row and not pd.isna(row['SUBPARAM']):
-                    ad_unit_id += str(row['SUBPARAM'])
-                
-                # 데이터 업데이트 또는 생성
-                AdStats.objects.update_or_create(
-                    user=cred.user,
-                    platform="mediamixer",
-                    alias=cred.alias,
-                    date=date,
-                    ad_unit_id=ad_unit_id,
-                    defaults={
-                        'ad_unit_name': row['지면명'],
-                        'earnings': float(row['최종수익금']) if not pd.isna(row['최종수익금']) else 0,
-                        'clicks': int(row['클릭수']) if not pd.isna(row['클릭수']) else 0,
-                        'impressions': int(row['노출수']) if not pd.isna(row['노출수']) else 0,
-                        'order_count': int(row['최종구매수량']) if not pd.isna(row['최종구매수량']) else 0,
-                        'total_amount': float(row['최종구매금액']) if not pd.isna(row['최종구매금액']) else 0,
-                        'credential': cred
-                    }
-                )
-                
-                # logger.info(f"[mediamixer] 데이터 저장 완료: {ad_unit_id} ({date})")
-                
-            except Exception as e:
-                # logger.error(f"[mediamixer] 행 {index+2} 처리 중 오류 발생: {str(e)}")
-                continue
-        
-        # 임시 엑셀 파일 삭제
         try:
             os.remove(file_path)
-            # logger.info(f"[mediamixer] 임시 엑셀 파일 삭제 완료: {file_path}")
         except Exception as e:
             logger.error(f"[mediamixer] 임시 엑셀 파일 삭제 실패: {str(e)}")
         
@@ -409,7 +375,7 @@ def fetch_mediamixer_stats_by_credential(cred, start_date, end_date, max_retries
             if success_count > 0:
                 logger.info(f"[mediamixer] '{cred.alias}' 계정 데이터 수집 완료: {success_count}개 행 처리 (시도 {attempt + 1})")
                 cred.last_fetched_at = timezone.now()
-                cred.save()
+                cred.save(update_fields=["last_fetched_at"])
                 return True
             else:
                 logger.error(f"[mediamixer] '{cred.alias}' 계정 데이터 처리 실패: 모든 행 처리 실패 (시도 {attempt + 1})")
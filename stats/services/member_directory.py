@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+
+from stats.models import Member
+from stats.services.data_versions import SHARED_SCOPE, bump, current_versions
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 로컬 멤버 캐시 유효 시간 (초) - 등급/이름 변경은 최대 이 시간 후 반영
+MEMBER_CACHE_TTL = 5 * 60
+# 캐시 최대 항목 수 (넘으면 만료 항목부터 정리)
+MEMBER_CACHE_MAX_ENTRIES = 50000
+
+# 전체 등급 서명 (등급 동기화 시 비교용)
+MEMBER_LEVELS_DIGEST_KEY = 'member_levels_digest'
+MEMBER_DEPS = [('member', None)]
+
+# {request_key: (만료 시각, (no, uid, uname, level) 또는 None)}
+_cache = {}
+_lock = threading.Lock()
+# 캐시를 채운 시점의 'member' 데이터 버전 (버전이 바뀌면 캐시 전체를 버림)
+_cache_version = None
+
+
+def _to_member(request_key, record):
+    if record is None:
+        return None
+    no, uid, uname, level = record
+    return Member(no=no, uid=uid, uname=uname, level=level, request_key=request_key)
+
+
+def _prune(now):
+    """만료 항목 정리 (락 안에서 호출)"""
+    for key in [key for key, (expires_at, _) in _cache.items() if expires_at <= now]:
+        del _cache[key]
+    if len(_cache) >= MEMBER_CACHE_MAX_ENTRIES:
+        _cache.clear()
+
+
+def member_version():
+    """newspic 멤버 등급 데이터 버전 (캐시 조회만, newspic DB 는 조회하지 않음)"""
+    return current_versions(SHARED_SCOPE, MEMBER_DEPS)
+
+
+def get_members(request_keys):
+    """
+    퍼블리셔 코드별 Member {request_key: Member 또는 None}.
+    캐시에 없거나 만료된 코드만 newspic member 테이블에서 1회 IN 쿼리로 조회합니다.
+    존재하지 않는 코드도 None 으로 캐시해 반복 조회하지 않습니다.
+    다시 조회한 멤버의 등급이 캐시된 값과 다르면 'member' 데이터 버전을 올립니다.
+    """
+    global _cache_version
+    keys = {key for key in request_keys if key}
+    version = member_version()
+    now = time.monotonic()
+    records = {}
+    previous = {}
+    with _lock:
+        # 다른 프로세스가 등급 변경을 감지했으면 이 프로세스의 캐시도 버림
+        if version != _cache_version:
+            _cache.clear()
+            _cache_version = version
+        for key in keys:
+            entry = _cache.get(key)
+            if entry and entry[0] > now:
+                records[key] = entry[1]
+            elif entry:
+                previous[key] = entry[1]
+
+    missing = keys - records.keys()
+    if missing:
+        fetched = {
+            request_key: (no, uid, uname, level)
+            for no, uid, uname, level, request_key in Member.newspic_objects().filter(
+                request_key__in=list(missing)
+            ).values_list('no', 'uid', 'uname', 'level', 'request_key')
+        }
+        expires_at = now + MEMBER_CACHE_TTL
+        with _lock:
+            if len(_cache) + len(missing) > MEMBER_CACHE_MAX_ENTRIES:
+                _prune(now)
+            for key in missing:
+                records[key] = fetched.get(key)
+                _cache[key] = (expires_at, records[key])
+        logger.debug(f"[MemberDirectory] 캐시 {len(keys) - len(missing)}건, 조회 {len(missing)}건")
+        changed = [key for key, record in previous.items() if _level(record) != _level(records[key])]
+        if changed:
+            logger.info(f"[MemberDirectory] 등급 변경 감지 {len(changed)}건")
+            bump(SHARED_SCOPE, 'member')
+
+    return {key: _to_member(key, record) for key, record in records.items()}
+
+
+def _level(record):
+    return record[3] if record is not None else None
+
+
+def sync_member_levels():
+    """
+    전체 멤버 등급 서명을 이전 동기화 때와 비교해 바뀌었으면 'member' 데이터 버전을 올립니다 (newspic 동기화 작업).
+    (퍼블리셔 코드, 등급) 쌍 전체의 해시라 등급 교환이나 합이 같은 변경도 감지합니다. 반환값: 변경 여부
+    """
+    digest = hashlib.sha1()
+    for request_key, level in Member.newspic_objects().exclude(request_key__isnull=True).values_list(
+        'request_key', 'level'
+    ).order_by('request_key').iterator():
+        digest.update(f"{request_key}:{level};".encode('utf-8'))
+    signature = digest.hexdigest()
+    previous = cache.get(MEMBER_LEVELS_DIGEST_KEY)
+    if previous == signature:
+        return False
+    cache.set(MEMBER_LEVELS_DIGEST_KEY, signature, None)
+    # 서명이 없던 경우(최초/캐시 축출)에도 버전을 올려 이전 계산 결과를 재사용하지 않음
+    bump(SHARED_SCOPE, 'member')
+    logger.info("[MemberDirectory] 멤버 등급 변경 - 'member' 데이터 버전 증가")
+    return True
+
+
+def get_member(request_key):
+    """단일 퍼블리셔 코드의 Member (없으면 None)"""
+    return get_members([request_key]).get(request_key)
+
+
+def prefetch_members(groups):
+    """
+    PurchaseGroup 목록(쿼리셋 포함)에 Member 를 한 번에 붙입니다 (prefetch_related 와 같은 용도).
+    이후 group.member 는 추가 쿼리 없이 붙인 값을 반환합니다. 넘겨받은 groups 를 그대로 반환합니다.
+    쿼리셋은 평가된 결과 캐시에 붙이므로, 같은 쿼리셋 객체를 다시 순회해야 효과가 있습니다.
+    """
+    group_list = list(groups)
+    members = get_members(group.member_request_key for group in group_list)
+    for group in group_list:
+        group.set_prefetched_member(members.get(group.member_request_key))
+    return groups
+
+
+def member_summary(member):
+    """캐시/JSON 에 담을 수 있는 Member 요약 dict (없으면 None)"""
+    if member is None:
+        return None
+    return {'request_key': member.request_key, 'uid': member.uid, 'uname': member.uname, 'level': member.level}
+
+
+def clear_member_cache():
+    """프로세스 로컬 멤버 캐시 비우기"""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,82 @@
+"""
+정수 최소 단위 금액 연산.
+
+리포트 합계의 KRW 금액은 원 단위 int64, USD 금액은 마이크로달러(1e-6 USD) 단위 int64 NumPy 배열로 보관하고
+합계/차감은 배열 연산(정수)으로만 계산합니다. 원 미만 값이 정리되는 곳은 아래 반올림 지점뿐이며,
+각 지점은 기존 리포트 코드의 반올림 방식을 그대로 따릅니다.
+
+반올림 지점
+  1. won()            섹션 플랫폼 수익(float/Decimal) → 원. ROUND_HALF_UP (0.5 는 0 에서 먼 쪽, 템플릿 floatformat:0 과 같음)
+                      셀(일자 × 플랫폼/계정) 단위로 한 번 반올림하고, 일 합계/기간 합계는 반올림된 셀의 합입니다.
+  2. won_trunc()      기타수익/매입 비용, 구글/네이버 일 수익 → 원. 원 미만 버림 (int() 와 같음)
+  3. won_half_even()  파트너스 개별 플랫폼 일 수익 셀 → 원. round(float()) 와 같은 ROUND_HALF_EVEN
+  4. usd_micros()     USD → 마이크로달러. ROUND_HALF_UP (소수 6자리 이하 값은 오차 없음)
+
+AdSense 원화 환산은 micros_to_krw() 로 마이크로달러 정수 합 × 환율을 정확한 Decimal 로 계산하며
+(Decimal(USD) × 환율 과 같은 값), 원 단위 정리는 구글 일 수익의 반올림 지점 2 에서 합니다.
+스탬플리 쿠팡 계정별 수익은 반올림하지 않은 값을 합산해 계정 합계에서 한 번만 ROUND_HALF_UP 합니다.
+
+템플릿/JSON 에는 to_template() 으로 파이썬 int (목록 또는 {키: int}) 로 변환해 넘깁니다.
+"""
+import logging
+from decimal import Decimal
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KRW_DTYPE = np.int64
+USD_MICROS = 10 ** 6
+
+
+def _as_float(values):
+    # Decimal/None 이 섞인 목록도 float64 배열로 (None 은 0)
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    return np.array([0.0 if value is None else float(value) for value in np.ravel(values)], dtype=np.float64).reshape(np.shape(values))
+
+
+def _half_up(values):
+    magnitude = np.abs(values)
+    whole = np.floor(magnitude)
+    # magnitude - whole 은 float 에서 정확하므로 0.5 판정에 오차가 없음
+    units = whole + (magnitude - whole >= 0.5)
+    return np.where(values < 0, -units, units).astype(KRW_DTYPE)
+
+
+def won(values):
+    """[반올림 지점 1] KRW 금액 배열 → 원 단위 int64 배열 (ROUND_HALF_UP)"""
+    return _half_up(_as_float(values))
+
+
+def won_trunc(values):
+    """[반올림 지점 2] KRW 금액 배열 → 원 단위 int64 배열 (원 미만 버림, int() 와 같음)"""
+    return np.trunc(_as_float(values)).astype(KRW_DTYPE)
+
+
+def won_half_even(values):
+    """[반올림 지점 3] KRW 금액 배열 → 원 단위 int64 배열 (ROUND_HALF_EVEN, 파이썬 round() 와 같음)"""
+    return np.rint(_as_float(values)).astype(KRW_DTYPE)
+
+
+def usd_micros(values):
+    """[반올림 지점 4] USD 금액 배열 → 마이크로달러 int64 배열 (ROUND_HALF_UP)"""
+    return _half_up(_as_float(values) * USD_MICROS)
+
+
+def micros_to_krw(micros, rate):
+    """마이크로달러 정수 × 환율(KRW/USD) → KRW Decimal (반올림 없음, 정수 곱 후 10^6 로 나눔)"""
+    return Decimal(int(micros)) * Decimal(str(rate)) / USD_MICROS
+
+
+def zeros(length):
+    """원 단위 0 배열"""
+    return np.zeros(length, dtype=KRW_DTYPE)
+
+
+def to_template(values, keys=None):
+    """원 단위 배열 → 파이썬 int 목록 (keys 를 주면 {key: int})"""
+    values = np.asarray(values).tolist()
+    if keys is None:
+        return values
+    return dict(zip(keys, values))
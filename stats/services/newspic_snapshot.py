@@ -0,0 +1,189 @@
+import logging
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, Sum
+from django.utils import timezone
+
+from stats.models import MemberStat, NewspicDailyStat, NewspicSyncState, TotalStat
+from stats.services.data_versions import SHARED_SCOPE, bump
+from stats.services.member_directory import sync_member_levels
+
+logger = logging.getLogger(__name__)
+
+SYNC_SOURCE = 'newspic_stats'
+# 최근 N일은 원본이 늦게 확정될 수 있어 워터마크와 무관하게 매번 다시 동기화
+NEWSPIC_RESYNC_DAYS = 7
+# 한 번에 집계/반영하는 최대 일수
+SYNC_CHUNK_DAYS = 31
+# 동기화 잠금: 프로세스마다 스케줄러가 돌기 때문에 한 번에 하나만 실행 (구간마다 만료 연장)
+SYNC_LOCK_KEY = 'newspic_sync_lock'
+SYNC_LOCK_TIMEOUT = 10 * 60
+SNAPSHOT_FIELDS = (
+    'visit_count', 'powerlink_count', 'click_count', 'valid_pageview', 'has_total_stat', 'has_member_stat',
+)
+
+
+def _empty_values():
+    return {field: (False if field.startswith('has_') else 0) for field in SNAPSHOT_FIELDS}
+
+
+def _aggregate(start_date, end_date):
+    """
+    newspic 원본을 (request_key, date) 단위로 집계 (tbTotalStat 1회, tbMemberStat 1회 쿼리).
+    반환값: {(request_key, date): {필드: 값}}
+    """
+    result = {}
+    for row in TotalStat.newspic_objects().filter(
+        sdate__range=[start_date, end_date]
+    ).values('request_key', 'sdate').annotate(
+        visit_count=Sum('visit_count'),
+        powerlink_count=Sum('powerlink_count'),
+        click_count=Sum('click_count'),
+    ).order_by():
+        values = result.setdefault((row['request_key'], row['sdate']), _empty_values())
+        values['visit_count'] = int(row['visit_count'] or 0)
+        values['powerlink_count'] = int(row['powerlink_count'] or 0)
+        values['click_count'] = int(row['click_count'] or 0)
+        values['has_total_stat'] = True
+
+    # tbMemberStat.sdate 는 YYYYMMDD 문자열
+    for row in MemberStat.newspic_objects().filter(
+        sdate__range=[start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')]
+    ).values('request_key', 'sdate').annotate(valid_pageview=Sum('click_cnt')).order_by():
+        try:
+            day = datetime.strptime(row['sdate'], '%Y%m%d').date()
+        except (TypeError, ValueError):
+            continue
+        values = result.setdefault((row['request_key'], day), _empty_values())
+        values['valid_pageview'] = int(row['valid_pageview'] or 0)
+        values['has_member_stat'] = True
+    return result
+
+
+def _write_snapshot(aggregated, start_date, end_date, batch_size=1000):
+    """
+    집계 결과를 스냅샷 테이블에 반영 (기간 안에서 원본에 없는 행은 삭제).
+    바뀐 행이 있는 월의 'newspic' 데이터 버전을 올립니다.
+    반환값: (created, updated, deleted)
+    """
+    existing = {
+        (obj.request_key, obj.date): obj
+        for obj in NewspicDailyStat.objects.filter(date__range=[start_date, end_date])
+    }
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for key, values in aggregated.items():
+        obj = existing.pop(key, None)
+        if obj is None:
+            request_key, day = key
+            to_create.append(NewspicDailyStat(request_key=request_key, date=day, **values))
+        elif any(getattr(obj, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(obj, field, value)
+            obj.updated_at = now
+            to_update.append(obj)
+
+    with transaction.atomic():
+        if to_create:
+            NewspicDailyStat.objects.bulk_create(to_create, batch_size=batch_size)
+        if to_update:
+            NewspicDailyStat.objects.bulk_update(
+                to_update, list(SNAPSHOT_FIELDS) + ['updated_at'], batch_size=batch_size
+            )
+        if existing:
+            NewspicDailyStat.objects.filter(pk__in=[obj.pk for obj in existing.values()]).delete()
+
+    changed_months = {obj.date.replace(day=1) for obj in to_create + to_update + list(existing.values())}
+    if changed_months:
+        bump(SHARED_SCOPE, 'newspic', changed_months)
+    return len(to_create), len(to_update), len(existing)
+
+
+@contextmanager
+def sync_lock():
+    """
+    동기화 잠금 (동시 실행 시 같은 (request_key, date) 를 중복 생성해 unique 충돌이 나지 않도록).
+    with sync_lock() as acquired: 형태로 사용하며, 다른 프로세스가 잡고 있으면 acquired 는 False 입니다.
+    """
+    token = uuid.uuid4().hex
+    acquired = cache.add(SYNC_LOCK_KEY, token, SYNC_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(SYNC_LOCK_KEY) == token:
+            cache.delete(SYNC_LOCK_KEY)
+
+
+def sync_range(start_date, end_date):
+    """기간을 SYNC_CHUNK_DAYS 단위로 나눠 동기화 (sync_lock 안에서 호출). 반환값: (created, updated, deleted)"""
+    totals = [0, 0, 0]
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        # 전체 동기화처럼 오래 걸려도 잠금이 만료되지 않도록 구간마다 연장
+        cache.touch(SYNC_LOCK_KEY, SYNC_LOCK_TIMEOUT)
+        chunk_end = min(chunk_start + timedelta(days=SYNC_CHUNK_DAYS - 1), end_date)
+        counts = _write_snapshot(_aggregate(chunk_start, chunk_end), chunk_start, chunk_end)
+        for i, count in enumerate(counts):
+            totals[i] += count
+        logger.debug(f"[NewspicSync] {chunk_start}~{chunk_end}: 생성 {counts[0]}, 갱신 {counts[1]}, 삭제 {counts[2]}")
+        chunk_start = chunk_end + timedelta(days=1)
+    return tuple(totals)
+
+
+def _first_source_date():
+    """원본에서 가장 이른 일자 (데이터가 없으면 None)"""
+    candidates = []
+    first_total = TotalStat.newspic_objects().aggregate(first=Min('sdate'))['first']
+    if first_total:
+        candidates.append(first_total)
+    first_member = MemberStat.newspic_objects().aggregate(first=Min('sdate'))['first']
+    if first_member:
+        try:
+            candidates.append(datetime.strptime(first_member, '%Y%m%d').date())
+        except ValueError:
+            pass
+    return min(candidates) if candidates else None
+
+
+def sync_newspic_stats(resync_days=NEWSPIC_RESYNC_DAYS, today=None):
+    """
+    증분 동기화: 워터마크 다음 날(또는 최근 resync_days 일 중 더 이른 날)부터 오늘까지 반영 후 워터마크를 오늘로 이동.
+    워터마크가 없으면 원본의 첫 일자부터 전체를 동기화합니다.
+    다른 프로세스가 동기화 중이면 건너뜁니다.
+    반환값: (start_date, end_date, (created, updated, deleted)) - 대상이 없거나 건너뛰면 None
+    """
+    with sync_lock() as acquired:
+        if not acquired:
+            logger.info("[NewspicSync] 다른 프로세스가 동기화 중이라 건너뜁니다.")
+            return None
+        # 멤버 등급은 스냅샷과 같은 주기로 확인 (페이지 조회 시에는 newspic 멤버 전체를 읽지 않음)
+        sync_member_levels()
+        return _sync_incremental(resync_days, today or timezone.localdate())
+
+
+def _sync_incremental(resync_days, today):
+    state, _ = NewspicSyncState.objects.get_or_create(source=SYNC_SOURCE)
+
+    resync_start = today - timedelta(days=max(resync_days, 1) - 1)
+    if state.synced_through:
+        start_date = min(state.synced_through + timedelta(days=1), resync_start)
+    else:
+        start_date = _first_source_date()
+        if start_date is None:
+            logger.info("[NewspicSync] 원본 데이터가 없습니다.")
+            return None
+    end_date = today
+
+    counts = sync_range(start_date, end_date)
+    state.synced_through = end_date
+    state.last_synced_at = timezone.now()
+    state.save(update_fields=['synced_through', 'last_synced_at', 'updated_at'])
+    logger.info(
+        f"[NewspicSync] {start_date}~{end_date} 동기화 완료: 생성 {counts[0]}, 갱신 {counts[1]}, 삭제 {counts[2]}"
+    )
+    return start_date, end_date, counts
@@ -0,0 +1,147 @@
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+
+import numpy as np
+from django.db.models import Sum
+
+from stats.models import AdStats, NewspicDailyStat
+
+logger = logging.getLogger(__name__)
+
+# 파워링크(애드포스트) 수익 분배 기준 광고 단위와 분배율
+POWERLINK_AD_UNIT_ID = '모바일뉴스픽_컨텐츠'
+POWERLINK_SHARE = Fraction(595, 1000)
+# int64 로 계산 가능한 최대값 (넘으면 파이썬 정수(object) 배열로 계산)
+INT64_SAFE_LIMIT = 2 ** 62
+
+
+class PowerlinkAllocator:
+    """
+    파워링크(애드포스트) 수익 분배 엔진.
+    분배액 = 단가 × 퍼블리셔 파워링크 클릭 × 59.5% × (애드포스트 클릭 / 전체 파워링크 클릭)
+    단가 = 애드포스트 수익 / 애드포스트 클릭 (unit_price_places 자리 ROUND_HALF_UP, None 이면 반올림하지 않음)
+
+    날짜별 클릭당 분배액을 유리수(분자/분모 정수)로 한 번만 계산하고,
+    (퍼블리셔 × 날짜) 클릭 행렬 전체에 정수 연산으로 적용해 ROUND_HALF_UP 결과를 정확히 얻습니다.
+    """
+
+    def __init__(self, date_list, adpost_earnings, adpost_clicks, total_powerlink, unit_price_places=2):
+        self.date_list = list(date_list)
+        self.date_index = {d: j for j, d in enumerate(self.date_list)}
+        self.adpost_earnings = list(adpost_earnings)
+        self.adpost_clicks = [int(clicks or 0) for clicks in adpost_clicks]
+        self.total_powerlink = [int(total or 0) for total in total_powerlink]
+
+        self.unit_prices = []
+        self.rates = []
+        for earnings, clicks, total in zip(self.adpost_earnings, self.adpost_clicks, self.total_powerlink):
+            unit_price = Decimal('0')
+            rate = Fraction(0)
+            if clicks > 0:
+                unit_price = Decimal(str(earnings or 0)) / Decimal(str(clicks))
+                if unit_price_places is not None:
+                    unit_price = unit_price.quantize(Decimal(1).scaleb(-unit_price_places), rounding=ROUND_HALF_UP)
+                if total > 0 and unit_price > 0:
+                    rate = Fraction(unit_price) * POWERLINK_SHARE * Fraction(clicks, total)
+            self.unit_prices.append(unit_price)
+            self.rates.append(rate)
+
+    @classmethod
+    def load(cls, user, date_list, unit_price_places=2):
+        """애드포스트 일별 수익/클릭과 전체 파워링크 클릭수를 2회 쿼리로 조회해 생성"""
+        date_list = list(date_list)
+        adpost = {}
+        total = {}
+        if date_list:
+            start_date, end_date = min(date_list), max(date_list)
+            adpost = {
+                stat['date']: (stat['earnings'] or 0, stat['clicks'] or 0)
+                for stat in AdStats.objects.filter(
+                    user=user,
+                    platform='adpost',
+                    ad_unit_id=POWERLINK_AD_UNIT_ID,
+                    date__range=[start_date, end_date],
+                ).values('date').annotate(earnings=Sum('earnings'), clicks=Sum('clicks'))
+            }
+            total = {
+                stat['date']: stat['total_powerlink'] or 0
+                for stat in NewspicDailyStat.objects.filter(
+                    date__range=[start_date, end_date]
+                ).values('date').annotate(total_powerlink=Sum('powerlink_count'))
+            }
+        return cls(
+            date_list,
+            [adpost.get(d, (0, 0))[0] for d in date_list],
+            [adpost.get(d, (0, 0))[1] for d in date_list],
+            [total.get(d, 0) for d in date_list],
+            unit_price_places=unit_price_places,
+        )
+
+    def allocate_units(self, member_clicks, places=0):
+        """
+        분배액 행렬 (10^-places 단위 정수, ROUND_HALF_UP).
+        member_clicks: (..., 날짜) 클릭 배열. 반환 배열의 모양은 member_clicks 와 같습니다.
+        """
+        clicks = np.asarray(member_clicks, dtype=np.int64)
+        if clicks.shape[-1:] != (len(self.date_list),):
+            raise ValueError(f"클릭 행렬의 날짜 수({clicks.shape})가 분배 기간({len(self.date_list)}일)과 다릅니다.")
+
+        scale = 10 ** places
+        numerators = [rate.numerator * scale for rate in self.rates]
+        denominators = [rate.denominator for rate in self.rates]
+        max_clicks = int(np.abs(clicks).max()) if clicks.size else 0
+        fits = 2 * max_clicks * max(numerators, default=0) + max(denominators, default=1) < INT64_SAFE_LIMIT
+        dtype = np.int64 if fits else object
+
+        n = np.array(numerators, dtype=dtype)
+        d = np.array(denominators, dtype=dtype)
+        magnitude = np.abs(clicks).astype(dtype)
+        # round_half_up(c × n / d) = (2cn + d) // 2d  (c ≥ 0), 음수는 부호를 분리해 0 에서 먼 쪽으로 반올림
+        units = (2 * magnitude * n + d) // (2 * d)
+        return np.where(clicks < 0, -units, units)
+
+    def allocate(self, member_clicks, places=0):
+        """분배액 행렬 (Decimal, 소수 places 자리)"""
+        units = self.allocate_units(member_clicks, places)
+        return units_to_decimal(units, places)
+
+    def rate(self, places=2):
+        """날짜별 클릭당 분배액 (Net CPC, Decimal 목록)"""
+        return units_to_decimal(self.allocate_units(np.ones(len(self.date_list), dtype=np.int64), places), places).tolist()
+
+
+def units_to_decimal(units, places=0):
+    """정수 단위 배열 → Decimal 배열 (소수 places 자리)"""
+    convert = np.frompyfunc(lambda value: Decimal(int(value)).scaleb(-places), 1, 1)
+    return convert(np.asarray(units, dtype=object))
+
+
+def member_powerlink_matrix(request_keys, date_list, counts=None):
+    """
+    (퍼블리셔 × 날짜) 파워링크 클릭 행렬.
+    counts({(request_key, date): powerlink_count}) 가 없으면 newspic 스냅샷(NewspicDailyStat)에서 1회 쿼리로 조회합니다.
+    """
+    request_keys = list(request_keys)
+    date_list = list(date_list)
+    matrix = np.zeros((len(request_keys), len(date_list)), dtype=np.int64)
+    if not request_keys or not date_list:
+        return matrix
+
+    if counts is None:
+        counts = {
+            (request_key, day): powerlink_count
+            for request_key, day, powerlink_count in NewspicDailyStat.objects.filter(
+                request_key__in=request_keys,
+                date__range=[min(date_list), max(date_list)]
+            ).values_list('request_key', 'date', 'powerlink_count')
+        }
+
+    key_index = {key: i for i, key in enumerate(request_keys)}
+    date_index = {d: j for j, d in enumerate(date_list)}
+    for (request_key, d), count in counts.items():
+        i = key_index.get(request_key)
+        j = date_index.get(d)
+        if i is not None and j is not None:
+            matrix[i, j] = count or 0
+    return matrix
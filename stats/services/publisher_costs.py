@@ -0,0 +1,310 @@
+import calendar
+import logging
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from stats.models import (
+    AdStats, DailyRevenueRollup, ExchangeRate, MonthlyPublisherCost,
+    NewspicDailyStat, PurchaseGroupAdUnit
+)
+from stats.services.data_versions import year_months
+from stats.services.powerlink import PowerlinkAllocator, member_powerlink_matrix
+from stats.services.purchase_prices import DEFAULT_UNIT_PRICE, DEFAULT_UNIT_TYPE, get_price_index
+from stats.services.upload_registry import hash_values
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE_RATE = Decimal('1370.00')
+# 매입비용 계산이 의존하는 데이터 도메인 (광고 수익, newspic 통계, 멤버 등급, 단가/그룹, 환율)
+PURCHASE_COST_DOMAINS = ('adstats', 'newspic', 'member', 'purchase', 'exchange_rate')
+
+
+def purchase_cost_deps(year):
+    """연간 매입비용 캐시의 데이터 의존성 (stats.services.data_versions 형식)"""
+    months = year_months(year)
+    return [(domain, months) for domain in PURCHASE_COST_DOMAINS]
+
+
+def month_end(month_start):
+    """월 마지막 날"""
+    return month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+
+
+def cost_spec(ad_unit_ids, unit_price, unit_type, monthly_prices=None, eligible=True):
+    """
+    퍼블리셔 매입비용 계산 입력.
+    monthly_prices: {year_month: (unit_price, unit_type)} - 있으면 해당 월은 기본 단가 대신 적용
+    eligible: False 이면 계산 없이 0 으로 처리
+    """
+    return {
+        'ad_unit_ids': sorted(ad_unit_ids),
+        'unit_price': Decimal(str(unit_price or 0)),
+        'unit_type': unit_type or DEFAULT_UNIT_TYPE,
+        'monthly_prices': monthly_prices or {},
+        'eligible': eligible,
+    }
+
+
+def group_cost_specs(groups, price_index):
+    """PurchaseGroup 목록(ad_units prefetch) → {request_key: spec} (단가 인덱스의 그룹 기본 단가 적용)"""
+    specs = {}
+    for group in groups:
+        unit_price, unit_type = price_index.group_rate(group.member_request_key) or (
+            group.default_unit_price, group.default_unit_type
+        )
+        specs[group.member_request_key] = cost_spec(
+            [ad_unit.ad_unit_id for ad_unit in group.ad_units.all() if ad_unit.is_active],
+            unit_price,
+            unit_type,
+        )
+    return specs
+
+
+def ungrouped_cost_specs(user, request_keys, year):
+    """
+    그룹이 없는 멤버 → {request_key: spec}
+    월별 매입 단가(PurchasePrice, 없으면 기본 50%)를 적용하고,
+    AdStats 에 member 데이터가 있는 멤버만 계산 대상으로 둡니다.
+    """
+    request_keys = list(request_keys)
+    if not request_keys:
+        return {}
+
+    ad_units = {}
+    for request_key, ad_unit_id in PurchaseGroupAdUnit.objects.filter(
+        purchase_group__member_request_key__in=request_keys,
+        purchase_group__user=user,
+        purchase_group__is_active=True,
+        is_active=True,
+    ).values_list('purchase_group__member_request_key', 'ad_unit_id'):
+        ad_units.setdefault(request_key, []).append(ad_unit_id)
+
+    price_index = get_price_index(user, year)
+
+    member_aliases = set(AdStats.objects.filter(
+        platform='member', user=user, alias__in=request_keys
+    ).values_list('alias', flat=True).distinct())
+
+    return {
+        request_key: cost_spec(
+            ad_units.get(request_key, []),
+            DEFAULT_UNIT_PRICE,
+            DEFAULT_UNIT_TYPE,
+            monthly_prices=price_index.monthly_overrides(request_key),
+            eligible=request_key in member_aliases,
+        )
+        for request_key in request_keys
+    }
+
+
+def _month_signatures(user, start_date, end_date):
+    """
+    월별 원천 데이터 서명 {year_month: hash}
+    AdStats 는 일별 집계(DailyRevenueRollup), 파워링크 클릭은 newspic 스냅샷(NewspicDailyStat) 기준으로 월 단위 요약값을 해시합니다.
+    """
+    adstats = {}
+    for row in DailyRevenueRollup.objects.filter(
+        user=user, date__range=[start_date, end_date]
+    ).annotate(month=TruncMonth('date')).values('month').annotate(
+        row_count=Count('id'),
+        sum_earnings=Sum('earnings'),
+        sum_earnings_usd=Sum('earnings_usd'),
+        sum_clicks=Sum('clicks'),
+        last_updated=Max('updated_at'),
+    ).order_by():
+        adstats[row['month']] = (
+            row['row_count'], row['sum_earnings'], row['sum_earnings_usd'], row['sum_clicks'], row['last_updated']
+        )
+
+    totalstat = {}
+    for row in NewspicDailyStat.objects.filter(
+        date__range=[start_date, end_date], has_total_stat=True
+    ).annotate(month=TruncMonth('date')).values('month').annotate(
+        row_count=Count('id'),
+        sum_powerlink=Sum('powerlink_count'),
+        sum_clicks=Sum('click_count'),
+    ).order_by():
+        totalstat[row['month']] = (row['row_count'], row['sum_powerlink'], row['sum_clicks'])
+
+    return {
+        month: hash_values(adstats.get(month), totalstat.get(month))
+        for month in set(adstats) | set(totalstat)
+    }
+
+
+def _month_price(spec, year_month):
+    unit_price, unit_type = spec['monthly_prices'].get(year_month, (spec['unit_price'], spec['unit_type']))
+    return Decimal(str(unit_price)), unit_type or DEFAULT_UNIT_TYPE
+
+
+def _inputs_hash(spec, year_month, exchange_rate, signature):
+    unit_price, unit_type = _month_price(spec, year_month)
+    return hash_values(
+        year_month, unit_price, unit_type, spec['eligible'],
+        ','.join(spec['ad_unit_ids']), exchange_rate, signature,
+    )
+
+
+def _compute_costs(user, pairs, specs, exchange_rate_map):
+    """
+    (request_key, year_month) 목록의 월 매입비용 계산.
+    일별로 광고수익 + 파워링크 분배액에 단가를 적용하고, 일별 매입비용(원 미만 절사)을 월 단위로 합산합니다.
+    """
+    months = sorted({year_month for _, year_month in pairs})
+    request_keys = sorted({request_key for request_key, _ in pairs})
+    date_q = Q()
+    for year_month in months:
+        date_q |= Q(date__range=[year_month, month_end(year_month)])
+
+    # 1. 광고 단위별 일별 수익 (애드센스는 월 환율로 KRW 환산)
+    ad_unit_ids = sorted({ad_unit_id for key in request_keys for ad_unit_id in specs[key]['ad_unit_ids']})
+    stats_map = {}
+    if ad_unit_ids:
+        ad_stats = AdStats.objects.filter(
+            date_q, user=user, ad_unit_id__in=ad_unit_ids
+        ).values('date', 'platform', 'ad_unit_id').annotate(
+            earnings=Sum('earnings'),
+            earnings_usd=Sum('earnings_usd')
+        )
+        for stat in ad_stats:
+            key = (stat['date'], stat['ad_unit_id'])
+            if stat['platform'] == 'adsense':
+                exchange_rate = exchange_rate_map.get(stat['date'].replace(day=1), DEFAULT_EXCHANGE_RATE)
+                stats_map[key] = (stat['earnings_usd'] or 0) * float(exchange_rate)
+            else:
+                stats_map[key] = stat['earnings'] or 0
+
+    # 2. 퍼블리셔별 파워링크/일반 클릭수
+    member_powerlink_data = {
+        (request_key, day): (powerlink_count, click_count)
+        for request_key, day, powerlink_count, click_count in NewspicDailyStat.objects.filter(
+            date_q, request_key__in=request_keys
+        ).values_list('request_key', 'date', 'powerlink_count', 'click_count')
+    }
+
+    # 3. 파워링크(애드포스트) 수익 분배 (퍼블리셔 × 날짜, 원 단위)
+    date_list = [
+        year_month + timedelta(days=i)
+        for year_month in months
+        for i in range((month_end(year_month) - year_month).days + 1)
+    ]
+    date_index = {d: j for j, d in enumerate(date_list)}
+    key_index = {request_key: i for i, request_key in enumerate(request_keys)}
+    allocator = PowerlinkAllocator.load(user, date_list)
+    powerlink_units = allocator.allocate_units(member_powerlink_matrix(
+        request_keys, date_list,
+        counts={key: values[0] for key, values in member_powerlink_data.items()},
+    ))
+
+    # 4. 퍼블리셔/월별 일 단위 계산 후 합산
+    results = {}
+    for request_key, year_month in pairs:
+        spec = specs[request_key]
+        unit_price, unit_type = _month_price(spec, year_month)
+        ad_revenue_total = Decimal('0')
+        click_total = 0
+        cost = 0
+
+        if spec['eligible']:
+            current_date = year_month
+            last_date = month_end(year_month)
+            while current_date <= last_date:
+                ad_revenue = Decimal('0')
+                for ad_unit_id in spec['ad_unit_ids']:
+                    ad_revenue += Decimal(str(stats_map.get((current_date, ad_unit_id), 0)))
+
+                _, click_count = member_powerlink_data.get((request_key, current_date), (0, 0))
+                ad_revenue += Decimal(int(powerlink_units[key_index[request_key], date_index[current_date]]))
+
+                if unit_type == 'percent':
+                    purchase_cost = ad_revenue * (unit_price / Decimal('100'))
+                else:
+                    # 퍼센트가 아닌 경우 클릭수(tbTotalStat.clickCount)에 단가를 곱함
+                    purchase_cost = Decimal(str(click_count)) * unit_price
+
+                ad_revenue_total += ad_revenue
+                click_total += click_count
+                cost += int(purchase_cost)
+                current_date += timedelta(days=1)
+
+        results[(request_key, year_month)] = {
+            'ad_revenue': ad_revenue_total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+            'click_count': click_total,
+            'unit_price': unit_price,
+            'unit_type': unit_type,
+            'cost': cost,
+        }
+    return results
+
+
+def get_monthly_publisher_costs(user, year, specs, batch_size=1000):
+    """
+    퍼블리셔별 연간 월 매입비용 조회. 반환값: {request_key: {month: cost}}
+    저장된 MonthlyPublisherCost 중 입력(단가, 광고 단위, 환율)이나 원천 데이터(AdStats, newspic 스냅샷)의
+    월 서명이 바뀐 (퍼블리셔, 월)만 다시 계산해 저장하고, 나머지는 저장된 값을 그대로 사용합니다.
+    """
+    if not specs:
+        return {}
+
+    months = year_months(year)
+    start_date, end_date = months[0], month_end(months[-1])
+    signatures = _month_signatures(user, start_date, end_date)
+    exchange_rate_map = dict(ExchangeRate.objects.filter(
+        user=user, year_month__range=[start_date, end_date]
+    ).values_list('year_month', 'usd_to_krw'))
+
+    input_hashes = {
+        (request_key, year_month): _inputs_hash(
+            spec, year_month, exchange_rate_map.get(year_month), signatures.get(year_month)
+        )
+        for request_key, spec in specs.items()
+        for year_month in months
+    }
+
+    existing = {}
+    for pk, request_key, year_month, inputs_hash, cost in MonthlyPublisherCost.objects.filter(
+        user=user, year_month__range=[start_date, end_date], request_key__in=list(specs)
+    ).values_list('pk', 'request_key', 'year_month', 'inputs_hash', 'cost'):
+        existing[(request_key, year_month)] = (pk, inputs_hash, cost)
+
+    costs = {pair: row[2] for pair, row in existing.items()}
+    stale = [pair for pair, inputs_hash in input_hashes.items() if existing.get(pair, (None, None))[1] != inputs_hash]
+
+    if stale:
+        computed = _compute_costs(user, stale, specs, exchange_rate_map)
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        for (request_key, year_month), values in computed.items():
+            obj = MonthlyPublisherCost(
+                user=user, request_key=request_key, year_month=year_month,
+                inputs_hash=input_hashes[(request_key, year_month)], updated_at=now, **values
+            )
+            row = existing.get((request_key, year_month))
+            if row is None:
+                to_create.append(obj)
+            else:
+                obj.pk = row[0]
+                to_update.append(obj)
+            costs[(request_key, year_month)] = values['cost']
+
+        # 동시 요청이 같은 행을 먼저 저장한 경우는 무시 (같은 입력이면 같은 결과)
+        if to_create:
+            MonthlyPublisherCost.objects.bulk_create(to_create, batch_size=batch_size, ignore_conflicts=True)
+        if to_update:
+            MonthlyPublisherCost.objects.bulk_update(
+                to_update,
+                ['ad_revenue', 'click_count', 'unit_price', 'unit_type', 'cost', 'inputs_hash', 'updated_at'],
+                batch_size=batch_size,
+            )
+        logger.info(f"[매입비용] user={user.pk} {year}년 {len(stale)}건 재계산 ({len(specs)}개 퍼블리셔)")
+
+    result = {request_key: {m: 0 for m in range(1, 13)} for request_key in specs}
+    for (request_key, year_month), cost in costs.items():
+        if request_key in result:
+            result[request_key][year_month.month] = cost
+    return result
@@ -0,0 +1,138 @@
+import logging
+from decimal import Decimal
+
+import numpy as np
+from django.db.models import Sum
+
+from stats.models import AdStats, ExchangeRate, NewspicDailyStat, PurchaseGroupAdUnit
+from stats.services.powerlink import POWERLINK_AD_UNIT_ID, PowerlinkAllocator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE_RATE = Decimal('1300')
+
+
+class PublisherDateMatrix:
+    """
+    퍼블리셔 × 날짜 입력 행렬.
+    퍼블리셔 목록과 기간 전체 입력을 고정된 수의 쿼리로 읽어 (퍼블리셔, 날짜) 배열로 보관합니다.
+    """
+
+    def __init__(self, publisher_keys, date_list):
+        self.publisher_keys = list(publisher_keys)
+        self.date_list = list(date_list)
+        self.publisher_index = {key: i for i, key in enumerate(self.publisher_keys)}
+        self.date_index = {d: j for j, d in enumerate(self.date_list)}
+
+        shape = (len(self.publisher_keys), len(self.date_list))
+        n_dates = len(self.date_list)
+        # (퍼블리셔, 날짜)
+        self.pageview = np.zeros(shape, dtype=np.int64)
+        self.valid_pageview = np.zeros(shape, dtype=np.int64)
+        self.powerlink_click = np.zeros(shape, dtype=np.int64)
+        self.adsense_usd = np.zeros(shape, dtype=np.float64)
+        self.adx_revenue = np.zeros(shape, dtype=np.float64)
+        # (날짜)
+        self.adpost_earnings = np.zeros(n_dates, dtype=np.float64)
+        self.adpost_clicks = np.zeros(n_dates, dtype=np.int64)
+        self.total_powerlink = np.zeros(n_dates, dtype=np.int64)
+        self.exchange_rates = [DEFAULT_EXCHANGE_RATE] * n_dates
+
+    @classmethod
+    def load(cls, user, publisher_keys, date_list):
+        """
+        퍼블리셔 수와 무관하게 7회의 쿼리로 입력을 적재합니다.
+        (광고 단위 매핑, 애드포스트, 전체 파워링크, 퍼블리셔 통계, 애드센스, ADX, 환율)
+        newspic 통계는 로컬 스냅샷(NewspicDailyStat)에서 읽습니다.
+        """
+        matrix = cls(publisher_keys, date_list)
+        if not matrix.publisher_keys or not matrix.date_list:
+            return matrix
+        start_date, end_date = matrix.date_list[0], matrix.date_list[-1]
+        pub_index = matrix.publisher_index
+        date_index = matrix.date_index
+
+        # 1. 퍼블리셔별 매핑된 광고 단위 (활성 그룹의 활성 단위)
+        unit_publishers = {'adsense': {}, 'admanager': {}}
+        for request_key, platform, ad_unit_id in PurchaseGroupAdUnit.objects.filter(
+            purchase_group__user=user,
+            purchase_group__is_active=True,
+            purchase_group__member_request_key__in=matrix.publisher_keys,
+            platform__in=list(unit_publishers),
+            is_active=True,
+        ).values_list('purchase_group__member_request_key', 'platform', 'ad_unit_id'):
+            unit_publishers[platform].setdefault(ad_unit_id, []).append(pub_index[request_key])
+
+        # 2. 애드포스트(파워링크) 일별 수익/클릭
+        for stat in AdStats.objects.filter(
+            user=user,
+            platform='adpost',
+            ad_unit_id=POWERLINK_AD_UNIT_ID,
+            date__range=[start_date, end_date],
+        ).values('date').annotate(earnings=Sum('earnings'), clicks=Sum('clicks')):
+            j = date_index.get(stat['date'])
+            if j is not None:
+                matrix.adpost_earnings[j] = stat['earnings'] or 0
+                matrix.adpost_clicks[j] = stat['clicks'] or 0
+
+        # 3. 전체 파워링크 클릭수
+        for stat in NewspicDailyStat.objects.filter(
+            date__range=[start_date, end_date]
+        ).values('date').annotate(total_powerlink=Sum('powerlink_count')):
+            j = date_index.get(stat['date'])
+            if j is not None:
+                matrix.total_powerlink[j] = stat['total_powerlink'] or 0
+
+        # 4. 퍼블리셔 통계 (페이지뷰, 파워링크 클릭, 유효 페이지뷰)
+        for request_key, day, visit_count, powerlink_count, valid_pageview in NewspicDailyStat.objects.filter(
+            request_key__in=matrix.publisher_keys,
+            date__range=[start_date, end_date]
+        ).values_list('request_key', 'date', 'visit_count', 'powerlink_count', 'valid_pageview'):
+            j = date_index.get(day)
+            if j is not None and request_key in pub_index:
+                i = pub_index[request_key]
+                matrix.pageview[i, j] = visit_count
+                matrix.powerlink_click[i, j] = powerlink_count
+                matrix.valid_pageview[i, j] = valid_pageview
+
+        # 5. 애드센스(USD) / 6. ADX(KRW) 광고 단위별 일별 수익 → 매핑된 퍼블리셔에 합산
+        for platform, field, target in (
+            ('adsense', 'earnings_usd', matrix.adsense_usd),
+            ('admanager', 'earnings', matrix.adx_revenue),
+        ):
+            units = unit_publishers[platform]
+            if not units:
+                continue
+            for stat in AdStats.objects.filter(
+                user=user,
+                platform=platform,
+                ad_unit_id__in=list(units),
+                date__range=[start_date, end_date],
+            ).values('ad_unit_id', 'date').annotate(amount=Sum(field)):
+                j = date_index.get(stat['date'])
+                if j is None:
+                    continue
+                for i in units.get(stat['ad_unit_id'], ()):
+                    target[i, j] += stat['amount'] or 0
+
+        # 7. 월별 환율 (애드센스 KRW 환산)
+        exchange_rate_map = dict(ExchangeRate.objects.filter(
+            user=user,
+            year_month__range=[start_date.replace(day=1), end_date]
+        ).values_list('year_month', 'usd_to_krw'))
+        matrix.exchange_rates = [
+            exchange_rate_map.get(d.replace(day=1), DEFAULT_EXCHANGE_RATE) for d in matrix.date_list
+        ]
+        return matrix
+
+    def powerlink_revenue(self):
+        """파워링크 수익 분배 (퍼블리셔 × 날짜, 원 단위 정수) - 단가 0.01 반올림 후 분배액 원 단위 반올림"""
+        allocator = PowerlinkAllocator(
+            self.date_list, self.adpost_earnings.tolist(), self.adpost_clicks.tolist(), self.total_powerlink.tolist()
+        )
+        return allocator.allocate_units(self.powerlink_click)
+
+    def adsense_revenue(self):
+        """애드센스 수익 (KRW, 퍼블리셔 × 날짜) = USD × 해당 월 환율"""
+        rates = np.array([float(rate) for rate in self.exchange_rates], dtype=np.float64)
+        return self.adsense_usd * rates[np.newaxis, :]
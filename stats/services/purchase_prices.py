@@ -0,0 +1,93 @@
+import logging
+from datetime import date
+from decimal import Decimal
+
+from stats.models import PurchaseGroup, PurchasePrice
+from stats.services.data_versions import get_or_compute, year_months
+
+logger = logging.getLogger(__name__)
+
+# 그룹이 없는 멤버의 기본 매입 단가 (월별 단가 미설정 시)
+DEFAULT_UNIT_PRICE = Decimal('50')
+DEFAULT_UNIT_TYPE = 'percent'
+
+
+class PurchasePriceIndex:
+    """
+    사용자/연도 단위 매입 단가 인덱스.
+    활성 PurchaseGroup 의 기본 단가와 해당 연도 PurchasePrice 를 dict 로 보관해 (request_key, 월) 단가를 O(1)로 조회합니다.
+    """
+
+    def __init__(self, year, group_rates, monthly_prices):
+        self.year = year
+        self.group_rates = group_rates          # {request_key: (unit_price, unit_type)}
+        self.monthly_prices = monthly_prices    # {request_key: {year_month: (unit_price, unit_type)}}
+
+    @classmethod
+    def build(cls, user, year):
+        return cls(year, *cls.load(user, year))
+
+    @staticmethod
+    def load(user, year):
+        """활성 그룹 기본 단가와 연도별 월 단가를 2회 쿼리로 조회. 반환값: (group_rates, monthly_prices)"""
+        group_rates = {
+            request_key: _normalize(unit_price, unit_type)
+            for request_key, unit_price, unit_type in PurchaseGroup.objects.filter(
+                user=user, is_active=True
+            ).values_list('member_request_key', 'default_unit_price', 'default_unit_type')
+        }
+        monthly_prices = {}
+        for request_key, year_month, unit_price, unit_type in PurchasePrice.objects.filter(
+            user=user, year_month__range=[date(year, 1, 1), date(year, 12, 31)]
+        ).values_list('request_key', 'year_month', 'unit_price', 'unit_type'):
+            monthly_prices.setdefault(request_key, {})[year_month] = _normalize(unit_price, unit_type)
+        return group_rates, monthly_prices
+
+    def group_rate(self, request_key):
+        """그룹 기본 단가 (그룹이 없으면 None)"""
+        return self.group_rates.get(request_key)
+
+    def monthly_rate(self, request_key, year_month):
+        """월별 매입 단가 (미설정 시 기본 50%)"""
+        return self.monthly_prices.get(request_key, {}).get(year_month, (DEFAULT_UNIT_PRICE, DEFAULT_UNIT_TYPE))
+
+    def monthly_overrides(self, request_key):
+        """멤버의 월별 매입 단가 {year_month: (unit_price, unit_type)}"""
+        return dict(self.monthly_prices.get(request_key, {}))
+
+    def resolve(self, request_key, year_month):
+        """적용 단가: 그룹이 있으면 그룹 기본 단가, 없으면 월별 매입 단가"""
+        return self.group_rate(request_key) or self.monthly_rate(request_key, year_month)
+
+
+class PurchasePriceResolver:
+    """여러 연도에 걸친 단가 조회 (연도별 인덱스를 필요할 때 한 번씩 로드)"""
+
+    def __init__(self, user):
+        self.user = user
+        self._indexes = {}
+
+    def index(self, year):
+        if year not in self._indexes:
+            self._indexes[year] = get_price_index(self.user, year)
+        return self._indexes[year]
+
+    def resolve(self, request_key, day):
+        """day(날짜 또는 월 시작일)가 속한 월의 적용 단가 (unit_price, unit_type)"""
+        return self.index(day.year).resolve(request_key, day.replace(day=1))
+
+
+def _normalize(unit_price, unit_type):
+    return Decimal(str(unit_price or 0)), unit_type or DEFAULT_UNIT_TYPE
+
+
+def get_price_index(user, year):
+    """
+    캐시된 단가 인덱스 (단가/그룹이 수정되면 'purchase' 데이터 버전이 바뀌어 다시 로드).
+    캐시에는 인스턴스 대신 dict 만 저장합니다.
+    """
+    group_rates, monthly_prices = get_or_compute(
+        'purchase_price_index', user, [('purchase', year_months(year))],
+        lambda: PurchasePriceIndex.load(user, year), year,
+    )
+    return PurchasePriceIndex(year, group_rates, monthly_prices)
@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from stats.models import (
+    DailyRevenueRollup, ExchangeRate, NewspicDailyStat, OtherRevenue, PlatformCredential,
+    PurchaseGroup, PurchaseGroupAdUnit, PurchasePrice,
+)
+from stats.services.member_directory import member_version
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'revenue_graph'
+# 노드 계산 로직이 바뀌면 올려서 기존 캐시를 무효화
+GRAPH_VERSION = 3
+# 일자별 결과는 입력 버전이 같으면 계속 재사용 - 만료는 공간 회수 및 서명 충돌 대비용
+NODE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# 사용자 단위 설정성 입력 (매핑/단가/환율/계정) - 변경 시 모든 노드 무효화
+GLOBAL_INPUT_MODELS = (
+    (PlatformCredential, 'user'),
+    (PurchaseGroup, 'user'),
+    (PurchaseGroupAdUnit, 'purchase_group__user'),
+    (PurchasePrice, 'user'),
+    (ExchangeRate, 'user'),
+)
+
+
+def _digest(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _date_runs(dates):
+    """정렬된 날짜 목록을 연속 구간 [(시작일, 종료일), ...] 으로 묶음"""
+    runs = []
+    for d in sorted(dates):
+        if runs and runs[-1][1] + timedelta(days=1) == d:
+            runs[-1][1] = d
+        else:
+            runs.append([d, d])
+    return [(start, end) for start, end in runs]
+
+
+class RevenueGraph:
+    """
+    매출 계산 노드 그래프 (요청 단위).
+    - value 노드: 기간과 무관한 입력 (플랫폼 목록, 광고 단위 매핑 등)
+    - daily 노드: 날짜별로 분해 가능한 계산. 결과를 일자 단위로 메모이즈하므로
+      기간이 겹치는 조회(당월/전월 등)는 겹치는 날짜를 한 번만 계산합니다.
+    노드 결과는 (사용자, 날짜, 입력 버전) 기준으로 캐시에 저장되어 요청 간에도 재사용되며,
+    노드별 소요 시간은 timings 에 기록됩니다.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._values = {}
+        self._days = {}
+        self._day_versions = {}
+        self._global_version = None
+        self.timings = {}
+
+    # ---- 입력 버전 ----
+
+    @property
+    def global_version(self):
+        """설정성 입력 서명 (건수 + 최종 수정일)"""
+        if self._global_version is None:
+            signature = []
+            for model, user_field in GLOBAL_INPUT_MODELS:
+                row = model.objects.filter(**{user_field: self.user}).aggregate(
+                    count=Count('pk'), updated=Max('updated_at')
+                )
+                signature.append((model.__name__, row['count'], str(row['updated'])))
+            # newspic 멤버 등급 (퍼블리셔/파트너스 분류 기준) - 등급 동기화/멤버 디렉터리가 올리는 데이터 버전
+            signature.append(('Member', member_version()))
+            self._global_version = _digest(GRAPH_VERSION, signature)
+        return self._global_version
+
+    def day_versions(self, dates):
+        """
+        날짜별 입력 버전 {date: version}.
+        일별 집계/기타수익/newspic 통계 스냅샷의 날짜별 서명을 기간 단위 3회 쿼리로 조회합니다.
+        """
+        missing = [d for d in dates if d not in self._day_versions]
+        if missing:
+            start_date, end_date = min(missing), max(missing)
+            signatures = {d: [] for d in missing}
+
+            def add(d, values):
+                if d in signatures:
+                    signatures[d].append(values)
+
+            for row in DailyRevenueRollup.objects.filter(
+                user=self.user, date__range=[start_date, end_date]
+            ).values('date').annotate(count=Count('pk'), updated=Max('updated_at'), earnings=Sum('earnings')).order_by():
+                add(row['date'], ('rollup', row['count'], str(row['updated']), row['earnings']))
+
+            for row in OtherRevenue.objects.filter(
+                user=self.user, date__range=[start_date, end_date]
+            ).values('date').annotate(count=Count('pk'), updated=Max('updated_at'), amount=Sum('amount')).order_by():
+                add(row['date'], ('other', row['count'], str(row['updated']), str(row['amount'])))
+
+            # 스냅샷 행은 값이 바뀔 때만 updated_at 이 갱신됨
+            for row in NewspicDailyStat.objects.filter(
+                date__range=[start_date, end_date]
+            ).values('date').annotate(count=Count('pk'), updated=Max('updated_at')).order_by():
+                add(row['date'], ('newspic', row['count'], str(row['updated'])))
+
+            for d in missing:
+                self._day_versions[d] = _digest(self.global_version, sorted(signatures[d]))
+        return {d: self._day_versions[d] for d in dates}
+
+    # ---- 노드 ----
+
+    def _record(self, name, seconds, computed=0, cached=0):
+        timing = self.timings.setdefault(name, {'seconds': 0.0, 'computed': 0, 'cached': 0})
+        timing['seconds'] += seconds
+        timing['computed'] += computed
+        timing['cached'] += cached
+
+    def value(self, name, compute):
+        """기간과 무관한 노드 (설정성 입력 버전 기준 캐시)"""
+        if name in self._values:
+            return self._values[name]
+        started = time.monotonic()
+        cache_key = f"{CACHE_PREFIX}:{self.user.id}:{name}:{self.global_version}"
+        value = cache.get(cache_key)
+        if value is None:
+            value = compute()
+            cache.set(cache_key, value, NODE_CACHE_TIMEOUT)
+            self._record(name, time.monotonic() - started, computed=1)
+        else:
+            self._record(name, time.monotonic() - started, cached=1)
+        self._values[name] = value
+        return value
+
+    def daily(self, name, start_date, end_date, compute):
+        """
+        날짜 단위 노드. compute(start_date, end_date) 는 {date: value} 를 반환해야 합니다.
+        요청 내 메모 → 캐시(월 단위 항목, 일자별 버전 비교) → 계산되지 않은 연속 구간만 compute 순으로 채웁니다.
+        """
+        date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        memo = self._days.setdefault(name, {})
+        missing = [d for d in date_list if d not in memo]
+        if not missing:
+            return {d: memo[d] for d in date_list}
+
+        started = time.monotonic()
+        versions = self.day_versions(missing)
+        month_keys = {
+            d: f"{CACHE_PREFIX}:{self.user.id}:{name}:{d:%Y%m}" for d in missing
+        }
+        entries = cache.get_many(set(month_keys.values()))
+
+        stale = []
+        for d in missing:
+            entry = entries.get(month_keys[d])
+            if entry and d in entry and entry[d][0] == versions[d]:
+                memo[d] = entry[d][1]
+            else:
+                stale.append(d)
+
+        for run_start, run_end in _date_runs(stale):
+            result = compute(run_start, run_end)
+            for offset in range((run_end - run_start).days + 1):
+                d = run_start + timedelta(days=offset)
+                memo[d] = result.get(d)
+                entry = entries.setdefault(month_keys[d], {})
+                entry[d] = (versions[d], memo[d])
+
+        if stale:
+            touched = {month_keys[d] for d in stale}
+            cache.set_many({key: entries[key] for key in touched}, NODE_CACHE_TIMEOUT)
+
+        seconds = time.monotonic() - started
+        self._record(name, seconds, computed=len(stale), cached=len(missing) - len(stale))
+        logger.debug(
+            f"[RevenueGraph] {name} {start_date}~{end_date}: 계산 {len(stale)}일, 캐시 {len(missing) - len(stale)}일, {seconds * 1000:.1f}ms"
+        )
+        return {d: memo[d] for d in date_list}
+
+    # ---- 타이밍 ----
+
+    def log_timings(self, label):
+        summary = ', '.join(
+            f"{name}={timing['seconds'] * 1000:.1f}ms({timing['computed']}/{timing['computed'] + timing['cached']})"
+            for name, timing in self.timings.items()
+        )
+        logger.info(f"[RevenueGraph] {label} user={self.user.id} {summary}")
+
+    def server_timing(self):
+        """Server-Timing 헤더 값 (노드별 소요 시간, ms)"""
+        return ', '.join(
+            f"{name};dur={timing['seconds'] * 1000:.1f}" for name, timing in self.timings.items()
+        )
@@ -0,0 +1,73 @@
+import logging
+from decimal import Decimal
+
+from stats.models import DailyRevenueRollup, PlatformCredential
+from stats.services.money import won_half_even, zeros
+
+logger = logging.getLogger(__name__)
+
+COUPANG_CLASSIFICATIONS = ('partners', 'stamply')
+
+
+class DailyRevenuePivot:
+    """
+    (platform, alias) × 날짜 수익 피벗.
+    기간 전체 일별 집계를 한 번에 읽어 date_list 순서로 보관합니다.
+    - series(): 반올림하지 않은 Decimal 목록 (스탬플리 계정별 수익)
+    - rounded_sum(): 셀 단위로 round() 한 원 단위 int64 배열의 합 (stats.services.money 반올림 지점 3)
+    """
+
+    def __init__(self, date_list, rows):
+        self.date_list = list(date_list)
+        self._index = {d: i for i, d in enumerate(self.date_list)}
+        self._series = {}
+        for row in rows:
+            i = self._index.get(row['date'])
+            if i is None:
+                continue
+            key = (row['platform'], row['alias'])
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [Decimal('0')] * len(self.date_list)
+            series[i] = Decimal(str(row['earnings'] or 0))
+        self._rounded = {key: won_half_even(series) for key, series in self._series.items()}
+
+    @classmethod
+    def load(cls, user, date_list):
+        """기간 전체 (date, platform, alias) 수익을 한 번의 쿼리로 조회"""
+        date_list = list(date_list)
+        if not date_list:
+            return cls(date_list, [])
+        rows = DailyRevenueRollup.objects.filter(
+            user=user, date__range=[min(date_list), max(date_list)]
+        ).values('date', 'platform', 'alias', 'earnings')
+        return cls(date_list, rows)
+
+    def zeros(self):
+        return zeros(len(self.date_list))
+
+    def series(self, platform, alias):
+        """(platform, alias) 일별 수익 Decimal 목록 (반올림 없음, 데이터가 없으면 0 목록)"""
+        series = self._series.get((platform, alias))
+        return list(series) if series is not None else [Decimal('0')] * len(self.date_list)
+
+    def rounded_sum(self, platform, aliases):
+        """여러 alias 의 일별 수익을 셀 단위로 원 단위 반올림(round()) 후 합산한 int64 배열"""
+        totals = self.zeros()
+        for alias in aliases:
+            series = self._rounded.get((platform, alias))
+            if series is not None:
+                totals += series
+        return totals
+
+
+def coupang_aliases_by_classification(user):
+    """쿠팡 계정 분류별 alias 목록 {'partners': [...], 'stamply': [...]} (한 번의 쿼리)"""
+    result = {classification: [] for classification in COUPANG_CLASSIFICATIONS}
+    for classification, alias in PlatformCredential.objects.filter(
+        user=user,
+        platform='coupang',
+        coupang_classification__in=COUPANG_CLASSIFICATIONS,
+    ).values_list('coupang_classification', 'alias'):
+        result[classification].append(alias)
+    return result
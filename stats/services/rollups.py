@@ -0,0 +1,162 @@
+import logging
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from stats.models import AdStats, DailyRevenueRollup
+from stats.services.dashboard_series import record_rollup_changes
+from stats.services.data_versions import bump
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_FIELDS = ('earnings', 'earnings_usd', 'clicks', 'impressions', 'order_count', 'total_amount')
+FLOAT_FIELDS = ('earnings', 'earnings_usd', 'total_amount')
+# float 합계 비교 허용 오차 (검증용)
+VERIFY_TOLERANCE = 0.005
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), '%Y-%m-%d').date()
+
+
+def date_range(start_date, end_date):
+    """시작일~종료일 날짜 목록"""
+    start_date, end_date = _to_date(start_date), _to_date(end_date)
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _aggregate(filters):
+    """AdStats 를 (user, platform, alias, date) 단위로 집계. 반환값: {(user_id, platform, alias, date): {필드: 값}}"""
+    rows = AdStats.objects.filter(**filters).values('user_id', 'platform', 'alias', 'date').annotate(
+        **{f'sum_{field}': Sum(field) for field in ROLLUP_FIELDS}
+    ).order_by()
+    result = {}
+    for row in rows:
+        key = (row['user_id'], row['platform'], row['alias'], row['date'])
+        result[key] = {
+            field: (float(row[f'sum_{field}'] or 0) if field in FLOAT_FIELDS else int(row[f'sum_{field}'] or 0))
+            for field in ROLLUP_FIELDS
+        }
+    return result
+
+
+def _write_rollups(aggregated, rollup_filters, batch_size=1000):
+    """
+    집계 결과를 rollup 테이블에 반영 (rollup_filters 범위 안에서 집계에 없는 행은 삭제).
+    바뀐 행이 있는 (사용자, 월)의 'adstats' 데이터 버전을 올리고, 캐시된 대시보드 시계열의 해당 일자를 교체합니다.
+    반환값: (created, updated, deleted)
+    """
+    existing = {
+        (obj.user_id, obj.platform, obj.alias, obj.date): obj
+        for obj in DailyRevenueRollup.objects.filter(**rollup_filters)
+    }
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for key, values in aggregated.items():
+        obj = existing.pop(key, None)
+        if obj is None:
+            user_id, platform, alias, day = key
+            to_create.append(DailyRevenueRollup(
+                user_id=user_id, platform=platform, alias=alias, date=day, **values
+            ))
+        elif any(getattr(obj, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(obj, field, value)
+            obj.updated_at = now
+            to_update.append(obj)
+
+    with transaction.atomic():
+        if to_create:
+            DailyRevenueRollup.objects.bulk_create(to_create, batch_size=batch_size)
+        if to_update:
+            DailyRevenueRollup.objects.bulk_update(
+                to_update, list(ROLLUP_FIELDS) + ['updated_at'], batch_size=batch_size
+            )
+        if existing:
+            DailyRevenueRollup.objects.filter(pk__in=[obj.pk for obj in existing.values()]).delete()
+
+    changed_months = {}
+    for obj in to_create + to_update + list(existing.values()):
+        changed_months.setdefault(obj.user_id, set()).add(obj.date.replace(day=1))
+    for user_id, months in changed_months.items():
+        bump(user_id, 'adstats', months)
+    record_rollup_changes(to_create + to_update, existing.values(), now)
+    return len(to_create), len(to_update), len(existing)
+
+
+def refresh_daily_rollups(user, platform, alias, dates):
+    """수집/업로드로 변경된 (user, platform, alias) 의 해당 날짜만 다시 집계"""
+    dates = sorted({_to_date(d) for d in dates})
+    if not dates:
+        return 0, 0, 0
+    user_id = getattr(user, 'pk', user)
+    filters = {'user_id': user_id, 'platform': platform, 'alias': alias, 'date__in': dates}
+    return _write_rollups(_aggregate(filters), filters)
+
+
+def refresh_rollups_for_credential(cred, start_date, end_date):
+    """자격증명 단위 수집 후 기간 전체 rollup 갱신 (오류는 호출부로 전달)"""
+    return refresh_daily_rollups(cred.user_id, cred.platform, cred.alias, date_range(start_date, end_date))
+
+
+def fetch_with_rollups(fetch, cred, start_date, end_date, *args):
+    """
+    수집(AdStats 저장) 후 rollup 갱신.
+    수집은 Selenium/HTTP 재시도로 수 분이 걸릴 수 있어 트랜잭션 밖에서 실행하고,
+    rollup 갱신만 짧은 트랜잭션으로 묶습니다. 예외는 호출부로 전달됩니다.
+    """
+    result = fetch(cred, start_date, end_date, *args)
+    with transaction.atomic():
+        refresh_rollups_for_credential(cred, start_date, end_date)
+    return result
+
+
+def rebuild_partition(user_id, platform, alias, start_date=None, end_date=None):
+    """(user, platform, alias) 파티션 전체(또는 기간) 재집계. 반환값: (created, updated, deleted)"""
+    filters = {'user_id': user_id, 'platform': platform, 'alias': alias}
+    if start_date and end_date:
+        filters['date__range'] = [_to_date(start_date), _to_date(end_date)]
+    return _write_rollups(_aggregate(filters), filters)
+
+
+def list_partitions(user_id=None, platform=None):
+    """AdStats/rollup 에 존재하는 (user_id, platform, alias) 목록"""
+    partitions = set()
+    for model in (AdStats, DailyRevenueRollup):
+        qs = model.objects.all()
+        if user_id:
+            qs = qs.filter(user_id=user_id)
+        if platform:
+            qs = qs.filter(platform=platform)
+        partitions.update(qs.values_list('user_id', 'platform', 'alias').distinct().order_by())
+    return sorted(partitions)
+
+
+def verify_partition(user_id, platform, alias, start_date=None, end_date=None):
+    """rollup 과 AdStats 집계 비교. 반환값: 불일치 목록 [(date, field, rollup 값, 원본 값)]"""
+    filters = {'user_id': user_id, 'platform': platform, 'alias': alias}
+    if start_date and end_date:
+        filters['date__range'] = [_to_date(start_date), _to_date(end_date)]
+    expected = _aggregate(filters)
+    actual = {
+        (obj.user_id, obj.platform, obj.alias, obj.date): obj
+        for obj in DailyRevenueRollup.objects.filter(**filters)
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=lambda k: k[3]):
+        values = expected.get(key)
+        obj = actual.get(key)
+        for field in ROLLUP_FIELDS:
+            want = values[field] if values else 0
+            got = getattr(obj, field) if obj else None
+            if got is None or abs(float(got) - float(want)) > VERIFY_TOLERANCE:
+                mismatches.append((key[3], field, got, want))
+    return mismatches
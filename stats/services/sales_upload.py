@@ -0,0 +1,293 @@
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from stats.models import MonthlySales, ServiceGroup
+from stats.services.data_versions import bump, year_months
+from stats.services.spreadsheet_reader import iter_rows, split_header
+from stats.services.upload_ingest import MissingColumnError
+from stats.services.upload_registry import hash_values, load_row_keys, save_row_keys
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_HEADER_LABELS = ['작성일자', '상호', '공급가액']
+REQUIRED_COLUMNS = ['상호', '품목명', '공급가액', '작성일자']
+# 진행 상황 갱신 주기 (행)
+PROGRESS_EVERY = 1000
+
+
+def sales_scope(year):
+    """매출 업로드 이력 구분 키 (sales:연도)"""
+    return f"sales:{year}"
+
+
+def _parse_issue_date(issue_date_raw):
+    """작성일자 변환 (datetime, 'YYYY-MM-DD' 문자열, 엑셀 일련번호). 변환 불가 시 None"""
+    if isinstance(issue_date_raw, datetime):
+        return issue_date_raw.date()
+    if isinstance(issue_date_raw, str) and issue_date_raw:
+        return datetime.strptime(issue_date_raw, '%Y-%m-%d').date()
+    if isinstance(issue_date_raw, (int, float)):
+        return datetime.fromordinal(datetime(1900, 1, 1).toordinal() + int(issue_date_raw) - 2).date()
+    return None
+
+
+def _normalize_business_number(business_number_raw):
+    """사업자번호 형식 정리 (하이픈 제거 후 XXX-XX-XXXXX)"""
+    if not business_number_raw:
+        return ""
+    business_number = str(business_number_raw).strip().replace('-', '').replace(' ', '')
+    if len(business_number) == 10:  # 10자리 숫자인 경우
+        business_number = f"{business_number[:3]}-{business_number[3:5]}-{business_number[5:]}"
+    return business_number
+
+
+def _group_service_name(service_names):
+    """그룹 서비스명 (여러 개인 경우 '첫 번째 외 N개')"""
+    service_names_list = sorted(service_names)
+    if not service_names_list:
+        return "미정"
+    if len(service_names_list) == 1:
+        return service_names_list[0]
+    return f"{service_names_list[0]} 외 {len(service_names_list)-1}개"
+
+
+def ingest_sales_file(user, source, file_ext, year, on_progress=None):
+    """
+    매출 엑셀 파일 처리 (2단계). 호출 측 트랜잭션 안에서 실행합니다.
+    1단계: 행을 스트리밍하며 (승인번호, 년월) / 사업자번호 단위로 집계
+    2단계: MonthlySales 일괄 upsert, ServiceGroup 일괄 생성, 그룹 일괄 지정
+    헤더/필수 컬럼이 없으면 MissingColumnError 를 발생시킵니다.
+    on_progress(processed_rows, saved_count, error_count) 는 PROGRESS_EVERY 행마다 호출됩니다.
+    반환값: {'saved_count', 'changed_count', 'error_count', 'errors', 'message'}
+    """
+    # read_only 스트리밍으로 앞쪽 10행에서 헤더 탐색 후 나머지 행은 순차 처리
+    header_row_index, headers, data_rows = split_header(
+        iter_rows(source, file_ext), REQUIRED_HEADER_LABELS, max_scan=10
+    )
+    if header_row_index == -1:
+        raise MissingColumnError(
+            '헤더', [], "엑셀 파일에서 유효한 헤더를 찾을 수 없습니다. ('작성일자', '상호', '공급가액' 포함 필요)"
+        )
+    logger.info(f"실제 헤더 발견 (행 {header_row_index + 1}): {headers}")
+
+    column_map = {header: i for i, header in enumerate(headers)}
+    missing_cols = [col for col in REQUIRED_COLUMNS if col not in column_map]
+    if missing_cols:
+        raise MissingColumnError(
+            missing_cols[0], headers, f"엑셀 파일에 필요한 컬럼이 없습니다: {', '.join(missing_cols)}"
+        )
+
+    # 사업자번호 컬럼 확인 (선택적)
+    business_number_column = column_map.get('공급받는자사업자등록번호')
+
+    # ===== 1단계: 행 집계 =====
+    # (승인번호, 년월) → 반영할 금액 차액과 신규 생성용 정보
+    sales_by_key = {}
+    # 사업자번호 → 그룹화 정보
+    business_number_groups = {}
+    # 행 단위 업로드 이력: 이미 반영된 행은 건너뛰고 변경된 행은 차액만 반영
+    scope = sales_scope(year)
+    registered_rows = load_row_keys(user, scope)
+    row_occurrences = {}
+    new_row_keys = {}
+    processed_rows = 0
+    row_count = 0
+    skipped_count = 0
+    error_count = 0
+    error_messages = []
+
+    for i, row_data in enumerate(data_rows, start=header_row_index + 2):
+        processed_rows += 1
+        if on_progress and processed_rows % PROGRESS_EVERY == 0:
+            on_progress(processed_rows, row_count, error_count)
+        try:
+            if not any(row_data) or not str(row_data[column_map['상호']]).strip():
+                continue
+            company_name = str(row_data[column_map['상호']]).strip()
+            service_name = str(row_data[column_map['품목명']]).strip()
+            approval_number = str(row_data[column_map['승인번호']]).strip() if '승인번호' in column_map else f"{company_name}_{service_name}"
+
+            business_number = ""
+            if business_number_column is not None and len(row_data) > business_number_column:
+                business_number = _normalize_business_number(row_data[business_number_column])
+
+            supply_value_raw = row_data[column_map['공급가액']]
+            supply_value = float(str(supply_value_raw).replace(',', '')) if supply_value_raw else 0.0
+
+            # 사업자번호별 그룹화 정보 수집
+            if business_number:
+                group_info = business_number_groups.setdefault(business_number, {
+                    'company_name': company_name,
+                    'service_names': set(),
+                    'service_codes': set(),
+                })
+                group_info['service_names'].add(service_name)
+                group_info['service_codes'].add(approval_number)
+
+            issue_date = _parse_issue_date(row_data[column_map['작성일자']])
+            if issue_date is None:
+                logger.warning(f"[{i}번째 행] 날짜 형식 오류, 건너뜁니다: {row_data[column_map['작성일자']]}")
+                continue
+            if issue_date.year != year:
+                continue
+
+            # 행 키: 같은 내용의 행이 파일 내 여러 번 나오면 순번으로 구분
+            identity = (approval_number, issue_date.isoformat(), company_name, service_name)
+            occurrence = row_occurrences.get(identity, 0)
+            row_occurrences[identity] = occurrence + 1
+            row_key = hash_values(*identity, occurrence)
+            row_hash = hash_values(supply_value, business_number)
+            row_amount = Decimal(str(supply_value))
+            row_count += 1
+
+            previous = registered_rows.get(row_key)
+            if previous is not None and previous[0] == row_hash:
+                skipped_count += 1
+                continue
+            amount_delta = row_amount - (previous[1] if previous is not None else Decimal('0'))
+
+            entry = sales_by_key.setdefault((approval_number, issue_date.replace(day=1)), {
+                'company_name': company_name,
+                'service_name': service_name,
+                'transaction_date': issue_date,
+                'business_number': business_number,
+                'amount': Decimal('0'),
+            })
+            entry['amount'] += amount_delta
+            if business_number and not entry['business_number']:
+                entry['business_number'] = business_number
+            new_row_keys[row_key] = (row_hash, row_amount)
+        except Exception as e:
+            error_count += 1
+            error_messages.append(f"{i}번째 행: {e}")
+            logger.warning(f"[오류] {i}번째 행 처리 실패: {row_data}, 원인: {e}")
+            continue
+
+    # ===== 2단계: 일괄 반영 =====
+    created_count, updated_count = _bulk_upsert_monthly_sales(user, sales_by_key)
+    grouped_count = _bulk_assign_business_groups(user, year, business_number_groups)
+    save_row_keys(user, scope, new_row_keys)
+    if on_progress:
+        on_progress(processed_rows, row_count, error_count)
+
+    logger.info(
+        f"--- 엑셀 파일 처리 종료 --- 신규 {created_count}, 업데이트 {updated_count}, "
+        f"변경 없음 {skipped_count}, 그룹화 {grouped_count}, 오류 {error_count}"
+    )
+    return {
+        'saved_count': row_count,
+        'changed_count': len(new_row_keys),
+        'error_count': error_count,
+        'errors': error_messages,
+        'message': (
+            f"엑셀 파일 처리가 완료되었습니다. (신규: {created_count}건, 업데이트: {updated_count}건, "
+            f"변경 없음: {skipped_count}건, 그룹화: {grouped_count}건)"
+        ),
+    }
+
+
+def _bulk_upsert_monthly_sales(user, sales_by_key, batch_size=1000):
+    """(승인번호, 년월) 집계 결과를 MonthlySales 에 일괄 반영 (기존 행은 금액 차액 가산). 반환값: (신규, 업데이트)"""
+    if not sales_by_key:
+        return 0, 0
+    
+    service_codes = {service_code for service_code, _ in sales_by_key}
+    year_months = {year_month for _, year_month in sales_by_key}
+    existing = {
+        (obj.service_code, obj.year_month): obj
+        for obj in MonthlySales.objects.filter(
+            user=user, service_code__in=service_codes, year_month__in=year_months
+        )
+    }
+    
+    to_create = []
+    to_update = []
+    for (service_code, year_month), entry in sales_by_key.items():
+        obj = existing.get((service_code, year_month))
+        if obj is None:
+            # bulk_create 는 save() 를 호출하지 않으므로 year_month 를 직접 지정
+            to_create.append(MonthlySales(
+                user=user,
+                service_code=service_code,
+                year_month=year_month,
+                transaction_date=entry['transaction_date'],
+                company_name=entry['company_name'],
+                service_name=entry['service_name'],
+                business_number=entry['business_number'],
+                amount=entry['amount'],
+            ))
+        else:
+            obj.amount += entry['amount']
+            # 사업자번호가 있고 기존에 없었다면 업데이트
+            if entry['business_number'] and not obj.business_number:
+                obj.business_number = entry['business_number']
+            to_update.append(obj)
+    
+    if to_create:
+        MonthlySales.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        MonthlySales.objects.bulk_update(to_update, ['amount', 'business_number'], batch_size=batch_size)
+    # bulk 작업은 시그널이 없으므로 매출 데이터 버전을 직접 올림
+    changed_months = {obj.year_month for obj in to_create + to_update}
+    if changed_months:
+        bump(user, 'sales', changed_months)
+    return len(to_create), len(to_update)
+
+
+def _bulk_assign_business_groups(user, year, business_number_groups, batch_size=1000):
+    """사업자번호별 ServiceGroup 일괄 생성 후 해당 연도 매출에 그룹을 한 번에 지정. 반환값: 그룹화된 행 수"""
+    if not business_number_groups:
+        return 0
+    
+    # group_code 는 전체 사용자 기준 unique 이므로 다른 사용자의 그룹과 겹치면 건너뜀
+    groups = {}
+    taken_codes = set()
+    for group in ServiceGroup.objects.filter(group_code__in=list(business_number_groups)):
+        if group.user_id == user.id:
+            groups[group.group_code] = group
+        else:
+            taken_codes.add(group.group_code)
+            logger.warning(f"사업자번호 {group.group_code} 그룹이 다른 사용자에게 존재하여 그룹화를 건너뜁니다.")
+    
+    new_groups = [
+        ServiceGroup(
+            user=user,
+            group_code=business_number,
+            group_name=f"{group_info['company_name']} ({business_number})",
+            company_name=group_info['company_name'],
+            service_name=_group_service_name(group_info['service_names']),
+        )
+        for business_number, group_info in business_number_groups.items()
+        if business_number not in groups and business_number not in taken_codes
+    ]
+    if new_groups:
+        ServiceGroup.objects.bulk_create(new_groups, batch_size=batch_size)
+        # MySQL 은 bulk_create 후 pk 를 채우지 않으므로 다시 조회
+        for group in ServiceGroup.objects.filter(user=user, group_code__in=[g.group_code for g in new_groups]):
+            groups[group.group_code] = group
+    
+    # 승인번호 → 그룹 (같은 승인번호가 여러 사업자번호에 있으면 마지막 사업자번호 우선)
+    group_by_service_code = {}
+    for business_number, group_info in business_number_groups.items():
+        group = groups.get(business_number)
+        if group is None:
+            continue
+        for service_code in group_info['service_codes']:
+            group_by_service_code[service_code] = group
+    if not group_by_service_code:
+        return 0
+    
+    to_update = []
+    for obj in MonthlySales.objects.filter(
+        user=user,
+        service_code__in=list(group_by_service_code),
+        year_month__year=year
+    ).only('id', 'service_code', 'group'):
+        obj.group = group_by_service_code[obj.service_code]
+        to_update.append(obj)
+    if to_update:
+        MonthlySales.objects.bulk_update(to_update, ['group'], batch_size=batch_size)
+    if new_groups or to_update:
+        bump(user, 'sales', year_months(year))
+    return len(to_update)
@@ -0,0 +1,162 @@
+import csv
+import io
+import logging
+from itertools import chain, islice
+
+import openpyxl
+import pandas as pd
+import xlrd
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('xlsx', 'xls', 'csv')
+DEFAULT_BATCH_SIZE = 5000
+
+
+def get_file_ext(name):
+    """파일명에서 확장자(소문자) 추출"""
+    return str(name).rsplit('.', 1)[-1].lower() if '.' in str(name) else ''
+
+
+def _is_path(source):
+    return isinstance(source, (str, bytes)) or hasattr(source, '__fspath__')
+
+
+def _iter_xlsx_rows(source):
+    """openpyxl read_only 모드로 행을 스트리밍 (셀 값은 datetime/int/float/str 로 유지)"""
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for row in wb.active.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def _iter_xls_rows(source):
+    """xlrd on_demand 모드로 첫 번째 시트 행을 순회"""
+    if _is_path(source):
+        wb = xlrd.open_workbook(source, on_demand=True)
+    else:
+        wb = xlrd.open_workbook(file_contents=source.read(), on_demand=True)
+    try:
+        sheet = wb.sheet_by_index(0)
+        for i in range(sheet.nrows):
+            yield tuple(sheet.row_values(i))
+    finally:
+        wb.release_resources()
+
+
+def _iter_csv_rows(source, encoding):
+    """CSV 행을 스트리밍 (값은 문자열)"""
+    if _is_path(source):
+        with open(source, newline='', encoding=encoding) as f:
+            yield from (tuple(row) for row in csv.reader(f))
+    else:
+        stream = io.TextIOWrapper(source, encoding=encoding, newline='')
+        try:
+            yield from (tuple(row) for row in csv.reader(stream))
+        finally:
+            stream.detach()
+
+
+def iter_rows(source, file_ext, encoding='utf-8'):
+    """
+    스프레드시트 원본 행(tuple)을 스트리밍합니다.
+    source: 파일 경로 또는 업로드 파일 객체, file_ext: xlsx/xls/csv
+    """
+    if file_ext == 'xlsx':
+        return _iter_xlsx_rows(source)
+    if file_ext == 'xls':
+        return _iter_xls_rows(source)
+    if file_ext == 'csv':
+        return _iter_csv_rows(source, encoding)
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {file_ext}")
+
+
+def _is_blank(row):
+    return not any(cell is not None and str(cell).strip() != '' for cell in row)
+
+
+def split_header(rows, required_labels, max_scan=10):
+    """
+    앞쪽 max_scan 행에서 required_labels 를 모두 포함하는 헤더 행을 찾습니다.
+    반환값: (헤더 행 번호(0부터), 헤더 리스트, 나머지 데이터 행 iterator) / 못 찾으면 (-1, [], None)
+    """
+    rows = iter(rows)
+    scanned = list(islice(rows, max_scan))
+    for i, row in enumerate(scanned):
+        row_values = [str(cell) if cell is not None else '' for cell in row]
+        if all(label in row_values for label in required_labels):
+            headers = [str(cell).strip() if cell is not None else '' for cell in row]
+            return i, headers, chain(scanned[i + 1:], rows)
+    return -1, [], None
+
+
+def _normalize_header(row):
+    return [
+        str(cell).strip() if cell is not None and str(cell).strip() != '' else f"Unnamed: {i}"
+        for i, cell in enumerate(row)
+    ]
+
+
+def _frame(records, columns, positions):
+    frame = pd.DataFrame.from_records(records, columns=columns)
+    frame.index = pd.Index(positions)
+    return frame
+
+
+def iter_batches(source, file_ext, batch_size=DEFAULT_BATCH_SIZE, encoding='utf-8'):
+    """
+    첫 행을 헤더로 사용해 DataFrame 배치를 스트리밍합니다.
+    배치 인덱스는 데이터 행 기준 절대 위치(0부터)이므로 index + 2 가 엑셀 행 번호입니다.
+    빈 행은 건너뛰되 행 번호는 유지하며, 데이터가 없으면 컬럼만 있는 빈 배치 하나를 반환합니다.
+    """
+    if file_ext == 'csv':
+        yield from pd.read_csv(source, encoding=encoding, chunksize=batch_size)
+        return
+
+    rows = iter_rows(source, file_ext, encoding=encoding)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = _normalize_header(header)
+    width = len(columns)
+
+    records, positions, yielded = [], [], False
+    for offset, row in enumerate(rows):
+        if _is_blank(row):
+            continue
+        # read_only 모드에서는 행 길이가 헤더와 다를 수 있음
+        records.append(tuple(row[:width]) + (None,) * (width - len(row)))
+        positions.append(offset)
+        if len(records) >= batch_size:
+            yield _frame(records, columns, positions)
+            records, positions, yielded = [], [], True
+    if records or not yielded:
+        yield _frame(records, columns, positions)
+
+
+def estimate_row_count(path, file_ext):
+    """진행률 표시용 데이터 행 수 추정 (헤더 1행 제외, 알 수 없으면 None)"""
+    try:
+        if file_ext == 'xlsx':
+            wb = openpyxl.load_workbook(path, read_only=True)
+            try:
+                total = wb.active.max_row
+            finally:
+                wb.close()
+        elif file_ext == 'xls':
+            wb = xlrd.open_workbook(path, on_demand=True)
+            try:
+                total = wb.sheet_by_index(0).nrows
+            finally:
+                wb.release_resources()
+        elif file_ext == 'csv':
+            with open(path, 'rb') as f:
+                total = sum(1 for _ in f)
+        else:
+            return None
+    except Exception as e:
+        logger.warning(f"행 수 추정 실패: {str(e)}")
+        return None
+    return max(total - 1, 0) if total else None
@@ -153,7 +153,7 @@ def fetch_teads_stats_by_credential(cred, start_date, end_date):
             
             logger.info(f"[teads] '{cred.alias}' 계정 데이터 수집 완료")
             cred.last_fetched_at = timezone.now()
-            cred.save()
+            cred.save(update_fields=["last_fetched_at"])
             return True
             
         finally:            
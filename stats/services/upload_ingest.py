@@ -0,0 +1,340 @@
+import logging
+
+import pandas as pd
+
+from stats.models import AdStats
+from stats.services.adstats_bulk import bulk_upsert_adstats
+from stats.services.spreadsheet_reader import get_file_ext, iter_batches
+from stats.services.upload_registry import hash_values, load_row_keys, save_row_keys
+
+logger = logging.getLogger(__name__)
+
+
+class MissingColumnError(Exception):
+    """업로드 파일에 필수 컬럼이 없음"""
+
+    def __init__(self, field, columns, message):
+        self.field = field
+        self.columns = list(columns)
+        super().__init__(message)
+
+
+# ===== 공통 유틸리티 =====
+def resolve_columns(columns, column_mapping):
+    """업로드 파일 컬럼명 해석 (부분 일치). 반환값: (필드→실제 컬럼, 누락 필드)"""
+    actual_columns = {}
+    for field, possible_names in column_mapping.items():
+        for col in columns:
+            if any(name in str(col) for name in possible_names):
+                actual_columns[field] = col
+                break
+        else:
+            return actual_columns, field
+    return actual_columns, None
+
+
+def collect_row_errors(index, checks):
+    """(마스크, 라벨, 원본값) 검사 목록으로 오류 행 마스크와 메시지 생성 (행별 첫 오류만)"""
+    bad_mask = pd.Series(False, index=index)
+    row_errors = []
+    for mask, label, raw in checks:
+        for row_index in index[mask & ~bad_mask]:
+            row_errors.append((row_index, f"행 {row_index + 2}: {label} ({raw[row_index]})"))
+        bad_mask |= mask
+    return bad_mask, [msg for _, msg in sorted(row_errors)]
+
+
+def detect_date_format(values, formats, sample_size=20):
+    """샘플 값으로 날짜 형식을 한 번만 판별 (가장 많이 파싱되는 형식)"""
+    sample = values[values.str.len() > 0].head(sample_size)
+    best_format, best_count = formats[0], -1
+    for fmt in formats:
+        parsed = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if parsed > best_count:
+            best_format, best_count = fmt, parsed
+    return best_format
+
+
+def _numeric(series, strip=','):
+    """문자열 정리 후 숫자 변환 (실패 시 NaN). 반환값: (원본 문자열, 숫자)"""
+    raw = series.astype(str).str.replace(strip, '', regex=False).str.strip()
+    return raw, pd.to_numeric(raw, errors='coerce')
+
+
+# ===== Adpost =====
+ADPOST_COLUMN_MAPPING = {
+    'date': ['날짜', 'date', 'Date', 'DATE'],
+    'content_id': ['미디어명', 'content_id', 'Content ID', 'CONTENT_ID'],
+    'content_name': ['미디어명', 'content_name', 'Content Name', 'CONTENT_NAME'],
+    'ad_unit_id': ['채널명', 'ad_unit_id', 'Ad Unit ID', 'AD_UNIT_ID'],
+    'ad_unit_name': ['채널명', 'ad_unit_name', 'Ad Unit Name', 'AD_UNIT_NAME'],
+    'impressions': ['광고요청수', '노출수', 'impressions', 'Impressions', 'IMPRESSIONS'],
+    'view_count': ['조회수', 'view_count', 'View Count', 'VIEW_COUNT'],
+    'clicks': ['클릭수', 'clicks', 'Clicks', 'CLICKS'],
+    'ctr': ['클릭률', 'ctr', 'CTR', 'Click Rate', 'CLICK_RATE'],
+    'earnings': ['매출', '수입예정액', 'earnings', 'Earnings', 'EARNINGS', '수입', '수익']
+}
+
+ADPOST_MISSING_LABELS = {
+    'date': '날짜',
+    'content_id': '미디어명',
+    'content_name': '미디어명',
+    'ad_unit_id': '채널명',
+    'ad_unit_name': '채널명',
+    'impressions': '광고요청수',
+    'view_count': '조회수',
+    'clicks': '클릭수',
+    'ctr': '클릭률',
+    'earnings': '매출'
+}
+
+ADPOST_UPDATE_FIELDS = [
+    'credential', 'content_name', 'ad_unit_name', 'view_count',
+    'impressions', 'clicks', 'ctr', 'earnings',
+]
+
+
+def parse_adpost_batch(df, actual_columns, cred, state):
+    """Adpost 배치 변환 (YYYYMMDD 날짜, % / 천단위 구분자 제거). 반환값: (객체 목록, 오류 마스크, 오류 메시지)"""
+    date_raw = df[actual_columns['date']].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+    dates = pd.to_datetime(date_raw.where(date_raw.str.len() == 8), format='%Y%m%d', errors='coerce')
+    ctr_raw, ctr = _numeric(df[actual_columns['ctr']], strip='%')
+    earnings_raw, earnings = _numeric(df[actual_columns['earnings']])
+    int_columns = {
+        field: _numeric(df[actual_columns[field]])
+        for field in ('impressions', 'view_count', 'clicks')
+    }
+
+    # 오류 행 마스크 (행별 첫 번째 오류만 기록)
+    checks = [
+        (date_raw.str.len() != 8, "잘못된 날짜 형식", date_raw),
+        (dates.isna(), "날짜 변환 실패", date_raw),
+        (ctr.isna(), "CTR 변환 실패", ctr_raw),
+        (earnings.isna(), "수입 변환 실패", earnings_raw),
+    ] + [
+        (values.isna(), f"{field} 변환 실패", raw)
+        for field, (raw, values) in int_columns.items()
+    ]
+    bad_mask, error_messages = collect_row_errors(df.index, checks)
+
+    valid = ~bad_mask
+    records = pd.DataFrame({
+        'date': dates[valid].dt.date,
+        'content_id': df.loc[valid, actual_columns['content_id']].astype(str),
+        'content_name': df.loc[valid, actual_columns['content_name']].astype(str),
+        'ad_unit_id': df.loc[valid, actual_columns['ad_unit_id']].astype(str),
+        'ad_unit_name': df.loc[valid, actual_columns['ad_unit_name']].astype(str),
+        'view_count': int_columns['view_count'][1][valid].astype('int64'),
+        'impressions': int_columns['impressions'][1][valid].astype('int64'),
+        'clicks': int_columns['clicks'][1][valid].astype('int64'),
+        'ctr': ctr[valid].astype(float),
+        'earnings': earnings[valid].astype(float),
+    })
+    objs = [AdStats(credential=cred, **record) for record in records.to_dict('records')]
+    return objs, bad_mask, error_messages
+
+
+# ===== Taboola =====
+TABOOLA_COLUMN_MAPPING = {
+    'date': ['Date', 'date', '날짜', 'DATE'],
+    'page_views': ['Page Views', 'page_views', '페이지뷰', 'PAGE_VIEWS'],
+    'ad_clicks': ['Ad Clicks', 'ad_clicks', '광고클릭', 'AD_CLICKS'],
+    'ad_revenue': ['Ad Revenue (KRW)', 'Ad Revenue', 'ad_revenue', '광고수익', 'AD_REVENUE']
+}
+
+TABOOLA_MISSING_LABELS = {
+    'date': 'Date',
+    'page_views': 'Page Views',
+    'ad_clicks': 'Ad Clicks',
+    'ad_revenue': 'Ad Revenue (KRW)'
+}
+
+TABOOLA_UPDATE_FIELDS = ['credential', 'impressions', 'clicks', 'ctr', 'earnings']
+
+
+def parse_taboola_batch(df, actual_columns, cred, state):
+    """Taboola 배치 변환 (날짜 형식은 첫 배치 샘플로 한 번만 판별). 반환값: (객체 목록, 오류 마스크, 오류 메시지)"""
+    date_raw = df[actual_columns['date']].astype(str).str.strip()
+    if 'date_format' not in state:
+        # MM/DD/YYYY 우선, YYYY-MM-DD 대체
+        state['date_format'] = detect_date_format(date_raw, ['%m/%d/%Y', '%Y-%m-%d'])
+    dates = pd.to_datetime(date_raw, format=state['date_format'], errors='coerce')
+
+    page_views_raw, page_views = _numeric(df[actual_columns['page_views']])
+    ad_clicks_raw, ad_clicks = _numeric(df[actual_columns['ad_clicks']])
+    ad_revenue_raw, ad_revenue = _numeric(df[actual_columns['ad_revenue']])
+
+    checks = [
+        (dates.isna(), "날짜 변환 실패", date_raw),
+        (page_views.isna(), "Page Views 변환 실패", page_views_raw),
+        (ad_clicks.isna(), "Ad Clicks 변환 실패", ad_clicks_raw),
+        (ad_revenue.isna(), "Ad Revenue 변환 실패", ad_revenue_raw),
+    ]
+    bad_mask, error_messages = collect_row_errors(df.index, checks)
+
+    # CTR 계산 (Ad Clicks / Page Views * 100) - 컬럼 단위
+    valid = ~bad_mask
+    page_views = page_views[valid].astype('int64')
+    ad_clicks = ad_clicks[valid].astype('int64')
+    ctr = (ad_clicks / page_views.where(page_views > 0) * 100).fillna(0.0)
+
+    records = pd.DataFrame({
+        'date': dates[valid].dt.date,
+        'impressions': page_views,
+        'clicks': ad_clicks,
+        'ctr': ctr.astype(float),
+        'earnings': ad_revenue[valid].astype(float),
+    })
+    objs = [
+        AdStats(credential=cred, content_id=None, ad_unit_id=None, **record)
+        for record in records.to_dict('records')
+    ]
+    return objs, bad_mask, error_messages
+
+
+# ===== 코지마망 / 미디어믹서 (SUB_ID 리포트) =====
+SUBID_REPORT_METRICS = {
+    'earnings': ('최종수익금', float),
+    'clicks': ('클릭수', 'int64'),
+    'impressions': ('노출수', 'int64'),
+    'order_count': ('최종구매수량', 'int64'),
+    'total_amount': ('최종구매금액', float),
+}
+
+SUBID_REPORT_UPDATE_FIELDS = ['credential', 'ad_unit_name'] + list(SUBID_REPORT_METRICS)
+
+
+def parse_subid_report_batch(df, cred):
+    """SUB_ID 리포트 배치 변환 (ad_unit_id = SUB_ID + SUBPARAM, 빈 수치는 0). 반환값: (객체 목록, 오류 마스크, 오류 메시지)"""
+    date_raw = df['날짜'].astype(str)
+    dates = pd.to_datetime(df['날짜'], errors='coerce')
+
+    ad_unit_id = df['SUB_ID'].astype(str)
+    if 'SUBPARAM' in df.columns:
+        ad_unit_id = ad_unit_id + df['SUBPARAM'].where(df['SUBPARAM'].notna(), '').astype(str)
+
+    checks = [(dates.isna(), "날짜 변환 실패", date_raw)]
+    metrics = {}
+    for field, (column, dtype) in SUBID_REPORT_METRICS.items():
+        values = pd.to_numeric(df[column], errors='coerce')
+        checks.append((values.isna() & df[column].notna(), f"{column} 변환 실패", df[column].astype(str)))
+        metrics[field] = (values.fillna(0), dtype)
+    bad_mask, error_messages = collect_row_errors(df.index, checks)
+
+    valid = ~bad_mask
+    ad_unit_name = df.loc[valid, '지면명']
+    records = pd.DataFrame({
+        'date': dates[valid].dt.date,
+        'ad_unit_id': ad_unit_id[valid],
+        'ad_unit_name': ad_unit_name.where(ad_unit_name.notna(), None),
+        **{field: values[valid].astype(dtype) for field, (values, dtype) in metrics.items()},
+    })
+    objs = [
+        AdStats(credential=cred, content_id=None, **record)
+        for record in records.to_dict('records')
+    ]
+    return objs, bad_mask, error_messages
+
+
+def ingest_subid_report(cred, file_path):
+    """코지마망/미디어믹서 다운로드 리포트를 배치 단위로 읽어 AdStats 에 일괄 upsert"""
+    saved_count = 0
+    error_messages = []
+    for df in iter_batches(file_path, get_file_ext(file_path)):
+        if df.empty:
+            continue
+        objs, bad_mask, batch_errors = parse_subid_report_batch(df, cred)
+        bulk_upsert_adstats(cred.user, cred.platform, cred.alias, objs, update_fields=SUBID_REPORT_UPDATE_FIELDS)
+        saved_count += len(objs)
+        error_messages.extend(batch_errors)
+    return {
+        'saved_count': saved_count,
+        'error_count': len(error_messages),
+        'errors': error_messages,
+    }
+
+
+# ===== 업로드 처리 =====
+UPLOAD_SPECS = {
+    'adpost': (ADPOST_COLUMN_MAPPING, ADPOST_MISSING_LABELS, parse_adpost_batch, ADPOST_UPDATE_FIELDS),
+    'taboola': (TABOOLA_COLUMN_MAPPING, TABOOLA_MISSING_LABELS, parse_taboola_batch, TABOOLA_UPDATE_FIELDS),
+}
+
+
+def upload_scope(cred):
+    """업로드 이력 구분 키 (플랫폼:계정)"""
+    return f"{cred.platform}:{cred.alias}"
+
+
+def filter_changed_rows(user, scope, objs, update_fields, force=False):
+    """
+    업로드 행 키 기준으로 신규/변경된 행만 남깁니다 (force 면 이력과 무관하게 모든 행).
+    행 키는 (date, content_id, ad_unit_id), 행 해시는 update_fields 값입니다.
+    반환값: (변경 행 객체 목록, 저장할 행 키 {row_key: (row_hash, None)})
+    """
+    attnames = [AdStats._meta.get_field(field).attname for field in update_fields]
+    rows = {}
+    for obj in objs:
+        row_key = hash_values(obj.date, obj.content_id, obj.ad_unit_id)
+        rows[row_key] = (hash_values(*(getattr(obj, name) for name in attnames)), obj)
+
+    registered = {} if force else load_row_keys(user, scope, rows.keys())
+    changed = {}
+    for row_key, (row_hash, obj) in rows.items():
+        previous = registered.get(row_key)
+        if previous is None or previous[0] != row_hash:
+            changed[row_key] = (row_hash, obj)
+    return [obj for _, obj in changed.values()], {key: (row_hash, None) for key, (row_hash, _) in changed.items()}
+
+
+def ingest_upload_file(cred, source, file_ext, on_progress=None, force=False):
+    """
+    업로드 파일을 배치 단위로 읽어 AdStats 에 일괄 upsert 합니다.
+    컬럼 해석은 첫 배치에서 한 번만 수행하며, 필수 컬럼이 없으면 MissingColumnError 를 발생시킵니다.
+    이전 업로드와 내용이 같은 행은 건너뛰고 신규/변경 행만 저장합니다 (force 면 모든 행을 다시 저장).
+    on_progress(processed_rows, saved_count, error_count) 는 배치마다 호출됩니다.
+    반환값: {'saved_count', 'changed_count', 'error_count', 'errors'}
+    """
+    column_mapping, missing_labels, parse_batch, update_fields = UPLOAD_SPECS[cred.platform]
+    scope = upload_scope(cred)
+    actual_columns = None
+    state = {}
+    processed_rows = 0
+    saved_count = 0
+    changed_count = 0
+    error_count = 0
+    error_messages = []
+
+    for df in iter_batches(source, file_ext):
+        if actual_columns is None:
+            actual_columns, missing_field = resolve_columns(df.columns, column_mapping)
+            if missing_field:
+                raise MissingColumnError(
+                    missing_field, df.columns, f"필수 컬럼이 없습니다: {missing_labels[missing_field]}"
+                )
+            logger.debug(f"[{cred.platform}] 매핑된 컬럼: {actual_columns}")
+        if df.empty:
+            continue
+
+        objs, bad_mask, batch_errors = parse_batch(df, actual_columns, cred, state)
+        changed_objs, row_keys = filter_changed_rows(cred.user, scope, objs, update_fields, force=force)
+        bulk_upsert_adstats(cred.user, cred.platform, cred.alias, changed_objs, update_fields=update_fields)
+        save_row_keys(cred.user, scope, row_keys)
+
+        processed_rows += len(df)
+        saved_count += len(objs)
+        changed_count += len(changed_objs)
+        error_count += int(bad_mask.sum())
+        error_messages.extend(batch_errors)
+        if on_progress:
+            on_progress(processed_rows, saved_count, error_count)
+
+    logger.debug(
+        f"[{cred.platform}] {cred.alias}: 저장 {saved_count}건 (변경 {changed_count}건), 실패 {error_count}건"
+    )
+    return {
+        'saved_count': saved_count,
+        'changed_count': changed_count,
+        'error_count': error_count,
+        'errors': error_messages,
+    }
@@ -0,0 +1,276 @@
+import logging
+import os
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from stats.models import UploadJob
+from stats.services.sales_upload import ingest_sales_file, sales_scope
+from stats.services.spreadsheet_reader import estimate_row_count, get_file_ext
+from stats.services.upload_ingest import MissingColumnError, ingest_upload_file, upload_scope
+from stats.services.upload_registry import file_content_hash, is_file_registered, prune_row_keys, register_file
+
+logger = logging.getLogger(__name__)
+
+# 업로드 작업은 요청에서 DB 에 대기 상태로만 기록하고, 스케줄러 작업이 DB 를 폴링해 처리
+# (동시에 처리하는 작업 수 = 스케줄러 작업 max_instances)
+UPLOAD_JOB_WORKERS = 2
+UPLOAD_JOB_POLL_SECONDS = 5
+UPLOAD_PROGRESS_TIMEOUT = 60 * 60
+# 진행 상황 갱신이 이 시간 이상 없으면 처리 중이던 프로세스가 종료된 것으로 보고 실패 처리
+UPLOAD_JOB_STALE_SECONDS = 15 * 60
+# 이 시간 이상 대기 상태인 작업은 실패 처리 (스케줄러가 돌지 않는 경우)
+UPLOAD_JOB_PENDING_TIMEOUT = 60 * 60
+
+
+def progress_cache_key(job_id):
+    """진행 상황 캐시 키 (트랜잭션 밖에서도 조회되도록 캐시에 기록)"""
+    return f"upload_job_progress_{job_id}"
+
+
+def _save_temp_file(uploaded_file, file_ext):
+    """업로드 파일을 임시 파일로 저장 (요청 종료 후에도 백그라운드에서 읽기 위함)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_ext}', prefix='upload_') as tmp:
+        for chunk in uploaded_file.chunks():
+            tmp.write(chunk)
+        return tmp.name
+
+
+def _remove_temp_file(file_path):
+    if not file_path:
+        return
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"[업로드 작업] 임시 파일 삭제 실패: {str(e)}")
+
+
+def submit_upload_job(cred, uploaded_file, force=False):
+    """업로드 작업을 대기 상태로 생성 (force: 동일 파일/행 이력 무시). 반환값: UploadJob"""
+    file_ext = get_file_ext(uploaded_file.name)
+    file_path = _save_temp_file(uploaded_file, file_ext)
+    return UploadJob.objects.create(
+        job_id=uuid.uuid4(),
+        user=cred.user,
+        credential=cred,
+        file_name=uploaded_file.name[:255],
+        file_path=file_path,
+        force=force,
+    )
+
+
+def submit_sales_upload_job(user, uploaded_file, year):
+    """매출 엑셀 업로드 작업을 대기 상태로 생성 (year: 반영 대상 연도). 반환값: UploadJob"""
+    file_ext = get_file_ext(uploaded_file.name)
+    file_path = _save_temp_file(uploaded_file, file_ext)
+    return UploadJob.objects.create(
+        job_id=uuid.uuid4(),
+        user=user,
+        kind='sales',
+        year=year,
+        file_name=uploaded_file.name[:255],
+        file_path=file_path,
+    )
+
+
+def claim_next_upload_job():
+    """가장 오래된 대기 작업을 처리 중으로 선점 (조건부 UPDATE 로 한 프로세스만 성공). 반환값: pk 또는 None"""
+    pending = UploadJob.objects.filter(status='pending').order_by('created_at').values_list('pk', flat=True)
+    for job_pk in pending[:10]:
+        claimed = UploadJob.objects.filter(pk=job_pk, status='pending').update(
+            status='running', started_at=timezone.now()
+        )
+        if claimed:
+            return job_pk
+    return None
+
+
+def process_pending_upload_jobs():
+    """대기 작업이 없을 때까지 하나씩 선점해 처리 (스케줄러 작업). 반환값: 처리한 작업 수"""
+    close_old_connections()
+    processed = 0
+    while True:
+        job_pk = claim_next_upload_job()
+        if job_pk is None:
+            break
+        run_upload_job(job_pk)
+        processed += 1
+    connection.close()
+    return processed
+
+
+def sweep_orphaned_upload_jobs():
+    """
+    처리 중 프로세스가 종료되어 멈춘 작업을 실패 처리합니다 (폴링 화면이 끝나도록).
+    - 처리 중: 마지막 진행 갱신(없으면 시작 시각)이 UPLOAD_JOB_STALE_SECONDS 이전
+    - 대기: 생성 후 UPLOAD_JOB_PENDING_TIMEOUT 경과
+    반환값: 실패 처리한 작업 수
+    """
+    close_old_connections()
+    now = timezone.now()
+    swept = 0
+    for job in UploadJob.objects.filter(status='running'):
+        progress = cache.get(progress_cache_key(job.job_id)) or {}
+        last_beat = progress.get('updated_at') or (job.started_at or job.created_at).timestamp()
+        if time.time() - last_beat < UPLOAD_JOB_STALE_SECONDS:
+            continue
+        if _fail_orphaned(job, 'running', "처리가 중단되었습니다. 파일을 다시 업로드해주세요."):
+            swept += 1
+    pending_cutoff = now - timedelta(seconds=UPLOAD_JOB_PENDING_TIMEOUT)
+    for job in UploadJob.objects.filter(status='pending', created_at__lt=pending_cutoff):
+        if _fail_orphaned(job, 'pending', "처리 대기 시간이 초과되었습니다. 파일을 다시 업로드해주세요."):
+            swept += 1
+    if swept:
+        logger.warning(f"[업로드 작업] 중단된 작업 {swept}건 실패 처리")
+    connection.close()
+    return swept
+
+
+def _fail_orphaned(job, expected_status, message):
+    # 그 사이 작업이 끝났다면 건드리지 않음
+    updated = UploadJob.objects.filter(pk=job.pk, status=expected_status).update(
+        status='failed', message=message, finished_at=timezone.now()
+    )
+    if updated:
+        cache.delete(progress_cache_key(job.job_id))
+        _remove_temp_file(job.file_path)
+    return bool(updated)
+
+
+def run_upload_job(job_pk):
+    """
+    선점한 업로드 작업 실행 (광고 리포트: AdStats, 매출: MonthlySales).
+    파일 전체를 하나의 트랜잭션으로 저장하며 (중간 실패 시 전체 롤백),
+    변환에 실패한 행은 건너뛰고 행 단위 오류 목록으로 남깁니다.
+    이미 처리된 동일 내용 파일은 바로 완료 처리합니다.
+    """
+    job = None
+    file_path = None
+    try:
+        job = UploadJob.objects.select_related('user', 'credential').get(pk=job_pk)
+        cred = job.credential
+        file_path = job.file_path
+        file_ext = get_file_ext(job.file_name)
+        force = job.force
+        job.total_rows = estimate_row_count(file_path, file_ext)
+        job.save(update_fields=['total_rows'])
+
+        scope = sales_scope(job.year) if job.kind == 'sales' else upload_scope(cred)
+        content_hash = file_content_hash(file_path)
+        if not force and is_file_registered(job.user, scope, content_hash):
+            _finish(job, 'success', "이미 처리된 동일한 파일입니다. 변경된 데이터가 없습니다.")
+            return
+
+        progress_key = progress_cache_key(job.job_id)
+
+        def on_progress(processed_rows, saved_count, error_count):
+            cache.set(progress_key, {
+                'processed_rows': processed_rows,
+                'saved_count': saved_count,
+                'error_count': error_count,
+                'updated_at': time.time(),
+            }, UPLOAD_PROGRESS_TIMEOUT)
+
+        try:
+            with transaction.atomic():
+                if job.kind == 'sales':
+                    result = ingest_sales_file(job.user, file_path, file_ext, job.year, on_progress=on_progress)
+                else:
+                    result = ingest_upload_file(cred, file_path, file_ext, on_progress=on_progress, force=force)
+                if result['saved_count'] > 0:
+                    register_file(
+                        job.user, scope, content_hash, job.file_name,
+                        result['saved_count'], result['changed_count'],
+                    )
+                # 매출 행 키는 금액 차액 계산에 쓰이므로 보존 기간과 무관하게 유지
+                if job.kind == 'report':
+                    prune_row_keys(job.user, scope)
+        except MissingColumnError as e:
+            _finish(job, 'failed', str(e))
+            return
+
+        job.saved_count = result['saved_count']
+        job.error_count = result['error_count']
+        job.errors = result['errors']
+        job.processed_rows = result['saved_count'] + result['error_count']
+
+        if job.kind == 'sales':
+            message = result['message']
+            if result['error_count'] > 0:
+                message += f" ({result['error_count']}개의 행 처리 실패)"
+            _finish(job, 'success', message)
+            return
+
+        if result['saved_count'] == 0:
+            _finish(job, 'failed', "저장된 데이터가 없습니다.")
+            return
+
+        # 마지막 저장 시간 업데이트
+        cred.last_fetched_at = timezone.now()
+        cred.save(update_fields=['last_fetched_at'])
+
+        message = f"{result['saved_count']}개의 데이터가 성공적으로 저장되었습니다."
+        unchanged_count = result['saved_count'] - result['changed_count']
+        if unchanged_count > 0:
+            message += f" (변경 없음 {unchanged_count}건 제외)"
+        if result['error_count'] > 0:
+            message += f" ({result['error_count']}개의 데이터 처리 실패)"
+        _finish(job, 'success', message)
+
+    except Exception as e:
+        logger.exception(f"[업로드 작업] {job_pk} 처리 중 오류 발생")
+        if job is not None:
+            _finish(job, 'failed', f"파일 처리 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        if job is not None:
+            cache.delete(progress_cache_key(job.job_id))
+        _remove_temp_file(file_path)
+
+
+def _finish(job, status, message):
+    job.status = status
+    job.message = message
+    job.finished_at = timezone.now()
+    job.save(update_fields=[
+        'status', 'message', 'finished_at', 'processed_rows',
+        'saved_count', 'error_count', 'errors',
+    ])
+
+
+def get_job_status(job, error_preview=5):
+    """폴링 응답용 작업 상태 (진행 중이면 캐시의 진행 상황 반영)"""
+    processed_rows = job.processed_rows
+    saved_count = job.saved_count
+    error_count = job.error_count
+    if job.status == 'running':
+        progress = cache.get(progress_cache_key(job.job_id)) or {}
+        processed_rows = progress.get('processed_rows', processed_rows)
+        saved_count = progress.get('saved_count', saved_count)
+        error_count = progress.get('error_count', error_count)
+
+    if job.status in ('success', 'failed'):
+        percent = 100
+    elif job.total_rows:
+        percent = min(99, int(processed_rows * 100 / job.total_rows))
+    else:
+        percent = 0
+
+    return {
+        'job_id': str(job.job_id),
+        'status': job.status,
+        'file_name': job.file_name,
+        'total_rows': job.total_rows,
+        'processed_rows': processed_rows,
+        'progress': percent,
+        'saved_count': saved_count,
+        'error_count': error_count,
+        'errors': job.errors[:error_preview],
+        'message': job.message,
+    }
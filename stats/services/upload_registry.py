@@ -0,0 +1,121 @@
+import hashlib
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from stats.models import UploadRegistry, UploadRowKey
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+ROW_KEY_QUERY_CHUNK = 1000
+# 행 키 보관 기간 (마지막 반영 후 N일이 지난 행 키는 정리 - 다시 올라오면 변경 행으로 처리)
+ROW_KEY_RETENTION_DAYS = 400
+
+
+def file_content_hash(source):
+    """파일 내용 SHA-256 (경로 또는 업로드 파일 객체, 업로드 파일은 읽은 뒤 처음으로 되돌림)"""
+    digest = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    else:
+        for chunk in source.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+def hash_values(*values):
+    """행 키/내용 해시 (값 목록 → SHA-256)"""
+    joined = '\x1f'.join('' if value is None else str(value) for value in values)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+
+def is_file_registered(user, scope, content_hash):
+    """동일 내용 파일이 이미 처리되었는지 여부"""
+    return UploadRegistry.objects.filter(user=user, scope=scope, content_hash=content_hash).exists()
+
+
+def register_file(user, scope, content_hash, file_name, row_count, changed_count):
+    """처리 완료된 파일 등록"""
+    UploadRegistry.objects.update_or_create(
+        user=user, scope=scope, content_hash=content_hash,
+        defaults={
+            'file_name': file_name[:255],
+            'row_count': row_count,
+            'changed_count': changed_count,
+        }
+    )
+
+
+def load_row_keys(user, scope, row_keys=None):
+    """
+    등록된 행 키 조회. 반환값: {row_key: (row_hash, amount)}
+    row_keys 가 None 이면 scope 전체를 한 번에 조회합니다.
+    """
+    qs = UploadRowKey.objects.filter(user=user, scope=scope)
+    if row_keys is None:
+        return {
+            row_key: (row_hash, amount)
+            for row_key, row_hash, amount in qs.values_list('row_key', 'row_hash', 'amount').iterator()
+        }
+
+    row_keys = list(row_keys)
+    result = {}
+    for i in range(0, len(row_keys), ROW_KEY_QUERY_CHUNK):
+        chunk = row_keys[i:i + ROW_KEY_QUERY_CHUNK]
+        for row_key, row_hash, amount in qs.filter(row_key__in=chunk).values_list('row_key', 'row_hash', 'amount'):
+            result[row_key] = (row_hash, amount)
+    return result
+
+
+def save_row_keys(user, scope, entries, batch_size=1000):
+    """행 키 일괄 저장. entries: {row_key: (row_hash, amount)}"""
+    if not entries:
+        return
+    existing = dict(
+        UploadRowKey.objects.filter(user=user, scope=scope, row_key__in=list(entries))
+        .values_list('row_key', 'pk')
+    ) if len(entries) <= ROW_KEY_QUERY_CHUNK else {
+        row_key: pk
+        for row_key, pk in UploadRowKey.objects.filter(user=user, scope=scope).values_list('row_key', 'pk').iterator()
+    }
+
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for row_key, (row_hash, amount) in entries.items():
+        obj = UploadRowKey(
+            user=user, scope=scope, row_key=row_key, row_hash=row_hash,
+            amount=amount or Decimal('0'), updated_at=now,
+        )
+        pk = existing.get(row_key)
+        if pk is None:
+            to_create.append(obj)
+        else:
+            obj.pk = pk
+            to_update.append(obj)
+
+    if to_create:
+        UploadRowKey.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        UploadRowKey.objects.bulk_update(to_update, ['row_hash', 'amount', 'updated_at'], batch_size=batch_size)
+
+
+def prune_row_keys(user, scope, retention_days=ROW_KEY_RETENTION_DAYS):
+    """보관 기간이 지난 행 키 삭제. 반환값: 삭제 건수"""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = UploadRowKey.objects.filter(user=user, scope=scope, updated_at__lt=cutoff).delete()
+    if deleted:
+        logger.info(f"[UploadRegistry] {scope}: 오래된 행 키 {deleted}건 정리")
+    return deleted
+
+
+def clear_upload_history(user, scope):
+    """scope 의 파일 이력/행 키 전체 삭제 (반영된 데이터가 삭제되어 이력이 더 이상 맞지 않을 때)"""
+    UploadRegistry.objects.filter(user=user, scope=scope).delete()
+    UploadRowKey.objects.filter(user=user, scope=scope).delete()
@@ -0,0 +1,297 @@
+"""
+스트리밍 xlsx 생성기.
+
+openpyxl Workbook 은 모든 셀을 메모리에 들고 있다가 저장 시점에 한 번에 내보내므로,
+퍼블리셔 시트가 수백 개인 다운로드는 메모리를 많이 쓰고 생성이 끝날 때까지 응답이 시작되지 않습니다.
+여기서는 xlsx(zip) 를 직접 스트리밍으로 기록합니다.
+- 행은 만들어지는 즉시 시트 XML 로 기록되고 일정 크기마다 응답 청크로 내보냄 (메모리 일정)
+- 셀 서식은 이름 있는 공유 스타일(STYLES)만 사용 - 셀마다 Font/Border 객체를 만들지 않음
+- 문자열은 inline string 으로 기록 (sharedStrings 테이블을 메모리에 모으지 않음), XML 에 쓸 수 없는 제어 문자는 제거
+- 날짜/일시는 엑셀 일련값 + 날짜 서식으로 기록, NaN/무한대는 #NUM! 오류 셀로 기록
+
+사용 예:
+    sheets = [XlsxSheet('시트1', rows_generator(), widths=[12, 15])]
+    response = StreamingHttpResponse(stream_xlsx(sheets), content_type=XLSX_CONTENT_TYPE)
+"""
+import math
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# 이 크기 이상 쌓이면 응답 청크로 내보냄
+CHUNK_SIZE = 64 * 1024
+SHEET_TITLE_MAX_LENGTH = 31
+INVALID_TITLE_CHARS = '[]:*?/\\'
+# XML 1.0 에서 허용되지 않는 문자 (탭/개행 제외 제어 문자, 짝이 없는 서로게이트, U+FFFE/U+FFFF)
+ILLEGAL_XML_CHARS_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+# 엑셀 1900 날짜 체계의 기준일 (일련값 = 기준일로부터의 일수, 1900-03-01 이후 날짜 기준)
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# 이름 있는 공유 스타일 → cellXfs 인덱스 (STYLES_XML 의 cellXfs 순서와 동일)
+STYLES = {
+    'default': 0,
+    'header': 1,        # 굵게, 회색 배경, 테두리, 가운데 정렬
+    'text': 2,          # 테두리, 가운데 정렬
+    'number': 3,        # #,##0, 테두리, 오른쪽 정렬
+    'total_number': 4,  # #,##0, 굵게, 회색 배경, 테두리, 오른쪽 정렬
+    'plain_number': 5,  # #,##0
+    'decimal': 6,       # 0.00
+    'date': 7,          # yyyy-mm-dd
+    'datetime': 8,      # yyyy-mm-dd hh:mm:ss
+}
+
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm:ss"/>'
+    '</numFmts>'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="맑은 고딕"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="맑은 고딕"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFF2F2F2"/><bgColor rgb="FFF2F2F2"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="9">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="3" fontId="0" fillId="0" borderId="1" xfId="0" applyNumberFormat="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="right" vertical="center"/></xf>'
+    '<xf numFmtId="3" fontId="1" fillId="2" borderId="1" xfId="0" applyNumberFormat="1" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="right" vertical="center"/></xf>'
+    '<xf numFmtId="3" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="2" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+
+class XlsxSheet:
+    """
+    시트 정의. rows 는 행을 순서대로 내는 iterable (생성기 권장) 입니다.
+    각 행은 값 목록이며, 값 대신 (값, 스타일 이름) 튜플을 넣으면 해당 셀에 공유 스타일을 적용합니다.
+    날짜/일시 값은 스타일을 지정하지 않으면 'date'/'datetime' 서식을 적용합니다.
+    """
+
+    def __init__(self, title, rows, widths=None):
+        self.title = title
+        self.rows = rows
+        self.widths = widths or []
+
+
+class _ChunkBuffer:
+    """zipfile 이 기록하는 바이트를 모아 두었다가 청크로 꺼내는 비탐색(non-seekable) 스트림"""
+
+    def __init__(self):
+        self._parts = []
+        self._size = 0
+        self._offset = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._size += len(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def pending(self):
+        return self._size
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        self._size = 0
+        return data
+
+
+def column_letter(index):
+    """0부터 시작하는 열 번호 → 엑셀 열 문자 (0 → A, 26 → AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def xml_text(value):
+    """XML 에 쓸 수 없는 문자를 제거한 문자열"""
+    return ILLEGAL_XML_CHARS_RE.sub('', str(value))
+
+
+def excel_serial(value):
+    """날짜/일시 → 엑셀 일련값 (시간대 정보는 무시하고 표시 시각 그대로 사용)"""
+    if isinstance(value, datetime):
+        delta = value.replace(tzinfo=None) - EXCEL_EPOCH
+        return delta.days + (delta.seconds + delta.microseconds / 1e6) / 86400
+    return (value - EXCEL_EPOCH.date()).days
+
+
+def safe_sheet_title(title, used, fallback='Sheet'):
+    """엑셀 시트명 규칙(31자, 금지 문자, 중복 불가)에 맞게 정리"""
+    cleaned = ''.join(c for c in xml_text(title) if c not in INVALID_TITLE_CHARS).strip().strip("'")
+    cleaned = cleaned[:SHEET_TITLE_MAX_LENGTH] or fallback[:SHEET_TITLE_MAX_LENGTH]
+    candidate = cleaned
+    suffix = 2
+    while candidate.lower() in used:
+        tail = f" ({suffix})"
+        candidate = cleaned[:SHEET_TITLE_MAX_LENGTH - len(tail)] + tail
+        suffix += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _cell_xml(ref, value, style):
+    style_attr = f' s="{STYLES[style]}"' if style and style != 'default' else ''
+    if value is None or value == '':
+        return f'<c r="{ref}"{style_attr}/>' if style_attr else ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        if isinstance(value, int) or (value.is_finite() if isinstance(value, Decimal) else math.isfinite(value)):
+            return f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+        # NaN/무한대는 숫자 셀로 쓸 수 없으므로 엑셀 오류 값으로 기록
+        return f'<c r="{ref}"{style_attr} t="e"><v>#NUM!</v></c>'
+    if isinstance(value, (date, datetime)):
+        if not style_attr:
+            style_attr = f' s="{STYLES["datetime" if isinstance(value, datetime) else "date"]}"'
+        return f'<c r="{ref}"{style_attr}><v>{excel_serial(value)}</v></c>'
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t xml:space="preserve">{escape(xml_text(value))}</t></is></c>'
+
+
+def _row_xml(row_number, values):
+    cells = []
+    for col, value in enumerate(values):
+        style = None
+        if isinstance(value, tuple):
+            value, style = value
+        cells.append(_cell_xml(f"{column_letter(col)}{row_number}", value, style))
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+
+def _sheet_header(widths):
+    cols = ''
+    if widths:
+        cols = '<cols>' + ''.join(
+            f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>' for i, width in enumerate(widths, 1) if width
+        ) + '</cols>'
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'{cols}<sheetData>'
+    )
+
+
+def _workbook_xml(titles):
+    sheets = ''.join(
+        f'<sheet name="{escape(title, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, title in enumerate(titles, 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets>{sheets}</sheets></workbook>'
+    )
+
+
+def _workbook_rels_xml(count):
+    rels = ''.join(
+        f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, count + 1)
+    )
+    rels += (
+        f'<Relationship Id="rId{count + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{rels}</Relationships>'
+    )
+
+
+def _content_types_xml(count):
+    overrides = ''.join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, count + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f'{overrides}</Types>'
+    )
+
+
+def stream_xlsx(sheets):
+    """
+    시트 목록(XlsxSheet iterable, 생성기 가능)을 xlsx 바이트 청크로 스트리밍합니다.
+    시트와 행은 필요할 때 하나씩 소비하므로 전체 데이터를 메모리에 올리지 않습니다.
+    워크북 목록/콘텐츠 타입은 시트 수를 알아야 하므로 마지막에 기록합니다.
+    """
+    buffer = _ChunkBuffer()
+    archive = zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED)
+    titles = []
+    used_titles = set()
+
+    for sheet in sheets:
+        titles.append(safe_sheet_title(sheet.title, used_titles, fallback=f"Sheet{len(titles) + 1}"))
+        with archive.open(f"xl/worksheets/sheet{len(titles)}.xml", 'w', force_zip64=True) as entry:
+            entry.write(_sheet_header(sheet.widths).encode('utf-8'))
+            for row_number, values in enumerate(sheet.rows, 1):
+                entry.write(_row_xml(row_number, values).encode('utf-8'))
+                if buffer.pending() >= CHUNK_SIZE:
+                    yield buffer.drain()
+            entry.write(b'</sheetData></worksheet>')
+        if buffer.pending() >= CHUNK_SIZE:
+            yield buffer.drain()
+
+    if not titles:
+        # 시트가 하나도 없으면 엑셀이 열지 못하므로 빈 시트 추가
+        titles.append('Sheet1')
+        archive.writestr('xl/worksheets/sheet1.xml', _sheet_header(None) + '</sheetData></worksheet>')
+
+    archive.writestr('xl/styles.xml', STYLES_XML)
+    archive.writestr('xl/workbook.xml', _workbook_xml(titles))
+    archive.writestr('xl/_rels/workbook.xml.rels', _workbook_rels_xml(len(titles)))
+    archive.writestr('_rels/.rels', ROOT_RELS_XML)
+    archive.writestr('[Content_Types].xml', _content_types_xml(len(titles)))
+    archive.close()
+    yield buffer.drain()
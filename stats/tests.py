@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from openpyxl import load_workbook
+
+from stats.cache_backends import Pickled, dumps, loads
+from stats.services.revenue_pivot import DailyRevenuePivot
+from stats.services.xlsx_stream import XlsxSheet, stream_xlsx
+
+PARTNER_PLATFORMS = ['cozymamang', 'mediamixer', 'aceplanet', 'teads', 'taboola', 'coupang']
+
+
+def legacy_daily_partner_revenue(date_list, rows, platform_list, coupang_aliases):
+    """
+    피벗 도입 전 calculate_daily_platform_revenue 의 일자별 계산.
+    AdStats/PlatformCredential 조회를 rows/coupang_aliases 로 바꾼 것 외에는 기존 코드 그대로입니다.
+    반환값: ({platform: {date: 원}}, {date: {stamply alias: Decimal}}, {date: Decimal})
+    """
+    partners = {platform: {} for platform in PARTNER_PLATFORMS}
+    stamply_by_account = {}
+    stamply_daily = {}
+    for d in date_list:
+        platform_revenues = {
+            'cozymamang': Decimal('0'),
+            'mediamixer': Decimal('0'),
+            'aceplanet': Decimal('0'),
+            'teads': Decimal('0'),
+            'taboola': Decimal('0'),
+            'coupang': Decimal('0')
+        }
+
+        data = {}
+        for row in [row for row in rows if row['date'] == d]:
+            key = f"{row['platform']}|{row['alias']}"
+            data[key] = Decimal(str(row['earnings'] or 0))
+
+        for platform in platform_revenues.keys():
+            if platform == 'coupang':
+                for alias in coupang_aliases['partners']:
+                    key = f"coupang|{alias}"
+                    platform_revenues['coupang'] += round(float(data.get(key, Decimal('0'))))
+            else:
+                for alias in [a for p, a in platform_list if p == platform]:
+                    key = f"{platform}|{alias}"
+                    platform_revenues[platform] += round(float(data.get(key, Decimal('0'))))
+
+        for platform in PARTNER_PLATFORMS:
+            partners[platform][d] = platform_revenues[platform]
+
+        stamply_by_account[d] = {}
+        coupang_revenue = Decimal('0')
+        for alias in coupang_aliases['stamply']:
+            key = f"coupang|{alias}"
+            account_revenue = data.get(key, Decimal('0'))
+            stamply_by_account[d][alias] = account_revenue
+            coupang_revenue += account_revenue
+
+        stamply_daily[d] = coupang_revenue
+    return partners, stamply_by_account, stamply_daily
+
+
+def legacy_coupang_account_totals(stamply_daily_coupang_by_account, date_list, stamply_platforms):
+    """피벗 도입 전 calculate_coupang_account_totals (기존 코드 그대로)"""
+    stamply_coupang_account_totals = {}
+    for platform, alias in stamply_platforms:
+        if platform == 'coupang':
+            account_total = Decimal(str(sum(stamply_daily_coupang_by_account[d].get(alias, Decimal('0')) for d in date_list))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
+            stamply_coupang_account_totals[alias] = account_total
+    return stamply_coupang_account_totals
+
+
+class DailyRevenuePivotTests(SimpleTestCase):
+    def setUp(self):
+        self.date_list = [date(2025, 3, 1) + timedelta(days=i) for i in range(5)]
+        d = self.date_list
+        self.rows = [
+            {'date': d[0], 'platform': 'cozymamang', 'alias': 'a', 'earnings': Decimal('1234.4')},
+            {'date': d[0], 'platform': 'cozymamang', 'alias': 'b', 'earnings': Decimal('0.5')},
+            {'date': d[1], 'platform': 'cozymamang', 'alias': 'a', 'earnings': Decimal('2.5')},
+            {'date': d[1], 'platform': 'cozymamang', 'alias': 'b', 'earnings': None},
+            {'date': d[2], 'platform': 'mediamixer', 'alias': 'm', 'earnings': Decimal('99.49')},
+            {'date': d[2], 'platform': 'cozymamang', 'alias': 'b', 'earnings': Decimal('3.5')},
+            {'date': d[3], 'platform': 'teads', 'alias': 't', 'earnings': Decimal('10.51')},
+            {'date': d[4], 'platform': 'taboola', 'alias': 'x', 'earnings': Decimal('-3.5')},
+            {'date': d[0], 'platform': 'coupang', 'alias': 'cp1', 'earnings': Decimal('15000.5')},
+            {'date': d[2], 'platform': 'coupang', 'alias': 'cp2', 'earnings': Decimal('700.25')},
+            # 스탬플리: 일별로는 반올림하지 않고 계정 합계에서 한 번만 반올림 (0.3 + 0.3 + 0.4 = 1, 셀 반올림이면 0)
+            {'date': d[1], 'platform': 'coupang', 'alias': 'st1', 'earnings': Decimal('0.3')},
+            {'date': d[2], 'platform': 'coupang', 'alias': 'st1', 'earnings': Decimal('0.3')},
+            {'date': d[3], 'platform': 'coupang', 'alias': 'st1', 'earnings': Decimal('320.5')},
+            {'date': d[4], 'platform': 'coupang', 'alias': 'st1', 'earnings': Decimal('0.4')},
+            {'date': d[0], 'platform': 'coupang', 'alias': 'st2', 'earnings': Decimal('12.25')},
+            {'date': d[3], 'platform': 'coupang', 'alias': 'st2', 'earnings': Decimal('0.25')},
+            # 기간 밖 행은 무시
+            {'date': d[4] + timedelta(days=1), 'platform': 'cozymamang', 'alias': 'a', 'earnings': Decimal('500')},
+        ]
+        # aceplanet 'ace' 는 데이터가 없는 alias, cozymamang 'a' 는 중복 항목
+        self.platform_list = [
+            ('cozymamang', 'a'), ('cozymamang', 'b'), ('cozymamang', 'a'), ('mediamixer', 'm'),
+            ('aceplanet', 'ace'), ('teads', 't'), ('taboola', 'x'),
+        ]
+        self.coupang_aliases = {'partners': ['cp1', 'cp2'], 'stamply': ['st1', 'st2', 'st3']}
+        self.legacy_partners, self.legacy_stamply, self.legacy_stamply_daily = legacy_daily_partner_revenue(
+            self.date_list, self.rows, self.platform_list, self.coupang_aliases
+        )
+
+    def test_partner_series_match_legacy_per_alias_computation(self):
+        pivot = DailyRevenuePivot(self.date_list, self.rows)
+        for platform in PARTNER_PLATFORMS:
+            if platform == 'coupang':
+                aliases = self.coupang_aliases['partners']
+            else:
+                aliases = [a for p, a in self.platform_list if p == platform]
+            series = pivot.rounded_sum(platform, aliases).tolist()
+            expected = [self.legacy_partners[platform][d] for d in self.date_list]
+            self.assertEqual(series, expected, platform)
+
+    def test_partner_cells_round_half_to_even(self):
+        pivot = DailyRevenuePivot(self.date_list, self.rows)
+        # 0.5 -> 0, 2.5 -> 2, 3.5 -> 4, -3.5 -> -4, 15000.5 -> 15000 (round(float()) 와 동일)
+        self.assertEqual(pivot.rounded_sum('cozymamang', ['b']).tolist(), [0, 0, 4, 0, 0])
+        self.assertEqual(pivot.rounded_sum('cozymamang', ['a']).tolist()[1], 2)
+        self.assertEqual(pivot.rounded_sum('taboola', ['x']).tolist()[4], -4)
+        self.assertEqual(pivot.rounded_sum('coupang', ['cp1']).tolist()[0], 15000)
+
+    def test_stamply_series_match_legacy_per_account_computation(self):
+        pivot = DailyRevenuePivot(self.date_list, self.rows)
+        for alias in self.coupang_aliases['stamply']:
+            series = pivot.series('coupang', alias)
+            self.assertEqual(series, [self.legacy_stamply[d][alias] for d in self.date_list], alias)
+            self.assertTrue(all(isinstance(value, Decimal) for value in series), alias)
+        daily = [
+            sum((pivot.series('coupang', alias)[i] for alias in self.coupang_aliases['stamply']), Decimal('0'))
+            for i in range(len(self.date_list))
+        ]
+        self.assertEqual(daily, [self.legacy_stamply_daily[d] for d in self.date_list])
+
+    def test_stamply_account_totals_round_once(self):
+        from stats.views.reports import calculate_coupang_account_totals
+
+        pivot = DailyRevenuePivot(self.date_list, self.rows)
+        by_account = {d: {} for d in self.date_list}
+        for alias in self.coupang_aliases['stamply']:
+            for d, value in zip(self.date_list, pivot.series('coupang', alias)):
+                by_account[d][alias] = value
+        stamply_platforms = [('coupang', alias) for alias in self.coupang_aliases['stamply']]
+
+        totals = calculate_coupang_account_totals(by_account, self.date_list, stamply_platforms)
+        legacy = legacy_coupang_account_totals(self.legacy_stamply, self.date_list, stamply_platforms)
+        self.assertEqual(totals, legacy)
+        # 0.3 + 0.3 + 320.5 + 0.4 = 321.5 -> 322, 12.25 + 0.25 = 12.5 -> 13
+        self.assertEqual(totals, {'st1': 322, 'st2': 13, 'st3': 0})
+
+    def test_series_returns_copy(self):
+        pivot = DailyRevenuePivot(self.date_list, self.rows)
+        series = pivot.series('cozymamang', 'a')
+        series[0] += 1
+        self.assertEqual(pivot.series('cozymamang', 'a'), [Decimal('1234.4'), Decimal('2.5'), 0, 0, 0])
+
+
+class CacheSerializationTests(SimpleTestCase):
+    def test_plain_values_round_trip(self):
+        value = {
+            'rows': OrderedDict([('2025-03-01|teads|t', [1.5, 2, 3, 0, 0.0])]),
+            'amount': Decimal('1234.56'),
+            'day': date(2025, 3, 1),
+            'at': datetime(2025, 3, 1, 12, 30),
+            'key': ('coupang', 'st1'),
+            'aliases': {'a', 'b'},
+            1: None,
+        }
+        self.assertEqual(loads(dumps(value)), dict(value, rows=dict(value['rows'])))
+
+    def test_unknown_types_are_rejected(self):
+        class Row:
+            pass
+
+        with self.assertRaises(TypeError), self.assertLogs('stats.cache_backends', level='ERROR'):
+            dumps({'member': Row()})
+
+    def test_pickle_requires_explicit_wrapper(self):
+        value = loads(dumps({'values': Pickled(range(3))}))
+        self.assertEqual(value, {'values': range(3)})
+
+
+class XlsxStreamTests(SimpleTestCase):
+    def _load(self, sheets):
+        return load_workbook(BytesIO(b''.join(stream_xlsx(sheets))))
+
+    def test_round_trip_values_and_styles(self):
+        rows = [
+            [('일자', 'header'), ('수익', 'header'), ('비고', 'header')],
+            [date(2025, 3, 1), (1234567, 'number'), 'a < b & "c"'],
+            [datetime(2025, 3, 1, 13, 45, 30), Decimal('12.5'), ('', 'text')],
+            [(date(2025, 3, 2), 'text'), 0.25, True],
+        ]
+        workbook = self._load([XlsxSheet('요약', iter(rows), widths=[12, 15])])
+        sheet = workbook['요약']
+        self.assertEqual(sheet['A1'].value, '일자')
+        self.assertTrue(sheet['A1'].font.b)
+        self.assertEqual(sheet['A2'].value, datetime(2025, 3, 1))
+        self.assertEqual(sheet['A2'].number_format, 'yyyy-mm-dd')
+        self.assertEqual(sheet['A3'].value, datetime(2025, 3, 1, 13, 45, 30))
+        self.assertEqual(sheet['A3'].number_format, 'yyyy-mm-dd hh:mm:ss')
+        self.assertEqual(sheet['B2'].value, 1234567)
+        self.assertEqual(sheet['B2'].number_format, '#,##0')
+        self.assertEqual(sheet['C2'].value, 'a < b & "c"')
+        self.assertEqual(sheet['B3'].value, 12.5)
+        self.assertEqual(sheet['B4'].value, 0.25)
+        self.assertIs(sheet['C4'].value, True)
+        self.assertEqual(sheet.column_dimensions['B'].width, 15)
+
+    def test_non_finite_numbers_and_control_characters(self):
+        rows = [[float('nan'), float('inf'), Decimal('NaN'), 'a\x00b\x1fc\td', '\ud800x']]
+        workbook = self._load([XlsxSheet('bad\x07title', iter(rows))])
+        sheet = workbook.worksheets[0]
+        self.assertEqual(sheet.title, 'badtitle')
+        self.assertEqual([cell.value for cell in sheet[1]], ['#NUM!', '#NUM!', '#NUM!', 'abc\td', 'x'])
+
+    def test_sheet_titles_and_empty_workbook(self):
+        workbook = self._load([XlsxSheet('a/b' * 20, iter([[1]])), XlsxSheet('A/B' * 20, iter([[2]]))])
+        self.assertEqual([len(title) for title in workbook.sheetnames], [31, 31])
+        self.assertEqual(len(set(title.lower() for title in workbook.sheetnames)), 2)
+        self.assertEqual(self._load([]).sheetnames, ['Sheet1'])
@@ -10,6 +10,7 @@ from .views import (
     credential_list_view,
     delete_credential,
     report_view,
+    report_data_api,
     publisher_report_view,
     purchase_report_view,
     publisher_detail_data_api,
@@ -82,7 +83,10 @@ urlpatterns = [
     path("api/stats/excel/", api_stats_excel_view, name="api_stats_excel"),
     path("api/adpost/upload/", api.upload_adpost_excel, name="upload_adpost_excel"),
     path("api/taboola/upload/", api.upload_taboola_excel, name="upload_taboola_excel"),
+    path("api/upload-jobs/<uuid:job_id>/", api.upload_job_status_api, name="upload_job_status"),
+    path("api/upload-jobs/<uuid:job_id>/errors/", api.upload_job_errors_api, name="upload_job_errors"),
     path("report/", report_view, name="report"),
+    path("api/report-data/", report_data_api, name="report_data_api"),
     path("publisher-report/", publisher_report_view, name="publisher_report"),
     path("purchase-report/", purchase_report_view, name='purchase_report'),
     path("api/publisher-detail-data/", publisher_detail_data_api, name="publisher_detail_data_api"),
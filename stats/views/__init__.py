@@ -24,6 +24,7 @@ from .main import (
 # Report views
 from .reports import (
     report_view,
+    report_data_api,
     publisher_report_view,
     save_other_revenue,
 )
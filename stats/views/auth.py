@@ -9,6 +9,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_POST
 from django.db.models import Sum, Count
 from django.contrib import messages
+from django.db import transaction
 from django.utils import timezone
 import openpyxl
 import xlrd
@@ -22,9 +23,14 @@ from ..forms import CredentialForm, SignUpForm
 from ..models import (
     AdStats, PlatformCredential, UserPreference, MonthlySales, 
     SettlementDepartment, ServiceGroup, PurchaseGroup, Member, 
-    PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate
+    PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate,
+    DailyRevenueRollup
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
+from ..services.dashboard_series import invalidate_dashboard_series
+from ..services.data_versions import bump
+from ..services.upload_ingest import upload_scope
+from ..services.upload_registry import clear_upload_history
 
 logger = logging.getLogger(__name__)
 
@@ -188,7 +194,14 @@ def delete_credential(request, pk):
     """자격증명 삭제"""
     cred = get_object_or_404(PlatformCredential, pk=pk, user=request.user)
     linked_stats_count = cred.adstats.count()
-    cred.delete()
+    with transaction.atomic():
+        cred.delete()
+        # 일별 집계는 자격증명 FK 가 없으므로 별도 삭제
+        DailyRevenueRollup.objects.filter(user=request.user, platform=cred.platform, alias=cred.alias).delete()
+        # 업로드 이력도 삭제 - 같은 계정을 다시 만들고 같은 파일을 올리면 처음부터 반영
+        clear_upload_history(request.user, upload_scope(cred))
+        bump(request.user, 'adstats')
+        invalidate_dashboard_series(request.user)
     messages.success(request, f"{linked_stats_count}개의 수익 데이터와 함께 계정이 삭제되었습니다.")
     return redirect("credential_list")
 
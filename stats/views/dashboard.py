@@ -1,4 +1,5 @@
 import os, json
+import hashlib
 from datetime import datetime, timedelta, date
 from django.conf import settings
 from django.contrib.auth import login, logout, authenticate
@@ -6,10 +7,11 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.http import JsonResponse, HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.views.decorators.http import require_POST
-from django.db.models import Sum, Count
+from django.views.decorators.http import condition, require_POST
+from django.db.models import Sum, Count, Max
 from django.contrib import messages
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 import openpyxl
 import xlrd
 from django.core.exceptions import ValidationError
@@ -22,15 +24,57 @@ from ..forms import CredentialForm, SignUpForm
 from ..models import (
     AdStats, PlatformCredential, UserPreference, MonthlySales, 
     SettlementDepartment, ServiceGroup, PurchaseGroup, Member, 
-    PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate
+    PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate,
+    DailyRevenueRollup
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
+from ..services.dashboard_series import get_dashboard_series, ingested_at, series_rows, series_window
 
 logger = logging.getLogger(__name__)
 
+# 화면 구성(템플릿)이 바뀌면 올려 이전 ETag 로 304 가 나가지 않게 함
+DASHBOARD_PAGE_VERSION = 1
+
+
+def _dashboard_state(request):
+    """
+    조건부 요청 판단용 상태 (요청 1회당 1번만 계산).
+    시계열 캐시의 마지막 반영 시각 + 자격증명 서명(개수, 수정 시각, 마지막 수집 시각)으로 ETag/Last-Modified 를 만듭니다.
+    """
+    state = getattr(request, '_dashboard_state', None)
+    if state is None:
+        entry = get_dashboard_series(request.user)
+        signature = PlatformCredential.objects.filter(user=request.user).aggregate(
+            count=Count('id'), updated=Max('updated_at'), fetched=Max('last_fetched_at')
+        )
+        last_modified = max(
+            value for value in (ingested_at(entry), signature['updated'], signature['fetched']) if value
+        )
+        etag = hashlib.sha1(repr((
+            DASHBOARD_PAGE_VERSION, entry['ingested_at'], signature['count'],
+            signature['updated'], signature['fetched'], series_window()[1],
+        )).encode('utf-8')).hexdigest()[:16]
+        state = request._dashboard_state = {'entry': entry, 'etag': etag, 'last_modified': last_modified}
+    return state
+
+
+def _dashboard_etag(request):
+    # 표시 대기 중인 메시지가 있으면 본문을 새로 그려야 하므로 조건부 응답을 하지 않음
+    if len(messages.get_messages(request)):
+        return None
+    return _dashboard_state(request)['etag']
+
+
+def _dashboard_last_modified(request):
+    if len(messages.get_messages(request)):
+        return None
+    return _dashboard_state(request)['last_modified']
+
+
 @login_required
+@condition(etag_func=_dashboard_etag, last_modified_func=_dashboard_last_modified)
 def dashboard_view(request):
-    """대시보드"""
+    """대시보드 (최근 30일 시계열은 수집 시 갱신되는 캐시에서 읽고, 변경이 없으면 304)"""
     credentials = PlatformCredential.objects.filter(user=request.user)
 
     platform_aliases_grouped = {}
@@ -54,19 +98,7 @@ def dashboard_view(request):
                 if cred.last_fetched_at and (not current or cred.last_fetched_at > current):
                     last_fetched_times[cred.platform] = cred.last_fetched_at
 
-    end_date = date.today()
-    start_date = end_date - timedelta(days=30)
-    
-    stats = AdStats.objects.filter(
-        user=request.user,
-        date__range=[start_date, end_date]
-    ).values("date", "platform", "alias").annotate(
-        earnings=Sum("earnings"),
-        clicks=Sum("clicks"),
-        impressions=Sum("impressions"),
-        order_count=Sum("order_count"),
-        total_amount=Sum("total_amount")
-    ).order_by("date")
+    stats = series_rows(_dashboard_state(request)['entry'])
 
     dates = []
     earnings_data = []
@@ -76,12 +108,12 @@ def dashboard_view(request):
 
     for stat in stats:
         dates.append(stat["date"].strftime("%Y-%m-%d"))
-        earnings_data.append(float(stat["earnings"] or 0))
-        clicks_data.append(int(stat["clicks"] or 0))
-        order_count_data.append(int(stat["order_count"] or 0))
-        total_amount_data.append(float(stat["total_amount"] or 0))
+        earnings_data.append(stat["earnings"])
+        clicks_data.append(stat["clicks"])
+        order_count_data.append(stat["order_count"])
+        total_amount_data.append(stat["total_amount"])
 
-    return render(request, "chart_template.html", {
+    response = render(request, "chart_template.html", {
         "platform_aliases_grouped": platform_aliases_grouped,
         "credential_colors": credential_colors,
         "last_fetched_times": last_fetched_times,
@@ -91,4 +123,7 @@ def dashboard_view(request):
         "order_count_data": order_count_data,
         "total_amount_data": total_amount_data,
         "daily_stats": stats
-    }) 
\ No newline at end of file
+    })
+    # 브라우저가 매번 재검증하도록 (사용자별 페이지이므로 공유 캐시 금지)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -25,6 +25,7 @@ from ..models import (
     PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate, MonthlyAdjustment
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
+from ..services.revenue_graph import RevenueGraph
 
 logger = logging.getLogger(__name__)
 
@@ -53,133 +54,33 @@ def main_view(request):
     if start_date > end_date:
         end_date = start_date
 
-    # 실제 매출 데이터 조회 (reports.py와 동일한 로직 사용)
-    from stats.models import AdStats, OtherRevenue
-    from .reports import (
-        get_platform_list, get_exchange_rates, get_ad_unit_member_mapping,
-        calculate_platform_revenue_by_member_level, calculate_naver_powerlink_revenue,
-        process_all_sections, get_other_revenue_data
+    # 실제 매출 데이터 조회 (reports.py와 동일한 계산 그래프 사용)
+    # 당월/전월 조회가 같은 그래프를 공유하므로 겹치는 날짜와 기간 무관 입력은 한 번만 계산됩니다.
+    from .reports import SECTION_NAMES, calculate_section_revenue, get_revenue_chain
+    graph = RevenueGraph(request.user)
+    chain = get_revenue_chain(graph, start_date, end_date)
+    
+    date_list = chain['date_list']
+    other_revenue_data = chain['other_revenue_data']
+    daily_data = chain['daily_data']
+    section_results = chain['section_results']
+    
+    # 8. 일별 매출 데이터 구성 (섹션별 일 매출 - report 와 같은 함수/반올림 규칙)
+    publisher_revenue, partners_revenue, stamply_revenue = calculate_section_revenue(
+        date_list, section_results, daily_data, other_revenue_data
     )
-    
-    # 1. 플랫폼 리스트 및 기본 설정
-    platform_list = get_platform_list(request.user)
-    
-    # 2. 환율 및 멤버 매핑 데이터
-    exchange_rates = get_exchange_rates(request.user, start_date, end_date)
-    ad_unit_member_map = get_ad_unit_member_mapping(request.user)
-    
-    # 날짜 리스트 생성
-    date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
-    
-    # 3. 구글/네이버 수익을 Member level별로 분류
-    publisher_google_naver_data, partners_google_naver_data = calculate_platform_revenue_by_member_level(
-        request.user, start_date, end_date, ad_unit_member_map, exchange_rates
-    )
-    
-    # 4. 네이버 파워링크 수익 계산
-    publisher_google_naver_data, partners_google_naver_data = calculate_naver_powerlink_revenue(
-        request.user, start_date, end_date, publisher_google_naver_data, partners_google_naver_data
-    )
-    
-    # 5. 기타수익 데이터 조회
-    other_revenue_data = get_other_revenue_data(request.user, start_date, end_date)
-    
-    # 6. 일일 개별 플랫폼 수익 계산 (reports.py와 동일한 방식)
-    from stats.views.reports import calculate_daily_platform_revenue, get_naver_powerlink_detail_data
-    naver_powerlink_detail = get_naver_powerlink_detail_data(request.user, start_date, end_date)
-    daily_data = calculate_daily_platform_revenue(
-        date_list, publisher_google_naver_data, partners_google_naver_data, 
-        {}, naver_powerlink_detail, request.user, platform_list
-    )
-    
-    # 7. 모든 섹션 처리 (daily_data 전달)
-    section_results = process_all_sections(
-        request.user, platform_list, start_date, end_date, 
-        publisher_google_naver_data, partners_google_naver_data, other_revenue_data, daily_data
-    )
-    
-    # 8. 일별 매출 데이터 구성 (reports.py와 동일한 방식)
-    sales_data = {}
-    
-    for current_date in date_list:
-        sales_data[current_date] = {
-            'publisher': 0,
-            'partners': 0,
-            'stamply': 0,
-            'total': 0
+    sales_data = {
+        current_date: {
+            'publisher': publisher_revenue[current_date],
+            'partners': partners_revenue[current_date],
+            'stamply': stamply_revenue[current_date],
+            'total': publisher_revenue[current_date] + partners_revenue[current_date] + stamply_revenue[current_date],
         }
-        
-        # 퍼블리셔 수익 (개별 플랫폼 + 구글/네이버 + 기타수익)
-        if current_date in section_results['publisher']['data']:
-            # 개별 플랫폼 수익 (구글/네이버 제외)
-            for key, value in section_results['publisher']['data'][current_date].items():
-                platform, alias = key.split('|', 1)
-                if platform not in ['google', 'naver']:
-                    sales_data[current_date]['publisher'] += round(float(value))  # daily_data에서 이미 int로 저장됨
-            
-            # 구글/네이버 수익 추가
-            if current_date in daily_data['publisher_daily_google']:
-                sales_data[current_date]['publisher'] += int(daily_data['publisher_daily_google'][current_date])
-            if current_date in daily_data['publisher_daily_naver']:
-                sales_data[current_date]['publisher'] += int(daily_data['publisher_daily_naver'][current_date])
-        
-        # 파트너스 수익 (개별 플랫폼 + 구글/네이버 + 기타수익)
-        if current_date in section_results['partners']['data']:
-            # 개별 플랫폼 수익 (구글/네이버 제외)
-            for key, value in section_results['partners']['data'][current_date].items():
-                platform, alias = key.split('|', 1)
-                if platform not in ['google', 'naver']:
-                    sales_data[current_date]['partners'] += round(float(value))  # daily_data에서 이미 int로 저장됨
-            
-            # 구글/네이버 수익 추가
-            if current_date in daily_data['partners_daily_google']:
-                sales_data[current_date]['partners'] += int(daily_data['partners_daily_google'][current_date])
-            if current_date in daily_data['partners_daily_naver']:
-                sales_data[current_date]['partners'] += int(daily_data['partners_daily_naver'][current_date])
-        
-        # 스탬플리 수익 (section_results에서 가져오기)
-        if current_date in section_results['stamply']['data']:
-            sales_data[current_date]['stamply'] += int(sum(section_results['stamply']['data'][current_date].values()))
-        
-        # 기타수익 추가
-        if current_date in other_revenue_data:
-            for section, amount in other_revenue_data[current_date].items():
-                if section == 'publisher':
-                    sales_data[current_date]['publisher'] += int(amount)
-                elif section == 'partners':
-                    sales_data[current_date]['partners'] += int(amount)
-                elif section == 'stamply':
-                    sales_data[current_date]['stamply'] += int(amount)
-        
-        # 총합 계산
-        sales_data[current_date]['total'] = (
-            sales_data[current_date]['publisher'] + 
-            sales_data[current_date]['partners'] + 
-            sales_data[current_date]['stamply']
-        )
+        for current_date in date_list
+    }
     
-    # 매입 비용 데이터 조회
-    purchase_data = {}
-    for current_date in date_list:
-        purchase_data[current_date] = {
-            'publisher': 0,
-            'partners': 0,
-            'stamply': 0,
-            'total': 0
-        }
-        
-        # 기타수익에서 매입 비용 추출
-        if current_date in other_revenue_data:
-            for section, amount in other_revenue_data[current_date].items():
-                if section.endswith('_cost'):
-                    if section == 'publisher_cost':
-                        purchase_data[current_date]['publisher'] += int(amount)
-                    elif section == 'partners_cost':
-                        purchase_data[current_date]['partners'] += int(amount)
-                    elif section == 'stamply_cost':
-                        purchase_data[current_date]['stamply'] += int(amount)
-                    
-                    purchase_data[current_date]['total'] += int(amount)
+    # 매입 비용 데이터 조회 (기타수익의 매입 비용 항목, 일자별 캐시)
+    purchase_data = chain['purchase_data']
     
     # 날짜별로 정렬된 매출 데이터 구성
     sales_rows = []
@@ -268,119 +169,23 @@ def main_view(request):
     # 전월 종료일 계산
     prev_end_date = prev_start_date + timedelta(days=period_days - 1)
     
-    # 전월 데이터 조회 (reports.py와 동일한 로직 사용)
-    prev_exchange_rates = get_exchange_rates(request.user, prev_start_date, prev_end_date)
-    prev_ad_unit_member_map = get_ad_unit_member_mapping(request.user)
-    
-    # 전월 구글/네이버 수익을 Member level별로 분류
-    prev_publisher_google_naver_data, prev_partners_google_naver_data = calculate_platform_revenue_by_member_level(
-        request.user, prev_start_date, prev_end_date, prev_ad_unit_member_map, prev_exchange_rates
-    )
-    
-    # 전월 네이버 파워링크 수익 계산
-    prev_publisher_google_naver_data, prev_partners_google_naver_data = calculate_naver_powerlink_revenue(
-        request.user, prev_start_date, prev_end_date, prev_publisher_google_naver_data, prev_partners_google_naver_data
-    )
-    
-    # 전월 기타수익 데이터 조회
-    prev_other_revenue_data = get_other_revenue_data(request.user, prev_start_date, prev_end_date)
-    
-    # 전월 일일 개별 플랫폼 수익 계산
-    prev_naver_powerlink_detail = get_naver_powerlink_detail_data(request.user, prev_start_date, prev_end_date)
-    prev_daily_data = calculate_daily_platform_revenue(
-        [prev_start_date + timedelta(days=i) for i in range(period_days)], 
-        prev_publisher_google_naver_data, prev_partners_google_naver_data, 
-        {}, prev_naver_powerlink_detail, request.user, platform_list
-    )
-    
-    # 전월 모든 섹션 처리
-    prev_section_results = process_all_sections(
-        request.user, platform_list, prev_start_date, prev_end_date, 
-        prev_publisher_google_naver_data, prev_partners_google_naver_data, prev_other_revenue_data, prev_daily_data
-    )
-    
-    # 전월 네이버 파워링크 수익 계산
-    prev_publisher_google_naver_data, prev_partners_google_naver_data = calculate_naver_powerlink_revenue(
-        request.user, prev_start_date, prev_end_date, prev_publisher_google_naver_data, prev_partners_google_naver_data
-    )
-    
-    # 전월 기타수익 데이터 조회
-    prev_other_revenue_data = get_other_revenue_data(request.user, prev_start_date, prev_end_date)
+    # 전월 데이터 조회 (당월과 같은 그래프에서 계산)
+    prev_chain = get_revenue_chain(graph, prev_start_date, prev_end_date)
     
-    # 전월 모든 섹션 처리
-    prev_section_results = process_all_sections(
-        request.user, platform_list, prev_start_date, prev_end_date, 
-        prev_publisher_google_naver_data, prev_partners_google_naver_data, prev_other_revenue_data
-    )
-    
-    # 전월 매출 합계 계산 (reports.py와 동일한 방식)
-    prev_sales_total = {'publisher': 0, 'partners': 0, 'stamply': 0, 'total': 0}
-    
-    # 전월 일별 매출 데이터 계산
-    prev_date_list = [prev_start_date + timedelta(days=i) for i in range(period_days)]
-    for current_date in prev_date_list:
-        # 퍼블리셔 수익 (개별 플랫폼 + 구글/네이버 + 기타수익)
-        if current_date in prev_section_results['publisher']['data']:
-            # 개별 플랫폼 수익 (구글/네이버 제외)
-            for key, value in prev_section_results['publisher']['data'][current_date].items():
-                platform, alias = key.split('|', 1)
-                if platform not in ['google', 'naver']:
-                    prev_sales_total['publisher'] += int(value)
-            
-            # 구글/네이버 수익 추가
-            if current_date in prev_daily_data['publisher_daily_google']:
-                prev_sales_total['publisher'] += int(prev_daily_data['publisher_daily_google'][current_date])
-            if current_date in prev_daily_data['publisher_daily_naver']:
-                prev_sales_total['publisher'] += int(prev_daily_data['publisher_daily_naver'][current_date])
-        
-        # 파트너스 수익 (개별 플랫폼 + 구글/네이버 + 기타수익)
-        if current_date in prev_section_results['partners']['data']:
-            # 개별 플랫폼 수익 (구글/네이버 제외)
-            for key, value in prev_section_results['partners']['data'][current_date].items():
-                platform, alias = key.split('|', 1)
-                if platform not in ['google', 'naver']:
-                    prev_sales_total['partners'] += int(value)
-            
-            # 구글/네이버 수익 추가
-            if current_date in prev_daily_data['partners_daily_google']:
-                prev_sales_total['partners'] += int(prev_daily_data['partners_daily_google'][current_date])
-            if current_date in prev_daily_data['partners_daily_naver']:
-                prev_sales_total['partners'] += int(prev_daily_data['partners_daily_naver'][current_date])
-        
-        # 스탬플리 수익
-        if current_date in prev_section_results['stamply']['data']:
-            prev_sales_total['stamply'] += int(sum(prev_section_results['stamply']['data'][current_date].values()))
-        
-        # 기타수익 추가
-        if current_date in prev_other_revenue_data:
-            for section, amount in prev_other_revenue_data[current_date].items():
-                if section == 'publisher':
-                    prev_sales_total['publisher'] += int(amount)
-                elif section == 'partners':
-                    prev_sales_total['partners'] += int(amount)
-                elif section == 'stamply':
-                    prev_sales_total['stamply'] += int(amount)
-    
-    # 전월 총합 계산
-    prev_sales_total['total'] = (
-        prev_sales_total['publisher'] + 
-        prev_sales_total['partners'] + 
-        prev_sales_total['stamply']
+    # 전월 매출 합계 계산 (당월과 같은 함수/반올림 규칙)
+    prev_revenue = calculate_section_revenue(
+        prev_chain['date_list'], prev_chain['section_results'], prev_chain['daily_data'], prev_chain['other_revenue_data']
     )
+    prev_sales_total = {
+        section_name: sum(revenue.values()) for section_name, revenue in zip(SECTION_NAMES, prev_revenue)
+    }
+    prev_sales_total['total'] = prev_sales_total['publisher'] + prev_sales_total['partners'] + prev_sales_total['stamply']
     
     # 전월 매입 합계 계산
     prev_purchase_total = {'publisher': 0, 'partners': 0, 'stamply': 0, 'total': 0}
-    for date_data in prev_other_revenue_data.values():
-        for section, amount in date_data.items():
-            if section.endswith('_cost'):
-                if section == 'publisher_cost':
-                    prev_purchase_total['publisher'] += int(amount)
-                elif section == 'partners_cost':
-                    prev_purchase_total['partners'] += int(amount)
-                elif section == 'stamply_cost':
-                    prev_purchase_total['stamply'] += int(amount)
-                
-                prev_purchase_total['total'] += int(amount)
+    for day_totals in prev_chain['purchase_data'].values():
+        for key in prev_purchase_total:
+            prev_purchase_total[key] += day_totals[key]
     
     # 전월대비 증감 계산
     sales_mom = {
@@ -417,7 +222,10 @@ def main_view(request):
         'purchase_mom': purchase_mom,
         'profit_mom': profit_mom,
     }
-    return render(request, 'home.html', context)
+    graph.log_timings('main')
+    response = render(request, 'home.html', context)
+    response['Server-Timing'] = graph.server_timing()
+    return response
 
 @login_required
 @require_POST
@@ -4,7 +4,7 @@ from django.conf import settings
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_POST
 from django.db.models import Sum, Count
@@ -25,6 +25,8 @@ from ..models import (
     PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
+from ..services.data_versions import bump
+from ..services.xlsx_stream import XLSX_CONTENT_TYPE, XlsxSheet, stream_xlsx
 from .sales import generate_sales_context
 
 logger = logging.getLogger(__name__)
@@ -102,217 +104,111 @@ def settlement_department_delete(request, pk):
 
 @login_required
 def sales_excel_download_view(request):
-    """매출 현황 데이터를 엑셀 파일로 다운로드"""
+    """매출 현황 데이터를 엑셀 파일로 다운로드 (MonthlySales 를 한 번 순회해 집계 후 스트리밍)"""
     year = request.GET.get('year', datetime.now().year)
     try:
         year = int(year)
     except (ValueError, TypeError):
         year = datetime.now().year
 
-    # 원본 MonthlySales 데이터 조회
-    from stats.models import MonthlySales, ServiceGroup, SettlementDepartment
-    from django.db.models import Sum
-    from datetime import date
-    
-    monthly_data = MonthlySales.objects.filter(
+    months = list(range(1, 13))
+    month_index = {date(year, month, 1): month for month in months}
+
+    # 원본 MonthlySales 1회 순회로 그룹별/서비스코드별/월별 합계 집계
+    group_monthly = {}
+    service_monthly = {}
+    service_names = {}  # 서비스코드별 첫 항목의 (업체명, 서비스명) - 기존 정렬 순서 유지
+    revenue_monthly = {m: 0 for m in months}
+    purchase_monthly = {m: 0 for m in months}
+    rows = MonthlySales.objects.filter(
         user=request.user,
         year_month__year=year
-    ).order_by('year_month', 'company_name', 'service_name')
-    
-    # 부서 정보 조회
-    departments = SettlementDepartment.objects.filter(user=request.user)
-    departments_map = {d.id: d.name for d in departments}
-    
-    # 그룹 정보 조회
-    groups = ServiceGroup.objects.filter(user=request.user)
-    groups_map = {g.group_code: g for g in groups}
-
-    # 엑셀 워크북 생성
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    sheet.title = f"{year}년 매출 현황"
-
-    # --- 헤더 생성 ---
-    header = [
-        '구분', '유형', '담당부서', '정산기간', '업체명', '서비스명', '서비스코드'
-    ]
-    months = list(range(1, 13))
-    for month in months:
-        header.extend([f'{month}월', '증감'])
-    header.append('총합')
-    sheet.append(header)
-
-    # --- 그룹별 데이터 추가 ---
-    for group in groups:
-        group_sales = monthly_data.filter(group=group)
-        if not group_sales.exists():
+    ).order_by('year_month', 'company_name', 'service_name').values_list(
+        'group_id', 'service_code', 'company_name', 'service_name', 'year_month', 'amount'
+    )
+    for group_id, service_code, company_name, service_name, year_month, amount in rows.iterator(chunk_size=2000):
+        month = month_index.get(year_month)
+        if month is None:
             continue
-            
-        # 그룹의 월별 데이터 계산
-        monthly_sales = {}
-        monthly_changes = {}
-        total_amount = 0
-        
-        for month in months:
-            month_start = date(year, month, 1)
-            month_amount = group_sales.filter(year_month=month_start).aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            monthly_sales[month] = month_amount
-            total_amount += month_amount
-            
-            # 증감 계산
-            if month == 1:
-                monthly_changes[month] = month_amount
-            else:
-                prev_month_amount = monthly_sales.get(month - 1, 0)
-                monthly_changes[month] = month_amount - prev_month_amount
-        
-        # 그룹 행 추가
-        department_name = departments_map.get(group.settlement_department.id if group.settlement_department else None, '')
-        row = [
-            '그룹',
-            group.issue_type or '',
-            department_name,
-            group.settlement_timing or '',
-            group.company_name,
-            group.service_name,
-            group.group_code,
-        ]
+        amount = amount or 0
+        if group_id is not None:
+            monthly = group_monthly.setdefault(group_id, {m: 0 for m in months})
+        else:
+            monthly = service_monthly.setdefault(service_code, {m: 0 for m in months})
+            service_names.setdefault(service_code, (company_name, service_name))
+        monthly[month] += amount
+        # 매출(양수) / 매입(음수 절대값)
+        if amount > 0:
+            revenue_monthly[month] += amount
+        elif amount < 0:
+            purchase_monthly[month] += -amount
+
+    departments_map = dict(SettlementDepartment.objects.filter(user=request.user).values_list('id', 'name'))
+
+    def amount_cells(monthly):
+        """월별 금액/증감 셀 + 총합"""
+        cells = []
         for month in months:
-            row.append(monthly_sales.get(month, 0))
-            row.append(monthly_changes.get(month, 0))
-        row.append(total_amount)
-        sheet.append(row)
-
-    # --- 개별 데이터 추가 (그룹에 속하지 않은 항목들) ---
-    ungrouped_sales = monthly_data.filter(group__isnull=True)
-    service_groups = {}
-    for sale in ungrouped_sales:
-        service_code = sale.service_code
-        if service_code not in service_groups:
-            service_groups[service_code] = []
-        service_groups[service_code].append(sale)
-    
-    for service_code, sales_list in service_groups.items():
-        # 개별 항목의 월별 데이터 계산
-        monthly_sales = {}
-        monthly_changes = {}
-        total_amount = 0
-        
+            cells.append(monthly[month])
+            cells.append(monthly[month] if month == 1 else monthly[month] - monthly[month - 1])
+        cells.append(sum(monthly.values()))
+        return cells
+
+    def summary_cells(monthly, total):
+        cells = []
         for month in months:
-            month_start = date(year, month, 1)
-            month_amount = sum(sale.amount for sale in sales_list if sale.year_month == month_start)
-            monthly_sales[month] = month_amount
-            total_amount += month_amount
-            
-            # 증감 계산
-            if month == 1:
-                monthly_changes[month] = month_amount
-            else:
-                prev_month_amount = monthly_sales.get(month - 1, 0)
-                monthly_changes[month] = month_amount - prev_month_amount
-        
-        # 개별 항목 행 추가
-        first_sale = sales_list[0]
-        row = [
-            '개별',
-            '',  # 개별 항목은 발행유형 없음
-            '',  # 개별 항목은 담당부서 없음
-            '',  # 개별 항목은 정산기간 없음
-            first_sale.company_name,
-            first_sale.service_name,
-            service_code,
-        ]
+            cells.extend([monthly[month], ''])  # 증감 없음
+        cells.append(total)
+        return cells
+
+    def sheet_rows():
+        # --- 헤더 ---
+        header = ['구분', '유형', '담당부서', '정산기간', '업체명', '서비스명', '서비스코드']
         for month in months:
-            row.append(monthly_sales.get(month, 0))
-            row.append(monthly_changes.get(month, 0))
-        row.append(total_amount)
-        sheet.append(row)
+            header.extend([f'{month}월', '증감'])
+        header.append('총합')
+        yield header
+
+        # --- 그룹별 데이터 ---
+        for group in ServiceGroup.objects.filter(user=request.user).values_list(
+            'id', 'issue_type', 'settlement_department_id', 'settlement_timing', 'company_name', 'service_name', 'group_code'
+        ).iterator():
+            group_id, issue_type, department_id, settlement_timing, company_name, service_name, group_code = group
+            if group_id not in group_monthly:
+                continue
+            yield [
+                '그룹', issue_type or '', departments_map.get(department_id, ''), settlement_timing or '',
+                company_name, service_name, group_code,
+            ] + amount_cells(group_monthly[group_id])
+
+        # --- 개별 데이터 (그룹에 속하지 않은 항목들) ---
+        for service_code, monthly in service_monthly.items():
+            company_name, service_name = service_names[service_code]
+            # 개별 항목은 발행유형/담당부서/정산기간 없음
+            yield ['개별', '', '', '', company_name, service_name, service_code] + amount_cells(monthly)
+
+        # --- 요약 행 ---
+        yield []  # Spacer
+        total_revenue = sum(revenue_monthly.values())
+        total_purchase = sum(purchase_monthly.values())
+        total_gross_profit = total_revenue - total_purchase
+        gross_profit_monthly = {m: revenue_monthly[m] - purchase_monthly[m] for m in months}
+        profit_rate_monthly = {
+            m: (gross_profit_monthly[m] / revenue_monthly[m] * 100) if revenue_monthly[m] > 0 else 0 for m in months
+        }
+        total_profit_rate = (total_gross_profit / total_revenue * 100) if total_revenue > 0 else 0
 
-    # --- 요약 행 추가 ---
-    sheet.append([]) # Spacer
-    
-    # 월별 매출/매입 계산
-    revenue_monthly = {m: 0 for m in months}
-    purchase_monthly = {m: 0 for m in months}
-    
-    for month in months:
-        month_start = date(year, month, 1)
-        
-        # 매출 데이터 (양수)
-        revenue = monthly_data.filter(
-            year_month=month_start,
-            amount__gt=0
-        ).aggregate(
-            total_amount=Sum('amount')
-        )['total_amount'] or 0
-        
-        # 매입 데이터 (음수 절대값)
-        purchase = monthly_data.filter(
-            year_month=month_start,
-            amount__lt=0
-        ).aggregate(
-            total_amount=Sum('amount')
-        )['total_amount'] or 0
-        
-        revenue_monthly[month] = revenue
-        purchase_monthly[month] = abs(purchase)
-    
-    # 총합 계산
-    total_revenue = sum(revenue_monthly.values())
-    total_purchase = sum(purchase_monthly.values())
-    total_gross_profit = total_revenue - total_purchase
-    
-    # 월별 손익
-    sheet.append(['--- 월별 손익 ---'])
-    
-    # 매출
-    row = ['매출', '', '', '', '', '', '']
-    for month in months:
-        row.append(revenue_monthly.get(month, 0))
-        row.append('')  # 증감 없음
-    row.append(total_revenue)
-    sheet.append(row)
-    
-    # 매입
-    row = ['매입', '', '', '', '', '', '']
-    for month in months:
-        row.append(purchase_monthly.get(month, 0))
-        row.append('')  # 증감 없음
-    row.append(total_purchase)
-    sheet.append(row)
-    
-    # 매출총이익
-    row = ['매출총이익', '', '', '', '', '', '']
-    for month in months:
-        gross_profit = revenue_monthly.get(month, 0) - purchase_monthly.get(month, 0)
-        row.append(gross_profit)
-        row.append('')  # 증감 없음
-    row.append(total_gross_profit)
-    sheet.append(row)
-
-    # 이익율
-    total_profit_rate = (total_gross_profit / total_revenue * 100) if total_revenue > 0 else 0
-    row = ['이익율(%)', '', '', '', '', '', '']
-    for month in months:
-        revenue = revenue_monthly.get(month, 0)
-        if revenue > 0:
-            profit_rate = ((revenue_monthly.get(month, 0) - purchase_monthly.get(month, 0)) / revenue) * 100
-        else:
-            profit_rate = 0
-        row.append(profit_rate)
-        row.append('')  # 증감 없음
-    row.append(total_profit_rate)
-    sheet.append(row)
-
-    # --- HttpResponse로 반환 ---
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        yield ['--- 월별 손익 ---']
+        yield ['매출', '', '', '', '', '', ''] + summary_cells(revenue_monthly, total_revenue)
+        yield ['매입', '', '', '', '', '', ''] + summary_cells(purchase_monthly, total_purchase)
+        yield ['매출총이익', '', '', '', '', '', ''] + summary_cells(gross_profit_monthly, total_gross_profit)
+        yield ['이익율(%)', '', '', '', '', '', ''] + summary_cells(profit_rate_monthly, total_profit_rate)
+
+    response = StreamingHttpResponse(
+        stream_xlsx([XlsxSheet(f"{year}년 매출 현황", sheet_rows())]),
+        content_type=XLSX_CONTENT_TYPE,
     )
     response['Content-Disposition'] = f'attachment; filename="{year}년_매출_현황.xlsx"'
-    workbook.save(response)
-
     return response
 
 # ===== 매입 그룹 관리 =====
@@ -635,6 +531,8 @@ def _handle_ad_units_api(request, platform):
             purchase_group=group,
             platform=platform
         ).update(is_active=False)
+        # QuerySet.update 는 시그널이 없으므로 매입 데이터 버전을 직접 올림
+        bump(request.user, 'purchase')
         
         # 새로운 매핑 생성
         for ad_unit_id in ad_unit_ids:
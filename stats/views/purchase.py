@@ -4,7 +4,7 @@ from django.conf import settings
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_POST
 from django.db.models import Sum, Count
@@ -17,7 +17,6 @@ from decimal import Decimal, ROUND_HALF_UP
 import logging
 from rest_framework.decorators import api_view
 from django.db.models import Q
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 import calendar
 from django.core.cache import cache
 
@@ -26,12 +25,21 @@ from ..models import (
     AdStats, PlatformCredential, UserPreference, MonthlySales, 
     SettlementDepartment, ServiceGroup, PurchaseGroup, Member, 
     PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate,
-    MonthlyAdjustment
+    MonthlyAdjustment, NewspicDailyStat
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
+from ..services.purchase_prices import PurchasePriceResolver, get_price_index
+from ..services.publisher_costs import get_monthly_publisher_costs, group_cost_specs, purchase_cost_deps, ungrouped_cost_specs
+from ..services.data_versions import bump, versioned_key
+from ..services.powerlink import PowerlinkAllocator, member_powerlink_matrix
+from ..services.member_directory import get_members, member_summary, prefetch_members
+from ..services.xlsx_stream import XLSX_CONTENT_TYPE, XlsxSheet, stream_xlsx
 
 logger = logging.getLogger(__name__)
 
+# 매입 현황 캐시 만료 (멤버 목록/등급은 newspic 원본이라 데이터 버전으로 추적되지 않음)
+PURCHASE_REPORT_CACHE_TIMEOUT = 60 * 60 * 24
+
 def calculate_purchase_cost_by_date_range(user, start_date, end_date):
     """
     지정된 날짜 범위의 매입비용을 계산하여 반환
@@ -51,8 +59,8 @@ def calculate_purchase_cost_by_date_range(user, start_date, end_date):
         'partners_cost': {d: Decimal('0') for d in date_list}
     }
     
-    # 1. 모든 PurchaseGroup 조회
-    all_groups = PurchaseGroup.objects.filter(user=user, is_active=True)
+    # 1. 모든 PurchaseGroup 조회 (Member 는 1회 조회로 일괄 연결)
+    all_groups = prefetch_members(PurchaseGroup.objects.filter(user=user, is_active=True))
     
     # 2. 모든 광고 단위 ID 수집
     all_ad_unit_ids = []
@@ -97,47 +105,33 @@ def calculate_purchase_cost_by_date_range(user, start_date, end_date):
             stats_map[key] = stat['earnings'] or 0
     
     # 6. 파워링크(애드포스트) 수익 분배 로직 (세부 데이터와 동일한 방식)
-    # 6-1. 파워링크(애드포스트) 데이터 일괄 조회
-    adpost_stats = AdStats.objects.filter(
-        platform='adpost',
-        ad_unit_id='모바일뉴스픽_컨텐츠',
-        date__range=[start_date, end_date],
-        user=user
-    ).values('date').annotate(
-        earnings=Sum('earnings'),
-        clicks=Sum('clicks')
-    )
-    adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
+    # 6-1. 파워링크(애드포스트) 데이터 및 전체 파워링크 클릭수 일괄 조회
+    allocator = PowerlinkAllocator.load(user, date_list)
     
-    # 6-2. 전체 파워링크 클릭수 일괄 조회
-    total_powerlink_stats = TotalStat.newspic_objects().filter(
-        sdate__range=[start_date, end_date]
-    ).values('sdate').annotate(
-        total_powerlink=Sum('powerlink_count')
-    )
-    total_powerlink_data = {stat['sdate']: stat['total_powerlink'] or 0 for stat in total_powerlink_stats}
-    
-    # 6-3. 퍼블리셔별 파워링크 클릭수 일괄 조회
+    # 6-2. 퍼블리셔별 파워링크 클릭수 일괄 조회
     publisher_keys = [group.member.request_key for group in all_groups]
-    member_powerlink_stats = TotalStat.newspic_objects().filter(
+    member_powerlink_stats = NewspicDailyStat.objects.filter(
         request_key__in=publisher_keys,
-        sdate__range=[start_date, end_date]
-    ).values('request_key', 'sdate').annotate(
-        powerlink_count=Sum('powerlink_count'),
-        click_count=Sum('click_count')
-    )
-    member_powerlink_data = {(stat['request_key'], stat['sdate']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
+        date__range=[start_date, end_date]
+    ).values('request_key', 'date', 'powerlink_count', 'click_count')
+    member_powerlink_data = {(stat['request_key'], stat['date']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
     
-    # 7. 각 그룹별 일별 매입비용 계산
+    # 6-3. 퍼블리셔 × 날짜 파워링크 분배액 (원 단위)
+    powerlink_units = allocator.allocate_units(member_powerlink_matrix(
+        publisher_keys, date_list,
+        counts={key: values['powerlink_count'] for key, values in member_powerlink_data.items()},
+    ))
+    publisher_index = {request_key: i for i, request_key in enumerate(publisher_keys)}
+    
+    # 7. 각 그룹별 일별 매입비용 계산 (적용 단가는 단가 인덱스에서 조회)
+    price_resolver = PurchasePriceResolver(user)
     for group in all_groups:
         member_level = group.member.level if group.member else 60
-        default_price = group.default_unit_price
-        default_type = group.default_unit_type
         
         # 해당 그룹의 매핑된 광고 단위들 조회
         ad_units = group.ad_units.filter(is_active=True)
         
-        for current_date in date_list:
+        for j, current_date in enumerate(date_list):
             ad_revenue = Decimal('0')
             
             # 1. 애드센스/애드매니저 광고수익 합산
@@ -146,25 +140,12 @@ def calculate_purchase_cost_by_date_range(user, start_date, end_date):
                 ad_revenue += Decimal(str(stats_map.get(stat_key, 0)))
             
             # 2. 파워링크(애드포스트) 수익 분배
-            adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-            total_powerlink_count = total_powerlink_data.get(current_date, 0)
             member_data = member_powerlink_data.get((group.member.request_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-            powerlink_count = member_data['powerlink_count']
             click_count = member_data['click_count']
-            
-            adpost_earnings = adpost_info['earnings']
-            adpost_clicks = adpost_info['clicks']
-            powerlink_revenue = Decimal('0')
-            
-            if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-            
-            ad_revenue += powerlink_revenue
+            ad_revenue += Decimal(int(powerlink_units[publisher_index[group.member.request_key], j]))
             
             # 3. 매입비용 계산
-            rs_rate = default_price or 0
-            rs_type = default_type or 'percent'
+            rs_rate, rs_type = price_resolver.resolve(group.member_request_key, current_date)
             purchase_cost = Decimal('0')
             
             if rs_type == 'percent':
@@ -226,6 +207,8 @@ def purchase_report_view(request):
             # 모든 사용자의 PurchaseGroup의 is_important 상태를 일괄 변경
             all_user_groups = PurchaseGroup.objects.filter(user=request.user, is_active=True)
             all_user_groups.update(is_important=is_important)
+            # QuerySet.update 는 시그널이 없으므로 매입 데이터 버전을 직접 올림
+            bump(request.user, 'purchase')
             
             messages.success(request, f"모든 퍼블리셔의 주요 설정이 {'설정' if is_important else '해제'}되었습니다.")
             redirect_url = f'/purchase-report/?year={year}&search={search_query}'
@@ -240,17 +223,20 @@ def purchase_report_view(request):
                     important_publishers.add(publisher_code)
             
             # 모든 PurchaseGroup의 is_important 상태 업데이트
-            all_user_groups = PurchaseGroup.objects.filter(user=request.user, is_active=True)
+            all_user_groups = prefetch_members(PurchaseGroup.objects.filter(user=request.user, is_active=True))
             for group in all_user_groups:
                 is_important = group.member.request_key in important_publishers
                 if group.is_important != is_important:
                     group.is_important = is_important
                     group.save()
             
-            # 그룹이 없는 멤버를 주요 퍼블리셔로 설정할 때 그룹 생성
+            # 그룹이 없는 멤버를 주요 퍼블리셔로 설정할 때 그룹 생성 (Member 는 1회 일괄 조회)
+            important_members = get_members(important_publishers)
             for publisher_code in important_publishers:
                 try:
-                    member = Member.newspic_objects().get(request_key=publisher_code)
+                    member = important_members.get(publisher_code)
+                    if member is None:
+                        raise Member.DoesNotExist
                     existing_group = PurchaseGroup.objects.filter(member_request_key=publisher_code, user=request.user, is_active=True).first()
                     
                     if not existing_group:
@@ -301,10 +287,13 @@ def purchase_report_view(request):
             success_count = 0
             error_count = 0
             
-            # 화면에 표시된 각 항목에 대해 업데이트를 처리합니다.
+            # 화면에 표시된 각 항목에 대해 업데이트를 처리합니다. (Member 는 1회 일괄 조회)
+            submitted_members = get_members(submitted_codes)
             for code in submitted_codes:
                 try:
-                    member = Member.newspic_objects().get(request_key=code)
+                    member = submitted_members.get(code)
+                    if member is None:
+                        raise Member.DoesNotExist
                     pg, created = PurchaseGroup.objects.get_or_create(
                         member_request_key=code, 
                         user=request.user,
@@ -430,18 +419,18 @@ def purchase_report_view(request):
     # 검색어가 없고 important_only가 True이면 주요 퍼블리셔만 표시
     if not search_query and important_only:
         # 주요 퍼블리셔만 기본으로 표시
-        important_groups = PurchaseGroup.objects.filter(
+        important_groups = prefetch_members(PurchaseGroup.objects.filter(
             user=request.user, 
             is_active=True,
             is_important=True
-        ).prefetch_related('ad_units')
+        ).prefetch_related('ad_units'))
         
         # 주요 퍼블리셔의 멤버들
         important_member_keys = {group.member.request_key for group in important_groups}
         
         # 주요 퍼블리셔 데이터 처리 (성능 최적화된 일별 계산)
-        # 캐시 키 생성 (더 구체적으로)
-        cache_key = f"purchase_data_important_{request.user.id}_{year}_{request.session.session_key}"
+        # 캐시 키: 매입비용 입력 데이터 버전 기준 (세션과 무관하게 공유, 데이터 변경 시 자동 갱신)
+        cache_key = versioned_key('purchase_data_important', request.user, purchase_cost_deps(year), year)
         
         # 캐시에서 데이터 확인
         cached_data = cache.get(cache_key)
@@ -505,125 +494,13 @@ def purchase_report_view(request):
         publisher_total = {m: Decimal('0') for m in months}
         partners_total = {m: Decimal('0') for m in months}
         
-        # 모든 광고 단위 ID 수집
-        all_ad_unit_ids = []
-        for group in important_groups:
-            for ad_unit in group.ad_units.all():
-                if ad_unit.is_active:
-                    all_ad_unit_ids.append(ad_unit.ad_unit_id)
-        
-        # 1. AdStats 데이터 일괄 조회 (일별 데이터)
-        ad_stats = AdStats.objects.filter(
-            user=request.user,
-            ad_unit_id__in=all_ad_unit_ids,
-            date__year=year
-        ).values('date', 'platform', 'ad_unit_id').annotate(
-            earnings=Sum('earnings'),
-            earnings_usd=Sum('earnings_usd')
-        )
-        
-        # 2. 환율 데이터 일괄 조회
-        exchange_rates = ExchangeRate.objects.filter(
-            user=request.user, 
-            year_month__gte=date(year, 1, 1)
-        ).values('year_month', 'usd_to_krw')
-        exchange_rate_map = {rate['year_month']: rate['usd_to_krw'] for rate in exchange_rates}
-        
-        # 3. stats_map 생성 (세부 데이터와 동일한 방식)
-        stats_map = {}
-        for stat in ad_stats:
-            key = (stat['date'], stat['ad_unit_id'])
-            if stat['platform'] == 'adsense':
-                month_start = stat['date'].replace(day=1)
-                exchange_rate = exchange_rate_map.get(month_start, Decimal('1370.00'))
-                stats_map[key] = (stat['earnings_usd'] or 0) * float(exchange_rate)
-            elif stat['platform'] == 'admanager':
-                stats_map[key] = stat['earnings'] or 0
-            elif stat['platform'] == 'adpost':
-                stats_map[key] = stat['earnings'] or 0
-            else:
-                stats_map[key] = stat['earnings'] or 0
-        
-        # 4. 파워링크(애드포스트) 수익 분배 로직
-        # 4-1. 파워링크(애드포스트) 데이터 일괄 조회
-        adpost_stats = AdStats.objects.filter(
-            platform='adpost',
-            ad_unit_id='모바일뉴스픽_컨텐츠',
-            date__year=year,
-            user=request.user
-        ).values('date').annotate(
-            earnings=Sum('earnings'),
-            clicks=Sum('clicks')
-        )
-        adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
-        
-        # 4-2. 전체 파워링크 클릭수 일괄 조회
-        total_powerlink_stats = TotalStat.newspic_objects().filter(
-            sdate__year=year
-        ).values('sdate').annotate(
-            total_powerlink=Sum('powerlink_count')
-        )
-        total_powerlink_data = {stat['sdate']: stat['total_powerlink'] or 0 for stat in total_powerlink_stats}
-        
-        # 4-3. 퍼블리셔별 파워링크 클릭수 일괄 조회
-        publisher_keys = [group.member.request_key for group in important_groups]
-        member_powerlink_stats = TotalStat.newspic_objects().filter(
-            request_key__in=publisher_keys,
-            sdate__year=year
-        ).values('request_key', 'sdate').annotate(
-            powerlink_count=Sum('powerlink_count'),
-            click_count=Sum('click_count')
-        )
-        member_powerlink_data = {(stat['request_key'], stat['sdate']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
+        # 퍼블리셔별 월 매입비용 (MonthlyPublisherCost 기준, 데이터/단가가 바뀐 월만 재계산)
+        group_costs = get_monthly_publisher_costs(request.user, year, group_cost_specs(important_groups, get_price_index(request.user, year)))
         
         for group in important_groups:
-            monthly_cost = {m: Decimal('0') for m in months}
             default_price = group.default_unit_price
             default_type = group.default_unit_type
-            ad_units = group.ad_units.filter(is_active=True)
-            
-            # 해당 연도의 모든 날짜에 대해 일별 계산 (세부 데이터와 동일한 방식)
-            for m in months:
-                last_day = calendar.monthrange(year, m)[1]
-                for d in range(1, last_day + 1):
-                    current_date = date(year, m, d)
-                    
-                    # 1. AdSense/AdManager 일별 수익 계산 (세부 데이터와 동일한 방식)
-                    ad_revenue = Decimal('0')
-                    for ad_unit in ad_units:
-                        stat_key = (current_date, ad_unit.ad_unit_id)
-                        ad_revenue += Decimal(str(stats_map.get(stat_key, 0)))
-                    
-                    # 2. AdPost 일별 수익 분배 (세부 데이터와 동일한 방식)
-                    adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                    total_powerlink_count = total_powerlink_data.get(current_date, 0)
-                    member_data = member_powerlink_data.get((group.member.request_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-                    powerlink_count = member_data['powerlink_count']
-                    click_count = member_data['click_count']
-                    
-                    adpost_earnings = adpost_info['earnings']
-                    adpost_clicks = adpost_info['clicks']
-                    powerlink_revenue = Decimal('0')
-                    
-                    if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                        unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                        powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-                    
-                    ad_revenue += powerlink_revenue
-                    
-                    # 3. 매입비용 계산 (세부 데이터와 동일한 방식)
-                    rs_rate = default_price or 0
-                    rs_type = default_type or 'percent'
-                    purchase_cost = Decimal('0')
-                    
-                    if rs_type == 'percent':
-                        purchase_cost = ad_revenue * (Decimal(str(rs_rate)) / Decimal('100'))
-                    else:
-                        # RS단가가 percent가 아닌 경우 tbTotalStat의 click_count에 RS단가를 곱함
-                        purchase_cost = Decimal(str(click_count)) * Decimal(str(rs_rate))
-                    
-                    # 4. 월별 매입비용에 누적 (세부 데이터와 동일한 반올림 방식)
-                    monthly_cost[m] += int(purchase_cost)
+            monthly_cost = {m: Decimal(group_costs[group.member_request_key][m]) for m in months}
             
             # 합계 반영
             if group.member.level == 50:
@@ -639,7 +516,7 @@ def purchase_report_view(request):
                 'publisher_code': group.member.request_key,
                 'monthly_cost': monthly_cost,
                 'has_group': True,
-                'member': group.member,
+                'member': member_summary(group.member),
                 'is_important': group.is_important,
             })
         
@@ -672,12 +549,12 @@ def purchase_report_view(request):
         partners_changes = calculate_monthly_changes(partners_total)
         total_changes = calculate_monthly_changes(total)
         
-        # 24시간 캐시 저장 (86400초)
+        # 멤버 목록/등급(newspic)은 데이터 버전에 포함되지 않으므로 최대 하루 캐시
         cache.set(cache_key, {
             'purchase_data': purchase_data,
             'publisher_total': publisher_total,
             'partners_total': partners_total
-        }, 86400)
+        }, PURCHASE_REPORT_CACHE_TIMEOUT)
         logger.info(f"캐시 SET: {cache_key} - 주요 퍼블리셔 데이터 저장 완료")
         
         context = {
@@ -734,6 +611,7 @@ def purchase_report_view(request):
                 Q(service_name__icontains=term)
             )
         all_groups = all_groups.filter(group_query)
+    prefetch_members(all_groups)
     
     # 그룹에 속한 멤버들의 request_key 수집 (검색어가 없거나 추가로 필요한 경우)
     for group in all_groups:
@@ -741,7 +619,7 @@ def purchase_report_view(request):
     
     # important_only가 True이고 검색어가 없으면 주요 항목만 필터링
     if important_only and not search_query:
-        all_groups = all_groups.filter(is_important=True)
+        all_groups = prefetch_members(all_groups.filter(is_important=True))
         # 주요 퍼블리셔의 멤버들만 유지
         important_member_keys = {group.member.request_key for group in all_groups}
         needed_request_keys = needed_request_keys.intersection(important_member_keys)
@@ -786,8 +664,11 @@ def purchase_report_view(request):
     all_members_map = {member.request_key: member for member in all_members}
     
     # 3. 월별 합계 초기화
-    # 캐시 키 생성 (더 구체적으로)
-    cache_key = f"purchase_data_all_{request.user.id}_{year}_{search_query}_{important_only}_{request.session.session_key}"
+    # 캐시 키: 조회 조건(페이지 포함) + 매입비용 입력 데이터 버전
+    cache_key = versioned_key(
+        'purchase_data_all', request.user, purchase_cost_deps(year),
+        year, search_query, important_only, page_obj.number if page_obj else None,
+    )
     
     # 캐시에서 데이터 확인
     cached_data = cache.get(cache_key)
@@ -854,123 +735,13 @@ def purchase_report_view(request):
     
     # 4. 그룹별 데이터 처리 - 각 멤버별로 개별 행 표시
     
-    # 모든 광고 단위 ID 수집 (메모리에서 처리)
-    all_ad_unit_ids = []
-    for group in all_groups:
-        for ad_unit in group.ad_units.all():
-            if ad_unit.is_active:
-                all_ad_unit_ids.append(ad_unit.ad_unit_id)
-    
-    # AdStats 데이터 일괄 조회 (세부 데이터와 동일한 방식)
-    ad_stats = AdStats.objects.filter(
-        user=request.user,
-        ad_unit_id__in=all_ad_unit_ids,
-        date__year=year
-    ).values('date', 'platform', 'ad_unit_id').annotate(
-        earnings=Sum('earnings'),
-        earnings_usd=Sum('earnings_usd')
-    )
-    
-    # 환율 데이터 일괄 조회 (세부 데이터와 동일한 방식)
-    exchange_rates = ExchangeRate.objects.filter(
-        user=request.user, 
-        year_month__gte=date(year, 1, 1)
-    ).values('year_month', 'usd_to_krw')
-    exchange_rate_map = {rate['year_month']: rate['usd_to_krw'] for rate in exchange_rates}
-    
-    # stats_map 생성 (세부 데이터와 동일한 방식)
-    stats_map = {}
-    for stat in ad_stats:
-        key = (stat['date'], stat['ad_unit_id'])
-        if stat['platform'] == 'adsense':
-            month_start = stat['date'].replace(day=1)
-            exchange_rate = exchange_rate_map.get(month_start, Decimal('1370.00'))
-            stats_map[key] = (stat['earnings_usd'] or 0) * float(exchange_rate)
-        elif stat['platform'] == 'admanager':
-            stats_map[key] = stat['earnings'] or 0
-        elif stat['platform'] == 'adpost':
-            stats_map[key] = stat['earnings'] or 0
-        else:
-            stats_map[key] = stat['earnings'] or 0
-    
-    # 애드포스트(파워링크) 데이터 일괄 조회
-    adpost_data = {}
-    adpost_stats = AdStats.objects.filter(
-        platform='adpost',
-        ad_unit_id='모바일뉴스픽_컨텐츠',
-        date__year=year,
-        user=request.user
-    ).values('date').annotate(
-        earnings=Sum('earnings'),
-        clicks=Sum('clicks')
-    )
-    adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
-    
-    # 전체 파워링크 클릭수 일괄 조회
-    total_powerlink_data = {}
-    total_powerlink_stats = TotalStat.newspic_objects().filter(
-        sdate__year=year
-    ).values('sdate').annotate(
-        total_powerlink=Sum('powerlink_count')
-    )
-    total_powerlink_data = {stat['sdate']: stat['total_powerlink'] or 0 for stat in total_powerlink_stats}
-    
-    # 퍼블리셔별 파워링크 클릭수 일괄 조회
-    member_powerlink_data = {}
-    publisher_keys = [group.member.request_key for group in all_groups]
-    member_powerlink_stats = TotalStat.newspic_objects().filter(
-        request_key__in=publisher_keys, sdate__year=year
-    ).values('request_key', 'sdate').annotate(
-        powerlink_count=Sum('powerlink_count'),
-        click_count=Sum('click_count')
-    )
-    member_powerlink_data = {(stat['request_key'], stat['sdate']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
+    # 퍼블리셔별 월 매입비용 (MonthlyPublisherCost 기준, 데이터/단가가 바뀐 월만 재계산)
+    group_costs = get_monthly_publisher_costs(request.user, year, group_cost_specs(all_groups, get_price_index(request.user, year)))
     
     for group in all_groups:
-        monthly_cost = {m: Decimal('0') for m in months}
         default_price = group.default_unit_price
         default_type = group.default_unit_type
-        ad_units = group.ad_units.filter(is_active=True)
-        
-        # 해당 연도의 모든 날짜에 대해 일별 계산 (세부 데이터와 동일한 방식)
-        for m in months:
-            last_day = calendar.monthrange(year, m)[1]
-            for d in range(1, last_day + 1):
-                current_date = date(year, m, d)
-                
-                # 1. AdSense/AdManager 일별 수익 계산 (세부 데이터와 동일한 방식)
-                ad_revenue = Decimal('0')
-                for ad_unit in ad_units:
-                    stat_key = (current_date, ad_unit.ad_unit_id)
-                    ad_revenue += Decimal(str(stats_map.get(stat_key, 0)))
-                
-                # 2. AdPost 일별 수익 분배 (세부 데이터와 동일한 방식)
-                adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                total_powerlink_count = total_powerlink_data.get(current_date, 0)
-                member_data = member_powerlink_data.get((group.member.request_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-                powerlink_count = member_data['powerlink_count']
-                click_count = member_data['click_count']
-                adpost_earnings = adpost_info['earnings']
-                adpost_clicks = adpost_info['clicks']
-                powerlink_revenue = Decimal('0')
-                if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                    unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-                ad_revenue += powerlink_revenue
-                
-                # 3. 매입비용 계산 (세부 데이터와 동일한 방식)
-                rs_rate = default_price or 0
-                rs_type = default_type or 'percent'
-                purchase_cost = Decimal('0')
-                
-                if rs_type == 'percent':
-                    purchase_cost = ad_revenue * (Decimal(str(rs_rate)) / Decimal('100'))
-                else:
-                    # RS단가가 percent가 아닌 경우 tbTotalStat의 click_count에 RS단가를 곱함
-                    purchase_cost = Decimal(str(click_count)) * Decimal(str(rs_rate))
-                
-                # 4. 월별 매입비용에 누적 (세부 데이터와 동일한 반올림 방식)
-                monthly_cost[m] += int(purchase_cost)
+        monthly_cost = {m: Decimal(group_costs[group.member_request_key][m]) for m in months}
         
         # 합계 반영
         if group.member.level == 50:
@@ -986,142 +757,33 @@ def purchase_report_view(request):
             'publisher_code': group.member_request_key,
             'monthly_cost': monthly_cost,
             'has_group': True,
-            'member': group.member,
+            'member': member_summary(group.member),
             'is_important': group.is_important,
         })
     
     # 5. 그룹에 속하지 않은 멤버 처리
     grouped_member_keys = {group.member_request_key for group in all_groups}
+    ungrouped_keys = [request_key for request_key in all_members_map if request_key not in grouped_member_keys]
     
-    # 검색 결과에 포함된 그룹에 속하지 않은 멤버들도 처리
-    ungrouped_members = []
-    for request_key, member in all_members_map.items():
-        if request_key in grouped_member_keys:
-            continue
-        
-        # 그룹에 속하지 않은 멤버의 광고 단위 ID 수집
-        member_ad_units = PurchaseGroupAdUnit.objects.filter(
-            purchase_group__member_request_key=request_key,
-            purchase_group__user=request.user,
-            purchase_group__is_active=True,
-            is_active=True
-        )
-        
-        # 그룹이 없는 멤버가 주요 퍼블리셔로 설정되어 있는지 확인
-        is_important = False
-        inactive_group = PurchaseGroup.objects.filter(
-            member_request_key=request_key, 
-            user=request.user, 
-            is_active=False
-        ).first()
-        if inactive_group and inactive_group.is_important:
-            is_important = True
-        
-        ungrouped_members.append({
-            'request_key': request_key,
-            'member': member,
-            'ad_units': member_ad_units,
-            'is_important': is_important
-        })
-    
-    # 그룹에 속하지 않은 멤버의 AdStats 데이터 일괄 조회
-    ungrouped_ad_unit_ids = []
-    for ungrouped_member in ungrouped_members:
-        ungrouped_ad_unit_ids.extend([ad_unit.ad_unit_id for ad_unit in ungrouped_member['ad_units']])
+    # 그룹이 없는 멤버가 주요 퍼블리셔로 설정되어 있는지 확인 (비활성 그룹 기준)
+    important_ungrouped_keys = set(PurchaseGroup.objects.filter(
+        member_request_key__in=ungrouped_keys,
+        user=request.user,
+        is_active=False,
+        is_important=True
+    ).values_list('member_request_key', flat=True))
     
-    ungrouped_ad_stats = {}
-    if ungrouped_ad_unit_ids:
-        ungrouped_ad_stats_data = AdStats.objects.filter(
-            user=request.user,
-            ad_unit_id__in=ungrouped_ad_unit_ids
-        ).values('date', 'platform', 'ad_unit_id', 'earnings', 'earnings_usd')
-        
-        for stat in ungrouped_ad_stats_data:
-            key = (stat['date'], stat['ad_unit_id'])
-            if key not in ungrouped_ad_stats:
-                ungrouped_ad_stats[key] = {'earnings': 0, 'earnings_usd': 0}
-            ungrouped_ad_stats[key]['earnings'] += stat['earnings'] or 0
-            ungrouped_ad_stats[key]['earnings_usd'] += stat['earnings_usd'] or 0
+    # 월별 매입 단가(PurchasePrice)를 적용한 퍼블리셔별 월 매입비용
+    default_unit_price = Decimal('50')
+    default_unit_type = 'percent'
+    ungrouped_costs = get_monthly_publisher_costs(
+        request.user, year, ungrouped_cost_specs(request.user, ungrouped_keys, year)
+    )
     
-    for ungrouped_member in ungrouped_members:
-        request_key = ungrouped_member['request_key']
-        member = ungrouped_member['member']
-        member_ad_units = ungrouped_member['ad_units']
-        is_important = ungrouped_member['is_important']
-        
-        monthly_cost = {m: Decimal('0') for m in months}
-        default_unit_price = Decimal('50')
-        default_unit_type = 'percent'
-        
-        # AdStats에 데이터가 있는 멤버만 실제 매입 비용 계산
-        all_member_aliases = AdStats.objects.filter(
-            platform='member', 
-            user=request.user
-        ).values_list('alias', flat=True).distinct()
-        
-        if request_key in all_member_aliases:
-            # 해당 연도의 모든 날짜에 대해 일별 계산 (세부 데이터와 동일한 방식)
-            for m in months:
-                last_day = calendar.monthrange(year, m)[1]
-                for d in range(1, last_day + 1):
-                    current_date = date(year, m, d)
-                    
-                    # 1. AdSense/AdManager 일별 수익 계산 (세부 데이터와 동일한 방식)
-                    ad_revenue = Decimal('0')
-                    for ad_unit in member_ad_units:
-                        stat_key = (current_date, ad_unit.ad_unit_id)
-                        if stat_key in ungrouped_ad_stats:
-                            stat_data = ungrouped_ad_stats[stat_key]
-                            if ad_unit.platform == 'adsense':
-                                # AdSense는 USD를 KRW로 변환 (세부 데이터와 동일한 방식)
-                                month_start = date(year, m, 1)
-                                usd_to_krw = exchange_rates.get(month_start, Decimal('1370.00'))
-                                earnings_usd = Decimal(str(stat_data['earnings_usd'] or 0))
-                                ad_revenue += earnings_usd * usd_to_krw
-                            elif ad_unit.platform == 'admanager':
-                                # AdManager는 KRW 그대로
-                                earnings = Decimal(str(stat_data['earnings'] or 0))
-                                ad_revenue += earnings
-                    
-                    # 2. AdPost 일별 수익 분배 (세부 데이터와 동일한 방식)
-                    adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                    total_powerlink_count = total_powerlink_data.get(current_date, 0)
-                    member_data = member_powerlink_data.get((request_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-                    powerlink_count = member_data['powerlink_count']
-                    click_count = member_data['click_count']
-                    adpost_earnings = adpost_info['earnings']
-                    adpost_clicks = adpost_info['clicks']
-                    powerlink_revenue = Decimal('0')
-                    if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                        unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                        powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-                    ad_revenue += powerlink_revenue
-                    
-                    # 3. RS단가 적용하여 일별 매입비용 계산
-                    month_start = date(year, m, 1)
-                    monthly_price = PurchasePrice.objects.filter(
-                        user=request.user,
-                        request_key=request_key,
-                        year_month=month_start
-                    ).first()
-                    
-                    if monthly_price:
-                        unit_price = monthly_price.unit_price
-                        unit_type = monthly_price.unit_type
-                    else:
-                        unit_price = default_unit_price
-                        unit_type = default_unit_type
-                    
-                    purchase_cost = Decimal('0')
-                    if unit_price is not None:
-                        if unit_type == 'percent':
-                            purchase_cost = ad_revenue * (Decimal(str(unit_price)) / Decimal('100'))
-                        else:
-                            # RS단가가 percent가 아닌 경우 tbTotalStat의 click_count에 RS단가를 곱함
-                            purchase_cost = Decimal(str(click_count)) * Decimal(str(unit_price))
-                    
-                    # 4. 월별 매입비용에 누적
-                    monthly_cost[m] += int(purchase_cost)
+    for request_key in ungrouped_keys:
+        member = all_members_map[request_key]
+        is_important = request_key in important_ungrouped_keys
+        monthly_cost = {m: Decimal(ungrouped_costs[request_key][m]) for m in months}
         
         # 매입 비용이 있는 멤버만 합계에 포함
         if any(monthly_cost.values()):
@@ -1138,7 +800,7 @@ def purchase_report_view(request):
             'publisher_code': request_key,
             'monthly_cost': monthly_cost,
             'has_group': False,
-            'member': member,
+            'member': member_summary(member),
             'is_important': is_important,
         })
     
@@ -1172,12 +834,12 @@ def purchase_report_view(request):
     partners_changes = calculate_monthly_changes(partners_total)
     total_changes = calculate_monthly_changes(total)
     
-    # 24시간 캐시 저장 (86400초)
+    # 멤버 목록/등급(newspic)은 데이터 버전에 포함되지 않으므로 최대 하루 캐시
     cache.set(cache_key, {
         'purchase_data': purchase_data,
         'publisher_total': publisher_total,
         'partners_total': partners_total
-    }, 86400)
+    }, PURCHASE_REPORT_CACHE_TIMEOUT)
     logger.info(f"캐시 SET: {cache_key} - 전체 퍼블리셔 데이터 저장 완료")
     
     context = {
@@ -1216,23 +878,22 @@ def publisher_detail_data_api(request):
             return JsonResponse({'success': False, 'error': 'No publishers specified.'}, status=400)
         publisher_keys = publisher_keys_str.split(',')
 
-        groups = PurchaseGroup.objects.filter(
+        groups = prefetch_members(PurchaseGroup.objects.filter(
             user=request.user,
             is_active=True,
             member_request_key__in=publisher_keys
-        )
+        ))
 
         publisher_info_map = {
             group.member_request_key: {
                 'label': f"{group.company_name} ({group.member.uname if group.member else '미설정'}) ({group.member_request_key})",
                 'key': group.member_request_key,
-                'rs_rate': group.default_unit_price or 0,
-                'rs_type': group.default_unit_type or 'percent',
                 'ad_units': list(group.ad_units.filter(is_active=True).values('platform', 'ad_unit_id'))
             } for group in groups
         }
         
         date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        price_resolver = PurchasePriceResolver(request.user)
 
         # --- 데이터 일괄 조회 ---
         all_ad_units = [unit['ad_unit_id'] for key in publisher_keys for unit in publisher_info_map.get(key, {}).get('ad_units', [])]
@@ -1267,36 +928,21 @@ def publisher_detail_data_api(request):
                 stats_map[key] = stat['earnings'] or 0
         
         # --- 파워링크(애드포스트) 수익 분배 로직 추가 ---
-        # 1. 파워링크(애드포스트) 데이터 일괄 조회
-        adpost_data = {}
-        adpost_stats = AdStats.objects.filter(
-            platform='adpost',
-            ad_unit_id='모바일뉴스픽_컨텐츠',
-            date__range=[start_date, end_date],
-            user=request.user
-        ).values('date').annotate(
-            earnings=Sum('earnings'),
-            clicks=Sum('clicks')
-        )
-        adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
-        # 2. 전체 파워링크 클릭수 일괄 조회
-        total_powerlink_data = {}
-        total_powerlink_stats = TotalStat.newspic_objects().filter(
-            sdate__range=[start_date, end_date]
-        ).values('sdate').annotate(
-            total_powerlink=Sum('powerlink_count')
-        )
-        total_powerlink_data = {stat['sdate']: stat['total_powerlink'] or 0 for stat in total_powerlink_stats}
+        # 1. 파워링크(애드포스트) 데이터 및 전체 파워링크 클릭수 일괄 조회
+        allocator = PowerlinkAllocator.load(request.user, date_list)
         # 3. 퍼블리셔별 파워링크 클릭수 일괄 조회
         member_powerlink_data = {}
         publisher_keys = [group.member_request_key for group in groups]
-        member_powerlink_stats = TotalStat.newspic_objects().filter(
-            request_key__in=publisher_keys, sdate__range=[start_date, end_date]
-        ).values('request_key', 'sdate').annotate(
-            powerlink_count=Sum('powerlink_count'),
-            click_count=Sum('click_count')
-        )
-        member_powerlink_data = {(stat['request_key'], stat['sdate']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
+        member_powerlink_stats = NewspicDailyStat.objects.filter(
+            request_key__in=publisher_keys, date__range=[start_date, end_date]
+        ).values('request_key', 'date', 'powerlink_count', 'click_count')
+        member_powerlink_data = {(stat['request_key'], stat['date']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
+        # 4. 퍼블리셔 × 날짜 파워링크 분배액 (원 단위)
+        powerlink_units = allocator.allocate_units(member_powerlink_matrix(
+            publisher_keys, date_list,
+            counts={key: values['powerlink_count'] for key, values in member_powerlink_data.items()},
+        ))
+        powerlink_index = {request_key: i for i, request_key in enumerate(publisher_keys)}
 
         # --- 퍼블리셔별 데이터 처리 ---
         all_publishers_detail_data = {}
@@ -1307,27 +953,18 @@ def publisher_detail_data_api(request):
 
             detail_data = []
             detail_totals = {'ad_revenue': 0, 'purchase_cost': 0}
-            for current_date in date_list:
+            for j, current_date in enumerate(date_list):
                 ad_revenue = Decimal('0')
                 # 1. 애드센스/애드매니저 광고수익 합산
                 for ad_unit in pub_info['ad_units']:
                     stat_key = (current_date, ad_unit['ad_unit_id'])
                     ad_revenue += Decimal(str(stats_map.get(stat_key, 0)))
                 # 2. 파워링크(애드포스트) 수익 분배
-                adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                total_powerlink_count = total_powerlink_data.get(current_date, 0)
                 member_data = member_powerlink_data.get((publisher_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-                powerlink_count = member_data['powerlink_count']
                 click_count = member_data['click_count']
-                adpost_earnings = adpost_info['earnings']
-                adpost_clicks = adpost_info['clicks']
-                powerlink_revenue = Decimal('0')
-                if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                    unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
+                powerlink_revenue = Decimal(int(powerlink_units[powerlink_index[publisher_key], j]))
                 # 매입비용 계산
-                rs_rate = pub_info['rs_rate']
-                rs_type = pub_info['rs_type']
+                rs_rate, rs_type = price_resolver.resolve(publisher_key, current_date)
                 purchase_cost = Decimal('0')
                 if rs_type == 'percent':
                     purchase_cost = ad_revenue * (Decimal(str(rs_rate)) / Decimal('100'))
@@ -1377,9 +1014,9 @@ def download_publisher_detail_excel(request):
         logger.info(f"엑셀 다운로드 시작: 퍼블리셔 {len(publisher_keys)}개, 기간 {start_date} ~ {end_date}")
 
         # 데이터 조회 로직 (API와 거의 동일)
-        groups = PurchaseGroup.objects.filter(
+        groups = prefetch_members(PurchaseGroup.objects.filter(
             user=request.user, is_active=True, member_request_key__in=publisher_keys
-        )
+        ))
         
         if not groups.exists():
             logger.warning("활성화된 PurchaseGroup이 없습니다.")
@@ -1391,13 +1028,12 @@ def download_publisher_detail_excel(request):
             group.member_request_key: {
                 'label': f"{group.company_name} ({group.member.uname if group.member else '미설정'}) ({group.member_request_key})",
                 'key': group.member_request_key,
-                'rs_rate': group.default_unit_price or 0,
-                'rs_type': group.default_unit_type or 'percent',
                 'ad_units': list(group.ad_units.filter(is_active=True).values('platform', 'ad_unit_id'))
             } for group in groups
         }
         
         date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        price_resolver = PurchasePriceResolver(request.user)
 
         all_ad_units = [unit['ad_unit_id'] for key in publisher_keys for unit in publisher_info_map.get(key, {}).get('ad_units', [])]
         
@@ -1408,235 +1044,104 @@ def download_publisher_detail_excel(request):
         ).values('date', 'platform', 'ad_unit_id').annotate(
             earnings=Sum('earnings'),
             earnings_usd=Sum('earnings_usd')
-        )
+        ).values_list('date', 'platform', 'ad_unit_id', 'earnings', 'earnings_usd').order_by()
 
         exchange_rates = ExchangeRate.objects.filter(user=request.user, year_month__gte=start_date.replace(day=1)).values('year_month', 'usd_to_krw')
         exchange_rate_map = {rate['year_month']: rate['usd_to_krw'] for rate in exchange_rates}
 
         stats_map = {}
-        for stat in ad_stats:
-            key = (stat['date'], stat['ad_unit_id'])
-            if stat['platform'] == 'adsense':
-                month_start = stat['date'].replace(day=1)
-                exchange_rate = exchange_rate_map.get(month_start, Decimal('1370.00'))
-                stats_map[key] = (stat['earnings_usd'] or 0) * float(exchange_rate)
-            elif stat['platform'] == 'admanager':
-                # 애드매니저(ADX)는 KRW 그대로
-                stats_map[key] = stat['earnings'] or 0
-            elif stat['platform'] == 'adpost':
-                # 애드포스트는 KRW 그대로
-                stats_map[key] = stat['earnings'] or 0
+        for stat_date, platform, ad_unit_id, earnings, earnings_usd in ad_stats.iterator():
+            key = (stat_date, ad_unit_id)
+            if platform == 'adsense':
+                exchange_rate = exchange_rate_map.get(stat_date.replace(day=1), Decimal('1370.00'))
+                stats_map[key] = (earnings_usd or 0) * float(exchange_rate)
             else:
-                # 기타 플랫폼은 KRW 그대로
-                stats_map[key] = stat['earnings'] or 0
+                # 애드매니저(ADX)/애드포스트/기타 플랫폼은 KRW 그대로
+                stats_map[key] = earnings or 0
         
         # --- 파워링크(애드포스트) 수익 분배 로직 추가 ---
-        # 1. 파워링크(애드포스트) 데이터 일괄 조회
-        adpost_data = {}
-        adpost_stats = AdStats.objects.filter(
-            platform='adpost',
-            ad_unit_id='모바일뉴스픽_컨텐츠',
-            date__range=[start_date, end_date],
-            user=request.user
-        ).values('date').annotate(
-            earnings=Sum('earnings'),
-            clicks=Sum('clicks')
-        )
-        adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
-        
-        # 2. 전체 파워링크 클릭수 일괄 조회
-        total_powerlink_data = {}
-        total_powerlink_stats = TotalStat.newspic_objects().filter(
-            sdate__range=[start_date, end_date]
-        ).values('sdate').annotate(
-            total_powerlink=Sum('powerlink_count')
-        )
-        total_powerlink_data = {stat['sdate']: stat['total_powerlink'] or 0 for stat in total_powerlink_stats}
+        # 1. 파워링크(애드포스트) 데이터 및 전체 파워링크 클릭수 일괄 조회
+        allocator = PowerlinkAllocator.load(request.user, date_list)
         
         # 3. 퍼블리셔별 파워링크 클릭수 일괄 조회
         member_powerlink_data = {}
         publisher_keys_for_powerlink = [group.member_request_key for group in groups]
-        member_powerlink_stats = TotalStat.newspic_objects().filter(
-            request_key__in=publisher_keys_for_powerlink, sdate__range=[start_date, end_date]
-        ).values('request_key', 'sdate').annotate(
-            powerlink_count=Sum('powerlink_count'),
-            click_count=Sum('click_count')
-        )
-        member_powerlink_data = {(stat['request_key'], stat['sdate']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
-        
-        all_publishers_detail_data = {}
-        for publisher_key in publisher_keys:
-            pub_info = publisher_info_map.get(publisher_key)
-            if not pub_info:
-                continue
+        member_powerlink_stats = NewspicDailyStat.objects.filter(
+            request_key__in=publisher_keys_for_powerlink, date__range=[start_date, end_date]
+        ).values('request_key', 'date', 'powerlink_count', 'click_count')
+        member_powerlink_data = {(stat['request_key'], stat['date']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
+        
+        # 4. 퍼블리셔 × 날짜 파워링크 분배액 (원 단위)
+        powerlink_units = allocator.allocate_units(member_powerlink_matrix(
+            publisher_keys_for_powerlink, date_list,
+            counts={key: values['powerlink_count'] for key, values in member_powerlink_data.items()},
+        ))
+        powerlink_index = {request_key: i for i, request_key in enumerate(publisher_keys_for_powerlink)}
+        
+        def detail_rows(publisher_key):
+            """퍼블리셔 1명의 시트 행 (헤더 → 일자별 → 합계), 일자별로 계산하며 바로 내보냄"""
+            pub_info = publisher_info_map[publisher_key]
+            yield [(header, 'header') for header in ('일자', '광고수익/유효PV', 'RS율', '매입비용')]
 
-            detail_data = []
             detail_totals = {'ad_revenue': 0, 'purchase_cost': 0}
-            for current_date in date_list:
+            for j, current_date in enumerate(date_list):
                 ad_revenue = Decimal('0')
                 # 1. 애드센스/애드매니저 광고수익 합산
                 for ad_unit in pub_info['ad_units']:
                     stat_key = (current_date, ad_unit['ad_unit_id'])
                     ad_revenue += Decimal(str(stats_map.get(stat_key, 0)))
                 # 2. 파워링크(애드포스트) 수익 분배
-                adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                total_powerlink_count = total_powerlink_data.get(current_date, 0)
                 member_data = member_powerlink_data.get((publisher_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-                powerlink_count = member_data['powerlink_count']
                 click_count = member_data['click_count']
-                adpost_earnings = adpost_info['earnings']
-                adpost_clicks = adpost_info['clicks']
-                powerlink_revenue = Decimal('0')
-                if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                    unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-                ad_revenue += powerlink_revenue
+                ad_revenue += Decimal(int(powerlink_units[powerlink_index[publisher_key], j]))
                 # 매입비용 계산
-                rs_rate = pub_info['rs_rate']
-                rs_type = pub_info['rs_type']
-                purchase_cost = Decimal('0')
+                rs_rate, rs_type = price_resolver.resolve(publisher_key, current_date)
                 if rs_type == 'percent':
                     purchase_cost = ad_revenue * (Decimal(str(rs_rate)) / Decimal('100'))
                 else:
                     # RS단가가 percent가 아닌 경우 tbTotalStat의 click_count에 RS단가를 곱함
                     purchase_cost = Decimal(str(click_count)) * Decimal(str(rs_rate))
-                detail_data.append({
-                    'date': current_date.strftime('%Y-%m-%d'),
-                    'ad_revenue': int(click_count) if rs_type != 'percent' else int(ad_revenue),
-                    'ad_revenue_formatted': f"{int(click_count):,}" if rs_type != 'percent' else f"{int(ad_revenue):,}",
-                    'rs_rate_display': f"{rs_rate}%" if rs_type == 'percent' else str(rs_rate),
-                    'purchase_cost': int(purchase_cost),
-                    'purchase_cost_formatted': f"{int(purchase_cost):,}",
-                })
-                detail_totals['ad_revenue'] += int(click_count) if rs_type != 'percent' else int(ad_revenue)
+                revenue_value = int(click_count) if rs_type != 'percent' else int(ad_revenue)
+                detail_totals['ad_revenue'] += revenue_value
                 detail_totals['purchase_cost'] += int(purchase_cost)
-            all_publishers_detail_data[publisher_key] = {
-                'label': pub_info['label'],
-                'detail_data': detail_data,
-                'detail_totals': detail_totals,
-            }
-
-        # --- 엑셀 생성 ---
-        try:
-            wb = openpyxl.Workbook()
-            wb.remove(wb.active) # 기본 시트 제거
+                yield [
+                    (current_date.strftime('%Y-%m-%d'), 'text'),
+                    (revenue_value, 'number'),
+                    (f"{rs_rate}%" if rs_type == 'percent' else str(rs_rate), 'text'),
+                    (int(purchase_cost), 'number'),
+                ]
 
-            # 스타일 정의
-            header_font = Font(bold=True, name='맑은 고딕')
-            center_align = Alignment(horizontal='center', vertical='center')
-            right_align = Alignment(horizontal='right', vertical='center')
-            header_fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-            thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-            
-            logger.info(f"엑셀 워크북 생성 완료, 퍼블리셔 수: {len(all_publishers_detail_data)}")
-        except Exception as e:
-            logger.error(f"엑셀 워크북 생성 실패: {str(e)}")
-            raise Exception(f"엑셀 워크북 생성 실패: {str(e)}")
+            yield [
+                ('합계', 'header'),
+                (detail_totals['ad_revenue'], 'total_number'),
+                ('', 'header'),
+                (detail_totals['purchase_cost'], 'total_number'),
+            ]
 
-        for pub_key, pub_data in all_publishers_detail_data.items():
-            try:
-                # 시트명에서 특수문자 제거 및 길이 제한
-                safe_title = "".join(c for c in pub_data['label'] if c.isalnum() or c in (' ', '-', '_'))[:31]
+        def sheets():
+            for publisher_key in publisher_keys:
+                pub_info = publisher_info_map.get(publisher_key)
+                if not pub_info:
+                    continue
+                # 시트명에서 특수문자 제거 (길이/중복은 xlsx_stream 에서 정리)
+                safe_title = "".join(c for c in pub_info['label'] if c.isalnum() or c in (' ', '-', '_'))
                 if not safe_title.strip():
-                    safe_title = f"Publisher_{pub_key[:20]}"
-                
-                ws = wb.create_sheet(title=safe_title)
-                logger.info(f"시트 생성: {safe_title}")
-
-                # 헤더
-                headers = ['일자', '광고수익/유효PV', 'RS율', '매입비용']
-                for col, header in enumerate(headers, 1):
-                    cell = ws.cell(row=1, column=col, value=header)
-                    cell.font = header_font
-                    cell.alignment = center_align
-                    cell.fill = header_fill
-                    cell.border = thin_border
-                
-                # 데이터
-                for row_idx, row_data in enumerate(pub_data['detail_data'], 2):
-                    try:
-                        # 날짜
-                        cell = ws.cell(row=row_idx, column=1, value=row_data['date'])
-                        cell.border = thin_border
-                        cell.alignment = center_align
-                        
-                        # 광고수익
-                        cell = ws.cell(row=row_idx, column=2, value=row_data['ad_revenue'])
-                        cell.number_format = '#,##0'
-                        cell.border = thin_border
-                        cell.alignment = right_align
-                        
-                        # RS율
-                        cell = ws.cell(row=row_idx, column=3, value=row_data['rs_rate_display'])
-                        cell.border = thin_border
-                        cell.alignment = center_align
-                        
-                        # 매입비용
-                        cell = ws.cell(row=row_idx, column=4, value=row_data['purchase_cost'])
-                        cell.number_format = '#,##0'
-                        cell.border = thin_border
-                        cell.alignment = right_align
-                    except Exception as e:
-                        logger.error(f"행 데이터 처리 실패 (시트: {safe_title}, 행: {row_idx}): {str(e)}")
-                        continue
-
-                # 합계
-                total_row_idx = len(pub_data['detail_data']) + 2
-                # 합계 라벨
-                cell = ws.cell(row=total_row_idx, column=1, value='합계')
-                cell.font = header_font
-                cell.border = thin_border
-                cell.alignment = center_align
-                cell.fill = header_fill
-                
-                # 광고수익 합계
-                cell = ws.cell(row=total_row_idx, column=2, value=pub_data['detail_totals']['ad_revenue'])
-                cell.number_format = '#,##0'
-                cell.font = header_font
-                cell.border = thin_border
-                cell.alignment = right_align
-                cell.fill = header_fill
-                
-                # RS율 합계 (빈칸)
-                cell = ws.cell(row=total_row_idx, column=3, value='')
-                cell.border = thin_border
-                cell.fill = header_fill
-                
-                # 매입비용 합계
-                cell = ws.cell(row=total_row_idx, column=4, value=pub_data['detail_totals']['purchase_cost'])
-                cell.number_format = '#,##0'
-                cell.font = header_font
-                cell.border = thin_border
-                cell.alignment = right_align
-                cell.fill = header_fill
+                    safe_title = f"Publisher_{publisher_key[:20]}"
+                yield XlsxSheet(safe_title, detail_rows(publisher_key), widths=[12, 15, 12, 15])
 
-                # 컬럼 너비 조정
-                ws.column_dimensions['A'].width = 12
-                ws.column_dimensions['B'].width = 15
-                ws.column_dimensions['C'].width = 12
-                ws.column_dimensions['D'].width = 15
-                
-                logger.info(f"시트 {safe_title} 완성")
-                
+        def stream():
+            try:
+                yield from stream_xlsx(sheets())
+                logger.info(f"엑셀 파일 전송 완료: {filename}")
             except Exception as e:
-                logger.error(f"시트 {pub_key} 생성 실패: {str(e)}")
-                continue
+                # 전송이 시작된 뒤에는 상태 코드를 바꿀 수 없으므로 기록 후 중단
+                logger.error(f"엑셀 스트리밍 중 오류: {str(e)}", exc_info=True)
+                raise
 
-        # --- HttpResponse로 반환 ---
-        try:
-            filename = f"publisher_detail_{start_date}_to_{end_date}.xlsx"
-            response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            
-            logger.info(f"엑셀 파일 저장 시작: {filename}")
-            wb.save(response)
-            logger.info(f"엑셀 파일 저장 완료: {filename}")
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"엑셀 파일 저장 실패: {str(e)}")
-            raise Exception(f"엑셀 파일 저장 실패: {str(e)}")
+        filename = f"publisher_detail_{start_date}_to_{end_date}.xlsx"
+        response = StreamingHttpResponse(stream(), content_type=XLSX_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
     except Exception as e:
         logger.error(f"엑셀 다운로드 오류: {str(e)}", exc_info=True)
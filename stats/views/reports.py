@@ -1,10 +1,11 @@
-import os, json
+import os, json, gzip, hashlib
 from datetime import datetime, timedelta, date
 from django.conf import settings
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import JsonResponse, HttpResponse
+from django.core.cache import cache
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_POST
 from django.db.models import Sum, Count
@@ -15,6 +16,7 @@ import xlrd
 from django.core.exceptions import ValidationError
 from decimal import Decimal, ROUND_HALF_UP
 import logging
+import numpy as np
 from rest_framework.decorators import api_view
 from django.db.models import Q
 
@@ -22,13 +24,24 @@ from ..forms import CredentialForm, SignUpForm
 from ..models import (
     AdStats, PlatformCredential, UserPreference, MonthlySales, 
     SettlementDepartment, ServiceGroup, PurchaseGroup, Member, 
-    PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate, OtherRevenue
+    PurchasePrice, MemberStat, TotalStat, PurchaseGroupAdUnit, ExchangeRate, OtherRevenue,
+    DailyRevenueRollup, NewspicDailyStat
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
 from .purchase import calculate_purchase_cost_by_date_range
+from ..services.publisher_matrix import PublisherDateMatrix
+from ..services.revenue_pivot import DailyRevenuePivot, coupang_aliases_by_classification
+from ..services.revenue_graph import RevenueGraph
+from ..services.powerlink import PowerlinkAllocator, member_powerlink_matrix
+from ..services.member_directory import get_members, prefetch_members
+from ..services.money import micros_to_krw, to_template, usd_micros, won, won_trunc
 
 logger = logging.getLogger(__name__)
 
+SECTION_NAMES = ('publisher', 'partners', 'stamply')
+# 파트너스 합계에 개별 표시하는 플랫폼
+PARTNERS_TOTAL_PLATFORMS = ('cozymamang', 'mediamixer', 'aceplanet', 'teads', 'taboola', 'coupang')
+
 def get_date_range_from_request(request, default_days=7, max_days=31):
     """요청에서 날짜 범위를 추출하고 유효성을 검사"""
     today = date.today()
@@ -65,14 +78,11 @@ def get_platform_list(user):
 
 def get_exchange_rates(user, start_date, end_date):
     """환율 데이터를 조회하여 딕셔너리로 반환"""
-    year_months = [date(start_date.year, start_date.month, 1)]
-    if end_date.month != start_date.month or end_date.year != start_date.year:
-        year_months.append(date(end_date.year, end_date.month, 1))
-    
+    # 기간에 걸친 모든 월 (시작월~종료월)
     exchange_rates = {}
     exchange_rate_data = ExchangeRate.objects.filter(
         user=user,
-        year_month__in=year_months
+        year_month__range=[date(start_date.year, start_date.month, 1), end_date]
     ).values('year_month', 'usd_to_krw')
     
     for rate in exchange_rate_data:
@@ -87,7 +97,8 @@ def get_ad_unit_member_mapping(user):
         purchase_group__is_active=True,
         platform__in=['adsense', 'admanager', 'naver'],
         is_active=True
-    )
+    ).select_related('purchase_group')
+    prefetch_members([ad_unit.purchase_group for ad_unit in google_naver_ad_units])
     
     ad_unit_member_map = {}
     for ad_unit in google_naver_ad_units:
@@ -110,38 +121,45 @@ def calculate_platform_revenue_by_member_level(user, start_date, end_date, ad_un
         partners_data[d] = {'adsense': Decimal('0'), 'admanager': Decimal('0'), 'naver': Decimal('0')}
     
     # AdStats에서 구글 데이터를 광고 단위별로 조회하여 분류
-    google_stats = AdStats.objects.filter(
+    google_stats = list(AdStats.objects.filter(
         user=user,
         platform__in=['adsense', 'admanager'],
         date__range=[start_date, end_date]
-    ).values('date', 'platform', 'ad_unit_id', 'earnings', 'earnings_usd')
+    ).values('date', 'platform', 'ad_unit_id', 'earnings', 'earnings_usd'))
     
-    for stat in google_stats:
+    # AdSense는 USD를 마이크로달러 정수로 (일자, 구분)별 합산 후 월 환율로 한 번에 KRW 변환
+    adsense_micros = usd_micros([
+        stat['earnings_usd'] if stat['platform'] == 'adsense' else 0 for stat in google_stats
+    ]).tolist()
+    adsense_totals = {}
+    
+    for stat, micros in zip(google_stats, adsense_micros):
         d = stat['date']
         platform = stat['platform']
         ad_unit_id = stat['ad_unit_id']
         
-        # AdSense는 USD를 KRW로 변환, AdManager는 KRW 그대로
-        if platform == 'adsense':
-            month_start = d.replace(day=1)
-            usd_to_krw = exchange_rates.get(month_start, Decimal('1370.00'))
-            earnings_usd = Decimal(str(stat['earnings_usd'] or 0))
-            earnings = earnings_usd * usd_to_krw
-        else:
-            earnings = Decimal(str(stat['earnings'] or 0))
-        
         if ad_unit_id in ad_unit_member_map:
             # 매핑된 광고 단위
             member_level = ad_unit_member_map[ad_unit_id]['level']
             if member_level in [50, 100]:  # 퍼블리셔
-                publisher_data[d][platform] += earnings
-            elif member_level in [60, 61, 65]:  # 파트너스
-                partners_data[d][platform] += earnings
-            else:  # 기타 level은 파트너스로 처리
-                partners_data[d][platform] += earnings
+                section = 'publisher'
+            else:  # 파트너스 (60, 61, 65) 및 기타 level
+                section = 'partners'
         else:
             # 매핑되지 않은 광고 단위는 파트너스로 처리
-            partners_data[d][platform] += earnings
+            section = 'partners'
+        
+        if platform == 'adsense':
+            adsense_totals[(section, d)] = adsense_totals.get((section, d), 0) + micros
+        else:
+            # AdManager는 KRW 그대로
+            section_data = publisher_data if section == 'publisher' else partners_data
+            section_data[d][platform] += Decimal(str(stat['earnings'] or 0))
+    
+    for (section, d), micros in adsense_totals.items():
+        usd_to_krw = exchange_rates.get(d.replace(day=1), Decimal('1370.00'))
+        section_data = publisher_data if section == 'publisher' else partners_data
+        section_data[d]['adsense'] += micros_to_krw(micros, usd_to_krw)
     
     return publisher_data, partners_data
 
@@ -149,49 +167,22 @@ def calculate_naver_powerlink_revenue(user, start_date, end_date, publisher_data
     """네이버 파워링크 수익을 Member level별로 계산"""
     date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     
-    # Adpost 데이터 조회 (파워링크 단가 계산용)
-    adpost_stats = AdStats.objects.filter(
-        platform='adpost',
-        ad_unit_id='모바일뉴스픽_컨텐츠',
-        date__range=[start_date, end_date],
-        user=user
-    ).values('date').annotate(
-        earnings=Sum('earnings'),
-        clicks=Sum('clicks')
-    )
-    
-    # 전체 파워링크 클릭수 조회
-    total_powerlink_stats = TotalStat.newspic_objects().filter(
-        sdate__range=[start_date, end_date]
-    ).values('sdate').annotate(
-        total_powerlink=Sum('powerlink_count')
-    )
-    
-    # 데이터를 딕셔너리로 변환
-    adpost_data = {}
-    for stat in adpost_stats:
-        adpost_data[stat['date']] = {
-            'earnings': stat['earnings'] or 0,
-            'clicks': stat['clicks'] or 0
-        }
+    # Adpost 데이터(파워링크 단가) 및 전체 파워링크 클릭수 - 단가는 반올림 없이 사용
+    allocator = PowerlinkAllocator.load(user, date_list, unit_price_places=None)
     
-    total_powerlink_data = {}
-    for stat in total_powerlink_stats:
-        total_powerlink_data[stat['sdate']] = stat['total_powerlink'] or 0
-    
-    # tbTotalStat에서 해당 기간에 데이터가 있는 모든 퍼블리셔 조회
-    totalstat_publishers = TotalStat.newspic_objects().filter(
-        sdate__range=[start_date, end_date]
+    # tbTotalStat에서 해당 기간에 데이터가 있는 모든 퍼블리셔 조회 (로컬 스냅샷 기준)
+    totalstat_publishers = NewspicDailyStat.objects.filter(
+        date__range=[start_date, end_date], has_total_stat=True
     ).values_list('request_key', flat=True).distinct()
     
-    # Member 테이블에서 해당 퍼블리셔들의 level 정보 조회
-    from stats.models import Member
-    member_levels = {}
-    for member in Member.newspic_objects().filter(request_key__in=totalstat_publishers):
-        member_levels[member.request_key] = member.level
+    # Member 테이블에서 해당 퍼블리셔들의 level 정보 조회 (멤버 디렉터리 캐시 사용)
+    member_levels = {
+        request_key: member.level
+        for request_key, member in get_members(totalstat_publishers).items() if member
+    }
     
     # purchase_group에 있는 퍼블리셔들도 추가 (level 정보가 없는 경우)
-    all_groups = PurchaseGroup.objects.filter(user=user, is_active=True)
+    all_groups = prefetch_members(PurchaseGroup.objects.filter(user=user, is_active=True))
     for group in all_groups:
         if group.member_request_key not in member_levels:
             member_levels[group.member_request_key] = group.member.level if group.member else 60
@@ -199,47 +190,18 @@ def calculate_naver_powerlink_revenue(user, start_date, end_date, publisher_data
     # 모든 퍼블리셔 키 목록
     all_member_keys = list(member_levels.keys())
     
-    member_powerlink_stats = TotalStat.newspic_objects().filter(
-        request_key__in=all_member_keys, sdate__range=[start_date, end_date]
-    ).values('request_key', 'sdate', 'powerlink_count')
+    # 퍼블리셔 × 날짜 파워링크 분배액 (원 단위 반올림)
+    revenue_units = allocator.allocate_units(member_powerlink_matrix(all_member_keys, date_list))
     
-    # 퍼블리셔별 파워링크 데이터를 딕셔너리로 변환
-    member_powerlink_data = {}
-    for stat in member_powerlink_stats:
-        key = (stat['request_key'], stat['sdate'])
-        member_powerlink_data[key] = stat['powerlink_count'] or 0
+    # level에 따라 퍼블리셔/파트너스 구분 (level 50만 퍼블리셔, 나머지는 파트너스)
+    is_publisher = np.array([member_levels.get(key, 60) == 50 for key in all_member_keys], dtype=bool)
+    publisher_units = revenue_units[is_publisher].sum(axis=0)
+    partners_units = revenue_units[~is_publisher].sum(axis=0)
     
-    # 3. 일자별 수익 계산
-    for d in date_list:
-        # Adpost 정보 (모바일뉴스픽_컨텐츠)
-        adpost_info = adpost_data.get(d, {'earnings': 0, 'clicks': 0})
-        adpost_earnings = adpost_info['earnings']
-        adpost_clicks = adpost_info['clicks']
-        
-        # 어드민 전체 파워링크 클릭수
-        admin_total_clicks = total_powerlink_data.get(d, 0)
-        
-        # PPC 계산: 모바일뉴스픽_컨텐츠 매출 / 모바일뉴스픽_컨텐츠 클릭수
-        ppc = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))) if adpost_clicks > 0 else Decimal('0')
-        
-        # 인정비율 계산: 모바일뉴스픽_컨텐츠 클릭수 / 파워링크 전체 클릭수
-        recognition_rate = (Decimal(str(adpost_clicks)) / Decimal(str(admin_total_clicks))) if admin_total_clicks > 0 else Decimal('0')
-        
-        # 모든 퍼블리셔별 수익 계산 (tbTotalStat에 있는 모든 퍼블리셔)
-        for request_key in all_member_keys:
-            clicks = member_powerlink_data.get((request_key, d), 0)
-            revenue = Decimal('0')
-            
-            if ppc > 0 and clicks > 0 and recognition_rate > 0:
-                # 수익 계산: PPC * 파워링크 클릭수 * 59.5% * 인정비율
-                revenue = (ppc * Decimal(str(clicks)) * Decimal('0.595') * recognition_rate).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-            
-            # level에 따라 퍼블리셔/파트너스 구분
-            member_level = member_levels.get(request_key, 60)  # 기본값은 파트너스
-            if member_level == 50:  # 퍼블리셔
-                publisher_data[d]['naver'] += revenue
-            else:  # 파트너스 (level 60 또는 기타)
-                partners_data[d]['naver'] += revenue
+    # 3. 일자별 수익 반영
+    for j, d in enumerate(date_list):
+        publisher_data[d]['naver'] += Decimal(int(publisher_units[j]))
+        partners_data[d]['naver'] += Decimal(int(partners_units[j]))
 
     return publisher_data, partners_data
 
@@ -287,7 +249,7 @@ def process_section_data(user, platform_list, start_date, end_date, section_plat
     date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     
     # 기본 데이터 조회 - 모든 플랫폼에 대해 조회
-    stats = AdStats.objects.filter(user=user, date__range=[start_date, end_date])
+    stats = DailyRevenueRollup.objects.filter(user=user, date__range=[start_date, end_date])
     data = {}
     for d in date_list:
         data[d] = {}
@@ -295,7 +257,7 @@ def process_section_data(user, platform_list, start_date, end_date, section_plat
             key = f"{platform}|{alias}"
             data[d][key] = Decimal('0')
 
-    for row in stats.values('date', 'platform', 'alias').annotate(earnings=Sum('earnings')):
+    for row in stats.values('date', 'platform', 'alias', 'earnings'):
         d = row['date']
         key = f"{row['platform']}|{row['alias']}"
         if d in data and key in data[d]:
@@ -332,187 +294,79 @@ def process_section_data(user, platform_list, start_date, end_date, section_plat
     
     return section_data
 
-def calculate_section_totals(section_data, date_list, section_name, google_naver_data=None, daily_data=None):
-    """섹션별 합계를 계산"""
-    # 구글/네이버 합계 제외하고 개별 플랫폼만 합산
-    daily_revenue = {}
-    for d in date_list:
-        daily_sum = Decimal('0')
-        for key, value in section_data[d].items():
-            platform, alias = key.split('|', 1)
-            if platform not in ['google', 'naver']:  # 합계 데이터 제외
-                daily_sum += value
-        
-        # daily_data에서 해당 섹션의 구글/네이버 수익 추가
-        if daily_data:
-            if section_name == 'publisher':
-                daily_sum += daily_data['publisher_daily_google'].get(d, Decimal('0')) + daily_data['publisher_daily_naver'].get(d, Decimal('0'))
-            elif section_name == 'partners':
-                daily_sum += daily_data['partners_daily_google'].get(d, Decimal('0')) + daily_data['partners_daily_naver'].get(d, Decimal('0'))
-        
-        daily_revenue[d] = daily_sum
-    
-    # 구글/네이버 수익 추가
-    google_revenue_total = Decimal('0')
-    naver_revenue_total = Decimal('0')
-    if google_naver_data:
-        google_revenue_total = sum(google_naver_data[d]['adsense'] + google_naver_data[d]['admanager'] for d in date_list)
-        naver_revenue_total = sum(google_naver_data[d]['naver'] for d in date_list)
-    
-    # 개별 플랫폼 수익 + 구글/네이버 수익 = 총 수익
-    total_revenue = sum(daily_revenue.values())
-    
-    # daily_data에서 해당 섹션의 구글/네이버 수익 추가
-    if daily_data:
-        if section_name == 'publisher':
-            total_revenue += sum(daily_data['publisher_daily_google'].values()) + sum(daily_data['publisher_daily_naver'].values())
-        elif section_name == 'partners':
-            total_revenue += sum(daily_data['partners_daily_google'].values()) + sum(daily_data['partners_daily_naver'].values())
-    
-    totals = {
-        'total_revenue': total_revenue.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        f'{section_name}_revenue': total_revenue.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        'other_revenue': Decimal('0'),
-        'total_cost': Decimal('0'),
-        f'{section_name}_cost': Decimal('0'),
-        'google_revenue': google_revenue_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        'naver_revenue': naver_revenue_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-    }
-    
-    # 파트너스 특별 필드 추가
-    if section_name == 'partners':
-        # 개별 플랫폼 수익 계산
-        platform_totals = {
-            'cozymamang': Decimal('0'),
-            'mediamixer': Decimal('0'),
-            'aceplanet': Decimal('0'),
-            'teads': Decimal('0'),
-            'taboola': Decimal('0'),
-            'coupang': Decimal('0')  # 쿠팡 파트너스 수익 추가
-        }
-        
-        for d in date_list:
-            for key, value in section_data[d].items():
-                platform, alias = key.split('|', 1)
-                if platform in platform_totals:
-                    platform_totals[platform] += value
-        
-        totals.update({
-            'valid_pv': Decimal('0'),
-            'revenue_per_pv': Decimal('0'),
-            'cozymamang_revenue': platform_totals['cozymamang'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'mediamixer_revenue': platform_totals['mediamixer'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'aceplanet_revenue': platform_totals['aceplanet'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'teads_revenue': platform_totals['teads'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'taboola_revenue': platform_totals['taboola'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'coupang_revenue': platform_totals['coupang'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),  # 쿠팡 파트너스 수익 추가
-        })
-    elif section_name == 'stamply':
-        totals['coupang_revenue'] = Decimal('0')
-    
-    return daily_revenue, totals
+def _section_ledger(section_data, date_list, section_name, other_revenue_data=None, daily_data=None):
+    """
+    섹션 일별 금액을 원 단위 int64 배열로 구성 (반올림 지점은 stats.services.money 참고).
+    반환값: {'keys': 개별 플랫폼 키 목록, 'cells': (날짜 × 플랫폼) 배열,
+             'base': 일 매출(개별 플랫폼 + 구글/네이버), 'other': 일 기타수익, 'cost': 일 매입 비용}
+    """
+    # 구글/네이버 합계 키(google|섹션, naver|섹션)와 퍼블리셔 네이버 키는 daily_data 값으로 대신 합산
+    keys = sorted({
+        key for d in date_list for key in section_data.get(d, {})
+        if key.split('|', 1)[0] not in ('google', 'naver')
+    })
+    cells = won([[section_data.get(d, {}).get(key, 0) for key in keys] for d in date_list]).reshape(len(date_list), len(keys))
+    base = cells.sum(axis=1)
+    if daily_data and section_name in ('publisher', 'partners'):
+        for field in (f'{section_name}_daily_google', f'{section_name}_daily_naver'):
+            base += won_trunc([daily_data[field].get(d, 0) for d in date_list])
 
-def calculate_section_totals_with_other_revenue(section_data, date_list, section_name, google_naver_data=None, other_revenue_data=None, daily_data=None):
-    """섹션별 합계를 계산 (기타수익 및 비용 포함) - 순익과 매출을 모두 반환"""
-    from decimal import Decimal, ROUND_HALF_UP
-    # 기본 매출(비용 차감 전) - 구글/네이버 합계 제외하고 개별 플랫폼만 합산
-    base_daily_revenue = {}
-    for d in date_list:
-        daily_sum = Decimal('0')
-        for key, value in section_data[d].items():
-            platform, alias = key.split('|', 1)
-            if platform not in ['google', 'naver']:  # 합계 데이터 제외
-                daily_sum += value
-        
-        # daily_data에서 해당 섹션의 구글/네이버 수익 추가
-        if daily_data:
-            if section_name == 'publisher':
-                daily_sum += daily_data['publisher_daily_google'].get(d, Decimal('0')) + daily_data['publisher_daily_naver'].get(d, Decimal('0'))
-            elif section_name == 'partners':
-                daily_sum += daily_data['partners_daily_google'].get(d, Decimal('0')) + daily_data['partners_daily_naver'].get(d, Decimal('0'))
-        
-        base_daily_revenue[d] = daily_sum
+    other_revenue_data = other_revenue_data or {}
+    other = won_trunc([other_revenue_data.get(d, {}).get(section_name, 0) for d in date_list])
+    cost = won_trunc([other_revenue_data.get(d, {}).get(f'{section_name}_cost', 0) for d in date_list])
+    return {'keys': keys, 'cells': cells, 'base': base, 'other': other, 'cost': cost}
 
-    daily_profit = {}  # 순익: 매출 + 기타수익 - 매입비용
-    daily_sales = {}   # 매출: 매출 + 기타수익
-    other_revenue_total = Decimal('0')
-    cost_total = Decimal('0')
 
-    for d in date_list:
-        base_revenue = base_daily_revenue[d]
-        other_revenue = Decimal('0')
-        cost = Decimal('0')
-        if other_revenue_data and d in other_revenue_data:
-            if section_name in other_revenue_data[d]:
-                other_revenue = other_revenue_data[d][section_name]
-                other_revenue_total += other_revenue
-            cost_key = f"{section_name}_cost"
-            if cost_key in other_revenue_data[d]:
-                cost = other_revenue_data[d][cost_key]
-                cost_total += cost
-        daily_profit[d] = (base_revenue + other_revenue - cost).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-        daily_sales[d] = (base_revenue + other_revenue).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-
-    # 구글/네이버 수익 추가
-    google_revenue_total = Decimal('0')
-    naver_revenue_total = Decimal('0')
+def _section_totals(ledger, date_list, section_name, google_naver_data=None):
+    """섹션 일별 순익/매출 ({date: int})과 합계 - 모두 원 단위 배열 합"""
+    sales = ledger['base'] + ledger['other']
+    profit = sales - ledger['cost']
+
+    google_revenue_total = 0
+    naver_revenue_total = 0
     if google_naver_data:
-        google_revenue_total = sum(google_naver_data[d]['adsense'] + google_naver_data[d]['admanager'] for d in date_list)
-        naver_revenue_total = sum(google_naver_data[d]['naver'] for d in date_list)
-    
-    # 개별 플랫폼 수익 + 구글/네이버 수익 = 총 수익
-    total_revenue = sum(daily_profit.values())
-    total_sales = sum(daily_sales.values())
-    
-    # daily_data에서 해당 섹션의 구글/네이버 수익 추가
-    if daily_data:
-        if section_name == 'publisher':
-            total_revenue += sum(daily_data['publisher_daily_google'].values()) + sum(daily_data['publisher_daily_naver'].values())
-            total_sales += sum(daily_data['publisher_daily_google'].values()) + sum(daily_data['publisher_daily_naver'].values())
-        elif section_name == 'partners':
-            total_revenue += sum(daily_data['partners_daily_google'].values()) + sum(daily_data['partners_daily_naver'].values())
-            total_sales += sum(daily_data['partners_daily_google'].values()) + sum(daily_data['partners_daily_naver'].values())
-    
+        google_revenue_total = int(won_trunc([
+            google_naver_data[d]['adsense'] + google_naver_data[d]['admanager'] for d in date_list
+        ]).sum())
+        naver_revenue_total = int(won_trunc([google_naver_data[d]['naver'] for d in date_list]).sum())
+
+    total_revenue = int(profit.sum())
+    cost_total = int(ledger['cost'].sum())
     totals = {
-        'total_revenue': total_revenue.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        f'{section_name}_revenue': total_revenue.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        'other_revenue': other_revenue_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        'total_cost': cost_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        f'{section_name}_cost': cost_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        f'{section_name}_sales': total_sales.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        'google_revenue': google_revenue_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-        'naver_revenue': naver_revenue_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP)
+        'total_revenue': total_revenue,
+        f'{section_name}_revenue': total_revenue,
+        'other_revenue': int(ledger['other'].sum()),
+        'total_cost': cost_total,
+        f'{section_name}_cost': cost_total,
+        f'{section_name}_sales': int(sales.sum()),
+        'google_revenue': google_revenue_total,
+        'naver_revenue': naver_revenue_total,
     }
 
-    # 파트너스 특별 필드 추가
+    # 파트너스 특별 필드 추가 (개별 플랫폼 수익)
     if section_name == 'partners':
-        platform_totals = {
-            'cozymamang': Decimal('0'),
-            'mediamixer': Decimal('0'),
-            'aceplanet': Decimal('0'),
-            'teads': Decimal('0'),
-            'taboola': Decimal('0'),
-            'coupang': Decimal('0')  # 쿠팡 파트너스 수익 추가
-        }
-        for d in date_list:
-            for key, value in section_data[d].items():
-                platform, alias = key.split('|', 1)
-                if platform in platform_totals:
-                    platform_totals[platform] += value
-        totals.update({
-            'valid_pv': Decimal('0'),
-            'revenue_per_pv': Decimal('0'),
-            'cozymamang_revenue': platform_totals['cozymamang'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'mediamixer_revenue': platform_totals['mediamixer'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'aceplanet_revenue': platform_totals['aceplanet'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'teads_revenue': platform_totals['teads'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'taboola_revenue': platform_totals['taboola'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),
-            'coupang_revenue': platform_totals['coupang'].quantize(Decimal('0'), rounding=ROUND_HALF_UP),  # 쿠팡 파트너스 수익 추가
-        })
+        platforms = [key.split('|', 1)[0] for key in ledger['keys']]
+        totals.update({'valid_pv': 0, 'revenue_per_pv': 0})
+        for platform in PARTNERS_TOTAL_PLATFORMS:
+            columns = [i for i, name in enumerate(platforms) if name == platform]
+            totals[f'{platform}_revenue'] = int(ledger['cells'][:, columns].sum())
     elif section_name == 'stamply':
-        totals['coupang_revenue'] = Decimal('0')
+        totals['coupang_revenue'] = 0
+
+    return to_template(profit, date_list), to_template(sales, date_list), totals
+
+
+def calculate_section_totals(section_data, date_list, section_name, google_naver_data=None, daily_data=None):
+    """섹션별 합계를 계산 (기타수익/비용 없음). 반환값: (일 매출 {date: int}, 합계)"""
+    ledger = _section_ledger(section_data, date_list, section_name, None, daily_data)
+    daily_revenue, _, totals = _section_totals(ledger, date_list, section_name, google_naver_data)
+    return daily_revenue, totals
 
-    return daily_profit, daily_sales, totals
+
+def calculate_section_totals_with_other_revenue(section_data, date_list, section_name, google_naver_data=None, other_revenue_data=None, daily_data=None):
+    """섹션별 합계를 계산 (기타수익 및 비용 포함) - 순익과 매출을 모두 반환"""
+    ledger = _section_ledger(section_data, date_list, section_name, other_revenue_data, daily_data)
+    return _section_totals(ledger, date_list, section_name, google_naver_data)
 
 def calculate_daily_platform_revenue(date_list, publisher_google_naver_data, partners_google_naver_data, 
                                    section_results, naver_powerlink_detail=None, user=None, platform_list=None):
@@ -532,7 +386,24 @@ def calculate_daily_platform_revenue(date_list, publisher_google_naver_data, par
         'stamply_daily_coupang_by_account': {},
     }
     
-    for d in date_list:
+    # 파트너스/스탬플리 개별 플랫폼 수익 - 기간 전체를 한 번에 조회해 플랫폼별 배열로 구성
+    pivot = DailyRevenuePivot.load(user, date_list)
+    coupang_aliases = coupang_aliases_by_classification(user)
+    platform_list = platform_list or []
+    
+    partners_series = {}
+    for platform in ['cozymamang', 'mediamixer', 'aceplanet', 'teads', 'taboola', 'coupang']:
+        if platform == 'coupang':
+            # 쿠팡은 PlatformCredential의 coupang_classification으로 판단
+            aliases = coupang_aliases['partners']
+        else:
+            aliases = [a for p, a in platform_list if p == platform]
+        partners_series[platform] = to_template(pivot.rounded_sum(platform, aliases))
+    
+    # 스탬플리로 분류된 쿠팡 계정별 수익 (반올림 없는 Decimal - 계정 합계에서 한 번만 반올림)
+    stamply_series = [(alias, pivot.series('coupang', alias)) for alias in coupang_aliases['stamply']]
+    
+    for i, d in enumerate(date_list):
         # 퍼블리셔 일일 수익 (main.py와 동일하게 int 변환)
         daily_data['publisher_daily_google'][d] = int(publisher_google_naver_data[d]['adsense'] + publisher_google_naver_data[d]['admanager'])
         
@@ -548,81 +419,26 @@ def calculate_daily_platform_revenue(date_list, publisher_google_naver_data, par
             daily_data['publisher_daily_naver'][d] = int(publisher_google_naver_data[d]['naver'])
             daily_data['partners_daily_naver'][d] = int(partners_google_naver_data[d]['naver'])
         
-        # 파트너스 개별 플랫폼 수익 - AdStats에서 직접 계산
-        platform_revenues = {
-            'cozymamang': Decimal('0'),
-            'mediamixer': Decimal('0'),
-            'aceplanet': Decimal('0'),
-            'teads': Decimal('0'),
-            'taboola': Decimal('0'),
-            'coupang': Decimal('0')  # 쿠팡 파트너스 수익 추가
-        }
-        
-        # AdStats에서 각 플랫폼별 수익 직접 조회
-        from django.db.models import Sum
-        from stats.models import AdStats
-        
-        # 기본 데이터 조회
-        stats = AdStats.objects.filter(user=user, date=d)
-        data = {}
-        for row in stats.values('platform', 'alias').annotate(earnings=Sum('earnings')):
-            key = f"{row['platform']}|{row['alias']}"
-            data[key] = Decimal(str(row['earnings'] or 0))
-        
-        for platform in platform_revenues.keys():
-            if platform == 'coupang':
-                # 쿠팡은 PlatformCredential의 coupang_classification으로 판단
-                from stats.models import PlatformCredential
-                coupang_creds = PlatformCredential.objects.filter(
-                    user=user,  # user는 함수 파라미터에 추가 필요
-                    platform='coupang',
-                    coupang_classification='partners'
-                )
-                for cred in coupang_creds:
-                    key = f"coupang|{cred.alias}"
-                    platform_revenues['coupang'] += round(float(data.get(key, Decimal('0'))))
-            else:
-                # 다른 플랫폼들은 기본 데이터에서 가져오기
-                for alias in [a for p, a in platform_list if p == platform]:
-                    key = f"{platform}|{alias}"
-                    platform_revenues[platform] += round(float(data.get(key, Decimal('0'))))
-        
-        daily_data['partners_daily_cozymamang'][d] = platform_revenues['cozymamang']
-        daily_data['partners_daily_mediamixer'][d] = platform_revenues['mediamixer']
-        daily_data['partners_daily_aceplanet'][d] = platform_revenues['aceplanet']
-        daily_data['partners_daily_teads'][d] = platform_revenues['teads']
-        daily_data['partners_daily_taboola'][d] = platform_revenues['taboola']
-        daily_data['partners_daily_coupang'][d] = platform_revenues['coupang']  # 쿠팡 파트너스 수익 추가
-        
-        # 스탬플리 쿠팡 수익 (계정별로 분리) - AdStats에서 직접 조회
-        daily_data['stamply_daily_coupang_by_account'][d] = {}
-        coupang_revenue = Decimal('0')
-        
-        # 스템플리로 분류된 쿠팡 계정들 조회
-        from stats.models import PlatformCredential
-        stamply_coupang_creds = PlatformCredential.objects.filter(
-            user=user,
-            platform='coupang',
-            coupang_classification='stamply'
-        )
+        daily_data['partners_daily_cozymamang'][d] = partners_series['cozymamang'][i]
+        daily_data['partners_daily_mediamixer'][d] = partners_series['mediamixer'][i]
+        daily_data['partners_daily_aceplanet'][d] = partners_series['aceplanet'][i]
+        daily_data['partners_daily_teads'][d] = partners_series['teads'][i]
+        daily_data['partners_daily_taboola'][d] = partners_series['taboola'][i]
+        daily_data['partners_daily_coupang'][d] = partners_series['coupang'][i]  # 쿠팡 파트너스 수익 추가
         
-        for cred in stamply_coupang_creds:
-            key = f"coupang|{cred.alias}"
-            account_revenue = data.get(key, Decimal('0'))
-            daily_data['stamply_daily_coupang_by_account'][d][cred.alias] = account_revenue
-            coupang_revenue += account_revenue
-        
-        daily_data['stamply_daily_coupang'][d] = coupang_revenue
+        # 스탬플리 쿠팡 수익 (계정별로 분리)
+        daily_data['stamply_daily_coupang_by_account'][d] = {alias: series[i] for alias, series in stamply_series}
+        daily_data['stamply_daily_coupang'][d] = sum((series[i] for _, series in stamply_series), Decimal('0'))
     
     return daily_data
 
 def calculate_coupang_account_totals(stamply_daily_coupang_by_account, date_list, stamply_platforms):
-    """쿠팡 계정별 합계를 계산"""
+    """쿠팡 계정별 합계를 계산 (반올림 없는 일 수익의 합을 계정별로 한 번 ROUND_HALF_UP)"""
     stamply_coupang_account_totals = {}
     for platform, alias in stamply_platforms:
         if platform == 'coupang':
-            account_total = Decimal(str(sum(stamply_daily_coupang_by_account[d].get(alias, Decimal('0')) for d in date_list))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-            stamply_coupang_account_totals[alias] = account_total
+            account_total = sum((stamply_daily_coupang_by_account[d].get(alias, Decimal('0')) for d in date_list), Decimal('0'))
+            stamply_coupang_account_totals[alias] = int(account_total.quantize(Decimal('0'), rounding=ROUND_HALF_UP))
     return stamply_coupang_account_totals
 
 def get_platform_headers(platforms, section_name=None):
@@ -647,7 +463,7 @@ def build_report_context(date_list, platform_headers, section_results, daily_dat
                          publisher_revenue, partners_revenue, stamply_revenue,
                          publisher_profit, partners_profit, stamply_profit,
                          total_revenue, total_profit, purchase_data, other_revenue_data):
-    """리포트 컨텍스트를 구성하는 헬퍼 함수"""
+    """리포트 컨텍스트를 구성하는 헬퍼 함수 (섹션 합계는 원 단위 배열 합 - section_results['totals'])"""
     section_headers = {
         'publisher': get_platform_headers(section_results['publisher']['platforms'], 'publisher'),
         'partners': get_platform_headers(section_results['partners']['platforms'], 'partners'),
@@ -677,8 +493,8 @@ def build_report_context(date_list, platform_headers, section_results, daily_dat
             'publisher_revenue': sum(publisher_revenue.values()),
             'publisher_profit': sum(publisher_profit.values()),
             'publisher_sales': sum(publisher_revenue.values()),
-            'publisher_cost': sum(purchase_data[d]['publisher'] for d in date_list),
-            'other_revenue': sum(int(other_revenue_data[d].get('publisher', 0)) for d in date_list if other_revenue_data and d in other_revenue_data),
+            'publisher_cost': section_results['publisher']['totals']['publisher_cost'],
+            'other_revenue': section_results['publisher']['totals']['other_revenue'],
             # 구글/네이버 합계 추가
             'google_revenue': sum(daily_data.get('publisher_daily_google', {}).values()),
             'naver_revenue': sum(daily_data.get('publisher_daily_naver', {}).values()),
@@ -688,8 +504,8 @@ def build_report_context(date_list, platform_headers, section_results, daily_dat
             'partners_revenue': sum(partners_revenue.values()),
             'partners_profit': sum(partners_profit.values()),
             'partners_sales': sum(partners_revenue.values()),
-            'partners_cost': sum(purchase_data[d]['partners'] for d in date_list),
-            'other_revenue': sum(int(other_revenue_data[d].get('partners', 0)) for d in date_list if other_revenue_data and d in other_revenue_data),
+            'partners_cost': section_results['partners']['totals']['partners_cost'],
+            'other_revenue': section_results['partners']['totals']['other_revenue'],
             # 구글/네이버 합계 추가
             'google_revenue': sum(daily_data.get('partners_daily_google', {}).values()),
             'naver_revenue': sum(daily_data.get('partners_daily_naver', {}).values()),
@@ -708,8 +524,8 @@ def build_report_context(date_list, platform_headers, section_results, daily_dat
             'stamply_revenue': sum(stamply_revenue.values()),
             'stamply_profit': sum(stamply_profit.values()),
             'stamply_sales': sum(stamply_revenue.values()),
-            'stamply_cost': sum(purchase_data[d]['stamply'] for d in date_list),
-            'other_revenue': sum(int(other_revenue_data[d].get('stamply', 0)) for d in date_list if other_revenue_data and d in other_revenue_data),
+            'stamply_cost': section_results['stamply']['totals']['stamply_cost'],
+            'other_revenue': section_results['stamply']['totals']['other_revenue'],
             'coupang_revenue': section_results['stamply']['totals'].get('coupang_revenue', 0),
         },
         'stamply_coupang_account_totals': stamply_coupang_account_totals,
@@ -743,34 +559,160 @@ def process_all_sections(user, platform_list, start_date, end_date, publisher_go
         'stamply': {'google_data': None}
     }
     
+    date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     section_results = {}
     for section_name, config in sections_config.items():
         platforms = get_section_platforms(platform_list, section_name, user)
         section_data = process_section_data(
             user, platform_list, start_date, end_date, platforms, config['google_data'], section_name
         )
-        
-        if other_revenue_data:
-            daily_profit, daily_sales, totals = calculate_section_totals_with_other_revenue(
-                section_data, [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)], 
-                section_name, config['google_data'], other_revenue_data, daily_data
-            )
-        else:
-            daily_profit, totals = calculate_section_totals(
-                section_data, [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)], 
-                section_name, config['google_data'], daily_data
+        section_results[section_name] = summarize_section(
+            section_name, section_data, date_list, platforms, config['google_data'], other_revenue_data, daily_data
+        )
+    
+    return section_results
+
+def summarize_section(section_name, section_data, date_list, platforms, google_data=None, other_revenue_data=None, daily_data=None):
+    """섹션 일별 데이터로 일별 순익/매출과 합계를 구성"""
+    if other_revenue_data:
+        daily_profit, daily_sales, totals = calculate_section_totals_with_other_revenue(
+            section_data, date_list, section_name, google_data, other_revenue_data, daily_data
+        )
+    else:
+        daily_profit, totals = calculate_section_totals(
+            section_data, date_list, section_name, google_data, daily_data
+        )
+        daily_sales = daily_profit  # 비용이 없으므로 매출=순익
+    
+    return {
+        'data': section_data,
+        'daily_profit': daily_profit,
+        'daily_sales': daily_sales,
+        'totals': totals,
+        'platforms': platforms
+    }
+
+def get_revenue_chain(graph, start_date, end_date):
+    """
+    main/report 공통 매출 계산 체인.
+    날짜별로 분해되는 단계는 RevenueGraph 의 daily 노드로 계산하므로
+    같은 요청의 다른 기간(전월 비교 등)과 이후 요청이 겹치는 날짜의 결과를 재사용합니다.
+    """
+    user = graph.user
+    date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    
+    platform_list = graph.value('platform_list', lambda: get_platform_list(user))
+    ad_unit_member_map = graph.value('ad_unit_member_map', lambda: get_ad_unit_member_mapping(user))
+    section_platforms = graph.value('section_platforms', lambda: {
+        section_name: get_section_platforms(platform_list, section_name, user)
+        for section_name in SECTION_NAMES
+    })
+    
+    def google_naver(s, e):
+        # 구글/네이버 수익을 Member level별로 분류 + 네이버 파워링크 수익
+        publisher_data, partners_data = calculate_platform_revenue_by_member_level(
+            user, s, e, ad_unit_member_map, get_exchange_rates(user, s, e)
+        )
+        publisher_data, partners_data = calculate_naver_powerlink_revenue(user, s, e, publisher_data, partners_data)
+        return {d: (publisher_data[d], partners_data[d]) for d in publisher_data}
+    
+    def naver_powerlink_daily(s, e):
+        return get_naver_powerlink_detail_data(user, s, e)['daily']
+    
+    def other_revenue(s, e):
+        return get_other_revenue_data(user, s, e)
+    
+    def daily_platform(s, e):
+        run_dates = [s + timedelta(days=i) for i in range((e - s).days + 1)]
+        run_google_naver = graph.daily('google_naver', s, e, google_naver)
+        run_daily_data = calculate_daily_platform_revenue(
+            run_dates,
+            {d: value[0] for d, value in run_google_naver.items()},
+            {d: value[1] for d, value in run_google_naver.items()},
+            {}, {'daily': graph.daily('naver_powerlink_detail', s, e, naver_powerlink_daily)}, user, platform_list
+        )
+        return {d: {field: values[d] for field, values in run_daily_data.items()} for d in run_dates}
+    
+    def section_data(s, e):
+        run_google_naver = graph.daily('google_naver', s, e, google_naver)
+        google_data = {
+            'publisher': {d: value[0] for d, value in run_google_naver.items()},
+            'partners': {d: value[1] for d, value in run_google_naver.items()},
+            'stamply': None,
+        }
+        run_sections = {
+            section_name: process_section_data(
+                user, platform_list, s, e, section_platforms[section_name], google_data[section_name], section_name
             )
-            daily_sales = daily_profit  # 비용이 없으므로 매출=순익
-        
-        section_results[section_name] = {
-            'data': section_data,
-            'daily_profit': daily_profit,
-            'daily_sales': daily_sales,
-            'totals': totals,
-            'platforms': platforms
+            for section_name in SECTION_NAMES
         }
+        return {d: {section_name: run_sections[section_name][d] for section_name in SECTION_NAMES} for d in run_sections['publisher']}
     
-    return section_results
+    google_naver_data = graph.daily('google_naver', start_date, end_date, google_naver)
+    publisher_google_naver_data = {d: value[0] for d, value in google_naver_data.items()}
+    partners_google_naver_data = {d: value[1] for d, value in google_naver_data.items()}
+    
+    naver_daily = graph.daily('naver_powerlink_detail', start_date, end_date, naver_powerlink_daily)
+    naver_powerlink_detail = {'daily': naver_daily, 'totals': summarize_naver_powerlink_totals(naver_daily)}
+    
+    other_revenue_data = {
+        d: value for d, value in graph.daily('other_revenue', start_date, end_date, other_revenue).items()
+        if value is not None
+    }
+    
+    def purchase_daily(s, e):
+        # 기타수익의 매입 비용 항목 (*_cost) 을 섹션별로 합산
+        run_other_revenue = graph.daily('other_revenue', s, e, other_revenue)
+        result = {}
+        for d, revenues in run_other_revenue.items():
+            totals = {'publisher': 0, 'partners': 0, 'stamply': 0, 'total': 0}
+            for section, amount in (revenues or {}).items():
+                if section.endswith('_cost'):
+                    if section in ('publisher_cost', 'partners_cost', 'stamply_cost'):
+                        totals[section[:-len('_cost')]] += int(amount)
+                    totals['total'] += int(amount)
+            result[d] = totals
+        return result
+    
+    purchase_data = graph.daily('purchase_daily', start_date, end_date, purchase_daily)
+    
+    daily_by_date = graph.daily('daily_platform', start_date, end_date, daily_platform)
+    daily_data = {field: {d: daily_by_date[d][field] for d in date_list} for field in daily_by_date[start_date]}
+    
+    sections_by_date = graph.daily('section_data', start_date, end_date, section_data)
+    google_data = {'publisher': publisher_google_naver_data, 'partners': partners_google_naver_data, 'stamply': None}
+    section_results = {
+        section_name: summarize_section(
+            section_name, {d: sections_by_date[d][section_name] for d in date_list}, date_list,
+            section_platforms[section_name], google_data[section_name], other_revenue_data, daily_data
+        )
+        for section_name in SECTION_NAMES
+    }
+    
+    return {
+        'date_list': date_list,
+        'platform_list': platform_list,
+        'publisher_google_naver_data': publisher_google_naver_data,
+        'partners_google_naver_data': partners_google_naver_data,
+        'naver_powerlink_detail': naver_powerlink_detail,
+        'other_revenue_data': other_revenue_data,
+        'daily_data': daily_data,
+        'section_results': section_results,
+        'purchase_data': purchase_data,
+    }
+
+def calculate_section_revenue(date_list, section_results, daily_data, other_revenue_data):
+    """
+    섹션별 일 매출 (개별 플랫폼 + 구글/네이버 + 기타수익). 반환값: (publisher, partners, stamply) {date: int}
+    main/report/API 가 모두 이 함수를 사용하므로 반올림 규칙은 섹션 합계(_section_ledger)와 같습니다.
+    """
+    result = []
+    for section_name in SECTION_NAMES:
+        ledger = _section_ledger(
+            section_results[section_name]['data'], date_list, section_name, other_revenue_data, daily_data
+        )
+        result.append(to_template(ledger['base'] + ledger['other'], date_list))
+    return tuple(result)
 
 @login_required
 def report_view(request):
@@ -785,7 +727,7 @@ def report_view(request):
     date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     
     # 2. 기본 수익 데이터 조회
-    stats = AdStats.objects.filter(user=user, date__range=[start_date, end_date])
+    stats = DailyRevenueRollup.objects.filter(user=user, date__range=[start_date, end_date])
     data = {}
     for d in date_list:
         data[d] = {}
@@ -793,133 +735,38 @@ def report_view(request):
             key = f"{platform}|{alias}"
             data[d][key] = Decimal('0')
 
-    for row in stats.values('date', 'platform', 'alias').annotate(earnings=Sum('earnings')):
+    for row in stats.values('date', 'platform', 'alias', 'earnings'):
         d = row['date']
         key = f"{row['platform']}|{row['alias']}"
         if d in data and key in data[d]:
             data[d][key] = Decimal(str(row['earnings'] or 0))
 
-    # 3. 구글/네이버 수익을 Member level별로 분류
-    exchange_rates = get_exchange_rates(user, start_date, end_date)
-    ad_unit_member_map = get_ad_unit_member_mapping(user)
-    
-    publisher_google_naver_data, partners_google_naver_data = calculate_platform_revenue_by_member_level(
-        user, start_date, end_date, ad_unit_member_map, exchange_rates
-    )
-    
-    # 4. 네이버 파워링크 수익 계산
-    publisher_google_naver_data, partners_google_naver_data = calculate_naver_powerlink_revenue(
-        user, start_date, end_date, publisher_google_naver_data, partners_google_naver_data
-    )
-    
-    # 5. 기타수익 데이터 조회
-    other_revenue_data = get_other_revenue_data(user, start_date, end_date)
-    
-    # 7. 세부 데이터 표를 위한 데이터 추가 (naver_powerlink_detail을 먼저 생성)
+    # 3~9. 구글/네이버 분류, 파워링크, 기타수익, 일일 플랫폼 수익, 섹션 처리 (공통 계산 그래프)
+    graph = RevenueGraph(user)
+    chain = get_revenue_chain(graph, start_date, end_date)
+    publisher_google_naver_data = chain['publisher_google_naver_data']
+    partners_google_naver_data = chain['partners_google_naver_data']
+    other_revenue_data = chain['other_revenue_data']
+    naver_powerlink_detail = chain['naver_powerlink_detail']
+    daily_data = chain['daily_data']
+    section_results = chain['section_results']
+    purchase_data = chain['purchase_data']
+    
+    # 세부 데이터 표
     google_detail_adsense, google_detail_admanager = get_google_detail_data(
         user, start_date, end_date, publisher_google_naver_data, partners_google_naver_data
     )
-    naver_powerlink_detail = get_naver_powerlink_detail_data(user, start_date, end_date)
     naver_performance_detail = get_naver_performance_report_data(user, start_date, end_date)
     cozymamang_detail, cozymamang_grand_totals, cozymamang_daily_totals = get_cozymamang_detail_data(user, start_date, end_date)
     partners_valid_pv_data = get_partners_valid_pv_data(user, start_date, end_date, other_revenue_data, partners_google_naver_data)
+    graph.log_timings('report')
     
-    # 8. 일일 개별 플랫폼 수익 계산 (naver_powerlink_detail 사용)
-    daily_data = calculate_daily_platform_revenue(
-        date_list, publisher_google_naver_data, partners_google_naver_data, 
-        {}, naver_powerlink_detail, user, platform_list  # user와 platform_list 전달
+    # 섹션별 일 매출 (main.py와 동일한 방식)
+    publisher_revenue, partners_revenue, stamply_revenue = calculate_section_revenue(
+        date_list, section_results, daily_data, other_revenue_data
     )
     
-    # 9. 모든 섹션 처리 (daily_data 전달)
-    section_results = process_all_sections(
-        user, platform_list, start_date, end_date, publisher_google_naver_data, partners_google_naver_data, other_revenue_data, daily_data
-    )
-    
-    # main.py와 동일한 방식으로 퍼블리셔 수익 계산
-    publisher_revenue = {}
-    for d in date_list:
-        publisher_revenue[d] = 0  # int로 시작
-        
-        # 퍼블리셔 섹션의 개별 플랫폼 수익 (구글/네이버 제외)
-        if d in section_results['publisher']['data']:
-            for key, value in section_results['publisher']['data'][d].items():
-                platform, alias = key.split('|', 1)
-                # google|publisher, naver|publisher 키도 제외 (중복 방지)
-                if platform not in ['google', 'naver'] and not key.startswith(('google|', 'naver|')):
-                    publisher_revenue[d] += round(float(value))  # 반올림 적용
-        
-        # 퍼블리셔의 구글/네이버 수익 추가 (daily_data에서 이미 int 변환됨)
-        if d in daily_data['publisher_daily_google']:
-            publisher_revenue[d] += daily_data['publisher_daily_google'][d]  # 이미 int이므로 변환 불필요
-        if d in daily_data['publisher_daily_naver']:
-            publisher_revenue[d] += daily_data['publisher_daily_naver'][d]  # 이미 int이므로 변환 불필요
-        
-        # 기타수익 추가 (main.py와 동일하게)
-        if other_revenue_data and d in other_revenue_data:
-            if 'publisher' in other_revenue_data[d]:
-                publisher_revenue[d] += int(other_revenue_data[d]['publisher'])
-    
-    # main.py와 동일한 방식으로 파트너스 수익 계산
-    partners_revenue = {}
-    for d in date_list:
-        partners_revenue[d] = 0  # int로 시작
-        
-        # 파트너스 섹션의 개별 플랫폼 수익 (구글/네이버 제외)
-        if d in section_results['partners']['data']:
-            for key, value in section_results['partners']['data'][d].items():
-                platform, alias = key.split('|', 1)
-                # google|partners, naver|partners 키도 제외 (중복 방지)
-                if platform not in ['google', 'naver'] and not key.startswith(('google|', 'naver|')):
-                    partners_revenue[d] += round(float(value))  # 반올림 적용
-        
-        # 파트너스의 구글/네이버 수익 추가 (daily_data에서 이미 int 변환됨)
-        if d in daily_data['partners_daily_google']:
-            partners_revenue[d] += daily_data['partners_daily_google'][d]  # 이미 int이므로 변환 불필요
-        if d in daily_data['partners_daily_naver']:
-            partners_revenue[d] += daily_data['partners_daily_naver'][d]  # 이미 int이므로 변환 불필요
-        
-        # 기타수익 추가 (main.py와 동일하게)
-        if other_revenue_data and d in other_revenue_data:
-            if 'partners' in other_revenue_data[d]:
-                partners_revenue[d] += int(other_revenue_data[d]['partners'])
-    
-    # 스탬플리 수익 계산 (main.py와 동일한 방식)
-    stamply_revenue = {}
-    for d in date_list:
-        stamply_revenue[d] = 0  # int로 시작
-        
-        # 스탬플리 섹션의 개별 플랫폼 수익
-        if d in section_results['stamply']['data']:
-            for key, value in section_results['stamply']['data'][d].items():
-                stamply_revenue[d] += round(float(value))  # 반올림 적용
-        
-        # 기타수익 추가
-        if other_revenue_data and d in other_revenue_data:
-            if 'stamply' in other_revenue_data[d]:
-                stamply_revenue[d] += int(other_revenue_data[d]['stamply'])
-    
-    # 매입 비용 계산 (main.py와 동일한 방식)
-    purchase_data = {}
-    for d in date_list:
-        purchase_data[d] = {
-            'publisher': 0,
-            'partners': 0,
-            'stamply': 0,
-            'total': 0
-        }
-        
-        # 기타수익에서 매입 비용 추출
-        if other_revenue_data and d in other_revenue_data:
-            for section, amount in other_revenue_data[d].items():
-                if section.endswith('_cost'):
-                    if section == 'publisher_cost':
-                        purchase_data[d]['publisher'] += int(amount)
-                    elif section == 'partners_cost':
-                        purchase_data[d]['partners'] += int(amount)
-                    elif section == 'stamply_cost':
-                        purchase_data[d]['stamply'] += int(amount)
-                    
-                    purchase_data[d]['total'] += int(amount)
+    # 매입 비용 (기타수익의 매입 비용 항목, 일자별 캐시 - chain['purchase_data'])
     
     # 순이익 계산 (매출 - 매입비용)
     publisher_profit = {d: publisher_revenue[d] - purchase_data[d]['publisher'] for d in date_list}
@@ -959,7 +806,152 @@ def report_view(request):
         'partners_valid_pv_data': partners_valid_pv_data,  # 파트너스 유효PV 데이터 추가
     })
     
-    return render(request, 'report.html', context)
+    response = render(request, 'report.html', context)
+    response['Server-Timing'] = graph.server_timing()
+    return response
+
+# 컬럼형 리포트 API 응답 형식 버전 (형식이 바뀌면 올려서 기존 ETag/캐시를 무효화)
+REPORT_API_VERSION = 2
+# 압축된 응답 본문 캐시 시간 (키에 입력 버전이 들어가므로 변경 시 자동으로 새 키 사용)
+REPORT_API_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _json_number(value):
+    if value is None:
+        return 0
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def _report_columns(date_list, by_date, prefix, series, dtypes):
+    """
+    {date: {key: 값}} 을 시리즈별 배열로 변환해 series/dtypes 에 추가.
+    값이 dict 인 항목(계정별 합계 등)은 한 단계 펼쳐 'prefix.key.subkey' 로 저장합니다.
+    """
+    columns = {}
+    for i, d in enumerate(date_list):
+        for key, value in (by_date.get(d) or {}).items():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    columns.setdefault(f"{prefix}.{key}.{sub_key}", [0] * len(date_list))[i] = _json_number(sub_value)
+            else:
+                columns.setdefault(f"{prefix}.{key}", [0] * len(date_list))[i] = _json_number(value)
+    for name, values in columns.items():
+        series[name] = values
+        dtypes[name] = 'float' if any(isinstance(v, float) for v in values) else 'int'
+
+
+def build_report_columns(user, graph, start_date, end_date):
+    """
+    report/main 페이지와 같은 계산 체인(get_revenue_chain)으로 컬럼형 리포트 구성.
+    dates 배열과 시리즈별 숫자 배열(날짜 순서), 시리즈 합계, 메타데이터를 반환합니다.
+    """
+    chain = get_revenue_chain(graph, start_date, end_date)
+    date_list = chain['date_list']
+    section_results = chain['section_results']
+    daily_data = chain['daily_data']
+    other_revenue_data = chain['other_revenue_data']
+    purchase_data = chain['purchase_data']
+
+    # 플랫폼별 원본 수익 (일별 집계)
+    platform_earnings = {d: {} for d in date_list}
+    for row in DailyRevenueRollup.objects.filter(
+        user=user, date__range=[start_date, end_date]
+    ).values('date', 'platform', 'alias', 'earnings'):
+        platform_earnings[row['date']][f"{row['platform']}|{row['alias']}"] = row['earnings'] or 0
+
+    series = {}
+    dtypes = {}
+    _report_columns(date_list, platform_earnings, 'platform', series, dtypes)
+    for section_name in SECTION_NAMES:
+        _report_columns(date_list, section_results[section_name]['data'], section_name, series, dtypes)
+    _report_columns(
+        date_list, {d: {field: values.get(d) for field, values in daily_data.items()} for d in date_list},
+        'daily', series, dtypes,
+    )
+    _report_columns(date_list, other_revenue_data, 'other', series, dtypes)
+    _report_columns(date_list, purchase_data, 'purchase', series, dtypes)
+
+    revenue = dict(zip(SECTION_NAMES, calculate_section_revenue(date_list, section_results, daily_data, other_revenue_data)))
+    for section_name in SECTION_NAMES:
+        series[f"revenue.{section_name}"] = [revenue[section_name][d] for d in date_list]
+        series[f"profit.{section_name}"] = [revenue[section_name][d] - purchase_data[d][section_name] for d in date_list]
+    series['revenue.total'] = [sum(revenue[name][d] for name in SECTION_NAMES) for d in date_list]
+    series['profit.total'] = [series['revenue.total'][i] - purchase_data[d]['total'] for i, d in enumerate(date_list)]
+    for name in ('revenue', 'profit'):
+        for section_name in SECTION_NAMES + ('total',):
+            dtypes[f"{name}.{section_name}"] = 'int'
+
+    # 표시명은 report/main 테이블 헤더와 같은 규칙 ('default' 계정은 별칭 생략)
+    platforms = [
+        {'key': key, 'platform': platform, 'alias': alias, 'label': label}
+        for platform, alias, label, key in get_platform_headers(chain['platform_list'])
+    ]
+    return {
+        'meta': {
+            'version': REPORT_API_VERSION,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'days': len(date_list),
+            'platforms': platforms,
+            'sections': {
+                section_name: [f"{platform}|{alias}" for platform, alias in section_results[section_name]['platforms']]
+                for section_name in SECTION_NAMES
+            },
+            'dtypes': dtypes,
+        },
+        'dates': [d.isoformat() for d in date_list],
+        'series': series,
+        'totals': {name: sum(values) for name, values in series.items()},
+    }
+
+
+@login_required
+def report_data_api(request):
+    """
+    컬럼형 리포트 JSON API (report/main 페이지와 같은 숫자를 외부 도구/스크립트가 조회하는 용도).
+    report/main 페이지는 아직 서버 템플릿으로 렌더링하며 이 API 를 사용하지 않습니다.
+    - 응답: {meta, dates, series: {이름: [날짜 순서 값]}, totals}
+    - ETag: 기간의 일자별 입력 버전으로 생성 → If-None-Match 일치 시 304
+    - gzip 압축 본문을 ETag 기준으로 캐시해 같은 데이터 재요청 시 재계산/재압축하지 않음
+    """
+    user = request.user
+    start_date, end_date = get_date_range_from_request(request)
+    date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    graph = RevenueGraph(user)
+    day_versions = graph.day_versions(date_list)
+    etag = hashlib.sha1(repr((
+        REPORT_API_VERSION, user.id, start_date, end_date, graph.global_version,
+        [day_versions[d] for d in date_list],
+    )).encode('utf-8')).hexdigest()[:32]
+    quoted_etag = f'"{etag}"'
+
+    if quoted_etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = quoted_etag
+        return response
+
+    cache_key = f"report_api:{user.id}:{etag}"
+    body = cache.get(cache_key)
+    if body is None:
+        payload = build_report_columns(user, graph, start_date, end_date)
+        body = gzip.compress(json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), 6)
+        cache.set(cache_key, body, REPORT_API_CACHE_TIMEOUT)
+        graph.log_timings('report_api')
+
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(body, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(body), content_type='application/json')
+    response['ETag'] = quoted_etag
+    response['Cache-Control'] = 'private, no-cache'
+    response['Vary'] = 'Accept-Encoding, Cookie'
+    if graph.timings:
+        response['Server-Timing'] = graph.server_timing()
+    return response
 
 def get_other_revenue_data(user, start_date, end_date):
     """기타수익 데이터를 조회하여 반환 (매입비용 포함)"""
@@ -1087,10 +1079,6 @@ def publisher_report_view(request):
     publisher_keys = []
     for group in important_groups:
         publisher_keys.append(group.member_request_key)
-        try:
-            member_name = group.member.uname if group.member else '미설정'
-        except:
-            member_name = '미설정'
         publisher_headers.append({
             'label': f"{group.company_name}",
             'key': group.member_request_key
@@ -1099,137 +1087,21 @@ def publisher_report_view(request):
     # 날짜 리스트
     date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
 
-    # 성능 최적화: 한 번에 모든 데이터 조회
+    # 퍼블리셔 × 날짜 입력을 고정된 수의 쿼리로 적재 후 배열 연산으로 계산
     all_publishers_detail_data = {}
     
     if publisher_keys:  # 퍼블리셔가 있을 때만 쿼리 실행
-        # 1. Adpost 데이터 일괄 조회
-        adpost_stats = AdStats.objects.filter(
-            platform='adpost',
-            ad_unit_id='모바일뉴스픽_컨텐츠',
-            date__range=[start_date, end_date],
-            user=request.user
-        ).values('date').annotate(
-            earnings=Sum('earnings'),
-            clicks=Sum('clicks')
-        )
-        
-        # 2. TotalStat powerlinkCount 일괄 조회
-        total_powerlink_stats = TotalStat.newspic_objects().filter(
-            sdate__range=[start_date, end_date]
-        ).values('sdate').annotate(
-            total_powerlink=Sum('powerlink_count')
-        )
-        
-        # 3. MemberStat 데이터 일괄 조회
-        member_stats = MemberStat.newspic_objects().filter(
-            request_key__in=publisher_keys,
-            sdate__range=[start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')]
-        ).values('request_key', 'sdate').annotate(
-            click_cnt=Sum('click_cnt'),
-            point=Sum('point')
-        )
-        
-        # 4. TotalStat 데이터 일괄 조회
-        total_stats = TotalStat.newspic_objects().filter(
-            request_key__in=publisher_keys,
-            sdate__range=[start_date, end_date]
-        ).values('request_key', 'sdate').annotate(
-            visit_count=Sum('visit_count'),
-            powerlink_count=Sum('powerlink_count')
-        )
-        
-        # 5. 애드센스 데이터 일괄 조회 (매핑된 ad_unit_id들)
-        adsense_ad_units = PurchaseGroupAdUnit.objects.filter(
-            purchase_group__user=request.user,
-            platform='adsense',
-            is_active=True
-        ).values_list('ad_unit_id', flat=True)
-        
-        adsense_stats = {}
-        if adsense_ad_units:
-            adsense_data = AdStats.objects.filter(
-                user=request.user,
-                platform='adsense',
-                ad_unit_id__in=adsense_ad_units,
-                date__range=[start_date, end_date]
-            ).values('ad_unit_id', 'date').annotate(
-                earnings_usd=Sum('earnings_usd')
-            )
-            
-            # 환율 데이터 조회
-            exchange_rates = ExchangeRate.objects.filter(
-                user=request.user
-            ).values('year_month', 'usd_to_krw')
-            exchange_rate_map = {rate['year_month']: rate['usd_to_krw'] for rate in exchange_rates}
-            
-            for stat in adsense_data:
-                key = (stat['ad_unit_id'], stat['date'])
-                usd_amount = stat['earnings_usd'] or 0
-                
-                # 해당 월의 환율 조회, 없으면 기본값 1300 사용
-                month_start = stat['date'].replace(day=1)
-                exchange_rate = exchange_rate_map.get(month_start, Decimal('1300'))
-                
-                # float를 Decimal로 변환하여 연산
-                usd_amount_decimal = Decimal(str(usd_amount))
-                krw_amount = usd_amount_decimal * exchange_rate
-                adsense_stats[key] = krw_amount
-        
-        # 6. ADX(애드매니저) 데이터 일괄 조회 (매핑된 ad_unit_id들)
-        adx_ad_units = PurchaseGroupAdUnit.objects.filter(
-            purchase_group__user=request.user,
-            platform='admanager',
-            is_active=True
-        ).values_list('ad_unit_id', flat=True)
-        
-        adx_stats = {}
-        if adx_ad_units:
-            adx_data = AdStats.objects.filter(
-                user=request.user,
-                platform='admanager',
-                ad_unit_id__in=adx_ad_units,
-                date__range=[start_date, end_date]
-            ).values('ad_unit_id', 'date').annotate(
-                earnings=Sum('earnings')
-            )
-            
-            for stat in adx_data:
-                key = (stat['ad_unit_id'], stat['date'])
-                earnings = stat['earnings'] or 0
-                adx_stats[key] = earnings
-        
-        # 데이터를 딕셔너리로 변환하여 빠른 접근 가능하게 함
-        adpost_data = {}
-        for stat in adpost_stats:
-            adpost_data[stat['date']] = {
-                'earnings': stat['earnings'] or 0,
-                'clicks': stat['clicks'] or 0
-            }
-        
-        total_powerlink_data = {}
-        for stat in total_powerlink_stats:
-            total_powerlink_data[stat['sdate']] = stat['total_powerlink'] or 0
-        
-        member_stats_data = {}
-        for stat in member_stats:
-            key = (stat['request_key'], stat['sdate'])
-            member_stats_data[key] = {
-                'click_cnt': stat['click_cnt'] or 0,
-                'point': stat['point'] or 0
-            }
-        
-        total_stats_data = {}
-        for stat in total_stats:
-            key = (stat['request_key'], stat['sdate'])
-            total_stats_data[key] = {
-                'visit_count': stat['visit_count'] or 0,
-                'powerlink_count': stat['powerlink_count'] or 0
-            }
+        matrix = PublisherDateMatrix.load(request.user, publisher_keys, date_list)
+        powerlink_matrix = matrix.powerlink_revenue().tolist()
+        adsense_matrix = matrix.adsense_revenue().tolist()
+        adsense_usd_matrix = matrix.adsense_usd.tolist()
+        adx_matrix = matrix.adx_revenue.tolist()
+        pageview_matrix = matrix.pageview.tolist()
+        valid_pageview_matrix = matrix.valid_pageview.tolist()
+        powerlink_click_matrix = matrix.powerlink_click.tolist()
         
         # 각 퍼블리셔별 데이터 처리
-        for pub in publisher_headers:
-            publisher_key = pub['key']
+        for i, publisher_key in enumerate(matrix.publisher_keys):
             detail_data = {}
             detail_totals = {
                 'pageview': 0,
@@ -1243,116 +1115,28 @@ def publisher_report_view(request):
                 'avg_revenue': 0,
             }
             
-            # 해당 퍼블리셔의 PurchaseGroup 조회
-            try:
-                member = Member.newspic_objects().get(request_key=publisher_key)
-            except Member.DoesNotExist:
-                member = None
-            
-            purchase_group = PurchaseGroup.objects.filter(
-                member_request_key=publisher_key,
-                user=request.user,
-                is_active=True
-            ).first()
-            
-            # 해당 그룹의 매핑된 애드센스 ad_unit_id들 조회
-            mapped_adsense_units = []
-            if purchase_group:
-                mapped_adsense_units = PurchaseGroupAdUnit.objects.filter(
-                    purchase_group=purchase_group,
-                    platform='adsense',
-                    is_active=True
-                ).values_list('ad_unit_id', flat=True)
-            
-            # 해당 그룹의 매핑된 ADX ad_unit_id들 조회
-            mapped_adx_units = []
-            if purchase_group:
-                mapped_adx_units = PurchaseGroupAdUnit.objects.filter(
-                    purchase_group=purchase_group,
-                    platform='admanager',
-                    is_active=True
-                ).values_list('ad_unit_id', flat=True)
-            
-            for current_date in date_list:
-                date_str = current_date.strftime('%Y%m%d')
-                
-                # 멤버 통계 데이터
-                member_key = (publisher_key, date_str)
-                member_data = member_stats_data.get(member_key, {'click_cnt': 0, 'point': 0})
-                click_cnt = member_data['click_cnt']
-                point = member_data['point']
-                
-                # 전체 통계 데이터
-                total_key = (publisher_key, current_date)
-                total_data = total_stats_data.get(total_key, {'visit_count': 0, 'powerlink_count': 0})
-                visit_count = total_data['visit_count']
-                powerlink_count = total_data['powerlink_count']
+            for j, current_date in enumerate(date_list):
+                visit_count = pageview_matrix[i][j]
+                click_cnt = valid_pageview_matrix[i][j]
+                powerlink_count = powerlink_click_matrix[i][j]
+                powerlink_revenue = powerlink_matrix[i][j]
+                adsense_revenue = adsense_matrix[i][j]
+                adx_revenue = adx_matrix[i][j]
                 
                 # 유효페이지뷰율 계산
                 valid_pageview_rate = 0
                 if visit_count > 0:
                     valid_pageview_rate = round((click_cnt / visit_count) * 100, 2)
                 
-                # 파워링크 수익 계산
-                powerlink_revenue = 0
-                adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                total_powerlink_count = total_powerlink_data.get(current_date, 0)
-                
-                adpost_earnings = adpost_info['earnings']
-                adpost_clicks = adpost_info['clicks']
-                
-                if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                    # 단가 = Adpost 매출 / Adpost 클릭수
-                    unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    # 파워링크 수익 = 단가 × 퍼블리셔 파워링크 클릭수 × 59.5% × (Adpost 클릭수 / 전체 powerlinkCount)
-                    powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-                
-                # 애드센스 수익 계산 (최적화된 버전)
-                adsense_revenue = 0
-                adsense_total_usd = Decimal('0')  # 그룹 전체 USD 합계 (Decimal로 초기화)
-                
-                # 해당 그룹의 모든 ad_unit_id에 대해 한 번에 데이터 조회
-                if mapped_adsense_units:
-                    adsense_usd_bulk = AdStats.objects.filter(
-                        user=request.user,
-                        platform='adsense',
-                        ad_unit_id__in=mapped_adsense_units,
-                        date=current_date
-                    ).values('ad_unit_id').annotate(
-                        total_earnings_usd=Sum('earnings_usd')
-                    )
-                    
-                    # 벌크 결과를 딕셔너리로 변환
-                    adsense_usd_dict = {item['ad_unit_id']: item['total_earnings_usd'] or 0 for item in adsense_usd_bulk}
-                    
-                    for ad_unit_id in mapped_adsense_units:
-                        adsense_key = (ad_unit_id, current_date)
-                        adsense_amount = adsense_stats.get(adsense_key, 0)
-                        adsense_revenue += adsense_amount
-                        
-                        # USD 금액도 합계 계산 (딕셔너리에서 조회)
-                        usd_amount = adsense_usd_dict.get(ad_unit_id, 0)
-                        adsense_total_usd += Decimal(str(usd_amount))
-                
                 # 툴팁용 상세 정보 (그룹 전체 합계)
                 adsense_details = None
-                if adsense_revenue > 0 and adsense_total_usd > 0:
-                    month_start = current_date.replace(day=1)
-                    exchange_rate = exchange_rate_map.get(month_start, Decimal('1300'))
+                if adsense_revenue > 0 and adsense_usd_matrix[i][j] > 0:
                     adsense_details = {
-                        'total_usd': adsense_total_usd,
-                        'exchange_rate': exchange_rate,
+                        'total_usd': adsense_usd_matrix[i][j],
+                        'exchange_rate': matrix.exchange_rates[j],
                         'total_krw': adsense_revenue
                     }
                 
-                # ADX 수익 계산
-                adx_revenue = 0
-                if mapped_adx_units:
-                    for ad_unit_id in mapped_adx_units:
-                        adx_key = (ad_unit_id, current_date)
-                        adx_amount = adx_stats.get(adx_key, 0)
-                        adx_revenue += adx_amount
-                
                 detail_data[current_date] = {
                     'pageview': visit_count,
                     'valid_pageview': click_cnt,
@@ -1481,114 +1265,85 @@ def get_naver_powerlink_detail_data(user, start_date, end_date):
         'totals': {}
     }
 
-    # 1. Adpost 데이터 (단가 계산용)
-    adpost_stats = AdStats.objects.filter(
-        platform='adpost',
-        ad_unit_id='모바일뉴스픽_컨텐츠',
-        date__range=[start_date, end_date],
-        user=user
-    ).values('date').annotate(earnings=Sum('earnings'), clicks=Sum('clicks'))
-    
-    adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
-
-    # 2. 전체 및 멤버별 파워링크 클릭수
-    total_powerlink_stats = TotalStat.newspic_objects().filter(sdate__range=[start_date, end_date]).values('sdate').annotate(total_clicks=Sum('powerlink_count'))
-    total_powerlink_data = {stat['sdate']: stat['total_clicks'] for stat in total_powerlink_stats}
+    # 1. Adpost 데이터(단가 계산용) 및 전체 파워링크 클릭수 - 단가는 반올림 없이 사용
+    allocator = PowerlinkAllocator.load(user, date_list, unit_price_places=None)
 
-    # tbTotalStat에서 해당 기간에 데이터가 있는 모든 퍼블리셔 조회
-    totalstat_publishers = TotalStat.newspic_objects().filter(
-        sdate__range=[start_date, end_date]
+    # 2. 퍼블리셔 level 정보
+    # tbTotalStat에서 해당 기간에 데이터가 있는 모든 퍼블리셔 조회 (로컬 스냅샷 기준)
+    totalstat_publishers = NewspicDailyStat.objects.filter(
+        date__range=[start_date, end_date], has_total_stat=True
     ).values_list('request_key', flat=True).distinct()
     
-    # Member 테이블에서 해당 퍼블리셔들의 level 정보 조회
-    from stats.models import Member
-    member_levels = {}
-    for member in Member.newspic_objects().filter(request_key__in=totalstat_publishers):
-        member_levels[member.request_key] = member.level
+    # Member 테이블에서 해당 퍼블리셔들의 level 정보 조회 (멤버 디렉터리 캐시 사용)
+    member_levels = {
+        request_key: member.level
+        for request_key, member in get_members(totalstat_publishers).items() if member
+    }
     
     # purchase_group에 있는 퍼블리셔들도 추가 (level 정보가 없는 경우)
-    all_groups = PurchaseGroup.objects.filter(user=user, is_active=True)
+    all_groups = prefetch_members(PurchaseGroup.objects.filter(user=user, is_active=True))
     for group in all_groups:
         if group.member_request_key not in member_levels:
             member_levels[group.member_request_key] = group.member.level if group.member else 60
     
-    # 모든 퍼블리셔 키 목록
-    all_member_keys = list(member_levels.keys())
-    
-    member_powerlink_stats = TotalStat.newspic_objects().filter(
-        request_key__in=all_member_keys, sdate__range=[start_date, end_date]
-    ).values('request_key', 'sdate', 'powerlink_count')
-    member_powerlink_data = {(stat['request_key'], stat['sdate']): stat['powerlink_count'] for stat in member_powerlink_stats}
+    # 파트너스(level 60, 61, 65) 퍼블리셔의 파워링크 클릭 및 분배액 (0.01 반올림 후 합산)
+    partners_keys = [key for key, level in member_levels.items() if level in [60, 61, 65]]
+    partners_clicks = member_powerlink_matrix(partners_keys, date_list)
+    partners_revenue_units = allocator.allocate_units(partners_clicks, places=2).sum(axis=0)
+    partners_clicks = partners_clicks.sum(axis=0)
 
-    # 3. 일자별 데이터 계산
-    for d in date_list:
-        daily_values = {
-            'total_revenue': Decimal('0'), 'publisher_revenue': Decimal('0'), 'partners_revenue': Decimal('0'),
-            'total_clicks': 0, 'publisher_clicks': 0, 'partners_clicks': 0
-        }
-        
-        # Adpost 정보 (모바일뉴스픽_컨텐츠)
-        adpost_info = adpost_data.get(d, {'earnings': 0, 'clicks': 0})
-        adpost_earnings = adpost_info['earnings']
-        adpost_clicks = adpost_info['clicks']
-        
-        # 어드민 전체 파워링크 클릭수
-        admin_total_clicks = total_powerlink_data.get(d, 0)
-        
-        # PPC 계산: 모바일뉴스픽_컨텐츠 매출 / 모바일뉴스픽_컨텐츠 클릭수
-        ppc = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))) if adpost_clicks > 0 else Decimal('0')
-        
+    # 퍼블리셔 클릭 = 어드민 전체 클릭 - 파트너스 클릭 → 합산 클릭 기준 분배액
+    admin_total_clicks = np.array(allocator.total_powerlink, dtype=np.int64)
+    publisher_clicks = admin_total_clicks - partners_clicks
+    publisher_revenue_units = allocator.allocate_units(publisher_clicks, places=2)
+    net_cpc = allocator.rate(places=2)
+
+    # 3. 일자별 데이터 구성
+    for j, d in enumerate(date_list):
+        adpost_clicks = allocator.adpost_clicks[j]
+        total_clicks = allocator.total_powerlink[j]
         # 인정비율 계산: 모바일뉴스픽_컨텐츠 클릭수 / 파워링크 전체 클릭수
-        recognition_rate = (Decimal(str(adpost_clicks)) / Decimal(str(admin_total_clicks))) if admin_total_clicks > 0 else Decimal('0')
+        recognition_rate = (Decimal(str(adpost_clicks)) / Decimal(str(total_clicks))) if total_clicks > 0 else Decimal('0')
 
-        daily_values['publisher_clicks'] = admin_total_clicks
-        
-        # 모든 퍼블리셔별 수익 및 클릭수 계산 (tbTotalStat에 있는 모든 퍼블리셔)
-        for request_key in all_member_keys:
-            clicks = member_powerlink_data.get((request_key, d), 0)
-            revenue = Decimal('0')
-            
-            if ppc > 0 and clicks > 0 and recognition_rate > 0:
-                # 수익 계산: PPC * 파워링크 클릭수 * 59.5% * 인정비율
-                revenue = (ppc * Decimal(str(clicks)) * Decimal('0.595') * recognition_rate).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-            
-            # level에 따라 퍼블리셔/파트너스 구분
-            member_level = member_levels.get(request_key, 60)  # 기본값은 파트너스
-            if member_level in [60, 61, 65]:  # 퍼블리셔 (level 50 또는 100)
-                daily_values['partners_revenue'] += revenue
-                daily_values['partners_clicks'] += clicks
-                daily_values['publisher_clicks'] -= clicks
-        
-        daily_values['publisher_revenue'] = (ppc * Decimal(str(daily_values['publisher_clicks'])) * Decimal('0.595') * recognition_rate).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        daily_values = {
+            'publisher_revenue': Decimal(int(publisher_revenue_units[j])).scaleb(-2),
+            'partners_revenue': Decimal(int(partners_revenue_units[j])).scaleb(-2),
+            'publisher_clicks': int(publisher_clicks[j]),
+            'partners_clicks': int(partners_clicks[j]),
+        }
         daily_values['total_revenue'] = daily_values['publisher_revenue'] + daily_values['partners_revenue']
         daily_values['total_clicks'] = daily_values['publisher_clicks'] + daily_values['partners_clicks']
 
-        # Net CPC 계산: 인정비율 * PPC * 59.5%
-        daily_values['net_cpc'] = (recognition_rate * ppc * Decimal('0.595')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-        daily_values['ppc'] = ppc
+        # Net CPC: 인정비율 * PPC * 59.5%, PPC: 모바일뉴스픽_컨텐츠 매출 / 모바일뉴스픽_컨텐츠 클릭수
+        daily_values['net_cpc'] = net_cpc[j]
+        daily_values['ppc'] = allocator.unit_prices[j]
         
         # 어드민 전체 클릭수 저장
-        daily_values['admin_total_clicks'] = admin_total_clicks
+        daily_values['admin_total_clicks'] = total_clicks
         daily_values['recognition_rate'] = float(recognition_rate * 100)  # 퍼센트로 변환
 
         powerlink_data['daily'][d] = daily_values
 
     # 4. 합계 계산
-    powerlink_data['totals'] = {
-        'total_revenue': sum(v['total_revenue'] for v in powerlink_data['daily'].values()),
-        'publisher_revenue': sum(v['publisher_revenue'] for v in powerlink_data['daily'].values()),
-        'partners_revenue': sum(v['partners_revenue'] for v in powerlink_data['daily'].values()),
-        'admin_total_clicks': sum(v['admin_total_clicks'] for v in powerlink_data['daily'].values()),
-        'total_clicks': sum(v['total_clicks'] for v in powerlink_data['daily'].values()),
-        'publisher_clicks': sum(v['publisher_clicks'] for v in powerlink_data['daily'].values()),
-        'partners_clicks': sum(v['partners_clicks'] for v in powerlink_data['daily'].values()),
+    powerlink_data['totals'] = summarize_naver_powerlink_totals(powerlink_data['daily'])
+
+    return powerlink_data
+
+def summarize_naver_powerlink_totals(daily):
+    """네이버 파워링크 일별 데이터의 기간 합계"""
+    total_sum = {
+        'total_revenue': sum(v['total_revenue'] for v in daily.values()),
+        'publisher_revenue': sum(v['publisher_revenue'] for v in daily.values()),
+        'partners_revenue': sum(v['partners_revenue'] for v in daily.values()),
+        'admin_total_clicks': sum(v['admin_total_clicks'] for v in daily.values()),
+        'total_clicks': sum(v['total_clicks'] for v in daily.values()),
+        'publisher_clicks': sum(v['publisher_clicks'] for v in daily.values()),
+        'partners_clicks': sum(v['partners_clicks'] for v in daily.values()),
     }
-    total_sum = powerlink_data['totals']
     total_sum['net_cpc'] = (total_sum['total_revenue'] / total_sum['total_clicks']) if total_sum['total_clicks'] > 0 else Decimal('0')
     total_sum['ppc'] = (total_sum['partners_revenue'] / total_sum['partners_clicks']) if total_sum['partners_clicks'] > 0 else Decimal('0')
     total_sum['recognition_rate'] = (total_sum['total_clicks'] / total_sum['admin_total_clicks'] * 100) if total_sum['admin_total_clicks'] > 0 else 0
-
-    return powerlink_data
+    return total_sum
 
 def get_naver_performance_report_data(user, start_date, end_date):
     """네이버 실적 보고서 표에 필요한 데이터를 반환"""
@@ -1725,36 +1480,31 @@ def get_partners_valid_pv_data(user, start_date, end_date, other_revenue_data=No
     """파트너스 유효PV와 유효PV당 매출 데이터를 계산하여 반환"""
     date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     
-    # 파트너스 유효PV 데이터 조회 (tbMemberStat의 clickCnt를 해당 기간에 데이터가 있는 모든 대상에 대해서)
-    from stats.models import MemberStat, Member
-    
-    # 날짜 범위를 문자열 형태로 변환 (YYYYMMDD 형식)
-    start_date_str = start_date.strftime('%Y%m%d')
-    end_date_str = end_date.strftime('%Y%m%d')
-    
+    # 파트너스 유효PV 데이터 조회 (tbMemberStat의 clickCnt를 해당 기간에 데이터가 있는 모든 대상에 대해서, 로컬 스냅샷 기준)
     # 해당 기간에 MemberStat에 데이터가 있는 모든 request_key 조회
-    memberstat_publishers = MemberStat.newspic_objects().filter(
-        sdate__range=[start_date_str, end_date_str]
+    memberstat_publishers = NewspicDailyStat.objects.filter(
+        date__range=[start_date, end_date], has_member_stat=True
     ).values_list('request_key', flat=True).distinct()
     
-    # Member 테이블에서 해당 퍼블리셔들의 level 정보 조회
-    member_levels = {}
-    for member in Member.newspic_objects().filter(request_key__in=memberstat_publishers):
-        member_levels[member.request_key] = member.level
+    # Member 테이블에서 해당 퍼블리셔들의 level 정보 조회 (멤버 디렉터리 캐시 사용)
+    member_levels = {
+        request_key: member.level
+        for request_key, member in get_members(memberstat_publishers).items() if member
+    }
     
     # level 50과 100을 제외한 퍼블리셔들만 필터링 (파트너스)
     partners_keys = [key for key, level in member_levels.items() if level != 50 and level != 100]
     
     # 해당 member들의 MemberStat 데이터 조회 (파트너스만)
-    partners_stats = MemberStat.newspic_objects().filter(
+    partners_stats = NewspicDailyStat.objects.filter(
         request_key__in=partners_keys,
-        sdate__range=[start_date_str, end_date_str]
-    ).values('sdate').annotate(
-        valid_pageview=Sum('click_cnt')
+        date__range=[start_date, end_date]
+    ).values('date').annotate(
+        valid_pageview=Sum('valid_pageview')
     )
     
-    # 파트너스 매출 데이터 조회 (AdStats에서 파트너스 플랫폼들)
-    partners_revenue_stats = AdStats.objects.filter(
+    # 파트너스 매출 데이터 조회 (일별 집계에서 파트너스 플랫폼들)
+    partners_revenue_stats = DailyRevenueRollup.objects.filter(
         user=user,
         platform__in=['cozymamang', 'mediamixer', 'aceplanet', 'teads', 'taboola'],
         date__range=[start_date, end_date]
@@ -1763,15 +1513,13 @@ def get_partners_valid_pv_data(user, start_date, end_date, other_revenue_data=No
     )
     
     # 데이터를 딕셔너리로 변환
-    valid_pv_data = {stat['sdate']: stat['valid_pageview'] or 0 for stat in partners_stats}
+    valid_pv_data = {stat['date']: stat['valid_pageview'] or 0 for stat in partners_stats}
     revenue_data = {stat['date']: Decimal(str(stat['revenue'] or 0)) for stat in partners_revenue_stats}
     
     # 일자별 데이터 계산
     daily_data = {}
     for d in date_list:
-        # date 객체를 문자열로 변환하여 MemberStat 데이터와 매칭
-        date_str = d.strftime('%Y%m%d')
-        valid_pv = valid_pv_data.get(date_str, 0)
+        valid_pv = valid_pv_data.get(d, 0)
         base_revenue = revenue_data.get(d, Decimal('0'))
         
         # 구글/네이버 수익 추가 (파트너스용)
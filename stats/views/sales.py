@@ -18,7 +18,7 @@ from decimal import Decimal, ROUND_HALF_UP
 import logging
 from rest_framework.decorators import api_view
 from django.db.models import Q
-from django.core.cache import cache
+from django.db import transaction
 
 from ..forms import CredentialForm, SignUpForm
 from ..models import (
@@ -28,6 +28,12 @@ from ..models import (
     MonthlyAdjustment
 )
 from ..platforms import get_platform_display_name, PLATFORM_ORDER
+from ..services.purchase_prices import get_price_index
+from ..services.publisher_costs import get_monthly_publisher_costs, group_cost_specs, purchase_cost_deps
+from ..services.member_directory import prefetch_members
+from ..services.data_versions import bump, get_or_compute, year_months
+from ..services.spreadsheet_reader import get_file_ext
+from ..services.upload_jobs import submit_sales_upload_job
 
 logger = logging.getLogger(__name__)
 
@@ -67,201 +73,22 @@ def sales_api_view(request):
     return JsonResponse({'success': False, 'message': '알 수 없는 작업입니다.'}, status=400)
 
 def handle_excel_upload(request, year):
-    """엑셀 파일 업로드 처리"""
+    """엑셀 파일 업로드 접수 - 파싱/저장은 업로드 작업으로 처리하고 job_id 를 반환 (폴링)"""
     excel_file = request.FILES['excel_file']
     try:
-        print("--- 엑셀 파일 처리 시작 ---")
-        if excel_file.name.endswith('.xlsx'):
-            wb = openpyxl.load_workbook(excel_file)
-            sheet = wb.active
-            nrows = sheet.max_row
-        elif excel_file.name.endswith('.xls'):
-            wb = xlrd.open_workbook(file_contents=excel_file.read())
-            sheet = wb.sheet_by_index(0)
-            nrows = sheet.nrows
-        else:
-            messages.error(request, "지원하지 않는 파일 형식입니다. .xlsx 또는 .xls 파일을 업로드해주세요.")
-            return redirect(f'/sales-report/?year={year}')
-        
-        header_row_index = -1
-        headers = []
-        temp_rows_for_header = [sheet.row_values(i) for i in range(min(10, nrows))] if excel_file.name.endswith('.xls') else list(sheet.iter_rows(values_only=True, max_row=10))
-        for i, row in enumerate(temp_rows_for_header):
-            row_values = [str(cell) if cell is not None else '' for cell in row]
-            if '작성일자' in row_values and '상호' in row_values and '공급가액' in row_values:
-                header_row_index = i
-                headers = [str(cell).strip() for cell in row]
-                print(f"실제 헤더 발견 (행 {header_row_index + 1}): {headers}")
-                break
-        
-        if header_row_index == -1:
-            messages.error(request, "엑셀 파일에서 유효한 헤더를 찾을 수 없습니다. ('작성일자', '상호', '공급가액' 포함 필요)")
-            return redirect(f'/sales-report/?year={year}')
-        
-        column_map = {header: i for i, header in enumerate(headers)}
-        print(f"생성된 컬럼 맵: {column_map}")
-        required_columns = ['상호', '품목명', '공급가액', '작성일자']
-        if not all(col in column_map for col in required_columns):
-            missing_cols = [col for col in required_columns if col not in column_map]
-            messages.error(request, f"엑셀 파일에 필요한 컬럼이 없습니다: {', '.join(missing_cols)}")
-            return redirect(f'/sales-report/?year={year}')
-        
-        # 사업자번호 컬럼 확인 (선택적)
-        business_number_column = None
-        if '공급받는자사업자등록번호' in column_map:
-            business_number_column = column_map['공급받는자사업자등록번호']
-            print(f"사업자번호 컬럼 발견: {business_number_column}번째 열")
-        else:
-            print("사업자번호 컬럼이 없습니다. 기본값으로 처리합니다.")
-        
-        created_count = 0
-        updated_count = 0
-        grouped_count = 0
-        data_rows = (sheet.row_values(i) for i in range(header_row_index + 1, nrows)) if excel_file.name.endswith('.xls') else sheet.iter_rows(values_only=True, min_row=header_row_index + 2)
-        
-        # 사업자번호별 그룹화를 위한 임시 저장소
-        business_number_groups = {}
-        
-        for i, row_data in enumerate(data_rows, start=header_row_index + 2):
-            try:
-                if not any(row_data) or not str(row_data[column_map['상호']]).strip():
-                    continue
-                company_name = str(row_data[column_map['상호']]).strip()
-                service_name = str(row_data[column_map['품목명']]).strip()
-                approval_number = str(row_data[column_map['승인번호']]).strip() if '승인번호' in column_map else f"{company_name}_{service_name}"
-                
-                # 사업자번호 추출
-                business_number = ""
-                if business_number_column is not None and len(row_data) > business_number_column:
-                    business_number_raw = row_data[business_number_column]
-                    if business_number_raw:
-                        business_number = str(business_number_raw).strip()
-                        # 사업자번호 형식 정리 (하이픈 제거 후 다시 추가)
-                        business_number = business_number.replace('-', '').replace(' ', '')
-                        if len(business_number) == 10:  # 10자리 숫자인 경우
-                            business_number = f"{business_number[:3]}-{business_number[3:5]}-{business_number[5:]}"
-                
-                supply_value_raw = row_data[column_map['공급가액']]
-                supply_value = float(str(supply_value_raw).replace(',', '')) if supply_value_raw else 0.0
-                
-                # 사업자번호별 그룹화 정보 수집
-                if business_number:
-                    if business_number not in business_number_groups:
-                        business_number_groups[business_number] = {
-                            'company_name': company_name,
-                            'service_names': set(),
-                            'service_codes': set(),
-                            'total_amount': 0
-                        }
-                    business_number_groups[business_number]['service_names'].add(service_name)
-                    business_number_groups[business_number]['service_codes'].add(approval_number)
-                    business_number_groups[business_number]['total_amount'] += supply_value
-                issue_date_raw = row_data[column_map['작성일자']]
-                
-                if isinstance(issue_date_raw, datetime):
-                    issue_date = issue_date_raw.date()
-                elif isinstance(issue_date_raw, str) and issue_date_raw:
-                     issue_date = datetime.strptime(issue_date_raw, '%Y-%m-%d').date()
-                elif isinstance(issue_date_raw, (int, float)):
-                     issue_date = datetime.fromordinal(datetime(1900, 1, 1).toordinal() + int(issue_date_raw) - 2).date()
-                else:
-                    print(f"[{i}번째 행] 날짜 형식 오류, 건너뜁니다: {issue_date_raw}")
-                    continue
-                
-                if issue_date.year != year:
-                     continue
-                
-                # MonthlySales에 직접 저장
-                obj, created = MonthlySales.objects.get_or_create(
-                    user=request.user,
-                    service_code=approval_number,
-                    year_month=issue_date.replace(day=1),
-                    defaults={
-                        'company_name': company_name,
-                        'service_name': service_name,
-                        'transaction_date': issue_date,
-                        'amount': supply_value,
-                        'business_number': business_number,
-                    }
-                )
-                if not created:
-                    obj.amount += supply_value
-                    # 사업자번호가 있고 기존에 없었다면 업데이트
-                    if business_number and not obj.business_number:
-                        obj.business_number = business_number
-                    obj.save()
-                    updated_count += 1
-                else:
-                    created_count += 1
-            except Exception as e:
-                print(f"[오류] {i}번째 행 처리 실패: {row_data}, 원인: {e}")
-                continue
-        
-        print(f"--- 엑셀 파일 처리 종료 ---")
-        
-        # 사업자번호별 자동 그룹화 수행
-        if business_number_groups:
-            print(f"사업자번호별 그룹화 시작: {len(business_number_groups)}개 그룹")
-            for business_number, group_info in business_number_groups.items():
-                try:
-                    # 이미 해당 사업자번호로 그룹이 있는지 확인
-                    existing_group = ServiceGroup.objects.filter(
-                        user=request.user,
-                        group_code=business_number
-                    ).first()
-                    
-                    if existing_group:
-                        # 기존 그룹이 있으면 해당 그룹에 연결
-                        updated = MonthlySales.objects.filter(
-                            user=request.user,
-                            service_code__in=group_info['service_codes'],
-                            year_month__year=year
-                        ).update(group=existing_group)
-                        grouped_count += updated
-                        print(f"기존 그룹 '{existing_group.group_name}'에 {updated}개 항목 연결")
-                    else:
-                        # 새 그룹 생성
-                        group_name = f"{group_info['company_name']} ({business_number})"
-                        
-                        # service_name 길이 제한 처리
-                        service_names_list = sorted(group_info['service_names'])
-                        if len(service_names_list) > 0:
-                            # 첫 번째 서비스명을 사용하고, 여러 개인 경우 "외 N개" 표시
-                            if len(service_names_list) == 1:
-                                service_name = service_names_list[0]
-                            else:
-                                service_name = f"{service_names_list[0]} 외 {len(service_names_list)-1}개"
-                        else:
-                            service_name = "미정"
-                        
-                        new_group = ServiceGroup.objects.create(
-                            user=request.user,
-                            group_code=business_number,
-                            group_name=group_name,
-                            company_name=group_info['company_name'],
-                            service_name=service_name
-                        )
-                        
-                        # 해당 서비스 코드들을 새 그룹에 연결
-                        updated = MonthlySales.objects.filter(
-                            user=request.user,
-                            service_code__in=group_info['service_codes'],
-                            year_month__year=year
-                        ).update(group=new_group)
-                        grouped_count += updated
-                        print(f"새 그룹 '{group_name}' 생성 및 {updated}개 항목 연결")
-                        
-                except Exception as e:
-                    print(f"사업자번호 {business_number} 그룹화 중 오류: {e}")
-                    continue
-        
-        messages.success(request, f"엑셀 파일 처리가 완료되었습니다. (신규: {created_count}건, 업데이트: {updated_count}건, 그룹화: {grouped_count}건)")
+        file_ext = get_file_ext(excel_file.name)
+        if file_ext not in ('xlsx', 'xls'):
+            return JsonResponse({'error': "지원하지 않는 파일 형식입니다. .xlsx 또는 .xls 파일을 업로드해주세요."}, status=400)
+
+        job = submit_sales_upload_job(request.user, excel_file, year)
+        return JsonResponse({
+            'job_id': str(job.job_id),
+            'status': job.status,
+            'message': "엑셀 파일 업로드가 접수되었습니다. 처리 상태를 확인합니다.",
+        }, status=202)
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        messages.error(request, f"엑셀 파일 처리 중 오류가 발생했습니다: {e}")
-    
-    return redirect(f"/sales-report/?year={year}")
+        logger.exception("엑셀 파일 업로드 접수 중 오류 발생")
+        return JsonResponse({'error': f"엑셀 파일 처리 중 오류가 발생했습니다: {e}"}, status=500)
 
 def handle_inline_edit(request, year):
     """인라인 수정 처리"""
@@ -436,6 +263,7 @@ def handle_sales_delete(request, data, year):
                 ).delete()[0]
                 deleted_count += count
         
+        bump(request.user, 'sales', year_months(year))
         return JsonResponse({
             'success': True,
             'message': f'{deleted_count}개 항목과 {deleted_groups}개 그룹이 삭제되었습니다.',
@@ -539,6 +367,7 @@ def handle_sales_group(request, data, year):
                 year_month__year=year
             ).update(group=group)
             
+            bump(request.user, 'sales', year_months(year))
             return JsonResponse({
                 'success': True,
                 'message': f'{deleted_groups}개 그룹이 삭제되고, {updated_count}개 항목이 새 그룹 "{group_name}"에 추가되었습니다.',
@@ -553,6 +382,7 @@ def handle_sales_group(request, data, year):
             year_month__year=year
         ).update(group=group)
         
+        bump(request.user, 'sales', year_months(year))
         return JsonResponse({
             'success': True,
             'message': f'{updated_count}개 항목이 그룹 "{group_name}"에 추가되었습니다.',
@@ -598,6 +428,7 @@ def handle_sales_ungroup(request, data, year):
             year_month__year=year
         ).update(group=None)
         
+        bump(request.user, 'sales', year_months(year))
         return JsonResponse({
             'success': True,
             'message': f'{updated_count}개 항목의 그룹이 해제되었습니다.',
@@ -684,13 +515,8 @@ def generate_sales_context(request, year):
         year_month__year=year
     ).order_by('year_month', 'company_name', 'service_name')
     
-    # 1. 월별 매출/매입 계산 (캐시 적용)
-    cache_key = f"monthly_totals_{request.user.id}_{year}"
-    cached_monthly_data = cache.get(cache_key)
-    
-    if cached_monthly_data is None:
-        # 캐시가 없으면 계산
-        logger.info(f"캐시 MISS: {cache_key} - 데이터 계산 시작")
+    # 1. 월별 매출/매입 계산 (매출 데이터 버전 기준 캐시)
+    def compute_monthly_totals():
         monthly_totals = {m: 0 for m in range(1, 13)}  # 매출 (양수)
         purchase_monthly = {m: 0 for m in range(1, 13)}  # 매입 (음수 절대값)
         
@@ -716,17 +542,15 @@ def generate_sales_context(request, year):
             monthly_totals[month] = revenue
             purchase_monthly[month] = abs(purchase)
         
-        # 24시간 캐시 저장 (86400초)
-        cache.set(cache_key, {
+        return {
             'monthly_totals': monthly_totals,
             'purchase_monthly': purchase_monthly
-        }, 86400)
-        logger.info(f"캐시 SET: {cache_key} - 데이터 저장 완료")
-    else:
-        # 캐시에서 데이터 가져오기
-        logger.info(f"캐시 HIT: {cache_key} - 캐시된 데이터 사용")
-        monthly_totals = cached_monthly_data['monthly_totals']
-        purchase_monthly = cached_monthly_data['purchase_monthly']
+        }
+    
+    sales_deps = [('sales', year_months(year))]
+    cached_monthly_data = get_or_compute('monthly_totals', request.user, sales_deps, compute_monthly_totals, year)
+    monthly_totals = cached_monthly_data['monthly_totals']
+    purchase_monthly = cached_monthly_data['purchase_monthly']
     
     # 전월대비 증감 계산
     monthly_changes = _calculate_monthly_changes(monthly_totals)
@@ -738,13 +562,9 @@ def generate_sales_context(request, year):
     # sales_data 생성 - 그룹별 및 개별 데이터 (표시용)
     sales_data = []
     
-    # 그룹별 데이터 캐시 확인
-    group_cache_key = f"group_sales_data_{request.user.id}_{year}"
-    cached_group_data = cache.get(group_cache_key)
-    
-    if cached_group_data is None:
-        # 캐시가 없으면 계산
-        logger.info(f"그룹 데이터 캐시 MISS: {group_cache_key} - 데이터 계산 시작")
+    # 그룹별 데이터 (매출 데이터 버전 기준 캐시)
+    def compute_group_sales():
+        group_sales_data = []
         for group in groups:
             group_sales = monthly_data.filter(group=group)
             monthly_sales = {}
@@ -766,7 +586,7 @@ def generate_sales_context(request, year):
                     prev_month_amount = monthly_sales.get(month - 1, 0)
                     monthly_changes[month] = month_amount - prev_month_amount
             
-            sales_data.append({
+            group_sales_data.append({
                 'is_group': True,
                 'code': group.group_code,
                 'company_name': group.company_name,
@@ -783,14 +603,9 @@ def generate_sales_context(request, year):
                 'service_mapping': {},
                 'service_names_list': [],
             })
-        
-        # 24시간 캐시 저장 (86400초)
-        cache.set(group_cache_key, sales_data, 86400)
-        logger.info(f"그룹 데이터 캐시 SET: {group_cache_key} - 데이터 저장 완료")
-    else:
-        # 캐시에서 데이터 가져오기
-        logger.info(f"그룹 데이터 캐시 HIT: {group_cache_key} - 캐시된 데이터 사용")
-        sales_data = cached_group_data
+        return group_sales_data
+    
+    sales_data = get_or_compute('group_sales_data', request.user, sales_deps, compute_group_sales, year)
     
     # 그룹에 속하지 않은 개별 데이터 처리
     ungrouped_sales = monthly_data.filter(group__isnull=True)
@@ -879,149 +694,30 @@ def generate_sales_context(request, year):
         # 매출 + 매입(음수) = 매출 - 매입 절대값
         revenue_monthly[month] = revenue - purchase
     
-    # 주요퍼블리셔만 보기 조건일 때의 매입 데이터 계산 (캐시 적용)
-    purchase_cache_key = f"purchase_monthly_{request.user.id}_{year}"
-    cached_purchase_data = cache.get(purchase_cache_key)
-    
-    if cached_purchase_data is None:
-        # 캐시가 없으면 계산
-        logger.info(f"매입 데이터 캐시 MISS: {purchase_cache_key} - 데이터 계산 시작")
+    # 주요퍼블리셔만 보기 조건일 때의 매입 데이터 계산 (매입비용 입력 데이터 버전 기준 캐시)
+    def compute_purchase_monthly():
         purchase_monthly = {m: 0 for m in range(1, 13)}
         
         # 주요 퍼블리셔 그룹 조회
-        important_groups = PurchaseGroup.objects.filter(
+        important_groups = prefetch_members(PurchaseGroup.objects.filter(
             user=request.user, 
             is_active=True,
             is_important=True
-        ).prefetch_related('ad_units')
-        
-        if important_groups.exists():
-            # 모든 광고 단위 ID 수집
-            all_ad_unit_ids = []
-            for group in important_groups:
-                for ad_unit in group.ad_units.all():
-                    if ad_unit.is_active:
-                        all_ad_unit_ids.append(ad_unit.ad_unit_id)
-            
-            # AdStats 데이터 일괄 조회
-            ad_stats = AdStats.objects.filter(
-                user=request.user,
-                ad_unit_id__in=all_ad_unit_ids,
-                date__year=year
-            ).values('date', 'platform', 'ad_unit_id').annotate(
-                earnings=Sum('earnings'),
-                earnings_usd=Sum('earnings_usd')
-            )
-            
-            # 환율 데이터 일괄 조회
-            exchange_rates = ExchangeRate.objects.filter(
-                user=request.user, 
-                year_month__gte=date(year, 1, 1)
-            ).values('year_month', 'usd_to_krw')
-            exchange_rate_map = {rate['year_month']: rate['usd_to_krw'] for rate in exchange_rates}
-            
-            # stats_map 생성
-            stats_map = {}
-            for stat in ad_stats:
-                key = (stat['date'], stat['ad_unit_id'])
-                if stat['platform'] == 'adsense':
-                    month_start = stat['date'].replace(day=1)
-                    exchange_rate = exchange_rate_map.get(month_start, Decimal('1370.00'))
-                    stats_map[key] = (stat['earnings_usd'] or 0) * float(exchange_rate)
-                elif stat['platform'] in ['admanager', 'adpost']:
-                    stats_map[key] = stat['earnings'] or 0
-                else:
-                    stats_map[key] = stat['earnings'] or 0
-        
-        # 파워링크 데이터 조회
-        adpost_stats = AdStats.objects.filter(
-            platform='adpost',
-            ad_unit_id='모바일뉴스픽_컨텐츠',
-            date__year=year,
-            user=request.user
-        ).values('date').annotate(
-            earnings=Sum('earnings'),
-            clicks=Sum('clicks')
-        )
-        adpost_data = {stat['date']: {'earnings': stat['earnings'] or 0, 'clicks': stat['clicks'] or 0} for stat in adpost_stats}
+        ).prefetch_related('ad_units'))
         
-        total_powerlink_stats = TotalStat.newspic_objects().filter(
-            sdate__year=year
-        ).values('sdate').annotate(
-            total_powerlink=Sum('powerlink_count')
-        )
-        total_powerlink_data = {stat['sdate']: stat['total_powerlink'] or 0 for stat in total_powerlink_stats}
+        # 퍼블리셔별 월 매입비용 (MonthlyPublisherCost 기준, 데이터/단가가 바뀐 월만 재계산)
+        group_costs = get_monthly_publisher_costs(request.user, year, group_cost_specs(important_groups, get_price_index(request.user, year)))
         
-        publisher_keys = [group.member.request_key for group in important_groups]
-        member_powerlink_stats = TotalStat.newspic_objects().filter(
-            request_key__in=publisher_keys,
-            sdate__year=year
-        ).values('request_key', 'sdate').annotate(
-            powerlink_count=Sum('powerlink_count'),
-            click_count=Sum('click_count')
-        )
-        member_powerlink_data = {(stat['request_key'], stat['sdate']): {'powerlink_count': stat['powerlink_count'] or 0, 'click_count': stat['click_count'] or 0} for stat in member_powerlink_stats}
-        
-        # 각 그룹별로 월별 매입비용 계산
         for group in important_groups:
-            monthly_cost = {m: 0 for m in range(1, 13)}
-            default_price = group.default_unit_price
-            default_type = group.default_unit_type
-            ad_units = group.ad_units.filter(is_active=True)
-            
-            for m in range(1, 13):
-                last_day = calendar.monthrange(year, m)[1]
-                for d in range(1, last_day + 1):
-                    current_date = date(year, m, d)
-                    
-                    # AdSense/AdManager 일별 수익 계산
-                    ad_revenue = Decimal('0')
-                    for ad_unit in ad_units:
-                        stat_key = (current_date, ad_unit.ad_unit_id)
-                        ad_revenue += Decimal(str(stats_map.get(stat_key, 0)))
-                    
-                    # AdPost 일별 수익 분배
-                    adpost_info = adpost_data.get(current_date, {'earnings': 0, 'clicks': 0})
-                    total_powerlink_count = total_powerlink_data.get(current_date, 0)
-                    member_data = member_powerlink_data.get((group.member.request_key, current_date), {'powerlink_count': 0, 'click_count': 0})
-                    powerlink_count = member_data['powerlink_count']
-                    click_count = member_data['click_count']
-                    
-                    adpost_earnings = adpost_info['earnings']
-                    adpost_clicks = adpost_info['clicks']
-                    powerlink_revenue = Decimal('0')
-                    
-                    if adpost_clicks > 0 and total_powerlink_count > 0 and powerlink_count > 0:
-                        unit_price = (Decimal(str(adpost_earnings)) / Decimal(str(adpost_clicks))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                        powerlink_revenue = (unit_price * Decimal(str(powerlink_count)) * Decimal('0.595') * (Decimal(str(adpost_clicks)) / Decimal(str(total_powerlink_count)))).quantize(Decimal('0'), rounding=ROUND_HALF_UP)
-                    
-                    ad_revenue += powerlink_revenue
-                    
-                    # 매입비용 계산
-                    rs_rate = default_price or 0
-                    rs_type = default_type or 'percent'
-                    purchase_cost = Decimal('0')
-                    
-                    if rs_type == 'percent':
-                        purchase_cost = ad_revenue * (Decimal(str(rs_rate)) / Decimal('100'))
-                    else:
-                        purchase_cost = Decimal(str(click_count)) * Decimal(str(rs_rate))
-                    
-                    # 월별 매입비용에 누적
-                    monthly_cost[m] += int(purchase_cost)
-            
             # 퍼블리셔 레벨에 따라 purchase_monthly에 누적
             if group.member.level == 50:  # 퍼블리셔
                 for m in range(1, 13):
-                    purchase_monthly[m] += monthly_cost[m]
-        
-        # 24시간 캐시 저장 (86400초)
-        cache.set(purchase_cache_key, purchase_monthly, 86400)
-        logger.info(f"매입 데이터 캐시 SET: {purchase_cache_key} - 데이터 저장 완료")
-    else:
-        # 캐시에서 데이터 가져오기
-        logger.info(f"매입 데이터 캐시 HIT: {purchase_cache_key} - 캐시된 데이터 사용")
-        purchase_monthly = cached_purchase_data
+                    purchase_monthly[m] += group_costs[group.member_request_key][m]
+        return purchase_monthly
+    
+    purchase_monthly = get_or_compute(
+        'purchase_monthly', request.user, purchase_cost_deps(year), compute_purchase_monthly, year
+    )
     
     gross_profit_monthly = {m: revenue_monthly.get(m, 0) - purchase_monthly.get(m, 0) for m in range(1, 13)}
     